@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Column rebar cage layouts, computed without the Revit API.
+
+A cage is laid out in the column's own axes (u along its width b, v along
+its depth h, w up the column) and mapped to model coordinates through a
+Frame built from the instance transform, so rotated columns get bars on
+their real faces rather than on the axis-aligned bounding box.
+
+Layouts are lists of BarSet: the curves of the first bar, the direction the
+set repeats in (the Revit "normal") and a layout rule. Identical bars share
+one set, so a rectangular cage with bars per face is at most four
+longitudinal sets (two full faces including the corners, two faces of
+intermediate bars) plus one stirrup set, whatever the bar count. Revit has
+no polar layout, so each bar of a circular section is its own element.
+
+All lengths are feet. Nothing here imports pyrevit; routes turn BarSets
+into Rebar elements (revit_mcp.rebar) and bench/rebar_check.py tests them
+directly.
+"""
+import math
+
+M_TO_FT = 1.0 / 0.3048
+
+
+class CageError(Exception):
+    """A section too small for its cover and bars, or an impossible bar count."""
+
+
+class Frame(object):
+    """Column axes in model coordinates: origin at the section centre, unit x/y/z as tuples."""
+    __slots__ = ("origin", "x", "y", "z")
+
+    def __init__(self, origin, x_axis, y_axis, z_axis=(0.0, 0.0, 1.0)):
+        self.origin = tuple(origin)
+        self.x, self.y, self.z = tuple(x_axis), tuple(y_axis), tuple(z_axis)
+
+    def vector(self, u, v, w):
+        return tuple(self.x[i] * u + self.y[i] * v + self.z[i] * w for i in range(3))
+
+    def point(self, u, v, w):
+        d = self.vector(u, v, w)
+        return tuple(self.origin[i] + d[i] for i in range(3))
+
+    def local(self, p):
+        """(u, v, w) of a model point."""
+        d = [p[i] - self.origin[i] for i in range(3)]
+        return tuple(sum(d[i] * axis[i] for i in range(3)) for axis in (self.x, self.y, self.z))
+
+
+class BarSet(object):
+    """Identical bars: curves of the first bar, repeated count times along normal over array_length.
+
+    layout is "single", "fixed" (count bars spread over array_length) or
+    "maxSpacing" (as many bars as needed so none is farther apart than spacing).
+    curves are ("line", p, q) or ("arc", p, q, point on arc), model coordinates.
+    """
+    __slots__ = ("role", "curves", "normal", "layout", "count", "array_length", "spacing")
+
+    def __init__(self, role, curves, normal, layout="single", count=1, array_length=0.0, spacing=0.0):
+        self.role = role
+        self.curves = curves
+        self.normal = normal
+        self.layout = layout
+        self.count = count
+        self.array_length = array_length
+        self.spacing = spacing
+
+    @property
+    def bars(self):
+        if self.layout == "maxSpacing":
+            return int(math.ceil(self.array_length / self.spacing - 1e-9)) + 1
+        return self.count
+
+    def positions(self):
+        """Start point of every bar in the set."""
+        start = self.curves[0][1]
+        n = self.bars
+        step = self.array_length / (n - 1) if n > 1 else 0.0
+        return [tuple(start[i] + self.normal[i] * step * k for i in range(3)) for k in range(n)]
+
+    def row(self):
+        return {"role": self.role, "layout": self.layout, "bars": self.bars,
+                "arrayLength": round(self.array_length, 6),
+                "start": [round(c, 6) for c in self.curves[0][1]]}
+
+
+def _vertical(frame, u, v, w0, w1):
+    return [("line", frame.point(u, v, w0), frame.point(u, v, w1))]
+
+
+def rectangular(frame, b, h, w0, w1, cover, bar, stirrup, bars_x=2, bars_y=2, stirrup_spacing=None):
+    """BarSets for a b x h section between heights w0 and w1 (cover already applied to the ends).
+
+    bars_x bars on each face parallel to b, bars_y on each face parallel to h,
+    corner bars counted on both. bar and stirrup are bar diameters.
+    """
+    bars_x, bars_y = int(bars_x), int(bars_y)
+    if bars_x < 2 or bars_y < 2:
+        raise CageError("barsX and barsY must be at least 2 (the corner bars)")
+    cu = b / 2.0 - cover - stirrup - bar / 2.0  # bar centres from the section centre
+    cv = h / 2.0 - cover - stirrup - bar / 2.0
+    if cu <= 0 or cv <= 0 or w1 <= w0:
+        raise CageError("Section %.3f x %.3f ft is too small for cover and bars" % (b, h))
+    sy = 2.0 * cv / (bars_y - 1)
+    sets = []
+    for v in (-cv, cv):
+        sets.append(BarSet("longitudinal", _vertical(frame, -cu, v, w0, w1), frame.x,
+                           "fixed", bars_x, 2.0 * cu))
+    if bars_y > 2:
+        for u in (-cu, cu):
+            sets.append(BarSet("longitudinal", _vertical(frame, u, -cv + sy, w0, w1), frame.y,
+                               "fixed" if bars_y > 3 else "single", bars_y - 2, (bars_y - 3) * sy))
+    if stirrup_spacing:
+        su = b / 2.0 - cover - stirrup / 2.0
+        sv = h / 2.0 - cover - stirrup / 2.0
+        corners = [frame.point(u, v, w0) for u, v in ((-su, -sv), (su, -sv), (su, sv), (-su, sv))]
+        loop = [("line", corners[i], corners[(i + 1) % 4]) for i in range(4)]
+        sets.append(BarSet("stirrup", loop, frame.z, "maxSpacing", 0, w1 - w0, stirrup_spacing))
+    return sets
+
+
+def circular(frame, diameter, w0, w1, cover, bar, stirrup, bars=6, stirrup_spacing=None):
+    """BarSets for a circular section: bars evenly round the hoop, one element per bar."""
+    bars = int(bars)
+    if bars < 4:
+        raise CageError("A circular section needs at least 4 bars")
+    r = diameter / 2.0 - cover - stirrup - bar / 2.0
+    if r <= 0 or w1 <= w0:
+        raise CageError("Diameter %.3f ft is too small for cover and bars" % diameter)
+    sets = []
+    for k in range(bars):
+        a = 2.0 * math.pi * k / bars
+        tangent = frame.vector(-math.sin(a), math.cos(a), 0.0)  # any normal works for one straight bar
+        sets.append(BarSet("longitudinal", _vertical(frame, r * math.cos(a), r * math.sin(a), w0, w1), tangent))
+    if stirrup_spacing:
+        rs = diameter / 2.0 - cover - stirrup / 2.0
+
+        def at(a):
+            return frame.point(rs * math.cos(a), rs * math.sin(a), w0)
+        hoop = [("arc", at(0.0), at(math.pi), at(math.pi / 2.0)),
+                ("arc", at(math.pi), at(0.0), at(1.5 * math.pi))]
+        sets.append(BarSet("stirrup", hoop, frame.z, "maxSpacing", 0, w1 - w0, stirrup_spacing))
+    return sets
+
+
+def totals(sets):
+    """{"bars", "stirrups", "elements"} of a layout."""
+    longitudinal = sum(s.bars for s in sets if s.role == "longitudinal")
+    stirrups = sum(s.bars for s in sets if s.role == "stirrup")
+    return {"bars": longitudinal, "stirrups": stirrups, "elements": len(sets)}
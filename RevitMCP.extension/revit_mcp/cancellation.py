@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Cooperative cancellation of route requests.
+
+The MCP server tags each request with an X-MCP-Request-Id header and, when a
+tool call is cancelled, posts that id to /cancel/. That route takes no
+``doc`` so pyRevit runs it on the server thread, even while another route
+holds Revit's API thread. Routes then stop at their next check():
+
+- Tx() checks before starting, so queued work that has not started yet
+  never modifies the model;
+- batch routes check between items; the Cancelled exception unwinds through
+  Tx/TxGroup, which roll back the partial work, and err() answers 499.
+"""
+import threading
+import time
+
+TTL_SECONDS = 600  # cancel marks for requests that never show up are dropped after this
+
+_lock = threading.Lock()
+_cancelled = {}  # request id -> time it was cancelled
+_running = {}    # request id -> time it started
+_local = threading.local()
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _purge(now):
+    for rid, t in list(_cancelled.items()):
+        if now - t > TTL_SECONDS:
+            del _cancelled[rid]
+
+
+def begin(request_id):
+    """Bind the request being handled on this thread to its client id."""
+    _local.request_id = request_id
+    if request_id:
+        with _lock:
+            _running[request_id] = time.time()
+
+
+def end():
+    rid = getattr(_local, "request_id", None)
+    _local.request_id = None
+    if rid:
+        with _lock:
+            _running.pop(rid, None)
+            _cancelled.pop(rid, None)
+
+
+def cancel(request_id):
+    """Mark a request cancelled; returns "running" or "pending" (not started or unknown)."""
+    now = time.time()
+    with _lock:
+        _purge(now)
+        _cancelled[request_id] = now
+        return "running" if request_id in _running else "pending"
+
+
+def check():
+    """Raise Cancelled if the client cancelled the request on this thread."""
+    rid = getattr(_local, "request_id", None)
+    if rid and rid in _cancelled:
+        raise Cancelled("Request %s was cancelled by the client" % rid)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from revit_mcp import profiler
+from revit_mcp.utils import err, log_api_call, ok, request_data
+
+
+def register_routes(api):
+    @api.route("/debug/profile/", methods=["POST"])
+    def start_profile(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/debug/profile/", data)
+        try:
+            info = profiler.start(
+                mode=data.get("mode", "deterministic"),  # "deterministic" | "sampling"
+                requests=data.get("requests"),  # profile the next N matching requests
+                seconds=data.get("seconds"),  # ...and/or for the next T seconds
+                routes=data.get("routes"),  # e.g. ["POST /draw_curves/"]; all routes if omitted
+                interval_ms=data.get("intervalMs", 5),
+            )
+            return ok(info)
+        except (ValueError, profiler.ProfilerUnavailable) as ex:
+            return err(str(ex), 400)
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/debug/profile/", methods=["GET"])
+    def profile_status(doc):
+        log_api_call("GET", "/debug/profile/")
+        try:
+            return ok(profiler.status())
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/debug/profile/stop/", methods=["POST"])
+    def stop_profile(doc):
+        log_api_call("POST", "/debug/profile/stop/")
+        try:
+            return ok(profiler.stop())
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/debug/profile/report/", methods=["GET"])
+    def profile_report(doc):
+        log_api_call("GET", "/debug/profile/report/")
+        try:
+            rep = profiler.report()
+            if rep is None:
+                return err("No profiling session has run", 404)
+            return ok(rep)
+        except Exception as ex:
+            return err(ex)
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
-import json
-
 from pyrevit import DB
-from System.Collections.Generic import List  # type: ignore
 
+from revit_mcp.rebar import CageError, RebarTypes, column_by_id, create_cage, plan_cage
+from revit_mcp.spatial import clash_settings, clashes_along, clashes_at_point
+from revit_mcp.tracing import span
 from revit_mcp.utils import (
     Tx,
     err,
@@ -13,13 +13,34 @@ from revit_mcp.utils import (
     find_type_by_name,
     log_api_call,
     ok,
+    request_data,
 )
 
 
+def _column_clashes(doc, data, level, x, y):
+    """Existing elements at a column position, when the request asks for clashCheck."""
+    enabled, categories, clearance = clash_settings(data, ["OST_StructuralColumns"])
+    if not enabled:
+        return []
+    return clashes_at_point(doc, x, y, [int(level.Id.IntegerValue)], categories, clearance)
+
+
+def _wall_clashes(doc, data, level, wall_type, x1, y1, x2, y2):
+    """Existing elements along a wall line, when the request asks for clashCheck.
+
+    Without an explicit clearance, half the wall type's width is used."""
+    enabled, categories, clearance = clash_settings(data, ["OST_Walls"])
+    if not enabled:
+        return []
+    if "clearance" not in data and wall_type is not None:
+        clearance = getattr(wall_type, "Width", 0.0) / 2.0
+    return clashes_along(doc, x1, y1, x2, y2, [int(level.Id.IntegerValue)], categories, clearance)
+
+
 def register_routes(api):
     @api.route("/validate/create_wall_line/", methods=["POST"])
     def validate_create_wall_line(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/validate/create_wall_line/", data)
         try:
             level_name = data.get("level") or "Level 1"
@@ -45,12 +66,16 @@ def register_routes(api):
             except Exception:
                 return ok({"canCreate": False, "reason": "Invalid numeric inputs"})
 
+            clashes = _wall_clashes(doc, data, level, wt if wall_type_name else None, x1, y1, x2, y2)
+            if clashes:
+                return ok({"canCreate": False, "reason": "Clashes with %d element(s)" % len(clashes),
+                           "clashes": clashes})
             return ok({"canCreate": True})
         except Exception as ex:
             return err(ex)
     @api.route("/validate/place_column/", methods=["POST"])
     def validate_place_column(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/validate/place_column/", data)
         try:
             level_name = data.get("level") or "Level 1"
@@ -73,12 +98,17 @@ def register_routes(api):
                 if not has_any:
                     return ok({"canPlace": False, "reason": "No structural column types available"})
 
+            if data.get("x") is not None and data.get("y") is not None:
+                clashes = _column_clashes(doc, data, level, float(data["x"]), float(data["y"]))
+                if clashes:
+                    return ok({"canPlace": False, "reason": "Clashes with %d element(s)" % len(clashes),
+                               "clashes": clashes})
             return ok({"canPlace": True})
         except Exception as ex:
             return err(ex)
     @api.route("/create_wall_line/", methods=["POST"])
     def create_wall_line(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/create_wall_line/", data)
         try:
             # inputs
@@ -101,6 +131,11 @@ def register_routes(api):
             else:
                 wt = None
 
+            clashes = _wall_clashes(doc, data, level, wt, x1, y1, x2, y2)
+            if clashes:
+                return ok({"ok": False, "error": "Wall clashes with %d element(s)" % len(clashes),
+                           "clashes": clashes})
+
             line = DB.Line.CreateBound(DB.XYZ(x1, y1, z), DB.XYZ(x2, y2, z))
             with Tx(doc, "MCP: Create Wall"):
                 wall = DB.Wall.Create(doc, line, level.Id, False)
@@ -112,7 +147,7 @@ def register_routes(api):
 
     @api.route("/place_column/", methods=["POST"])
     def place_column(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/place_column/", data)
         try:
             x = float(data["x"])
@@ -129,6 +164,11 @@ def register_routes(api):
             if type_name and col_type is None:
                 return err("Column type not found: " + type_name, 400)
 
+            clashes = _column_clashes(doc, data, level, x, y)
+            if clashes:
+                return ok({"ok": False, "error": "Column clashes with %d element(s)" % len(clashes),
+                           "clashes": clashes})
+
             with Tx(doc, "MCP: Place Column"):
                 if col_type:
                     if not col_type.IsActive:
@@ -170,34 +210,33 @@ def register_routes(api):
                 .OfClass(DB.Wall)\
                 .WhereElementIsNotElementType()
             
-            walls = iter(collector)
-            
-            for wall in collector:
-                try:
-                    # Obter o parâmetro de área
-                    area_param = wall.get_Parameter(DB.BuiltInParameter.HOST_AREA_COMPUTED)
-                    if area_param and area_param.HasValue:
-                        # Área em pés quadrados (unidade interna do Revit)
-                        area_sqft = area_param.AsDouble()
-                        # Converter para metros quadrados (1 pé² = 0.09290304 m²)
-                        area_sqm = area_sqft * 0.09290304
+            with span("collect"):
+                for wall in collector:
+                    try:
+                        # Obter o parâmetro de área
+                        area_param = wall.get_Parameter(DB.BuiltInParameter.HOST_AREA_COMPUTED)
+                        if area_param and area_param.HasValue:
+                            # Área em pés quadrados (unidade interna do Revit)
+                            area_sqft = area_param.AsDouble()
+                            # Converter para metros quadrados (1 pé² = 0.09290304 m²)
+                            area_sqm = area_sqft * 0.09290304
                         
-                        # Como temos duas faces (interna e externa), multiplicamos por 2
-                        paint_area = area_sqm * 2
+                            # Como temos duas faces (interna e externa), multiplicamos por 2
+                            paint_area = area_sqm * 2
                         
-                        wall_info = {
-                            "id": int(wall.Id.IntegerValue),
-                            "name": wall.Name if hasattr(wall, "Name") else "Wall",
-                            "area_m2": round(area_sqm, 2),
-                            "paint_area_m2": round(paint_area, 2)
-                        }
+                            wall_info = {
+                                "id": int(wall.Id.IntegerValue),
+                                "name": wall.Name if hasattr(wall, "Name") else "Wall",
+                                "area_m2": round(area_sqm, 2),
+                                "paint_area_m2": round(paint_area, 2)
+                            }
                         
-                        walls.append(wall_info)
-                        total_area += paint_area
+                            walls.append(wall_info)
+                            total_area += paint_area
                         
-                except Exception:
-                    # Se falhar em uma parede específica, continua com as outras
-                    continue
+                    except Exception:
+                        # Se falhar em uma parede específica, continua com as outras
+                        continue
             
             result = {
                 "walls": walls,
@@ -212,13 +251,14 @@ def register_routes(api):
 
     @api.route("/validate/rebar_cage_column/", methods=["POST"])
     def validate_rebar_cage_column(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/validate/rebar_cage_column/", data)
         try:
             col_id = int(data.get("columnId", -1))
             bar_type = data.get("barType")
             shape_name = data.get("stirrupShape")
-            spacing = float(data.get("stirrupSpacing", 0.2))
+            spacing = data.get("stirrupSpacing")
+            spacing = float(spacing) if spacing is not None else 0.2
             cover = float(data.get("cover", 0.03))
 
             if col_id <= 0:
@@ -252,93 +292,19 @@ def register_routes(api):
 
     @api.route("/place/rebar_cage_column/", methods=["POST"])
     def place_rebar_cage_column(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/place/rebar_cage_column/", data)
         try:
-            col_id = int(data["columnId"])
-            bar_type_name = data.get("barType")
-            stirrup_shape_name = data.get("stirrupShape")
-            spacing = float(data.get("stirrupSpacing", 0.2))
-            cover = float(data.get("cover", 0.03))
-
-            col = doc.GetElement(DB.ElementId(col_id))
-            if col is None or not isinstance(col, DB.FamilyInstance):
-                return err("Invalid element", 400)
-
-            bar_type = find_rebar_bar_type_by_name(doc, bar_type_name) if bar_type_name else None
-            if bar_type is None:
-                it = DB.FilteredElementCollector(doc).OfClass(DB.Structure.RebarBarType)
-                bar_type = next((x for x in it), None)
-            if bar_type is None:
-                return err("No RebarBarType available.", 400)
-
-            stirrup_shape = find_rebar_shape_by_name(doc, stirrup_shape_name) if stirrup_shape_name else None
-
-            bb = col.get_BoundingBox(None)
-            if bb is None:
-                return err("Column has no bounding box", 400)
-
-            tr = col.GetTransform()
-            minp = tr.OfPoint(bb.Min)
-            maxp = tr.OfPoint(bb.Max)
-
-            x1, x2 = minp.X + cover, maxp.X - cover
-            y1, y2 = minp.Y + cover, maxp.Y - cover
-            z1, z2 = minp.Z + cover, maxp.Z - cover
-
-            pA1, pA2 = DB.XYZ(x1, y1, z1), DB.XYZ(x1, y1, z2)
-            pB1, pB2 = DB.XYZ(x2, y1, z1), DB.XYZ(x2, y1, z2)
-            pC1, pC2 = DB.XYZ(x2, y2, z1), DB.XYZ(x2, y2, z2)
-            pD1, pD2 = DB.XYZ(x1, y2, z1), DB.XYZ(x1, y2, z2)
-
-            vA = DB.Line.CreateBound(pA1, pA2)
-            vB = DB.Line.CreateBound(pB1, pB2)
-            vC = DB.Line.CreateBound(pC1, pC2)
-            vD = DB.Line.CreateBound(pD1, pD2)
-
-            normal = tr.BasisX
-
-            created_ids = []
+            try:
+                plan = plan_cage(column_by_id(doc, data.get("columnId")), data, RebarTypes(doc))
+            except (CageError, ValueError) as ex:
+                return err(ex, 400)
 
             with Tx(doc, "MCP: Column Rebar (longitudinals + stirrups)"):
-                for crv in [vA, vB, vC, vD]:
-                    curves = List[DB.Curve]()
-                    curves.Add(crv)
-                    rb = DB.Structure.Rebar.CreateFromCurves(
-                        doc,
-                        DB.Structure.RebarStyle.Standard,
-                        bar_type,
-                        None,
-                        None,
-                        col,
-                        normal,
-                        curves,
-                        DB.Structure.RebarHookOrientation.Left,
-                        DB.Structure.RebarHookOrientation.Left,
-                        True,
-                        True
-                    )
-                    created_ids.append(int(rb.Id.IntegerValue))
-
-                if stirrup_shape is not None:
-                    zbase = z1 + spacing * 0.5
-                    p1 = DB.XYZ(x1, y1, zbase)
-                    p2 = DB.XYZ(x2, y1, zbase)
-                    p3 = DB.XYZ(x2, y2, zbase)
-                    p4 = DB.XYZ(x1, y2, zbase)
-                    rect = List[DB.Curve]()
-                    rect.Add(DB.Line.CreateBound(p1, p2))
-                    rect.Add(DB.Line.CreateBound(p2, p3))
-                    rect.Add(DB.Line.CreateBound(p3, p4))
-                    rect.Add(DB.Line.CreateBound(p4, p1))
-
-                    stir = DB.Structure.Rebar.CreateFromCurvesAndShape(
-                        doc, stirrup_shape, bar_type, None, None, col, normal, rect
-                    )
-                    acc = stir.GetShapeDrivenAccessor()
-                    acc.SetLayoutAsMaximumSpacing(spacing, z2 - z1, True, True, True)
-                    created_ids.append(int(stir.Id.IntegerValue))
-
-            return ok({"ok": True, "elementIds": created_ids})
+                created_ids = create_cage(doc, plan)
+
+            result = plan.row(created_ids)
+            result["ok"] = True
+            return ok(result)
         except Exception as ex:
-            return err(ex)
\ No newline at end of file
+            return err(ex)
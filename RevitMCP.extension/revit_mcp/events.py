@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Document change events pushed to the MCP server.
+
+Revit events (DocumentChanged, ViewActivated, DocumentOpened/Closing) are
+turned into small JSON events and kept in a ring buffer. Each event has an
+id "<epoch>:<seq>": seq increases by one per event and epoch changes every
+time Revit starts, so a client can resume exactly where it stopped.
+
+Two ways to read them:
+
+- Server-Sent Events on http://127.0.0.1:48885/events (pyRevit routes cannot
+  hold a response open, so a small HTTP server runs on its own thread).
+  Send the last id seen as the Last-Event-ID header to resume; comments are
+  sent every KEEPALIVE_SECONDS.
+- GET /revit_mcp/events/?after=<id>&timeout=<s>, a long poll through
+  pyRevit for clients that cannot keep a stream open.
+
+When the id asked for is no longer buffered (or from an earlier epoch),
+the reply starts with a "reset" event: the client must treat everything
+it cached as stale.
+
+document_changed lists the categories it touched by id (the BuiltInCategory
+value, e.g. -2000011 for walls): category names are localized.
+"""
+import collections
+import json
+import threading
+import time
+import uuid
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer  # IronPython 2.7
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 48885
+BUFFER_SIZE = 4096
+MAX_IDS = 1000  # element ids listed per event; beyond that the event says "truncated"
+KEEPALIVE_SECONDS = 15.0
+MAX_POLL_SECONDS = 25.0
+
+EPOCH = uuid.uuid4().hex[:12]
+
+_lock = threading.Condition()
+_buffer = collections.deque(maxlen=BUFFER_SIZE)  # (seq, event dict)
+_seq = [0]
+_stats = {"published": 0, "subscribers": 0, "resets": 0}
+_changes = {}  # document title -> DocumentChanged count this session
+_active = [None]  # title of the document in the active view, as last reported by Revit
+listeners = []  # in-process consumers (spatial index): called with each published event
+installed = False  # set by install(); without Revit's events, listeners hear nothing
+
+
+def event_id(seq):
+    return "%s:%d" % (EPOCH, seq)
+
+
+def publish(kind, **data):
+    """Append an event and wake every waiting reader."""
+    data["type"] = kind
+    data["time"] = time.time()
+    with _lock:
+        _seq[0] += 1
+        data["id"] = event_id(_seq[0])
+        _buffer.append((_seq[0], data))
+        _stats["published"] += 1
+        _lock.notify_all()
+    for listener in listeners:
+        try:
+            listener(data)
+        except Exception:
+            pass
+    return data
+
+
+def _parse_id(last_id):
+    """seq to resume after, or None when last_id is from another epoch."""
+    if not last_id:
+        return 0
+    try:
+        epoch, seq = str(last_id).split(":", 1)
+        return int(seq) if epoch == EPOCH else None
+    except ValueError:
+        return None
+
+
+def since(last_id):
+    """(events after last_id, reset) where reset means events were missed."""
+    after = _parse_id(last_id)
+    with _lock:
+        oldest = _buffer[0][0] if _buffer else _seq[0] + 1
+        reset = after is None or after < oldest - 1
+        if reset:
+            _stats["resets"] += 1
+            after = oldest - 1
+        return [e for s, e in _buffer if s > after], reset
+
+
+def wait(last_id, timeout):
+    """Like since(), but blocks up to timeout seconds for a new event (or a wake-up)."""
+    events, reset = since(last_id)
+    if events or reset:
+        return events, reset
+    with _lock:
+        if _seq[0] <= (_parse_id(last_id) or 0):
+            _lock.wait(timeout)
+    return since(last_id)
+
+
+def last_id():
+    with _lock:
+        return event_id(_seq[0])
+
+
+def change_counter(document):
+    """DocumentChanged events seen for a document since Revit started.
+
+    Together with EPOCH this identifies a model state: data read while
+    (EPOCH, counter) was current is still valid while it is."""
+    with _lock:
+        return _changes.get(document, 0)
+
+
+def _count_change(document):
+    with _lock:
+        _changes[document] = _changes.get(document, 0) + 1
+        return _changes[document]
+
+
+def model_state():
+    """Epoch, active document and change counters: what a reader needs to tell whether
+    data read earlier (a model snapshot) still describes the model."""
+    with _lock:
+        return {"epoch": EPOCH, "activeDocument": _active[0], "changeCounters": dict(_changes)}
+
+
+def set_active_document(document):
+    with _lock:
+        _active[0] = document
+
+
+def snapshot():
+    with _lock:
+        out = dict(_stats)
+        out.update({"epoch": EPOCH, "lastId": event_id(_seq[0]), "buffered": len(_buffer),
+                    "changeCounters": dict(_changes)})
+    return out
+
+
+def reset_event(last_id):
+    return {"type": "reset", "id": None, "time": time.time(), "lastSeen": last_id, "epoch": EPOCH}
+
+
+# ---------------------------------------------------------------- Revit event handlers
+
+def _ids(collection):
+    ids = []
+    for eid in collection:
+        if len(ids) >= MAX_IDS:
+            break
+        ids.append(int(eid.IntegerValue))
+    return ids, collection.Count > len(ids)
+
+
+def _on_document_changed(sender, args):
+    try:
+        from pyrevit import DB
+        doc = args.GetDocument()
+        counter = _count_change(doc.Title)  # first, so a failure below cannot hide the change
+        added, t1 = _ids(args.GetAddedElementIds())
+        modified, t2 = _ids(args.GetModifiedElementIds())
+        deleted, t3 = _ids(args.GetDeletedElementIds())
+        categories = set()
+        element_types = False
+        for i in added + modified:
+            el = doc.GetElement(DB.ElementId(i))
+            if el is None:
+                continue
+            if el.Category is not None:
+                categories.add(int(el.Category.Id.IntegerValue))
+            if isinstance(el, (DB.ElementType, DB.Family)):
+                element_types = True
+        publish("document_changed",
+                document=doc.Title,
+                changeCounter=counter,
+                transactions=list(args.GetTransactionNames()),
+                operation=str(args.Operation),
+                added=added, modified=modified, deleted=deleted,
+                categories=sorted(categories),
+                elementTypes=element_types,
+                truncated=bool(t1 or t2 or t3))
+    except Exception:
+        pass  # never let a listener break the user's transaction
+
+
+def _on_view_activated(sender, args):
+    try:
+        view, previous, doc = args.CurrentActiveView, args.PreviousActiveView, args.Document
+        set_active_document(doc.Title)
+        switched = previous is None or not previous.Document.Equals(doc)
+        publish("view_activated", document=doc.Title, viewId=int(view.Id.IntegerValue), viewName=view.Name,
+                documentSwitched=bool(switched))
+    except Exception:
+        pass
+
+
+def _on_document_opened(sender, args):
+    try:
+        set_active_document(args.Document.Title)
+        publish("document_opened", document=args.Document.Title)
+    except Exception:
+        pass
+
+
+def _on_document_closing(sender, args):
+    try:
+        title = args.Document.Title
+        with _lock:
+            if _active[0] == title:
+                _active[0] = None
+        publish("document_closed", document=title)
+    except Exception:
+        pass
+
+
+def install(uiapp):
+    """Subscribe to Revit's events (call once from startup.py)."""
+    global installed
+    app = uiapp.Application
+    app.DocumentChanged += _on_document_changed
+    app.DocumentOpened += _on_document_opened
+    app.DocumentClosing += _on_document_closing
+    uiapp.ViewActivated += _on_view_activated
+    installed = True
+
+
+# ---------------------------------------------------------------- SSE server
+
+def _sse(event):
+    lines = []
+    if event.get("id"):
+        lines.append("id: %s" % event["id"])
+    lines.append("event: %s" % event["type"])
+    lines.append("data: %s" % json.dumps(event))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0].rstrip("/") != "/events":
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        cursor = self.headers.get("Last-Event-ID") or last_id()  # new subscribers start from now
+        with _lock:
+            _stats["subscribers"] += 1
+        try:
+            self.wfile.write(("retry: 2000\n: epoch %s\n\n" % EPOCH).encode("utf-8"))
+            # Replay what the client missed, then "ready": from here on it sees every change.
+            cursor = self._write_batch(cursor, *since(cursor))
+            ready = model_state()
+            ready.update({"type": "ready", "lastId": cursor})
+            self.wfile.write(_sse(ready))
+            self.wfile.flush()
+            while not self.server.stopping:
+                events, reset = wait(cursor, KEEPALIVE_SECONDS)
+                if not events and not reset:
+                    self.wfile.write(b": keepalive\n\n")
+                cursor = self._write_batch(cursor, events, reset)
+                self.wfile.flush()
+        except Exception:
+            pass  # client went away
+        finally:
+            with _lock:
+                _stats["subscribers"] -= 1
+
+
+    def _write_batch(self, cursor, events, reset):
+        """Write a batch; returns the id to resume after."""
+        if reset:
+            self.wfile.write(_sse(reset_event(cursor)))
+        for e in events:
+            self.wfile.write(_sse(e))
+        if events:
+            return events[-1]["id"]
+        return last_id() if reset else cursor
+
+
+class _StreamServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    stopping = False
+
+
+def start_stream_server(host=STREAM_HOST, port=STREAM_PORT):
+    """Serve /events on a background thread; returns the server."""
+    server = _StreamServer((host, port), _StreamHandler)
+    thread = threading.Thread(target=server.serve_forever, name="revit-mcp-events")
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def stop_stream_server(server):
+    server.stopping = True
+    with _lock:
+        _lock.notify_all()
+    server.shutdown()
+    server.server_close()
@@ -1,38 +1,40 @@
 # -*- coding: utf-8 -*-
-import json
-
 from pyrevit import DB
 
+from revit_mcp.tracing import span
 from revit_mcp.utils import (
     Tx,
     err,
     log_api_call,
     ok,
+    request_data,
 )
 
 
+def family_row(fam):
+    """Row of /families/ and /families/search/ (also stored with model snapshots)."""
+    # Count symbols/types in this family
+    symbol_ids = fam.GetFamilySymbolIds()
+    return {
+        "id": int(fam.Id.IntegerValue),
+        "name": fam.Name,
+        "category": fam.FamilyCategory.Name if fam.FamilyCategory else "Unknown",
+        "symbolCount": symbol_ids.Count if symbol_ids else 0
+    }
+
+
+def collect_families(doc):
+    return [family_row(fam) for fam in DB.FilteredElementCollector(doc).OfClass(DB.Family)]
+
+
 def register_routes(api):
     @api.route("/families/", methods=["GET"])
     def list_families(doc):
         log_api_call("GET", "/families/")
         try:
-            families = []
-            collector = DB.FilteredElementCollector(doc).OfClass(DB.Family)
-            for fam in collector:
-                # Get family category
-                cat_name = fam.FamilyCategory.Name if fam.FamilyCategory else "Unknown"
-                
-                # Count symbols/types in this family
-                symbol_ids = fam.GetFamilySymbolIds()
-                symbol_count = symbol_ids.Count if symbol_ids else 0
-                
-                families.append({
-                    "id": int(fam.Id.IntegerValue),
-                    "name": fam.Name,
-                    "category": cat_name,
-                    "symbolCount": symbol_count
-                })
-            
+            with span("collect"):
+                families = collect_families(doc)
+
             return ok({"families": families, "count": len(families)})
         except Exception as ex:
             return err(ex)
@@ -67,7 +69,7 @@ def register_routes(api):
 
     @api.route("/families/search_libraries/", methods=["POST"])
     def search_family_in_libraries(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/families/search_libraries/", data)
         try:
             import glob
@@ -131,7 +133,7 @@ def register_routes(api):
 
     @api.route("/families/load/", methods=["POST"])
     def load_family(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/families/load/", data)
         try:
             file_path = data.get("filePath")
@@ -202,32 +204,27 @@ def register_routes(api):
 
     @api.route("/families/search/", methods=["POST"])
     def search_families(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/families/search/", data)
         try:
             query = data.get("query", "").lower()
             category_filter = data.get("category")
             
-            families = []
-            collector = DB.FilteredElementCollector(doc).OfClass(DB.Family)
+            with span("collect"):
+                families = []
+                collector = DB.FilteredElementCollector(doc).OfClass(DB.Family)
             
-            for fam in collector:
-                cat_name = fam.FamilyCategory.Name if fam.FamilyCategory else "Unknown"
+                for fam in collector:
+                    cat_name = fam.FamilyCategory.Name if fam.FamilyCategory else "Unknown"
                 
-                # Apply filters
-                if category_filter and cat_name.lower() != category_filter.lower():
-                    continue
+                    # Apply filters
+                    if category_filter and cat_name.lower() != category_filter.lower():
+                        continue
                 
-                if query and query not in fam.Name.lower() and query not in cat_name.lower():
-                    continue
+                    if query and query not in fam.Name.lower() and query not in cat_name.lower():
+                        continue
                 
-                symbol_ids = fam.GetFamilySymbolIds()
-                families.append({
-                    "id": int(fam.Id.IntegerValue),
-                    "name": fam.Name,
-                    "category": cat_name,
-                    "symbolCount": symbol_ids.Count if symbol_ids else 0
-                })
+                    families.append(family_row(fam))
             
             return ok({
                 "families": families,
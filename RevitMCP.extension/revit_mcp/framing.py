@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Structural framing: /place_beams/.
+
+Beams come either from explicit end points ("beams") or from the columns on
+a level ("connect": "grid"): for each grid direction the columns lying on a
+grid line (within tolerance, measured across the line) are sorted along it
+and every neighbouring pair gets a beam. Without grids the model X and Y
+axes are used and columns are grouped by their position across the axis.
+
+Framing type and level are resolved once, beam lines are computed in one
+pass over the columns, and everything is created in one transaction.
+Beams whose end points match an existing beam on the level are skipped.
+Coordinates are feet; beams are drawn at the level's elevation plus
+"offset" unless a beam gives its own z.
+"""
+import bisect
+import math
+
+from pyrevit import DB
+
+from revit_mcp.grids import collect_grids
+from revit_mcp.layout import PointHash
+from revit_mcp.snapshot import element_level_id
+from revit_mcp.tracing import span
+from revit_mcp.utils import (
+    Tx,
+    check_cancelled,
+    err,
+    find_level_by_name,
+    find_type_by_name,
+    log_api_call,
+    ok,
+    request_data,
+)
+
+DEFAULT_TOLERANCE = 0.5  # feet a column centre may be off its grid line
+MATCH_TOLERANCE = 0.01  # feet between end points of the same beam
+MIN_SPAN = 0.1
+MAX_BEAMS = 20000
+
+
+def _framing_type(doc, type_name):
+    if type_name:
+        return find_type_by_name(doc, DB.BuiltInCategory.OST_StructuralFraming, type_name)
+    it = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_StructuralFraming)\
+        .WhereElementIsElementType()
+    for t in it:
+        return t
+    return None
+
+
+def _columns_on(doc, level_id):
+    """[(id, x, y)] of structural columns based on the level."""
+    out = []
+    it = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_StructuralColumns)\
+        .WhereElementIsNotElementType()
+    for el in it:
+        loc = el.Location
+        if int(el.LevelId.IntegerValue) == level_id and isinstance(loc, DB.LocationPoint):
+            out.append((int(el.Id.IntegerValue), loc.Point.X, loc.Point.Y))
+    return out
+
+
+def _directions(grid_lines):
+    """[(dx, dy, [(across, name)] sorted)] one per distinct grid direction, lines sorted across it."""
+    groups = []
+    for g in grid_lines:
+        dx, dy = g.dx, g.dy
+        if dx < -1e-9 or (abs(dx) <= 1e-9 and dy < 0):
+            dx, dy = -dx, -dy  # A->B and B->A run the same way
+        for group in groups:
+            if abs(group[0] * dy - group[1] * dx) < 1e-6:
+                break
+        else:
+            group = (dx, dy, [])
+            groups.append(group)
+        group[2].append((g.x * -group[1] + g.y * group[0], g.name))
+    for group in groups:
+        group[2].sort()
+    return groups
+
+
+def _lines_by_grid(columns, dx, dy, grid_lines, tolerance):
+    """{grid name: [(along, id, x, y)]} for columns within tolerance of a grid line running (dx, dy)."""
+    across_values = [a for a, _ in grid_lines]
+    out = {}
+    for cid, x, y in columns:
+        across = x * -dy + y * dx
+        i = bisect.bisect_left(across_values, across)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(across_values) and abs(across_values[j] - across) <= tolerance:
+                if best is None or abs(across_values[j] - across) < abs(across_values[best] - across):
+                    best = j
+        if best is not None:
+            out.setdefault(grid_lines[best][1], []).append((x * dx + y * dy, cid, x, y))
+    return out
+
+
+def _lines_by_axis(columns, dx, dy, tolerance):
+    """Columns grouped into rows across (dx, dy): a gap over tolerance starts a new row."""
+    ordered = sorted((x * -dy + y * dx, cid, x, y) for cid, x, y in columns)
+    out = {}
+    row, last = -1, None
+    for across, cid, x, y in ordered:
+        if last is None or across - last > tolerance:
+            row += 1
+        last = across
+        out.setdefault(row, []).append((x * dx + y * dy, cid, x, y))
+    return out
+
+
+def connect_columns(columns, grid_lines, tolerance, max_span=None):
+    """Beam spans between neighbouring columns: [(from id, to id, (x1, y1), (x2, y2), grid name or None)]."""
+    spans = []
+    if grid_lines:
+        per_direction = [(dx, dy, _lines_by_grid(columns, dx, dy, lines, tolerance))
+                         for dx, dy, lines in _directions(grid_lines)]
+    else:
+        per_direction = [(1.0, 0.0, _lines_by_axis(columns, 1.0, 0.0, tolerance)),
+                         (0.0, 1.0, _lines_by_axis(columns, 0.0, 1.0, tolerance))]
+    for dx, dy, rows in per_direction:
+        for key in sorted(rows):
+            row = sorted(rows[key])
+            for a, b in zip(row, row[1:]):
+                length = b[0] - a[0]
+                if length < MIN_SPAN or (max_span is not None and length > max_span):
+                    continue
+                spans.append((a[1], b[1], (a[2], a[3]), (b[2], b[3]), key if grid_lines else None))
+    return spans
+
+
+def _existing_beams(doc, level_id, tolerance):
+    index = PointHash(tolerance)
+    it = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_StructuralFraming)\
+        .WhereElementIsNotElementType()
+    for el in it:
+        loc = el.Location
+        if element_level_id(el) != level_id or not isinstance(loc, DB.LocationCurve):
+            continue
+        p, q = loc.Curve.GetEndPoint(0), loc.Curve.GetEndPoint(1)
+        index.add((p.X + q.X) / 2.0, (p.Y + q.Y) / 2.0, (int(el.Id.IntegerValue), (p.X, p.Y), (q.X, q.Y)))
+    return index
+
+
+def _existing_match(index, start, end, tolerance):
+    def close(p, q):
+        return math.hypot(p[0] - q[0], p[1] - q[1]) <= tolerance
+    for _, (eid, p, q) in index.near((start[0] + end[0]) / 2.0, (start[1] + end[1]) / 2.0):
+        if (close(p, start) and close(q, end)) or (close(p, end) and close(q, start)):
+            return eid
+    return None
+
+
+def register_routes(api):
+    @api.route("/place_beams/", methods=["POST"])
+    def place_beams(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/place_beams/", dict(data, beams=len(data.get("beams") or [])))
+        try:
+            level_name = data.get("level") or "Level 1"
+            level = find_level_by_name(doc, level_name)
+            if level is None:
+                return err("Level not found: " + level_name, 400)
+            beam_type = _framing_type(doc, data.get("type"))
+            if beam_type is None:
+                return err("Framing type not found: %s" % (data.get("type") or "(none loaded)"), 400)
+            z = level.Elevation + float(data.get("offset", 0.0))
+            skip_existing = data.get("skipExisting", True)
+            dry_run = bool(data.get("dryRun"))
+
+            spans = []  # (from id, to id, (x1, y1), (x2, y2), grid, z)
+            if data.get("beams"):
+                for i, b in enumerate(data["beams"]):
+                    try:
+                        start, end = (float(b["x1"]), float(b["y1"])), (float(b["x2"]), float(b["y2"]))
+                    except (KeyError, TypeError, ValueError):
+                        return err("beams[%d] needs numeric x1, y1, x2, y2" % i, 400)
+                    if math.hypot(end[0] - start[0], end[1] - start[1]) < MIN_SPAN:
+                        return err("beams[%d] is shorter than %s ft" % (i, MIN_SPAN), 400)
+                    spans.append((None, None, start, end, None, float(b.get("z", z))))
+            elif data.get("connect") == "grid":
+                column_level_name = data.get("columnLevel") or level_name
+                column_level = find_level_by_name(doc, column_level_name)
+                if column_level is None:
+                    return err("Level not found: " + column_level_name, 400)
+                tolerance = float(data.get("tolerance", DEFAULT_TOLERANCE))
+                max_span = float(data["maxSpan"]) if data.get("maxSpan") is not None else None
+                with span("collect"):
+                    columns = _columns_on(doc, int(column_level.Id.IntegerValue))
+                    grid_lines, _ = collect_grids(doc)
+                if len(columns) < 2:
+                    return err("Fewer than two columns on " + column_level_name, 400)
+                with span("connect"):
+                    spans = [s + (z,) for s in connect_columns(columns, grid_lines, tolerance, max_span)]
+            else:
+                return err('Give "beams" or "connect": "grid"', 400)
+            if len(spans) > MAX_BEAMS:
+                return err("At most %d beams per request" % MAX_BEAMS, 400)
+
+            targets, skipped = [], []
+            existing = _existing_beams(doc, int(level.Id.IntegerValue), MATCH_TOLERANCE) if skip_existing else None
+            for s in spans:
+                eid = _existing_match(existing, s[2], s[3], MATCH_TOLERANCE) if existing is not None else None
+                if eid is not None:
+                    skipped.append({"start": list(s[2]), "end": list(s[3]), "reason": "beam exists", "id": eid})
+                else:
+                    targets.append(s)
+
+            def row(s, eid):
+                r = {"start": [round(s[2][0], 6), round(s[2][1], 6)], "end": [round(s[3][0], 6), round(s[3][1], 6)],
+                     "id": eid}
+                if s[0] is not None:
+                    r["fromColumn"], r["toColumn"] = s[0], s[1]
+                if s[4] is not None:
+                    r["grid"] = s[4]
+                return r
+
+            created = []
+            if dry_run or not targets:
+                created = [row(s, None) for s in targets]
+            else:
+                with Tx(doc, "MCP: Place Beams"):
+                    if not beam_type.IsActive:
+                        beam_type.Activate()
+                        doc.Regenerate()
+                    with span("create"):
+                        for s in targets:
+                            check_cancelled()
+                            line = DB.Line.CreateBound(DB.XYZ(s[2][0], s[2][1], s[5]), DB.XYZ(s[3][0], s[3][1], s[5]))
+                            beam = doc.Create.NewFamilyInstance(line, beam_type, level,
+                                                                DB.Structure.StructuralType.Beam)
+                            created.append(row(s, int(beam.Id.IntegerValue)))
+            return ok({"ok": True, "dryRun": dry_run, "beams": created, "skipped": skipped,
+                       "count": len(created), "type": beam_type.Name, "level": level.Name})
+        except Exception as ex:
+            return err(ex)
@@ -1,50 +1,124 @@
 # -*- coding: utf-8 -*-
-import json
-
 from pyrevit import DB
 
+from revit_mcp import metrics
 from revit_mcp.utils import (
     Tx,
+    TxGroup,
     active_uidoc,
+    cached_detail_view_validation,
+    check_cancelled,
+    curve_from_spec,
     ensure_plane_for_line,
     err,
-    get_detail_view_validation,
     log_api_call,
     ok,
+    plane_for_points,
+    request_data,
 )
 
 
+# Horizontal sketch planes reused across /draw_curves/ chunks: {(doc title, z): element id}
+_sketch_planes = {}
+
+
+def _horizontal_sketch_plane(doc, z):
+    key = (doc.Title, round(z, 6))
+    sp_id = _sketch_planes.get(key)
+    sp = doc.GetElement(DB.ElementId(sp_id)) if sp_id is not None else None
+    if sp is None or not isinstance(sp, DB.SketchPlane):
+        metrics.cache_miss("sketchPlanes")
+        plane = DB.Plane.CreateByNormalAndOrigin(DB.XYZ.BasisZ, DB.XYZ(0, 0, z))
+        sp = DB.SketchPlane.Create(doc, plane)
+        _sketch_planes[key] = int(sp.Id.IntegerValue)
+    else:
+        metrics.cache_hit("sketchPlanes")
+    return sp
+
+
 def register_routes(api):
     @api.route("/validate/detail_line_view/", methods=["GET"])
     def validate_detail_line_view(doc):
         log_api_call("GET", "/validate/detail_line_view/")
         try:
             v = active_uidoc().ActiveView
-            info = get_detail_view_validation(v)
+            info = cached_detail_view_validation(v)
             return ok(info)
         except Exception as ex:
             return err(ex)
 
     @api.route("/draw_detail_line/", methods=["POST"])
     def draw_detail_line(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/draw_detail_line/", data)
         try:
             p1 = DB.XYZ(float(data["x1"]), float(data["y1"]), float(data.get("z1", 0.0)))
             p2 = DB.XYZ(float(data["x2"]), float(data["y2"]), float(data.get("z2", 0.0)))
             v  = active_uidoc().ActiveView
-            info = get_detail_view_validation(v)
+            info = cached_detail_view_validation(v)
             if not info.get("canDrawDetailLine", False):
                 return err(info.get("reason") or "Active view does not support detail lines", 400)
             with Tx(doc, "MCP: Detail Line"):
                 el = doc.Create.NewDetailCurve(v, DB.Line.CreateBound(p1, p2))
-                return ok({"ok": True, "elementId": int(el.Id.IntegerValue)})
+            return ok({"ok": True, "elementId": int(el.Id.IntegerValue)})
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/draw_detail_lines/", methods=["POST"])
+    def draw_detail_lines(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/draw_detail_lines/", data)
+        try:
+            lines = data.get("lines", [])  # [{"x1","y1","x2","y2","z1","z2"}, ...] or [[x1,y1,x2,y2], ...]
+            specs = data.get("curves", [])  # [{"type": "line"|"arc", "points": [...]}, ...]
+            if not lines and not specs:
+                return err("Need at least one line", 400)
+            v = active_uidoc().ActiveView
+            info = cached_detail_view_validation(v)
+            if not info.get("canDrawDetailLine", False):
+                return err(info.get("reason") or "Active view does not support detail lines", 400)
+
+            curves = DB.CurveArray()
+            skipped = []
+            tol = doc.Application.ShortCurveTolerance
+            for i, ln in enumerate(lines):
+                check_cancelled()
+                try:
+                    if isinstance(ln, dict):
+                        p1 = DB.XYZ(float(ln["x1"]), float(ln["y1"]), float(ln.get("z1", 0.0)))
+                        p2 = DB.XYZ(float(ln["x2"]), float(ln["y2"]), float(ln.get("z2", 0.0)))
+                    else:
+                        p1 = DB.XYZ(float(ln[0]), float(ln[1]), 0.0)
+                        p2 = DB.XYZ(float(ln[2]), float(ln[3]), 0.0)
+                    if p1.DistanceTo(p2) <= tol:
+                        skipped.append({"index": i, "reason": "Line is shorter than Revit tolerance"})
+                        continue
+                    curves.Append(DB.Line.CreateBound(p1, p2))
+                except Exception as ex:
+                    skipped.append({"index": i, "reason": str(ex)})
+            for i, spec in enumerate(specs):
+                check_cancelled()
+                try:
+                    crv = curve_from_spec(spec)
+                    if crv.Length <= tol:
+                        skipped.append({"index": len(lines) + i, "reason": "Curve is shorter than Revit tolerance"})
+                        continue
+                    curves.Append(crv)
+                except Exception as ex:
+                    skipped.append({"index": len(lines) + i, "reason": str(ex)})
+            ids = []
+            if curves.Size > 0:
+                with Tx(doc, "MCP: Detail Lines"):
+                    created = doc.Create.NewDetailCurveArray(v, curves)
+                    for el in created:
+                        ids.append(int(el.Id.IntegerValue))
+            return ok({"ok": True, "elementIds": ids, "count": len(ids), "skipped": skipped})
         except Exception as ex:
             return err(ex)
 
     @api.route("/draw_model_line/", methods=["POST"])
     def draw_model_line(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/draw_model_line/", data)
         try:
             p1 = DB.XYZ(float(data["x1"]), float(data["y1"]), float(data["z1"]))
@@ -55,28 +129,94 @@ def register_routes(api):
             with Tx(doc, "MCP: Model Line"):
                 crv = DB.Line.CreateBound(p1, p2)
                 el = doc.Create.NewModelCurve(crv, sp)
-                return ok({"ok": True, "elementId": int(el.Id.IntegerValue)})
+            return ok({"ok": True, "elementId": int(el.Id.IntegerValue)})
         except Exception as ex:
             return err(ex)
 
     # Bonus: polyline of model lines
     @api.route("/draw_model_polyline/", methods=["POST"])
     def draw_model_polyline(doc, request):
-        data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+        data = request_data(request)
         log_api_call("POST", "/draw_model_polyline/", data)
         try:
             pts = data.get("points", [])  # [[x,y,z], [x,y,z], ...]
-            if len(pts) < 2:
-                return err("Need at least two points", 400)
-            xyz = [DB.XYZ(float(p[0]), float(p[1]), float(p[2])) for p in pts]
-            plane = ensure_plane_for_line(xyz[0], xyz[1])
+            specs = data.get("curves")  # [{"type": "line"|"arc", "points": [...]}, ...] (pre-simplified)
+            if specs:
+                curves = [curve_from_spec(c) for c in specs]
+                xyz = [DB.XYZ(float(p[0]), float(p[1]), float(p[2])) for c in specs for p in c["points"]]
+            else:
+                if len(pts) < 2:
+                    return err("Need at least two points", 400)
+                xyz = [DB.XYZ(float(p[0]), float(p[1]), float(p[2])) for p in pts]
+                curves = [DB.Line.CreateBound(xyz[i], xyz[i+1]) for i in range(len(xyz) - 1)]
+            plane = plane_for_points(xyz)
             with Tx(doc, "MCP: Polyline SP"):
                 sp = DB.SketchPlane.Create(doc, plane)
             ids = []
             with Tx(doc, "MCP: Polyline"):
-                for i in range(len(xyz) - 1):
-                    el = doc.Create.NewModelCurve(DB.Line.CreateBound(xyz[i], xyz[i+1]), sp)
+                for crv in curves:
+                    check_cancelled()
+                    el = doc.Create.NewModelCurve(crv, sp)
                     ids.append(int(el.Id.IntegerValue))
             return ok({"ok": True, "elementIds": ids})
         except Exception as ex:
             return err(ex)
+
+    @api.route("/draw_curves/", methods=["POST"])
+    def draw_curves(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/draw_curves/", {"mode": data.get("mode"), "chunk": data.get("chunk"),
+                                               "count": len(data.get("curves", []))})
+        try:
+            mode = data.get("mode", "detail")  # "detail" (active view) or "model"
+            specs = data.get("curves", [])  # [{"type": "line"|"arc", "points": [...]}, ...]
+            chunk = data.get("chunk")
+            if mode not in ("detail", "model"):
+                return err("mode must be 'detail' or 'model'", 400)
+            if not specs:
+                return err("Need at least one curve", 400)
+            v = None
+            if mode == "detail":
+                v = active_uidoc().ActiveView
+                info = cached_detail_view_validation(v)
+                if not info.get("canDrawDetailLine", False):
+                    return err(info.get("reason") or "Active view does not support detail lines", 400)
+
+            tol = doc.Application.ShortCurveTolerance
+            by_z = {}  # model curves are grouped on horizontal sketch planes
+            skipped = []
+            for i, spec in enumerate(specs):
+                check_cancelled()
+                try:
+                    crv = curve_from_spec(spec)
+                    if crv.Length <= tol:
+                        skipped.append({"index": i, "reason": "Curve is shorter than Revit tolerance"})
+                        continue
+                    z = crv.GetEndPoint(0).Z if mode == "model" else 0.0
+                    if mode == "model" and abs(crv.GetEndPoint(1).Z - z) > 1e-9:
+                        skipped.append({"index": i, "reason": "Model curve is not horizontal"})
+                        continue
+                    by_z.setdefault(round(z, 6), DB.CurveArray()).Append(crv)
+                except Exception as ex:
+                    skipped.append({"index": i, "reason": str(ex)})
+
+            ids = []
+            name = "MCP: Curves" if chunk is None else "MCP: Curves (chunk %s)" % chunk
+            with TxGroup(doc, name):
+                if mode == "detail":
+                    with Tx(doc, "MCP: Detail Curves"):
+                        for arr in by_z.values():
+                            check_cancelled()
+                            for el in doc.Create.NewDetailCurveArray(v, arr):
+                                ids.append(int(el.Id.IntegerValue))
+                else:
+                    with Tx(doc, "MCP: Curves SP"):
+                        planes = dict((z, _horizontal_sketch_plane(doc, z)) for z in by_z)
+                    with Tx(doc, "MCP: Model Curves"):
+                        for z, arr in by_z.items():
+                            check_cancelled()
+                            for el in doc.Create.NewModelCurveArray(arr, planes[z]):
+                                ids.append(int(el.Id.IntegerValue))
+            return ok({"ok": True, "chunk": chunk, "elementIds": ids, "count": len(ids), "skipped": skipped})
+        except Exception as ex:
+            return err(ex)
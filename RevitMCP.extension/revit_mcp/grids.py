@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""Structural grids: /grids/, /grids/intersections/, /place/columns_at_grids/.
+
+Grid lines are read once per request into (name, point, direction) rows and
+every pair of selected grids is intersected in a single pass (2 x 2 Cramer
+solve per pair), so a 10 x 12 grid is one collector call and 120 small
+solves instead of one round trip per column.
+
+Grid names are selected with filters such as "A-F", "1-8", "A,C,E" or
+"A-C,F". Ranges follow drawing order rather than string order, so "A-AA"
+includes "Z" and "2-10" includes "9". Curved and multi-segment grids are not
+intersected. Coordinates are feet.
+
+/place/columns_at_grids/ skips intersections that already have a column on
+the level (spatial index), so it can be re-run after adding grids.
+"""
+import math
+import re
+
+from pyrevit import DB
+
+from revit_mcp.query import category_from_name
+from revit_mcp.spatial import index_for, nearby
+from revit_mcp.tracing import span
+from revit_mcp.utils import (
+    Tx,
+    check_cancelled,
+    err,
+    find_level_by_name,
+    find_type_by_name,
+    log_api_call,
+    ok,
+    request_data,
+)
+
+PARALLEL_SINE = 1e-6  # |sin(angle)| below which two grids are treated as parallel
+ON_GRID_TOLERANCE = 0.01  # feet an intersection may lie beyond a grid's end
+MERGE_TOLERANCE = 0.01  # intersections closer than this (three grids through a point) are one
+
+
+class GridError(Exception):
+    """A grid filter that cannot be parsed or selects nothing."""
+
+
+def natural_key(name):
+    """Sort key in drawing order: "A" < "B" < "Z" < "AA", "2" < "10", "A.1" after "A"."""
+    parts = re.findall(r"\d+|[^\d.]+", name.upper())
+    key = []
+    for p in parts:
+        key.append((0, int(p), "") if p.isdigit() else (1, len(p), p))
+    return tuple(key)
+
+
+class _GridLine(object):
+    __slots__ = ("id", "name", "x", "y", "dx", "dy", "length")
+
+    def __init__(self, grid, p, q):
+        self.id = int(grid.Id.IntegerValue)
+        self.name = grid.Name
+        self.x, self.y = p.X, p.Y
+        self.length = math.hypot(q.X - p.X, q.Y - p.Y)
+        self.dx, self.dy = (q.X - p.X) / self.length, (q.Y - p.Y) / self.length
+
+    def row(self):
+        return {"id": self.id, "name": self.name,
+                "start": [round(self.x, 6), round(self.y, 6)],
+                "end": [round(self.x + self.dx * self.length, 6), round(self.y + self.dy * self.length, 6)],
+                "direction": [round(self.dx, 6), round(self.dy, 6)]}
+
+
+def collect_grids(doc):
+    """(straight grid lines sorted by name, names of grids that are curved or multi-segment)."""
+    lines, skipped = [], []
+    for grid in DB.FilteredElementCollector(doc).OfClass(DB.Grid).WhereElementIsNotElementType():
+        curve = getattr(grid, "Curve", None)
+        if not isinstance(curve, DB.Line):
+            skipped.append(grid.Name)
+            continue
+        p, q = curve.GetEndPoint(0), curve.GetEndPoint(1)
+        if math.hypot(q.X - p.X, q.Y - p.Y) < 1e-9:
+            skipped.append(grid.Name)  # vertical in plan: not a plan grid
+            continue
+        lines.append(_GridLine(grid, p, q))
+    lines.sort(key=lambda g: natural_key(g.name))
+    return lines, skipped
+
+
+def select_grids(lines, spec):
+    """Grid lines whose name matches spec ("A-F", "1,3,5", ["A", "C-E"], "*" or None for all)."""
+    if spec is None or spec == "*" or spec == []:
+        return list(lines)
+    tokens = spec if isinstance(spec, (list, tuple)) else str(spec).split(",")
+    by_name = dict((g.name, g) for g in lines)
+    chosen = set()
+    for token in tokens:
+        token = token.strip().replace(u"–", "-")
+        if not token:
+            continue
+        if token in by_name:
+            chosen.add(token)
+            continue
+        if "-" not in token:
+            raise GridError("No grid named %s" % token)
+        lo, hi = [t.strip() for t in token.split("-", 1)]
+        lo_key, hi_key = natural_key(lo), natural_key(hi)
+        if lo_key > hi_key:
+            lo_key, hi_key = hi_key, lo_key
+        matched = [g.name for g in lines if lo_key <= natural_key(g.name) <= hi_key]
+        if not matched:
+            raise GridError("No grid in range %s" % token)
+        chosen.update(matched)
+    return [g for g in lines if g.name in chosen]
+
+
+def intersections(first, second, extend=False):
+    """Intersections of every grid in first with every non-parallel grid in second.
+
+    Returns [(x, y, [grid, grid])] in first-then-second drawing order; a point
+    where three or more selected grids cross appears once, with every name.
+    Unless extend, the point must lie on both grid lines (within ON_GRID_TOLERANCE).
+    """
+    found = []
+    seen = {}
+    for a in first:
+        for b in second:
+            if a is b:
+                continue
+            det = a.dx * b.dy - a.dy * b.dx  # sine of the angle between them
+            if abs(det) < PARALLEL_SINE:
+                continue
+            wx, wy = b.x - a.x, b.y - a.y
+            t = (wx * b.dy - wy * b.dx) / det  # distance along a
+            u = (wx * a.dy - wy * a.dx) / det  # distance along b
+            if not extend and not (-ON_GRID_TOLERANCE <= t <= a.length + ON_GRID_TOLERANCE and
+                                   -ON_GRID_TOLERANCE <= u <= b.length + ON_GRID_TOLERANCE):
+                continue
+            x, y = a.x + a.dx * t, a.y + a.dy * t
+            key = (int(round(x / MERGE_TOLERANCE)), int(round(y / MERGE_TOLERANCE)))
+            if key in seen:
+                names = seen[key][2]
+                for g in (a, b):
+                    if g not in names:
+                        names.append(g)
+                continue
+            seen[key] = (x, y, [a, b])
+            found.append(seen[key])
+    return found
+
+
+def grid_names(grids):
+    """Names lettered grids first, as on drawings: ["A", "1"] whichever order they were selected in."""
+    return sorted((g.name for g in grids), key=lambda n: (n[:1].isdigit(), natural_key(n)))
+
+
+def label(grids):
+    return "-".join(grid_names(grids))
+
+
+def register_routes(api):
+    @api.route("/grids/", methods=["GET"])
+    def list_grids(doc, request):
+        log_api_call("GET", "/grids/")
+        try:
+            with span("collect"):
+                lines, skipped = collect_grids(doc)
+            return ok({"grids": [g.row() for g in lines], "count": len(lines), "skipped": skipped})
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/grids/intersections/", methods=["POST"])
+    def grid_intersections(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/grids/intersections/", data)
+        try:
+            with span("collect"):
+                lines, _ = collect_grids(doc)
+            first = select_grids(lines, data.get("first"))
+            second = select_grids(lines, data.get("second"))
+            points = intersections(first, second, bool(data.get("extend")))
+            return ok({"intersections": [{"label": label(names), "grids": grid_names(names),
+                                          "x": round(x, 6), "y": round(y, 6)} for x, y, names in points],
+                       "count": len(points)})
+        except GridError as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/place/columns_at_grids/", methods=["POST"])
+    def place_columns_at_grids(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/place/columns_at_grids/", data)
+        try:
+            level_name = data.get("level") or "Level 1"
+            type_name = data.get("type")
+            z = float(data.get("z", 0.0))
+            skip_existing = data.get("skipExisting", True)
+            dry_run = bool(data.get("dryRun"))
+
+            level = find_level_by_name(doc, level_name)
+            if level is None:
+                return err("Level not found: " + level_name, 400)
+            if type_name:
+                col_type = find_type_by_name(doc, DB.BuiltInCategory.OST_StructuralColumns, type_name)
+                if col_type is None:
+                    return err("Column type not found: " + type_name, 400)
+            else:
+                col_type = None
+                it = DB.FilteredElementCollector(doc)\
+                    .OfCategory(DB.BuiltInCategory.OST_StructuralColumns)\
+                    .WhereElementIsElementType()
+                for t in it:
+                    col_type = t
+                    break
+                if col_type is None:
+                    return err("No structural column types available.", 400)
+
+            with span("collect"):
+                lines, _ = collect_grids(doc)
+            first = select_grids(lines, data.get("first"))
+            second = select_grids(lines, data.get("second"))
+            with span("intersect"):
+                points = intersections(first, second, bool(data.get("extend")))
+            if not points:
+                return err("The selected grids do not intersect", 400)
+
+            targets, skipped = [], []
+            index = index_for(doc) if skip_existing else None
+            level_ids = [int(level.Id.IntegerValue)]
+            column_cat = set([int(category_from_name("OST_StructuralColumns"))])
+            for x, y, names in points:
+                if index is not None:
+                    existing = nearby(index, x, y, None, MERGE_TOLERANCE, level_ids, column_cat)
+                    if existing:
+                        skipped.append({"label": label(names), "reason": "column exists", "id": existing[0][1]})
+                        continue
+                targets.append((x, y, names))
+
+            placed = []
+            if dry_run or not targets:
+                placed = [{"label": label(names), "grids": grid_names(names), "x": round(x, 6),
+                           "y": round(y, 6), "id": None} for x, y, names in targets]
+            else:
+                with Tx(doc, "MCP: Place Columns at Grids"):
+                    if not col_type.IsActive:
+                        col_type.Activate()
+                        doc.Regenerate()
+                    for x, y, names in targets:
+                        check_cancelled()
+                        col = doc.Create.NewFamilyInstance(DB.XYZ(x, y, z), col_type, level,
+                                                           DB.Structure.StructuralType.Column)
+                        placed.append({"label": label(names), "grids": grid_names(names),
+                                       "x": round(x, 6), "y": round(y, 6), "id": int(col.Id.IntegerValue)})
+            return ok({"ok": True, "dryRun": dry_run, "placed": placed, "skipped": skipped,
+                       "count": len(placed), "intersections": len(points),
+                       "type": col_type.Name, "level": level.Name})
+        except GridError as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
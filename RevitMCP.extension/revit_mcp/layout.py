@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""Declarative layout: /layout/reconcile/.
+
+The request lists the structural columns and straight walls the plan wants;
+the route matches them against the existing ones and applies only the
+difference in one transaction:
+
+    column   matched by level and location point within tolerance
+    wall     matched by level and both end points within tolerance (either direction)
+
+A match whose type differs from the requested one is updated (ChangeTypeId);
+an item without "type" accepts whatever type is there. Unmatched items are
+created. Existing elements of a listed kind ("columns" and/or "walls" present
+in the request) that nothing matched are deleted, unless deleteMissing is
+false; only the request's "level" and the levels its items use are looked
+at. Re-running an unchanged plan touches nothing.
+
+Existing elements are bucketed in a point hash with cells of the tolerance,
+so matching is linear in the number of elements. Coordinates are feet.
+"""
+import math
+import time
+
+from pyrevit import DB
+from System.Collections.Generic import List  # type: ignore
+
+from revit_mcp.tracing import span
+from revit_mcp.utils import (
+    Tx,
+    check_cancelled,
+    err,
+    find_level_by_name,
+    find_type_by_name,
+    log_api_call,
+    ok,
+    request_data,
+)
+
+DEFAULT_TOLERANCE = 0.01  # feet
+MAX_ITEMS = 20000
+
+
+class PointHash(object):
+    """Points bucketed in cells of one tolerance; a lookup checks the 3 x 3 neighbourhood."""
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.cell = max(tolerance, 1e-6)
+        self.cells = {}
+
+    def _key(self, x, y):
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def add(self, x, y, item):
+        self.cells.setdefault(self._key(x, y), []).append((x, y, item))
+
+    def near(self, x, y):
+        """[(distance, item)] within tolerance of (x, y), nearest first."""
+        kx, ky = self._key(x, y)
+        found = []
+        for ix in (kx - 1, kx, kx + 1):
+            for iy in (ky - 1, ky, ky + 1):
+                for px, py, item in self.cells.get((ix, iy), ()):
+                    d = math.hypot(px - x, py - y)
+                    if d <= self.tolerance:
+                        found.append((d, item))
+        found.sort(key=lambda f: f[0])
+        return found
+
+
+class _Existing(object):
+    def __init__(self, el, ends):
+        self.element = el
+        self.id = int(el.Id.IntegerValue)
+        self.level = int(el.LevelId.IntegerValue)
+        self.type_id = int(el.GetTypeId().IntegerValue)
+        self.ends = ends  # ((x, y),) for a column, ((x1, y1), (x2, y2)) for a wall
+        self.matched = False
+
+
+def _existing_columns(doc, levels):
+    out = []
+    it = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_StructuralColumns)\
+        .WhereElementIsNotElementType()
+    for el in it:
+        loc = el.Location
+        if int(el.LevelId.IntegerValue) in levels and isinstance(loc, DB.LocationPoint):
+            out.append(_Existing(el, ((loc.Point.X, loc.Point.Y),)))
+    return out
+
+
+def _existing_walls(doc, levels):
+    """Straight walls on the levels; arc and other curved walls are left alone."""
+    out = []
+    for el in DB.FilteredElementCollector(doc).OfClass(DB.Wall).WhereElementIsNotElementType():
+        loc = el.Location
+        if int(el.LevelId.IntegerValue) not in levels or not isinstance(loc, DB.LocationCurve):
+            continue
+        if not isinstance(loc.Curve, DB.Line):
+            continue
+        p, q = loc.Curve.GetEndPoint(0), loc.Curve.GetEndPoint(1)
+        out.append(_Existing(el, ((p.X, p.Y), (q.X, q.Y))))
+    return out
+
+
+def _wall_matches(candidate, ends, tolerance):
+    (a, b), (c, d) = candidate.ends, ends
+
+    def close(p, q):
+        return math.hypot(p[0] - q[0], p[1] - q[1]) <= tolerance
+    return (close(a, c) and close(b, d)) or (close(a, d) and close(b, c))
+
+
+class _Plan(object):
+    """Parsed request: desired items with their level and type resolved once per name."""
+
+    def __init__(self, doc, data):
+        self.doc = doc
+        self.default_level = data.get("level") or "Level 1"
+        self.levels = {}  # name -> Level, for every level the request names or its items use
+        if data.get("level"):
+            self._level(data["level"])
+        self.types = {}  # (category, name) -> type
+        self.columns = self._items(data, "columns", DB.BuiltInCategory.OST_StructuralColumns,
+                                   ("x", "y"))
+        self.walls = self._items(data, "walls", DB.BuiltInCategory.OST_Walls, ("x1", "y1", "x2", "y2"))
+
+    def _level(self, name):
+        level = self.levels.get(name)
+        if level is None:
+            level = find_level_by_name(self.doc, name)
+            if level is None:
+                raise ValueError("Level not found: %s" % name)
+            self.levels[name] = level
+        return level
+
+    def _type(self, bic, name):
+        key = (int(bic), name)
+        if key not in self.types:
+            t = find_type_by_name(self.doc, bic, name)
+            if t is None:
+                raise ValueError("Type not found: %s" % name)
+            self.types[key] = t
+        return self.types[key]
+
+    def _items(self, data, key, bic, coords):
+        if key not in data or data[key] is None:
+            return None
+        items = []
+        for i, spec in enumerate(data[key]):
+            try:
+                values = [float(spec[c]) for c in coords]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("%s[%d] needs numeric %s" % (key, i, ", ".join(coords)))
+            if len(values) == 4 and values[0] == values[2] and values[1] == values[3]:
+                raise ValueError("%s[%d] has zero length" % (key, i))
+            level = self._level(spec.get("level") or self.default_level)
+            type_name = spec.get("type")
+            items.append({
+                "index": i,
+                "values": values,
+                "z": float(spec.get("z", 0.0)),
+                "level": level,
+                "levelId": int(level.Id.IntegerValue),
+                "type": self._type(bic, type_name) if type_name else None,
+            })
+        return items
+
+    def level_ids(self):
+        return set(int(lv.Id.IntegerValue) for lv in self.levels.values())
+
+
+def _diff(items, existing, tolerance, ends_of, match):
+    """(create, update, keep) lists; existing elements left unmatched are marked so."""
+    index = PointHash(tolerance)
+    for ex in existing:
+        index.add(*(_midpoint(ex.ends) + (ex,)))
+    create, update, keep = [], [], []
+    for item in items:
+        ends = ends_of(item["values"])
+        found = None
+        for _, ex in index.near(*_midpoint(ends)):
+            if not ex.matched and ex.level == item["levelId"] and match(ex, ends):
+                found = ex
+                break
+        if found is None:
+            create.append(item)
+            continue
+        found.matched = True
+        wanted = item["type"]
+        if wanted is not None and int(wanted.Id.IntegerValue) != found.type_id:
+            update.append((item, found))
+        else:
+            keep.append((item, found))
+    return create, update, keep
+
+
+def _midpoint(ends):
+    if len(ends) == 1:
+        return ends[0]
+    (a, b), (c, d) = ends
+    return ((a + c) / 2.0, (b + d) / 2.0)
+
+
+def _default_column_type(doc):
+    it = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_StructuralColumns)\
+        .WhereElementIsElementType()
+    for t in it:
+        return t
+    return None
+
+
+def _type_name(doc, type_id):
+    t = doc.GetElement(DB.ElementId(type_id))
+    return t.Name if t is not None else None
+
+
+def register_routes(api):
+    @api.route("/layout/reconcile/", methods=["POST"])
+    def reconcile_layout(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/layout/reconcile/", {
+            "level": data.get("level"),
+            "columns": len(data.get("columns") or []),
+            "walls": len(data.get("walls") or []),
+            "tolerance": data.get("tolerance"),
+            "deleteMissing": data.get("deleteMissing"),
+            "dryRun": data.get("dryRun"),
+        })
+        try:
+            started = time.time()
+            tolerance = float(data.get("tolerance", DEFAULT_TOLERANCE))
+            if tolerance <= 0:
+                return err("tolerance must be positive", 400)
+            delete_missing = data.get("deleteMissing", True)
+            dry_run = bool(data.get("dryRun"))
+            if "columns" not in data and "walls" not in data:
+                return err("columns or walls is required", 400)
+            try:
+                with span("lookup"):
+                    plan = _Plan(doc, data)
+            except ValueError as ex:
+                return err(ex, 400)
+            if len(plan.columns or []) + len(plan.walls or []) > MAX_ITEMS:
+                return err("At most %d items per request" % MAX_ITEMS, 400)
+            levels = plan.level_ids()
+
+            kinds = []  # (kind, create, update, keep, delete)
+            with span("collect"):
+                if plan.columns is not None:
+                    existing = _existing_columns(doc, levels)
+                    diff = _diff(plan.columns, existing, tolerance, lambda v: ((v[0], v[1]),),
+                                 lambda ex, ends: True)
+                    kinds.append(("column",) + diff + ([ex for ex in existing if not ex.matched],))
+                if plan.walls is not None:
+                    existing = _existing_walls(doc, levels)
+                    diff = _diff(plan.walls, existing, tolerance, lambda v: ((v[0], v[1]), (v[2], v[3])),
+                                 lambda ex, ends: _wall_matches(ex, ends, tolerance))
+                    kinds.append(("wall",) + diff + ([ex for ex in existing if not ex.matched],))
+
+            column_type = None
+            creates_columns = any(kind == "column" and create for kind, create, _, _, _ in kinds)
+            if creates_columns and any(item["type"] is None for item in plan.columns):
+                column_type = _default_column_type(doc)
+                if column_type is None:
+                    return err("No structural column types available.", 400)
+
+            created, updated, deleted = [], [], []
+            removed = 0
+            unchanged = 0
+            for kind, create, update, keep, missing in kinds:
+                unchanged += len(keep)
+                for item, ex in update:
+                    updated.append({"kind": kind, "index": item["index"], "id": ex.id,
+                                    "fromType": _type_name(doc, ex.type_id), "toType": item["type"].Name})
+                if delete_missing:
+                    deleted.extend({"kind": kind, "id": ex.id} for ex in missing)
+                else:
+                    unchanged += len(missing)
+
+            pending = sum(len(create) for _, create, _, _, _ in kinds)
+            if not dry_run and (pending or updated or deleted):
+                with Tx(doc, "MCP: Reconcile Layout"):
+                    with span("delete"):
+                        if deleted:
+                            # Revit also deletes what depends on them (hosted doors, joins, ...)
+                            ids = List[DB.ElementId]([DB.ElementId(d["id"]) for d in deleted])
+                            removed = len(list(doc.Delete(ids)))
+                    with span("update"):
+                        for kind, _, update, _, _ in kinds:
+                            for item, ex in update:
+                                check_cancelled()
+                                ex.element.ChangeTypeId(item["type"].Id)
+                    with span("create"):
+                        for kind, create, _, _, _ in kinds:
+                            if kind == "column" and create:
+                                symbols = set(item["type"] or column_type for item in create)
+                                activated = False
+                                for sym in symbols:
+                                    if not sym.IsActive:
+                                        sym.Activate()
+                                        activated = True
+                                if activated:
+                                    doc.Regenerate()
+                            for item in create:
+                                check_cancelled()
+                                v = item["values"]
+                                if kind == "column":
+                                    el = doc.Create.NewFamilyInstance(
+                                        DB.XYZ(v[0], v[1], item["z"]), item["type"] or column_type,
+                                        item["level"], DB.Structure.StructuralType.Column)
+                                else:
+                                    line = DB.Line.CreateBound(DB.XYZ(v[0], v[1], item["z"]),
+                                                               DB.XYZ(v[2], v[3], item["z"]))
+                                    el = DB.Wall.Create(doc, line, item["level"].Id, False)
+                                    if item["type"] is not None:
+                                        el.ChangeTypeId(item["type"].Id)
+                                created.append({"kind": kind, "index": item["index"],
+                                                "id": int(el.Id.IntegerValue)})
+            else:
+                for kind, create, _, _, _ in kinds:
+                    created.extend({"kind": kind, "index": item["index"], "id": None} for item in create)
+
+            return ok({
+                "ok": True,
+                "dryRun": dry_run,
+                "created": created,
+                "updated": updated,
+                "deleted": deleted,
+                "counts": {"created": len(created), "updated": len(updated), "deleted": len(deleted),
+                           "unchanged": unchanged, "removedWithDependents": removed},
+                "seconds": round(time.time() - started, 3),
+            })
+        except Exception as ex:
+            return err(ex)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""In-process metrics for the route handlers (reported by /status/).
+
+Updated from the helpers every route already goes through: log_api_call()
+starts a request, ok()/err() finish it, Tx/TxGroup count transactions and
+caches call cache_hit()/cache_miss().
+"""
+import re
+import threading
+import time
+
+SAMPLES_PER_ROUTE = 2048
+
+_lock = threading.Lock()
+_local = threading.local()
+_started = time.time()
+_routes = {}
+_transactions = {"committed": 0, "rolledBack": 0, "groupsAssimilated": 0, "groupsRolledBack": 0}
+_caches = {}
+_state = {"inFlight": 0, "requests": 0, "errors": 0}
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/)")
+
+
+def route_key(method, endpoint):
+    """'GET /families/123/symbols/' -> 'GET /families/<id>/symbols/'."""
+    return "%s %s" % (method, _ID_SEGMENT.sub("/<id>", endpoint))
+
+
+class _Route(object):
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "samples", "pos")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = []
+        self.pos = 0
+
+    def add(self, ms, failed):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if len(self.samples) < SAMPLES_PER_ROUTE:
+            self.samples.append(ms)
+        else:
+            self.samples[self.pos] = ms
+            self.pos = (self.pos + 1) % SAMPLES_PER_ROUTE
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    k = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return round(ordered[k], 3)
+
+
+def begin_request(method, endpoint):
+    """Mark the start of a request on this thread."""
+    abandoned = getattr(_local, "current", None) is not None
+    with _lock:
+        _state["inFlight"] += 0 if abandoned else 1
+    _local.current = (route_key(method, endpoint), time.time())
+
+
+def current_elapsed_ms():
+    cur = getattr(_local, "current", None)
+    return None if cur is None else (time.time() - cur[1]) * 1000.0
+
+
+def end_request(status):
+    """Record the request started on this thread; returns its duration in ms."""
+    cur = getattr(_local, "current", None)
+    if cur is None:
+        return None
+    _local.current = None
+    key, t0 = cur
+    ms = (time.time() - t0) * 1000.0
+    failed = status >= 400
+    with _lock:
+        _state["inFlight"] -= 1
+        _state["requests"] += 1
+        if failed:
+            _state["errors"] += 1
+        r = _routes.get(key)
+        if r is None:
+            r = _routes[key] = _Route()
+        r.add(ms, failed)
+    return ms
+
+
+def count_transaction(committed, group=False):
+    if group:
+        key = "groupsAssimilated" if committed else "groupsRolledBack"
+    else:
+        key = "committed" if committed else "rolledBack"
+    with _lock:
+        _transactions[key] += 1
+
+
+def _cache(name):
+    c = _caches.get(name)
+    if c is None:
+        c = _caches[name] = [0, 0]
+    return c
+
+
+def cache_hit(name):
+    with _lock:
+        _cache(name)[0] += 1
+
+
+def cache_miss(name):
+    with _lock:
+        _cache(name)[1] += 1
+
+
+def snapshot():
+    with _lock:
+        routes = {}
+        for key, r in _routes.items():
+            ordered = sorted(r.samples)
+            routes[key] = {
+                "calls": r.calls,
+                "errors": r.errors,
+                "meanMs": round(r.total_ms / r.calls, 3) if r.calls else None,
+                "maxMs": round(r.max_ms, 3),
+                "p50Ms": _percentile(ordered, 0.50),
+                "p95Ms": _percentile(ordered, 0.95),
+                "p99Ms": _percentile(ordered, 0.99),
+            }
+        caches = {}
+        for name, (hits, misses) in _caches.items():
+            total = hits + misses
+            caches[name] = {"hits": hits, "misses": misses,
+                            "hitRatio": round(float(hits) / total, 4) if total else None}
+        return {
+            "uptimeSeconds": round(time.time() - _started, 3),
+            # The caller of snapshot() (the /status/ request) is excluded.
+            "inFlight": max(0, _state["inFlight"] - 1),
+            "requests": _state["requests"],
+            "errors": _state["errors"],
+            "routes": routes,
+            "transactions": dict(_transactions),
+            "caches": caches,
+        }
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""Bulk parameter read/write: /parameters/get_bulk/ and /parameters/set_bulk/.
+
+Parameters are named like in /elements/query/ (BuiltInParameter name or
+display name) or by built-in parameter id (negative int). Each name is
+resolved once per element type to its Definition, then read with
+get_Parameter(definition); parameters missing on the instance fall back to
+its type element. Doubles are converted between internal units and the
+project's display units (Revit 2021+ ForgeTypeId API); pass
+"units": "internal" to skip the conversion.
+"""
+from pyrevit import DB
+
+from revit_mcp import metrics
+from revit_mcp.query import lookup_parameter, parameter_value
+from revit_mcp.tracing import span
+from revit_mcp.utils import Tx, check_cancelled, err, log_api_call, ok, request_data
+
+MAX_ITEMS = 20000
+
+
+class _Resolver(object):
+    """Per-request cache of (type id, parameter name) -> (Definition, on_type)."""
+
+    def __init__(self, doc, display_units):
+        self.doc = doc
+        self.display_units = display_units
+        self._defs = {}
+        self._units = {}  # definition name -> display unit type id (or None)
+        self.hits = 0
+        self.misses = 0
+
+    def _find(self, el, name):
+        if isinstance(name, int):
+            for p in el.Parameters:
+                if p.Id.IntegerValue == name:
+                    return p
+            return None
+        return lookup_parameter(el, name)
+
+    def parameter(self, el, name):
+        """(Parameter, on_type) or (None, False)."""
+        type_id = el.GetTypeId()
+        key = (type_id.IntegerValue, name)
+        cached = self._defs.get(key)
+        if cached is not None:
+            self.hits += 1
+            metrics.cache_hit("parameter_definitions")
+            definition, on_type = cached
+            if definition is None:
+                return None, False
+            owner = self.doc.GetElement(type_id) if on_type else el
+            return owner.get_Parameter(definition), on_type
+        self.misses += 1
+        metrics.cache_miss("parameter_definitions")
+        p, on_type = self._find(el, name), False
+        if p is None and type_id != DB.ElementId.InvalidElementId:
+            el_type = self.doc.GetElement(type_id)
+            if el_type is not None:
+                p, on_type = self._find(el_type, name), True
+        self._defs[key] = (p.Definition if p is not None else None, on_type)
+        return p, on_type
+
+    def unit(self, p):
+        """Display unit of a double parameter, or None when no conversion applies."""
+        if not self.display_units or p.StorageType != DB.StorageType.Double:
+            return None
+        name = p.Definition.Name
+        if name in self._units:
+            return self._units[name]
+        unit = None
+        try:
+            spec = p.Definition.GetDataType()
+            if DB.UnitUtils.IsMeasurableSpec(spec):
+                unit = self.doc.GetUnits().GetFormatOptions(spec).GetUnitTypeId()
+        except Exception:
+            unit = None  # pre-2021 API or unitless parameter: report internal units
+        self._units[name] = unit
+        return unit
+
+
+def _to_display(resolver, p):
+    value = parameter_value(p)
+    unit = resolver.unit(p) if value is not None else None
+    if unit is not None:
+        value = DB.UnitUtils.ConvertFromInternalUnits(value, unit)
+    return value, unit
+
+
+def _set_value(resolver, p, value):
+    st = p.StorageType
+    if isinstance(value, (str, type(u""))) and st != DB.StorageType.String:
+        # "3.5 m", "12'" ... parsed by Revit with the project's units
+        if not p.SetValueString(value):
+            raise ValueError("Could not parse '%s'" % value)
+        return
+    if st == DB.StorageType.Double:
+        value = float(value)
+        unit = resolver.unit(p)
+        if unit is not None:
+            value = DB.UnitUtils.ConvertToInternalUnits(value, unit)
+        p.Set(value)
+    elif st == DB.StorageType.Integer:
+        p.Set(int(value))
+    elif st == DB.StorageType.ElementId:
+        p.Set(DB.ElementId(int(value)))
+    elif st == DB.StorageType.String:
+        p.Set("" if value is None else value)
+    else:
+        raise ValueError("Parameter has no value storage")
+
+
+def _unit_name(unit):
+    return unit.TypeId if unit is not None and hasattr(unit, "TypeId") else None
+
+
+def _bulk_request(data):
+    """(element ids, parameter names) from a get_bulk request body."""
+    names = data.get("parameters") or []
+    ids = [int(i) for i in data.get("elementIds") or []]
+    return ids, names
+
+
+def register_routes(api):
+    @api.route("/parameters/get_bulk/", methods=["POST"])
+    def get_parameters_bulk(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/parameters/get_bulk/", {"elements": len(data.get("elementIds") or []),
+                                                        "parameters": data.get("parameters")})
+        try:
+            ids, names = _bulk_request(data)
+            if not ids or not names:
+                return err("elementIds and parameters are required", 400)
+            if len(ids) * len(names) > MAX_ITEMS:
+                return err("At most %d element x parameter values per call" % MAX_ITEMS, 400)
+            resolver = _Resolver(doc, data.get("units", "display") == "display")
+            rows = []
+            errors = []
+            units = {}
+            with span("collect"):
+                for eid in ids:
+                    el = doc.GetElement(DB.ElementId(eid))
+                    if el is None:
+                        errors.append({"id": eid, "error": "Element not found"})
+                        continue
+                    values = {}
+                    for name in names:
+                        p, on_type = resolver.parameter(el, name)
+                        if p is None:
+                            values[name] = None
+                            errors.append({"id": eid, "parameter": name, "error": "Parameter not found"})
+                            continue
+                        values[name], unit = _to_display(resolver, p)
+                        if unit is not None:
+                            units[str(name)] = _unit_name(unit)
+                    rows.append({"id": eid, "values": values})
+            return ok({"elements": rows, "units": units, "errors": errors,
+                       "definitionCache": {"hits": resolver.hits, "misses": resolver.misses}})
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/parameters/set_bulk/", methods=["POST"])
+    def set_parameters_bulk(doc, request):
+        data = request_data(request)
+        items = data.get("items") or []
+        log_api_call("POST", "/parameters/set_bulk/", {"items": len(items),
+                                                        "elements": len(data.get("elementIds") or [])})
+        try:
+            # items: [{"id", "parameter", "value"}, ...] and/or elementIds x {"values": {name: value}}
+            for eid in data.get("elementIds") or []:
+                for name, value in (data.get("values") or {}).items():
+                    items.append({"id": eid, "parameter": name, "value": value})
+            if not items:
+                return err("items (or elementIds and values) are required", 400)
+            if len(items) > MAX_ITEMS:
+                return err("At most %d values per call" % MAX_ITEMS, 400)
+            allow_type = bool(data.get("allowTypeParameters", False))
+            resolver = _Resolver(doc, data.get("units", "display") == "display")
+            updated = 0
+            errors = []
+            with Tx(doc, "MCP: Set Parameters (%d)" % len(items)):
+                for i, item in enumerate(items):
+                    check_cancelled()
+                    eid, name = item.get("id"), item.get("parameter")
+                    try:
+                        el = doc.GetElement(DB.ElementId(int(eid)))
+                        if el is None:
+                            raise ValueError("Element not found")
+                        p, on_type = resolver.parameter(el, name)
+                        if p is None:
+                            raise ValueError("Parameter not found")
+                        if on_type and not allow_type:
+                            raise ValueError("Type parameter (affects every instance); pass allowTypeParameters")
+                        if p.IsReadOnly:
+                            raise ValueError("Parameter is read-only")
+                        _set_value(resolver, p, item.get("value"))
+                        updated += 1
+                    except Exception as ex:
+                        errors.append({"index": i, "id": eid, "parameter": name, "error": str(ex)})
+            return ok({"ok": True, "updated": updated, "failed": len(errors), "errors": errors})
+        except Exception as ex:
+            return err(ex)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""On-demand profiling of route handlers, driven by /debug/profile/.
+
+A session profiles the next N requests and/or the next T seconds, optionally
+only for chosen routes. Two modes:
+
+- "deterministic": cProfile (or the pure-Python profile module) around each
+  handler; aggregated with pstats.
+- "sampling": a background thread samples the handler thread's stack every
+  intervalMs and counts collapsed stacks (flamegraph-compatible).
+
+Both need frame support in the Python engine (IronPython: -X:Frames); when it
+is missing, start() raises ProfilerUnavailable. When no session is active the
+hooks in log_api_call()/ok()/err() cost a single check.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import cProfile as _profile_mod
+except ImportError:  # IronPython has no _lsprof
+    try:
+        import profile as _profile_mod
+    except ImportError:
+        _profile_mod = None
+
+try:
+    from StringIO import StringIO  # IronPython 2.7
+except ImportError:
+    from io import StringIO
+
+REPORT_DIR = os.path.join(tempfile.gettempdir(), "revit_mcp_profiles")
+
+_lock = threading.Lock()
+_session = [None]  # the active session, or None
+_last = [None]     # the most recently finished session
+_local = threading.local()
+
+
+class ProfilerUnavailable(Exception):
+    pass
+
+
+def _thread_id():
+    try:
+        return threading.current_thread().ident
+    except AttributeError:
+        import thread  # type: ignore
+        return thread.get_ident()
+
+
+class _Sampler(object):
+    def __init__(self, session, thread_id):
+        self.session = session
+        self.thread_id = thread_id
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="revit_mcp-profiler")
+        self.thread.daemon = True
+
+    def _run(self):
+        interval = self.session["intervalMs"] / 1000.0
+        counts = self.session["stacks"]
+        while self.running:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append("%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), frame.f_lineno))
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                with _lock:
+                    counts[key] = counts.get(key, 0) + 1
+                    self.session["samples"] += 1
+            time.sleep(interval)
+
+
+def start(mode="deterministic", requests=None, seconds=None, routes=None, interval_ms=5):
+    """Start a profiling session; replaces any active one."""
+    if mode not in ("deterministic", "sampling"):
+        raise ValueError("mode must be 'deterministic' or 'sampling'")
+    if mode == "deterministic" and _profile_mod is None:
+        raise ProfilerUnavailable("No profile module available in this Python engine")
+    if mode == "sampling" and not hasattr(sys, "_current_frames"):
+        raise ProfilerUnavailable("sys._current_frames is unavailable (enable frames in the engine)")
+    if not requests and not seconds:
+        requests = 10
+    session = {
+        "mode": mode,
+        "routes": set(routes) if routes else None,
+        "remaining": int(requests) if requests else None,
+        "deadline": time.time() + float(seconds) if seconds else None,
+        "intervalMs": max(1, int(interval_ms)),
+        "started": time.time(),
+        "ended": None,
+        "profiled": {},
+        "stats": None,
+        "stacks": {},
+        "samples": 0,
+        "reportPath": None,
+    }
+    with _lock:
+        _session[0] = session
+    return status()
+
+
+def _expired(s):
+    return (s["remaining"] is not None and s["remaining"] <= 0) or \
+        (s["deadline"] is not None and time.time() >= s["deadline"])
+
+
+def _finish(s):
+    with _lock:
+        if _session[0] is s:
+            _session[0] = None
+        if s["ended"] is None:
+            s["ended"] = time.time()
+            _last[0] = s
+
+
+def begin(route_key):
+    """Start profiling this request if a session wants it."""
+    s = _session[0]
+    if s is None:
+        return
+    if _expired(s):
+        _finish(s)
+        return
+    if s["routes"] is not None and route_key not in s["routes"]:
+        return
+    if " /debug/" in route_key:
+        return
+    if s["mode"] == "deterministic":
+        prof = _profile_mod.Profile()
+        try:
+            prof.enable()
+        except AttributeError:  # pure-Python profile has no enable()
+            sys.setprofile(prof.dispatcher)
+        _local.active = (s, route_key, prof)
+    else:
+        sampler = _Sampler(s, _thread_id())
+        sampler.thread.start()
+        _local.active = (s, route_key, sampler)
+
+
+def end():
+    """Stop profiling the current request and fold it into its session."""
+    active = getattr(_local, "active", None)
+    if active is None:
+        return
+    _local.active = None
+    s, route_key, tool = active
+    if s["mode"] == "deterministic":
+        try:
+            tool.disable()
+        except AttributeError:
+            sys.setprofile(None)
+        import pstats
+        with _lock:
+            if s["stats"] is None:
+                s["stats"] = pstats.Stats(tool, stream=StringIO())
+            else:
+                s["stats"].add(tool)
+    else:
+        tool.running = False
+        tool.thread.join(1.0)
+    with _lock:
+        s["profiled"][route_key] = s["profiled"].get(route_key, 0) + 1
+        if s["remaining"] is not None:
+            s["remaining"] -= 1
+    if _expired(s):
+        _finish(s)
+
+
+def stop():
+    s = _session[0]
+    if s is not None:
+        _finish(s)
+    return status()
+
+
+def _describe(s):
+    if s is None:
+        return None
+    return {
+        "mode": s["mode"],
+        "routes": sorted(s["routes"]) if s["routes"] else None,
+        "remainingRequests": s["remaining"],
+        "secondsLeft": round(max(0.0, s["deadline"] - time.time()), 3) if s["deadline"] and not s["ended"] else None,
+        "profiled": dict(s["profiled"]),
+        "samples": s["samples"] if s["mode"] == "sampling" else None,
+        "started": s["started"],
+        "ended": s["ended"],
+    }
+
+
+def status():
+    s = _session[0]
+    if s is not None and _expired(s):
+        _finish(s)
+        s = None
+    return {"active": _describe(s), "last": _describe(_last[0])}
+
+
+def report(sort="cumulative", limit=40):
+    """Text report of the active or last session; also written under REPORT_DIR."""
+    s = _session[0] or _last[0]
+    if s is None:
+        return None
+    if not os.path.isdir(REPORT_DIR):
+        os.makedirs(REPORT_DIR)
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(s["started"]))
+    out = {"session": _describe(s), "text": "", "reportPath": None, "statsPath": None}
+    with _lock:
+        if s["mode"] == "deterministic":
+            if s["stats"] is not None:
+                buf = StringIO()
+                s["stats"].stream = buf
+                s["stats"].sort_stats(sort).print_stats(int(limit))
+                out["text"] = buf.getvalue()
+                stats_path = os.path.join(REPORT_DIR, "profile_%s.pstats" % stamp)
+                s["stats"].dump_stats(stats_path)
+                out["statsPath"] = stats_path
+        else:
+            ranked = sorted(s["stacks"].items(), key=lambda kv: -kv[1])
+            lines = ["%d %s" % (n, stack) for stack, n in ranked]
+            out["text"] = "\n".join(lines[:int(limit)])
+            stats_path = os.path.join(REPORT_DIR, "profile_%s.folded" % stamp)
+            with open(stats_path, "w") as f:
+                f.write("\n".join("%s %d" % (stack, n) for stack, n in ranked))
+            out["statsPath"] = stats_path
+    report_path = os.path.join(REPORT_DIR, "profile_%s.txt" % stamp)
+    with open(report_path, "w") as f:
+        f.write(out["text"])
+    out["reportPath"] = report_path
+    return out
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Generic element query: /elements/query/.
+
+Category, class and parameter filters run inside Revit's collector
+(ElementMulticategoryFilter, OfClass, ElementParameterFilter), so Python only
+sees the ids that pass. Pages are cut from the sorted id list: the cursor is
+the last id returned, which stays valid while elements are added or deleted.
+"""
+from pyrevit import DB
+from System.Collections.Generic import List  # type: ignore
+
+from revit_mcp.tracing import span
+from revit_mcp.utils import err, log_api_call, ok, request_data
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+DOUBLE_EPSILON = 1e-6  # internal units (feet, square feet, ...)
+
+_RULES = {
+    "eq": "CreateEqualsRule",
+    "ne": "CreateNotEqualsRule",
+    "gt": "CreateGreaterRule",
+    "ge": "CreateGreaterOrEqualRule",
+    "lt": "CreateLessRule",
+    "le": "CreateLessOrEqualRule",
+    "contains": "CreateContainsRule",
+    "startswith": "CreateBeginsWithRule",
+    "endswith": "CreateEndsWithRule",
+}
+_STRING_ONLY = ("contains", "startswith", "endswith")
+
+
+class QueryError(Exception):
+    """Invalid query; answered with 400."""
+
+
+def category_from_name(name):
+    bic = getattr(DB.BuiltInCategory, name, None)
+    if bic is None and not name.startswith("OST_"):
+        bic = getattr(DB.BuiltInCategory, "OST_" + name.replace(" ", ""), None)
+    if bic is None:
+        raise QueryError("Unknown category: %s" % name)
+    return bic
+
+
+def _element_class(name):
+    cls = getattr(DB, name, None) or getattr(DB.Structure, name, None)
+    if not isinstance(cls, type):
+        raise QueryError("Unknown element class: %s" % name)
+    return cls
+
+
+def element_collector(doc, categories, cls=None, element_types=False):
+    collector = DB.FilteredElementCollector(doc)
+    if cls is not None:
+        collector = collector.OfClass(cls)
+    if len(categories) == 1:
+        collector = collector.OfCategory(categories[0])
+    elif categories:
+        bics = List[DB.BuiltInCategory]()
+        for bic in categories:
+            bics.Add(bic)
+        collector = collector.WherePasses(DB.ElementMulticategoryFilter(bics))
+    if element_types:
+        return collector.WhereElementIsElementType()
+    return collector.WhereElementIsNotElementType()
+
+
+def lookup_parameter(el, name):
+    """Parameter of el by BuiltInParameter name ("HOST_AREA_COMPUTED") or by display name ("Mark")."""
+    bip = getattr(DB.BuiltInParameter, name, None)
+    if bip is not None:
+        return el.get_Parameter(bip)
+    return el.LookupParameter(name)
+
+
+def parameter_value(p):
+    """Typed value of a parameter: float (internal units), int, string or element id as int."""
+    if p is None or not p.HasValue:
+        return None
+    st = p.StorageType
+    if st == DB.StorageType.Double:
+        return p.AsDouble()
+    if st == DB.StorageType.Integer:
+        return p.AsInteger()
+    if st == DB.StorageType.ElementId:
+        return int(p.AsElementId().IntegerValue)
+    if st == DB.StorageType.String:
+        return p.AsString()
+    return None
+
+
+def _create_rule(op, param_id, storage, value):
+    factory = DB.ParameterFilterRuleFactory
+    make = getattr(factory, _RULES[op])
+    if storage == DB.StorageType.String:
+        try:
+            return make(param_id, str(value))
+        except TypeError:  # Revit < 2023 takes a caseSensitive flag
+            return make(param_id, str(value), False)
+    if op in _STRING_ONLY:
+        raise QueryError("Operator '%s' needs a text parameter" % op)
+    if storage == DB.StorageType.Double:
+        return make(param_id, float(value), DOUBLE_EPSILON)
+    if storage == DB.StorageType.Integer:
+        return make(param_id, int(value))
+    if storage == DB.StorageType.ElementId:
+        return make(param_id, DB.ElementId(int(value)))
+    raise QueryError("Parameter cannot be filtered on")
+
+
+def _parameter_filters(collector_factory, specs):
+    """ElementParameterFilters for [{"parameter", "op", "value"}, ...].
+
+    The parameter id and storage type come from the first element that has
+    the parameter, so shared and project parameters work as well as
+    built-in ones."""
+    filters = []
+    for spec in specs:
+        name = spec.get("parameter")
+        op = spec.get("op", "eq")
+        if not name or "value" not in spec:
+            raise QueryError("Each filter needs 'parameter' and 'value'")
+        if op not in _RULES:
+            raise QueryError("Unknown operator '%s' (use %s)" % (op, ", ".join(sorted(_RULES))))
+        param = None
+        for el in collector_factory():
+            param = lookup_parameter(el, name)
+            if param is not None:
+                break
+        if param is None:
+            return None  # no candidate has the parameter: nothing can match
+        rule = _create_rule(op, param.Id, param.StorageType, spec["value"])
+        filters.append(DB.ElementParameterFilter(rule))
+    return filters
+
+
+def _row(el, fields):
+    cat = el.Category
+    type_id = el.GetTypeId()
+    row = {
+        "id": int(el.Id.IntegerValue),
+        "name": el.Name,
+        "category": cat.Name if cat is not None else None,
+        "typeId": int(type_id.IntegerValue) if type_id != DB.ElementId.InvalidElementId else None,
+    }
+    if fields:
+        row["fields"] = dict((f, parameter_value(lookup_parameter(el, f))) for f in fields)
+    return row
+
+
+def register_routes(api):
+    @api.route("/elements/query/", methods=["POST"])
+    def query_elements(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/elements/query/", data)
+        try:
+            categories = [category_from_name(c) for c in data.get("categories") or []]
+            classes = [_element_class(c) for c in data.get("classes") or []] or [None]
+            element_types = bool(data.get("elementTypes", False))
+            fields = data.get("fields") or []
+            limit = min(int(data.get("limit") or DEFAULT_LIMIT), MAX_LIMIT)
+            cursor = data.get("cursor")
+            cursor = int(cursor) if cursor is not None else None
+            if limit <= 0:
+                return err("limit must be positive", 400)
+
+            ids = set()
+            with span("collect"):
+                for cls in classes:
+                    def make(cls=cls):
+                        return element_collector(doc, categories, cls, element_types)
+                    filters = _parameter_filters(make, data.get("filters") or [])
+                    if filters is None:
+                        continue
+                    collector = make()
+                    for f in filters:
+                        collector = collector.WherePasses(f)
+                    for eid in collector.ToElementIds():
+                        ids.add(int(eid.IntegerValue))
+            ordered = sorted(i for i in ids if cursor is None or i > cursor)
+            page = ordered[:limit]
+
+            with span("serialize"):
+                rows = []
+                for i in page:
+                    el = doc.GetElement(DB.ElementId(i))
+                    if el is not None:
+                        rows.append(_row(el, fields))
+            return ok({
+                "elements": rows,
+                "count": len(rows),
+                "total": len(ids),
+                "nextCursor": page[-1] if len(ordered) > limit else None,
+            })
+        except QueryError as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
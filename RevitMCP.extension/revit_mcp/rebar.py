@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""Column rebar cages (/place/rebar_cages/, /place/rebar_cage_column/) and /quantify/rebar/.
+
+Each column's axes come from its instance transform and its section from
+the type's "b"/"h" (or "d") length parameters, falling back to the bounding
+box mapped into the column's axes; the bounding box also gives the height.
+The bar layout itself is computed in revit_mcp.cage and each BarSet becomes
+one Rebar element with a fixed-number or maximum-spacing layout.
+
+Cage specs take the "detailing" entries of design_columns_nbr6118:
+columnId, barType, stirrupBarType, stirrupShape, stirrupSpacing and cover
+(metres), shape ("rectangular"/"circular"), barsX/barsY or bars. Stirrups
+are placed only when a spec names stirrupShape or stirrupSpacing (0.2 m when
+only the shape is given); without either a cage is longitudinal bars only.
+/place/rebar_cages/ lays out every cage first, reports the ones that cannot
+be built and creates the rest in one transaction.
+
+/quantify/rebar/ walks the rebar once, reading quantity and total length
+per element; linear mass (steel density x nominal bar area) is computed
+once per bar type and host category/level once per host.
+"""
+from pyrevit import DB
+from System.Collections.Generic import List  # type: ignore
+
+from revit_mcp import cage
+from revit_mcp.cage import CageError
+from revit_mcp.snapshot import element_level_id
+from revit_mcp.tracing import span
+from revit_mcp.utils import (
+    Tx,
+    check_cancelled,
+    err,
+    find_rebar_bar_type_by_name,
+    find_rebar_shape_by_name,
+    log_api_call,
+    ok,
+    request_data,
+)
+
+RECTANGULAR_PARAMS = (("b", "h"), ("Width", "Depth"), ("Width", "Height"))
+CIRCULAR_PARAMS = ("d", "Diameter")
+SPEC_KEYS = ("barType", "stirrupBarType", "stirrupShape", "stirrupSpacing", "cover", "shape", "barsX", "barsY", "bars")
+MAX_CAGES = 5000
+DEFAULT_STIRRUP_SPACING = 0.2  # m, when a spec gives stirrupShape but no spacing
+STEEL_DENSITY = 7850.0  # kg/m3
+FT_TO_M = 0.3048
+GROUP_KEYS = ("barType", "diameter", "category", "level")
+DEFAULT_GROUP_BY = ("level", "category", "barType")
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def bar_diameter(bar_type):
+    """Model diameter in feet (BarModelDiameter from Revit 2023, BarDiameter before)."""
+    for attr in ("BarModelDiameter", "BarDiameter"):
+        value = getattr(bar_type, attr, None)
+        if value:
+            return float(value)
+    p = bar_type.get_Parameter(DB.BuiltInParameter.REBAR_BAR_DIAMETER)
+    return p.AsDouble() if p is not None else 0.0
+
+
+def nominal_diameter(bar_type):
+    """Nominal diameter in feet, the one steel weight tables use."""
+    for attr in ("BarNominalDiameter", "BarDiameter"):
+        value = getattr(bar_type, attr, None)
+        if value:
+            return float(value)
+    return bar_diameter(bar_type)
+
+
+def linear_mass(bar_type):
+    """kg per metre of one bar of the type."""
+    d = nominal_diameter(bar_type) * FT_TO_M
+    return STEEL_DENSITY * 3.141592653589793 * d * d / 4.0
+
+
+def _rebar_classes():
+    classes = [DB.Structure.Rebar]
+    in_system = getattr(DB.Structure, "RebarInSystem", None)  # bars of area/path reinforcement
+    if in_system is not None:
+        classes.append(in_system)
+    return classes
+
+
+def _length(elements, name):
+    for el in elements:
+        p = el.LookupParameter(name) if el is not None else None
+        if p is not None and p.StorageType == DB.StorageType.Double and p.HasValue:
+            return p.AsDouble()
+    return None
+
+
+def column_section(col, shape=None):
+    """(frame, shape, b, h, w bottom, w top, warnings): the column's axes centred on its section."""
+    tr = col.GetTransform()
+    bb = col.get_BoundingBox(None)
+    if bb is None:
+        raise CageError("Column has no bounding box")
+    inv = tr.Inverse
+    local = [inv.OfPoint(bb.Transform.OfPoint(DB.XYZ(x, y, z)))
+             for x in (bb.Min.X, bb.Max.X) for y in (bb.Min.Y, bb.Max.Y) for z in (bb.Min.Z, bb.Max.Z)]
+    us, vs, ws = [p.X for p in local], [p.Y for p in local], [p.Z for p in local]
+    centre = tr.OfPoint(DB.XYZ((min(us) + max(us)) / 2.0, (min(vs) + max(vs)) / 2.0, 0.0))
+    frame = cage.Frame((centre.X, centre.Y, centre.Z), (tr.BasisX.X, tr.BasisX.Y, tr.BasisX.Z),
+                       (tr.BasisY.X, tr.BasisY.Y, tr.BasisY.Z), (tr.BasisZ.X, tr.BasisZ.Y, tr.BasisZ.Z))
+    elements = (getattr(col, "Symbol", None), col)
+    warnings = []
+    b = h = None
+    if shape != "circular":
+        for bn, hn in RECTANGULAR_PARAMS:
+            b, h = _length(elements, bn), _length(elements, hn)
+            if b and h:
+                break
+    if not (b and h) and shape != "rectangular":
+        for name in CIRCULAR_PARAMS:
+            d = _length(elements, name)
+            if d:
+                return frame, "circular", d, d, min(ws), max(ws), warnings
+    if not (b and h):
+        b, h = max(us) - min(us), max(vs) - min(vs)
+        if abs(tr.BasisX.X * tr.BasisX.Y) > 1e-6:
+            warnings.append("section taken from the bounding box of a rotated column; it may be oversized")
+        if shape == "circular":
+            return frame, "circular", min(b, h), min(b, h), min(ws), max(ws), warnings
+    return frame, "rectangular", b, h, min(ws), max(ws), warnings
+
+
+class CagePlan(object):
+    __slots__ = ("column", "sets", "bar_type", "stirrup_type", "stirrup_shape", "shape", "warnings")
+
+    def __init__(self, column, sets, bar_type, stirrup_type, stirrup_shape, shape, warnings):
+        self.column = column
+        self.sets = sets
+        self.bar_type = bar_type
+        self.stirrup_type = stirrup_type
+        self.stirrup_shape = stirrup_shape
+        self.shape = shape
+        self.warnings = warnings
+
+    def row(self, element_ids=None):
+        r = {"columnId": int(self.column.Id.IntegerValue), "shape": self.shape, "barType": self.bar_type.Name,
+             "elementIds": element_ids, "sets": [s.row() for s in self.sets]}
+        r.update(cage.totals(self.sets))
+        if self.warnings:
+            r["warnings"] = self.warnings
+        return r
+
+
+class RebarTypes(object):
+    """Bar types and shapes by name, looked up once per request."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.bars = {}
+        self.shapes = {}
+        self.first = None
+
+    def bar(self, name):
+        if not name:
+            if self.first is None:
+                self.first = next(iter(DB.FilteredElementCollector(self.doc).OfClass(DB.Structure.RebarBarType)),
+                                  None)
+            if self.first is None:
+                raise CageError("No RebarBarType available.")
+            return self.first
+        if name not in self.bars:
+            self.bars[name] = find_rebar_bar_type_by_name(self.doc, name)
+        if self.bars[name] is None:
+            raise CageError("RebarBarType not found: %s" % name)
+        return self.bars[name]
+
+    def shape(self, name):
+        if not name:
+            return None
+        if name not in self.shapes:
+            self.shapes[name] = find_rebar_shape_by_name(self.doc, name)
+        if self.shapes[name] is None:
+            raise CageError("RebarShape not found: %s" % name)
+        return self.shapes[name]
+
+
+def column_by_id(doc, column_id):
+    try:
+        col = doc.GetElement(DB.ElementId(int(column_id)))
+    except (TypeError, ValueError):
+        col = None
+    if col is None or not isinstance(col, DB.FamilyInstance):
+        raise CageError("Invalid element")
+    return col
+
+
+def plan_cage(col, spec, types):
+    """Lay out one column's cage from a detailing spec (cover and stirrupSpacing in metres)."""
+    bar_type = types.bar(spec.get("barType"))
+    stirrup_type = types.bar(spec.get("stirrupBarType") or spec.get("barType"))
+    stirrup_shape = types.shape(spec.get("stirrupShape"))
+    cover = float(spec.get("cover", 0.03)) * cage.M_TO_FT
+    spacing = spec.get("stirrupSpacing")
+    if spacing is None:
+        spacing = DEFAULT_STIRRUP_SPACING if spec.get("stirrupShape") else 0.0  # no stirrups unless asked for
+    spacing = float(spacing) * cage.M_TO_FT
+    if cover < 0 or spacing < 0:
+        raise CageError("cover and stirrupSpacing must be >= 0")
+    frame, shape, b, h, w0, w1, warnings = column_section(col, spec.get("shape"))
+    bar, stirrup = bar_diameter(bar_type), bar_diameter(stirrup_type)
+    w0, w1 = w0 + cover, w1 - cover
+    if shape == "circular":
+        sets = cage.circular(frame, b, w0, w1, cover, bar, stirrup, spec.get("bars", 6), spacing)
+    else:
+        sets = cage.rectangular(frame, b, h, w0, w1, cover, bar, stirrup,
+                                spec.get("barsX", 2), spec.get("barsY", 2), spacing)
+    return CagePlan(col, sets, bar_type, stirrup_type, stirrup_shape, shape, warnings)
+
+
+def _curve(c):
+    if c[0] == "arc":
+        return DB.Arc.Create(DB.XYZ(*c[1]), DB.XYZ(*c[2]), DB.XYZ(*c[3]))
+    return DB.Line.CreateBound(DB.XYZ(*c[1]), DB.XYZ(*c[2]))
+
+
+def create_cage(doc, plan):
+    """Create one Rebar per BarSet (inside an open transaction); returns the new ids."""
+    ids = []
+    for s in plan.sets:
+        check_cancelled()
+        curves = List[DB.Curve]()
+        for c in s.curves:
+            curves.Add(_curve(c))
+        normal = DB.XYZ(*s.normal)
+        if s.role == "stirrup" and plan.stirrup_shape is not None:
+            rb = DB.Structure.Rebar.CreateFromCurvesAndShape(
+                doc, plan.stirrup_shape, plan.stirrup_type, None, None, plan.column, normal, curves)
+        else:
+            style = DB.Structure.RebarStyle.StirrupTie if s.role == "stirrup" else DB.Structure.RebarStyle.Standard
+            rb = DB.Structure.Rebar.CreateFromCurves(
+                doc, style, plan.stirrup_type if s.role == "stirrup" else plan.bar_type, None, None, plan.column,
+                normal, curves, DB.Structure.RebarHookOrientation.Left, DB.Structure.RebarHookOrientation.Left,
+                True, True)
+        if s.layout == "fixed":
+            rb.GetShapeDrivenAccessor().SetLayoutAsFixedNumber(s.count, s.array_length, True, True, True)
+        elif s.layout == "maxSpacing":
+            rb.GetShapeDrivenAccessor().SetLayoutAsMaximumSpacing(s.spacing, s.array_length, True, True, True)
+        ids.append(int(rb.Id.IntegerValue))
+    return ids
+
+
+def register_routes(api):
+    @api.route("/place/rebar_cages/", methods=["POST"])
+    def place_rebar_cages(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/place/rebar_cages/", dict(data, cages=len(data.get("cages") or [])))
+        try:
+            specs = data.get("cages") or []
+            if not specs:
+                return err('Give "cages": [{"columnId": ..., "barType": ..., "barsX": ..., "barsY": ...}]', 400)
+            if len(specs) > MAX_CAGES:
+                return err("At most %d cages per request" % MAX_CAGES, 400)
+            defaults = dict((k, data[k]) for k in SPEC_KEYS if data.get(k) is not None)
+            dry_run = bool(data.get("dryRun"))
+            types = RebarTypes(doc)
+
+            plans, failed = [], []
+            with span("layout"):
+                for i, item in enumerate(specs):
+                    spec = dict(defaults)
+                    spec.update((k, v) for k, v in item.items() if v is not None)
+                    try:
+                        plans.append(plan_cage(column_by_id(doc, spec.get("columnId")), spec, types))
+                    except (CageError, ValueError, TypeError) as ex:
+                        failed.append({"index": i, "columnId": spec.get("columnId"), "error": str(ex)})
+
+            if dry_run or not plans:
+                rows = [p.row() for p in plans]
+            else:
+                rows = []
+                with Tx(doc, "MCP: Column Rebar Cages"):
+                    with span("create"):
+                        for p in plans:
+                            rows.append(p.row(create_cage(doc, p)))
+            return ok({"ok": True, "dryRun": dry_run, "cages": rows, "failed": failed, "count": len(rows),
+                       "bars": sum(r["bars"] for r in rows), "elements": sum(r["elements"] for r in rows)})
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/quantify/rebar/", methods=["POST"])
+    def quantify_rebar(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/quantify/rebar/", data)
+        try:
+            group_by = data.get("groupBy") or list(DEFAULT_GROUP_BY)
+            bad = [k for k in group_by if k not in GROUP_KEYS]
+            if bad:
+                return err("groupBy takes %s, not %s" % (", ".join(GROUP_KEYS), ", ".join(bad)), 400)
+            per_host = bool(data.get("perHost"))
+            limit = min(int(data.get("limit") or DEFAULT_LIMIT), MAX_LIMIT)
+            cursor = data.get("cursor")
+            cursor = int(cursor) if cursor is not None else None
+            if limit <= 0:
+                return err("limit must be positive", 400)
+
+            bar_types = {}  # type id -> (name, diameter mm, kg/m)
+            hosts = {}  # host id -> (category, level)
+            level_names = {-1: "(none)"}
+            groups = {}
+            host_rows = {}
+            total = [0, 0.0, 0.0, 0]  # bars, metres, kg, elements
+            with span("collect"):
+                for cls in _rebar_classes():
+                    for rb in DB.FilteredElementCollector(doc).OfClass(cls):
+                        check_cancelled()
+                        type_id = int(rb.GetTypeId().IntegerValue)
+                        bar = bar_types.get(type_id)
+                        if bar is None:
+                            bt = doc.GetElement(rb.GetTypeId())
+                            bar = bar_types[type_id] = (bt.Name, round(nominal_diameter(bt) / FT_TO_M * 1000.0, 1),
+                                                        linear_mass(bt)) if bt is not None else ("(none)", 0.0, 0.0)
+                        host_id = int(rb.GetHostId().IntegerValue)
+                        host = hosts.get(host_id)
+                        if host is None:
+                            el = doc.GetElement(rb.GetHostId()) if host_id > 0 else None
+                            level_id = element_level_id(el) if el is not None else -1
+                            if level_id not in level_names:
+                                level = doc.GetElement(DB.ElementId(level_id))
+                                level_names[level_id] = level.Name if level is not None else "(none)"
+                            host = hosts[host_id] = (el.Category.Name if el is not None and el.Category else "(none)",
+                                                     level_names[level_id])
+                        bars = int(rb.Quantity)
+                        metres = rb.TotalLength * FT_TO_M
+                        kg = metres * bar[2]
+                        values = {"barType": bar[0], "diameter": bar[1], "category": host[0], "level": host[1]}
+                        key = tuple(values[k] for k in group_by)
+                        g = groups.get(key)
+                        if g is None:
+                            g = groups[key] = [0, 0.0, 0.0, 0]
+                        g[0] += bars
+                        g[1] += metres
+                        g[2] += kg
+                        g[3] += 1
+                        total[0] += bars
+                        total[1] += metres
+                        total[2] += kg
+                        total[3] += 1
+                        if per_host:
+                            h = host_rows.get(host_id)
+                            if h is None:
+                                h = host_rows[host_id] = {"hostId": host_id if host_id > 0 else None,
+                                                          "category": host[0], "level": host[1],
+                                                          "bars": 0, "lengthM": 0.0, "weightKg": 0.0, "byBarType": {}}
+                            h["bars"] += bars
+                            h["lengthM"] += metres
+                            h["weightKg"] += kg
+                            h["byBarType"][bar[0]] = h["byBarType"].get(bar[0], 0.0) + kg
+
+            with span("serialize"):
+                diameters = dict((name, d) for name, d, _ in bar_types.values())
+
+                def order(key):  # bar types by diameter, not by name ("6.3mm" before "10mm")
+                    return tuple((diameters.get(v, 0.0), v) if k == "barType" else v for k, v in zip(group_by, key))
+                rows = []
+                for key in sorted(groups, key=order):
+                    g = groups[key]
+                    row = dict(zip(group_by, key))
+                    row.update({"bars": g[0], "lengthM": round(g[1], 3), "weightKg": round(g[2], 3),
+                                "elements": g[3]})
+                    rows.append(row)
+                result = {
+                    "groupBy": group_by,
+                    "groups": rows,
+                    "total": {"bars": total[0], "lengthM": round(total[1], 3), "weightKg": round(total[2], 3),
+                              "elements": total[3]},
+                    "barTypes": [{"barType": name, "diameterMm": d, "kgPerM": round(kg_m, 4)}
+                                 for name, d, kg_m in sorted(bar_types.values(), key=lambda b: (b[1], b[0]))],
+                }
+                if per_host:
+                    ordered = sorted(i for i in host_rows if cursor is None or i > cursor)
+                    page = ordered[:limit]
+                    for i in page:
+                        h = host_rows[i]
+                        h["lengthM"] = round(h["lengthM"], 3)
+                        h["weightKg"] = round(h["weightKg"], 3)
+                        h["byBarType"] = dict((k, round(v, 3)) for k, v in h["byBarType"].items())
+                    result["hosts"] = [host_rows[i] for i in page]
+                    result["hostCount"] = len(host_rows)
+                    result["nextCursor"] = page[-1] if len(ordered) > limit else None
+            return ok(result)
+        except Exception as ex:
+            return err(ex)
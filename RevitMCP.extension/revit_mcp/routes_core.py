@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime
 
-from revit_mcp.utils import err, log_api_call, ok
+from revit_mcp import cancellation, events, metrics
+from revit_mcp.utils import err, log_api_call, ok, request_data
 
 
 def register_routes(api):
@@ -14,8 +15,39 @@ def register_routes(api):
                 "revit_available": bool(doc is not None),
                 "document_title": getattr(doc, "Title", None),
                 "api_name": "revit_mcp",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                "metrics": metrics.snapshot(),
+                "events": events.snapshot(),
             }
             return ok(data)
         except Exception as ex:
             return err(ex)
+
+    # No ``doc`` argument: pyRevit runs this on the server thread, so it is
+    # handled even while another route keeps Revit busy.
+    @api.route("/cancel/", methods=["POST"])
+    def cancel_request(request):
+        data = request_data(request)
+        log_api_call("POST", "/cancel/", data)
+        try:
+            request_id = data.get("requestId")
+            if not request_id:
+                return err("requestId is required", 400)
+            return ok({"requestId": request_id, "state": cancellation.cancel(request_id)})
+        except Exception as ex:
+            return err(ex)
+
+    # Long-poll fallback for the SSE stream (see events.py); doc-less like /cancel/.
+    @api.route("/events/", methods=["GET"])
+    def poll_events(request):
+        log_api_call("GET", "/events/")
+        try:
+            params = getattr(request, "params", None) or {}
+            after = params.get("after")
+            timeout = min(float(params.get("timeout", 0) or 0), events.MAX_POLL_SECONDS)
+            found, reset = events.wait(after, timeout) if timeout > 0 else events.since(after)
+            out = [events.reset_event(after)] if reset else []
+            out.extend(found)
+            return ok({"events": out, "lastId": found[-1]["id"] if found else events.last_id()})
+        except Exception as ex:
+            return err(ex)
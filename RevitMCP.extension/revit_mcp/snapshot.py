@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""Columnar model snapshot: /snapshot/.
+
+Writes one row per model element to a directory of flat binary columns (one
+file per column, native byte order) described by manifest.json, so the MCP
+server can memory-map the arrays and aggregate without calling Revit again:
+
+    id, category, type_id, level_id     int32, ElementId.IntegerValue (-1 = none)
+    min_x .. max_z                      float64, world bounding box (NaN = none)
+    one column per parameter            float64, internal units (NaN = missing)
+
+Elements are written CHUNK_ROWS at a time, so memory stays flat on large
+models and a cancelled request stops between chunks. The manifest also holds
+the lookup tables (category and type names, the /levels/, /types/ and
+/families/ rows) and the document's change counter at export time: the
+snapshot describes the model for as long as events.change_counter() and
+events.EPOCH still match.
+
+Everything is written to "<path>.tmp" and renamed when complete, so a reader
+never sees a half-written snapshot.
+"""
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+
+from pyrevit import DB
+
+from revit_mcp import events
+from revit_mcp.catalog import collect_levels, collect_types
+from revit_mcp.families import collect_families
+from revit_mcp.query import QueryError, category_from_name, element_collector, lookup_parameter
+from revit_mcp.tracing import span
+from revit_mcp.utils import check_cancelled, err, log_api_call, ok, request_data
+
+SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), "revit_mcp_snapshots")
+FORMAT_VERSION = 1
+CHUNK_ROWS = 20000
+KEEP_SNAPSHOTS = 3  # per document in SNAPSHOT_DIR; older ones are deleted
+DEFAULT_PARAMETERS = ("HOST_VOLUME_COMPUTED", "HOST_AREA_COMPUTED", "CURVE_ELEM_LENGTH")
+
+INT_COLUMNS = ("id", "category", "type_id", "level_id")
+BOX_COLUMNS = ("min_x", "min_y", "min_z", "max_x", "max_y", "max_z")
+
+_NAN = float("nan")
+_ORDER = "<" if sys.byteorder == "little" else ">"
+_DTYPES = {"i": _ORDER + "i4", "d": _ORDER + "f8"}
+
+
+class _Columns(object):
+    """Typed column buffers appended to one file each on flush()."""
+
+    def __init__(self, directory, parameters):
+        self.directory = directory
+        self.columns = []  # (name, typecode, file name)
+        for name in INT_COLUMNS:
+            self.columns.append((name, "i", name + ".bin"))
+        for name in BOX_COLUMNS:
+            self.columns.append((name, "d", name + ".bin"))
+        for i, name in enumerate(parameters):
+            self.columns.append((name, "d", "param_%d.bin" % i))
+        self._buffers = [array(code) for _, code, _ in self.columns]
+        self._files = [open(os.path.join(directory, fname), "wb") for _, _, fname in self.columns]
+        self.bytes = 0
+
+    def add(self, values):
+        for buf, value in zip(self._buffers, values):
+            buf.append(value)
+
+    def flush(self):
+        for i, buf in enumerate(self._buffers):
+            buf.tofile(self._files[i])
+            self.bytes += len(buf) * buf.itemsize
+            self._buffers[i] = array(buf.typecode)
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+    def describe(self):
+        return [{"name": name, "file": fname, "dtype": _DTYPES[code]} for name, code, fname in self.columns]
+
+
+def world_box(el):
+    """(min_x, min_y, min_z, max_x, max_y, max_z) in model coordinates, or None."""
+    bb = el.get_BoundingBox(None)
+    if bb is None:
+        return None
+    lo, hi = bb.Min, bb.Max
+    tr = bb.Transform
+    if tr is None or tr.IsIdentity:
+        return (lo.X, lo.Y, lo.Z, hi.X, hi.Y, hi.Z)
+    pts = [tr.OfPoint(DB.XYZ(x, y, z)) for x in (lo.X, hi.X) for y in (lo.Y, hi.Y) for z in (lo.Z, hi.Z)]
+    return (min(p.X for p in pts), min(p.Y for p in pts), min(p.Z for p in pts),
+            max(p.X for p in pts), max(p.Y for p in pts), max(p.Z for p in pts))
+
+
+def _id(eid):
+    if eid is None or eid == DB.ElementId.InvalidElementId:
+        return -1
+    return int(eid.IntegerValue)
+
+
+def element_level_id(el):
+    level = _id(el.LevelId)
+    if level == -1:
+        # Framing and some hosted families leave LevelId empty and use a reference level
+        p = lookup_parameter(el, "INSTANCE_REFERENCE_LEVEL_PARAM")
+        if p is not None and p.HasValue and p.StorageType == DB.StorageType.ElementId:
+            level = _id(p.AsElementId())
+    return level
+
+
+def is_model_element(el):
+    """Elements a snapshot (or the spatial index) covers: categorized, not view-specific, not views."""
+    return el.Category is not None and not el.ViewSpecific and not isinstance(el, DB.View)
+
+
+def _number(p):
+    if p is None or not p.HasValue:
+        return _NAN
+    if p.StorageType == DB.StorageType.Double:
+        return p.AsDouble()
+    if p.StorageType == DB.StorageType.Integer:
+        return float(p.AsInteger())
+    return _NAN
+
+
+def _spec(p):
+    """ForgeTypeId of the parameter's spec ("autodesk.spec.aec:length-2.0.0"), if the API has it."""
+    try:
+        return p.Definition.GetDataType().TypeId or None
+    except Exception:
+        return None
+
+
+def _type_row(doc, type_id):
+    t = doc.GetElement(DB.ElementId(type_id))
+    if t is None:
+        return None
+    cat = t.Category
+    return {"name": t.Name,
+            "family": getattr(t, "FamilyName", None),
+            "category": cat.Name if cat is not None else None}
+
+
+def _default_path(doc):
+    title = re.sub(r"[^A-Za-z0-9_.-]+", "_", doc.Title or "untitled")
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + "-%03d" % int((now % 1) * 1000)
+    return os.path.join(SNAPSHOT_DIR, "%s_%s" % (title, stamp))
+
+
+def _prune(path):
+    """Keep the KEEP_SNAPSHOTS newest default-path snapshots of the same document."""
+    parent, name = os.path.split(path)
+    # "<title>_<stamp>" exactly: a bare prefix would also match "<title>_<more>_<stamp>" of another document
+    same = re.compile(r"^%s_\d{8}-\d{6}-\d{3}$" % re.escape(name.rsplit("_", 1)[0]))
+    siblings = sorted(d for d in os.listdir(parent)
+                      if same.match(d) and os.path.isfile(os.path.join(parent, d, "manifest.json")))
+    for d in siblings[:-KEEP_SNAPSHOTS]:
+        shutil.rmtree(os.path.join(parent, d), ignore_errors=True)
+
+
+def write_snapshot(doc, path, category_names, parameters):
+    """Write the snapshot to path; returns the manifest."""
+    categories = [category_from_name(c) for c in category_names]
+    tmp = path + ".tmp"
+    if os.path.isdir(tmp):
+        shutil.rmtree(tmp)
+    os.makedirs(tmp)
+    events.set_active_document(doc.Title)  # routes always get the active document
+    counter = events.change_counter(doc.Title)
+    last_event = events.last_id()
+    columns = _Columns(tmp, parameters)
+    seen_categories = {}
+    type_ids = set()
+    specs = dict((name, None) for name in parameters)
+    rows = 0
+    chunks = 0
+    try:
+        with span("collect"):
+            for el in element_collector(doc, categories):
+                if not is_model_element(el):
+                    continue
+                cat = el.Category
+                box = world_box(el) or (_NAN,) * 6
+                values = [_id(el.Id), _id(cat.Id), _id(el.GetTypeId()), element_level_id(el)]
+                values.extend(box)
+                for name in parameters:
+                    p = lookup_parameter(el, name)
+                    if p is not None and specs[name] is None:
+                        specs[name] = _spec(p)
+                    values.append(_number(p))
+                columns.add(values)
+                seen_categories[values[1]] = cat.Name
+                if values[2] != -1:
+                    type_ids.add(values[2])
+                rows += 1
+                if rows % CHUNK_ROWS == 0:
+                    columns.flush()
+                    chunks += 1
+                    check_cancelled()
+            if rows % CHUNK_ROWS:
+                columns.flush()
+                chunks += 1
+        columns.close()
+
+        with span("tables"):
+            types = {}
+            for type_id in type_ids:
+                row = _type_row(doc, type_id)
+                if row is not None:
+                    types[str(type_id)] = row
+            manifest = {
+                "version": FORMAT_VERSION,
+                "document": doc.Title,
+                "created": time.time(),
+                "epoch": events.EPOCH,
+                "changeCounter": counter,
+                "lastEventId": last_event,
+                "categoryFilter": list(category_names),  # empty: every category
+                "rows": rows,
+                "chunks": chunks,
+                "chunkRows": CHUNK_ROWS,
+                "bytes": columns.bytes,
+                "columns": columns.describe(),
+                "parameters": dict((name, {"spec": specs[name]}) for name in parameters),
+                "categories": dict((str(k), v) for k, v in seen_categories.items()),
+                "types": types,
+                "catalog": {
+                    "levels": collect_levels(doc),
+                    "types": collect_types(doc),
+                    "families": collect_families(doc),
+                },
+            }
+            with open(os.path.join(tmp, "manifest.json"), "w") as f:
+                json.dump(manifest, f)
+    except Exception:
+        columns.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.rename(tmp, path)
+    return manifest
+
+
+def register_routes(api):
+    @api.route("/snapshot/", methods=["POST"])
+    def snapshot_model(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/snapshot/", data)
+        try:
+            categories = data.get("categories") or []
+            parameters = list(data.get("parameters") or DEFAULT_PARAMETERS)
+            clash = [p for p in parameters if p in INT_COLUMNS or p in BOX_COLUMNS]
+            if clash or len(set(parameters)) != len(parameters):
+                return err("Parameter names must be unique and not one of the fixed columns", 400)
+            path = data.get("path")
+            if path and os.path.exists(path) and not os.path.isfile(os.path.join(path, "manifest.json")):
+                return err("%s exists and is not a snapshot; refusing to replace it" % path, 400)
+            default = not path
+            if default:
+                path = _default_path(doc)
+                if not os.path.isdir(SNAPSHOT_DIR):
+                    os.makedirs(SNAPSHOT_DIR)
+
+            started = time.time()
+            manifest = write_snapshot(doc, path, categories, parameters)
+            if default:
+                _prune(path)
+            return ok({
+                "path": path,
+                "document": manifest["document"],
+                "rows": manifest["rows"],
+                "chunks": manifest["chunks"],
+                "bytes": manifest["bytes"],
+                "columns": [c["name"] for c in manifest["columns"]],
+                "changeCounter": manifest["changeCounter"],
+                "seconds": round(time.time() - started, 3),
+            })
+        except QueryError as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+"""Spatial index of element bounding boxes: /spatial/nearby/, /spatial/overlaps/.
+
+Each document gets a uniform grid hash over XY per level: a cell of
+CELL_SIZE feet lists the elements whose world bounding box touches it, so a
+query looks at a handful of cells instead of collecting the model. The index
+is built on first use (one collector pass) and then kept current from change
+events (events.listeners): added, modified and deleted ids are queued and
+re-read at the start of the next query; a truncated event or closing the
+document drops the index, and it is rebuilt on next use. If Revit's events
+could not be subscribed (events.installed is False) the index is rebuilt for
+every query instead of going stale.
+
+Elements whose box would cover more than MAX_CELLS cells (slabs, long
+walls on a coarse grid) are kept in a per-level list checked by every
+query. All coordinates are Revit internal units (feet).
+
+place_column and create_wall_line use clashes_at_point / clashes_along to
+refuse a placement that would overlap existing elements ("clashCheck").
+Straight walls are measured by their location lines rather than their boxes,
+so a new wall may end on an existing one (L, T and in-line joins).
+"""
+import math
+import threading
+import time
+
+from pyrevit import DB
+
+from revit_mcp import events, metrics
+from revit_mcp.query import QueryError, category_from_name, element_collector
+from revit_mcp.snapshot import element_level_id, is_model_element, world_box
+from revit_mcp.tracing import span
+from revit_mcp.utils import err, find_level_by_name, log_api_call, ok, request_data
+
+CELL_SIZE = 10.0
+MAX_CELLS = 256
+DEFAULT_RADIUS = 5.0
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 5000
+
+_lock = threading.Lock()
+_indexes = {}  # document title -> _DocumentIndex
+_pending = {}  # document title -> ids changed since the index last looked
+
+
+class _Grid(object):
+    """Grid hash of one level: cell (ix, iy) -> ids, plus the boxes themselves."""
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.cells = {}
+        self.large = set()
+        self.boxes = {}  # id -> (min_x, min_y, min_z, max_x, max_y, max_z)
+
+    def _span(self, min_x, min_y, max_x, max_y):
+        c = self.cell
+        return (int(math.floor(min_x / c)), int(math.floor(min_y / c)),
+                int(math.floor(max_x / c)), int(math.floor(max_y / c)))
+
+    def insert(self, eid, box):
+        self.boxes[eid] = box
+        ix0, iy0, ix1, iy1 = self._span(box[0], box[1], box[3], box[4])
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > MAX_CELLS:
+            self.large.add(eid)
+            return
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                self.cells.setdefault((ix, iy), set()).add(eid)
+
+    def remove(self, eid):
+        box = self.boxes.pop(eid, None)
+        if box is None:
+            return
+        if eid in self.large:
+            self.large.discard(eid)
+            return
+        ix0, iy0, ix1, iy1 = self._span(box[0], box[1], box[3], box[4])
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                ids = self.cells.get((ix, iy))
+                if ids is not None:
+                    ids.discard(eid)
+                    if not ids:
+                        del self.cells[(ix, iy)]
+
+    def candidates(self, min_x, min_y, max_x, max_y):
+        ix0, iy0, ix1, iy1 = self._span(min_x, min_y, max_x, max_y)
+        out = set(self.large)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self.cells):
+            for key, ids in self.cells.items():  # query wider than the occupied cells
+                if ix0 <= key[0] <= ix1 and iy0 <= key[1] <= iy1:
+                    out.update(ids)
+            return out
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                ids = self.cells.get((ix, iy))
+                if ids:
+                    out.update(ids)
+        return out
+
+
+class _DocumentIndex(object):
+    def __init__(self, cell=CELL_SIZE):
+        self.cell = cell
+        self.levels = {}  # level id (-1: none) -> _Grid
+        self.where = {}  # element id -> (level id, category id)
+        self.category_names = {}
+        self.built = None
+        self.build_ms = 0.0
+        self.updates = 0
+
+    def _add(self, el):
+        if not is_model_element(el) or isinstance(el, (DB.Level, DB.Grid)):
+            return
+        box = world_box(el)
+        if box is None:
+            return
+        eid = int(el.Id.IntegerValue)
+        level = element_level_id(el)
+        grid = self.levels.get(level)
+        if grid is None:
+            grid = self.levels[level] = _Grid(self.cell)
+        grid.insert(eid, box)
+        category = int(el.Category.Id.IntegerValue)
+        self.where[eid] = (level, category)
+        self.category_names[category] = el.Category.Name
+
+    def _remove(self, eid):
+        where = self.where.pop(eid, None)
+        if where is not None:
+            self.levels[where[0]].remove(eid)
+
+    def build(self, doc):
+        t0 = time.time()
+        for el in element_collector(doc, []):
+            self._add(el)
+        self.built = time.time()
+        self.build_ms = (self.built - t0) * 1000.0
+
+    def update(self, doc, ids):
+        for eid in ids:
+            self._remove(eid)
+            el = doc.GetElement(DB.ElementId(eid))
+            if el is not None:
+                self._add(el)
+        self.updates += len(ids)
+
+    def search(self, box, levels=None, categories=None, exclude=None):
+        """(id, element box) for indexed boxes overlapping box in XY and Z."""
+        out = []
+        grids = self.levels.items() if levels is None else [(lv, self.levels.get(lv)) for lv in levels]
+        for level, grid in grids:
+            if grid is None:
+                continue
+            for eid in grid.candidates(box[0], box[1], box[3], box[4]):
+                b = grid.boxes[eid]
+                if eid == exclude or b[0] > box[3] or b[3] < box[0] or b[1] > box[4] or b[4] < box[1]:
+                    continue
+                if b[2] > box[5] or b[5] < box[2]:
+                    continue
+                if categories is not None and self.where[eid][1] not in categories:
+                    continue
+                out.append((eid, b))
+        return out
+
+    def describe(self, eid, **extra):
+        level, category = self.where[eid]
+        row = {"id": eid, "category": self.category_names.get(category), "levelId": level if level != -1 else None}
+        row.update(extra)
+        return row
+
+    def stats(self):
+        return {"elements": len(self.where), "levels": len(self.levels), "cellSize": self.cell,
+                "buildMs": round(self.build_ms, 3), "updates": self.updates,
+                "large": sum(len(g.large) for g in self.levels.values())}
+
+
+def _on_event(event):
+    kind = event.get("type")
+    document = event.get("document")
+    with _lock:
+        if kind == "document_changed":
+            if event.get("truncated"):
+                _indexes.pop(document, None)
+                _pending.pop(document, None)
+            elif document in _indexes:
+                ids = _pending.setdefault(document, set())
+                ids.update(event.get("added") or ())
+                ids.update(event.get("modified") or ())
+                ids.update(event.get("deleted") or ())
+        elif kind == "document_closed":
+            _indexes.pop(document, None)
+            _pending.pop(document, None)
+
+
+events.listeners.append(_on_event)
+
+
+def index_for(doc):
+    """The document's index, built or brought up to date (call on Revit's thread)."""
+    title = doc.Title
+    with _lock:
+        index = _indexes.get(title)
+        pending = _pending.pop(title, None)
+    if index is None:
+        metrics.cache_miss("spatial_index")
+        index = _DocumentIndex()
+        with span("build_index"):
+            index.build(doc)
+        if events.installed:  # otherwise nothing would tell the index about changes
+            with _lock:
+                _indexes[title] = index
+                _pending.pop(title, None)  # the build read the current state
+        return index
+    metrics.cache_hit("spatial_index")
+    if pending:
+        index.update(doc, pending)
+    return index
+
+
+# ---------------------------------------------------------------- geometry
+
+def _point_box_distance(x, y, z, b):
+    dx = max(b[0] - x, 0.0, x - b[3])
+    dy = max(b[1] - y, 0.0, y - b[4])
+    dz = 0.0 if z is None else max(b[2] - z, 0.0, z - b[5])
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def _point_segment_distance(px, py, ax, ay, bx, by):
+    vx, vy = bx - ax, by - ay
+    denom = vx * vx + vy * vy
+    t = 0.0 if denom == 0.0 else max(0.0, min(1.0, ((px - ax) * vx + (py - ay) * vy) / denom))
+    dx, dy = ax + t * vx - px, ay + t * vy - py
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def _segments_cross(a, b, c, d):
+    def orient(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    return (orient(a, b, c) * orient(a, b, d) < 0) and (orient(c, d, a) * orient(c, d, b) < 0)
+
+
+def _segment_distance(a, b, c, d):
+    """XY distance between segments a-b and c-d."""
+    if _segments_cross(a, b, c, d):
+        return 0.0
+    return min(_point_segment_distance(a[0], a[1], c[0], c[1], d[0], d[1]),
+               _point_segment_distance(b[0], b[1], c[0], c[1], d[0], d[1]),
+               _point_segment_distance(c[0], c[1], a[0], a[1], b[0], b[1]),
+               _point_segment_distance(d[0], d[1], a[0], a[1], b[0], b[1]))
+
+
+def _trimmed(a, b, r):
+    """Segment a-b shortened by r at both ends, or None when nothing is left."""
+    length = math.hypot(b[0] - a[0], b[1] - a[1])
+    if length <= 2.0 * r:
+        return None
+    ux, uy = (b[0] - a[0]) / length * r, (b[1] - a[1]) / length * r
+    return (a[0] + ux, a[1] + uy), (b[0] - ux, b[1] - uy)
+
+
+def _wall_line(doc, eid):
+    """((x1, y1), (x2, y2), half width) of a straight wall, or None for anything else."""
+    el = doc.GetElement(DB.ElementId(eid))
+    if not isinstance(el, DB.Wall):
+        return None
+    curve = getattr(el.Location, "Curve", None)
+    if not isinstance(curve, DB.Line):
+        return None
+    p, q = curve.GetEndPoint(0), curve.GetEndPoint(1)
+    return (p.X, p.Y), (q.X, q.Y), getattr(el.WallType, "Width", 0.0) / 2.0
+
+
+def _wall_clash_distance(a, b, line, clearance):
+    """Face distance from segment a-b to an existing wall, or None when they only join.
+
+    The two meet at a join when, with either one shortened by the reach
+    (clearance plus the wall's half width) at its ends, they are apart: an
+    L corner, a T onto the wall or an in-line extension. Crossing or running
+    alongside within reach is a clash."""
+    c, d, half = line
+    reach = clearance + half
+    gap = _segment_distance(a, b, c, d)
+    if gap >= reach:
+        return gap - half
+    apart = reach - 1e-9  # trimmed ends land exactly at reach
+    new_inner, old_inner = _trimmed(a, b, reach), _trimmed(c, d, reach)
+    if (new_inner is None or _segment_distance(new_inner[0], new_inner[1], c, d) >= apart) or \
+            (old_inner is None or _segment_distance(a, b, old_inner[0], old_inner[1]) >= apart):
+        return None
+    return max(0.0, gap - half)
+
+
+def _segment_box_distance(ax, ay, bx, by, b):
+    """XY distance between segment a-b and box b (0 when they touch)."""
+    if (b[0] <= ax <= b[3] and b[1] <= ay <= b[4]) or (b[0] <= bx <= b[3] and b[1] <= by <= b[4]):
+        return 0.0
+    corners = ((b[0], b[1]), (b[3], b[1]), (b[3], b[4]), (b[0], b[4]))
+    for i in range(4):
+        if _segments_cross((ax, ay), (bx, by), corners[i], corners[(i + 1) % 4]):
+            return 0.0
+    d = min(_point_box_distance(ax, ay, None, b), _point_box_distance(bx, by, None, b))
+    for cx, cy in corners:
+        d = min(d, _point_segment_distance(cx, cy, ax, ay, bx, by))
+    return d
+
+
+# ---------------------------------------------------------------- queries
+
+def _category_ids(names):
+    if not names:
+        return None
+    return set(int(category_from_name(n)) for n in names)
+
+
+def _level_ids(doc, data):
+    """[level id] from "levelId" or "level" (name), or None for every level."""
+    if data.get("levelId") is not None:
+        return [int(data["levelId"])]
+    if data.get("level"):
+        level = find_level_by_name(doc, data["level"])
+        if level is None:
+            raise QueryError("Level not found: %s" % data["level"])
+        return [int(level.Id.IntegerValue)]
+    return None
+
+
+def nearby(index, x, y, z, radius, levels=None, categories=None):
+    """[(distance, id)] of boxes within radius of (x, y[, z]), nearest first."""
+    zr = (-1e30, 1e30) if z is None else (z - radius, z + radius)
+    box = (x - radius, y - radius, zr[0], x + radius, y + radius, zr[1])
+    found = []
+    for eid, b in index.search(box, levels, categories):
+        d = _point_box_distance(x, y, z, b)
+        if d <= radius:
+            found.append((d, eid))
+    found.sort()
+    return found
+
+
+def clashes_at_point(doc, x, y, levels, categories, clearance):
+    """Elements within clearance of (x, y) on the given levels, as rows for a response."""
+    index = index_for(doc)
+    return [index.describe(eid, distance=round(d, 6))
+            for d, eid in nearby(index, x, y, None, clearance, levels, categories)]
+
+
+def clashes_along(doc, x1, y1, x2, y2, levels, categories, clearance):
+    """Elements within clearance of the segment (x1, y1)-(x2, y2) on the given levels.
+
+    Straight walls the segment only joins at its ends are not clashes."""
+    index = index_for(doc)
+    box = (min(x1, x2) - clearance, min(y1, y2) - clearance, -1e30,
+           max(x1, x2) + clearance, max(y1, y2) + clearance, 1e30)
+    out = []
+    for eid, b in index.search(box, levels, categories):
+        line = _wall_line(doc, eid)
+        if line is not None:
+            d = _wall_clash_distance((x1, y1), (x2, y2), line, clearance)
+            if d is None:
+                continue
+        else:
+            d = _segment_box_distance(x1, y1, x2, y2, b)
+        if d <= clearance:
+            out.append(index.describe(eid, distance=round(d, 6)))
+    out.sort(key=lambda r: r["distance"])
+    return out
+
+
+def clash_settings(data, default_categories):
+    """(enabled, category ids, clearance) from a placement request's clashCheck options."""
+    if not data.get("clashCheck"):
+        return False, None, 0.0
+    names = data.get("clashCategories") or default_categories
+    return True, _category_ids(names), float(data.get("clearance", 0.0))
+
+
+def register_routes(api):
+    @api.route("/spatial/nearby/", methods=["POST"])
+    def spatial_nearby(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/spatial/nearby/", data)
+        try:
+            if data.get("x") is None or data.get("y") is None:
+                return err("x and y are required", 400)
+            x, y = float(data["x"]), float(data["y"])
+            z = float(data["z"]) if data.get("z") is not None else None
+            radius = float(data.get("radius", DEFAULT_RADIUS))
+            limit = min(int(data.get("limit") or DEFAULT_LIMIT), MAX_LIMIT)
+            levels = _level_ids(doc, data)
+            categories = _category_ids(data.get("categories"))
+            index = index_for(doc)
+            t0 = time.time()
+            with span("query"):
+                found = nearby(index, x, y, z, radius, levels, categories)
+            query_us = (time.time() - t0) * 1e6
+            rows = [index.describe(eid, distance=round(d, 6)) for d, eid in found[:limit]]
+            return ok({"elements": rows, "count": len(rows), "total": len(found),
+                       "queryUs": round(query_us, 1), "index": index.stats()})
+        except (QueryError, ValueError) as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
+
+    @api.route("/spatial/overlaps/", methods=["POST"])
+    def spatial_overlaps(doc, request):
+        data = request_data(request)
+        log_api_call("POST", "/spatial/overlaps/", data)
+        try:
+            tolerance = float(data.get("tolerance", 0.0))
+            levels = _level_ids(doc, data)
+            categories = _category_ids(data.get("categories"))
+            index = index_for(doc)
+            exclude = None
+            if data.get("elementId") is not None:
+                exclude = int(data["elementId"])
+                el = doc.GetElement(DB.ElementId(exclude))
+                box = world_box(el) if el is not None else None
+                if box is None:
+                    return err("Element not found or has no bounding box", 404)
+            elif data.get("min") and data.get("max"):
+                box = tuple(float(v) for v in list(data["min"])[:3] + list(data["max"])[:3])
+                if len(box) != 6:
+                    return err("min and max need [x, y, z]", 400)
+            else:
+                return err("elementId or min/max is required", 400)
+            box = (box[0] - tolerance, box[1] - tolerance, box[2] - tolerance,
+                   box[3] + tolerance, box[4] + tolerance, box[5] + tolerance)
+            limit = min(int(data.get("limit") or DEFAULT_LIMIT), MAX_LIMIT)
+            t0 = time.time()
+            with span("query"):
+                found = sorted(eid for eid, _ in index.search(box, levels, categories, exclude))
+            query_us = (time.time() - t0) * 1e6
+            rows = [index.describe(eid) for eid in found[:limit]]
+            return ok({"elements": rows, "count": len(rows), "total": len(found),
+                       "queryUs": round(query_us, 1), "index": index.stats()})
+        except (QueryError, ValueError) as ex:
+            return err(ex, 400)
+        except Exception as ex:
+            return err(ex)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Per-request tracing spans written as JSONL.
+
+log_api_call() opens the root span of a request and ok()/err() close it;
+nested spans come from span() blocks and @traced helpers (parse, lookup,
+collect, transaction, commit, serialize). One JSON line is written per
+request to a rotating file; summarize it with revit_mcp/trace_report.py.
+
+Set REVIT_MCP_TRACE=0 to turn tracing off.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from datetime import datetime
+
+TRACE_FILE = r"C:\Users\m170488\AppData\Roaming\pyRevit\Extensions\revit_mcp_traces.jsonl"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+ENABLED = os.environ.get("REVIT_MCP_TRACE", "1") != "0"
+
+_local = threading.local()
+_writer = {"logger": None}
+
+
+def _trace_logger():
+    lg = _writer["logger"]
+    if lg is None:
+        lg = logging.getLogger("revit_mcp.trace")
+        lg.setLevel(logging.INFO)
+        lg.propagate = False
+        handler = logging.handlers.RotatingFileHandler(TRACE_FILE, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        lg.addHandler(handler)
+        _writer["logger"] = lg
+    return lg
+
+
+def record_parse(t0, t1):
+    """Remember a request body parse that happened before the trace began."""
+    if ENABLED:
+        _local.pending_parse = (t0, t1)
+
+
+def begin_trace(route):
+    if not ENABLED:
+        return
+    now = time.time()
+    spans = []
+    parse = getattr(_local, "pending_parse", None)
+    _local.pending_parse = None
+    if parse is not None:
+        spans.append({"name": "parse", "parent": None, "start": parse[0], "end": parse[1]})
+        now = min(now, parse[0])
+    _local.trace = {"route": route, "start": now, "spans": spans, "stack": []}
+
+
+class span(object):
+    """Context manager timing a nested span of the current request."""
+    __slots__ = ("name", "attrs", "_rec", "_trace")
+
+    def __init__(self, span_name, **attrs):
+        self.name = span_name
+        self.attrs = attrs
+        self._rec = None
+        self._trace = None
+
+    def __enter__(self):
+        t = getattr(_local, "trace", None) if ENABLED else None
+        if t is not None:
+            stack = t["stack"]
+            self._rec = {"name": self.name, "parent": stack[-1] if stack else None, "start": time.time()}
+            if self.attrs:
+                self._rec["attrs"] = self.attrs
+            stack.append(len(t["spans"]))
+            t["spans"].append(self._rec)
+            self._trace = t
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._rec is not None:
+            self._rec["end"] = time.time()
+            if exc_type is not None:
+                self._rec["error"] = exc_type.__name__
+            stack = self._trace["stack"]
+            if stack:
+                stack.pop()
+        return False
+
+
+def traced(name):
+    """Decorator recording each call of a helper as a span."""
+    def deco(fn):
+        def wrapper(*args, **kwargs):
+            with span(name, fn=fn.__name__):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return deco
+
+
+def end_trace(status):
+    t = getattr(_local, "trace", None)
+    if t is None:
+        return
+    _local.trace = None
+    end = time.time()
+    t0 = t["start"]
+    spans = []
+    for s in t["spans"]:
+        out = {
+            "name": s["name"],
+            "parent": s["parent"],
+            "startMs": round((s["start"] - t0) * 1000.0, 3),
+            "durationMs": round((s.get("end", end) - s["start"]) * 1000.0, 3),
+        }
+        if "attrs" in s:
+            out["attrs"] = s["attrs"]
+        if "error" in s:
+            out["error"] = s["error"]
+        spans.append(out)
+    record = {
+        "ts": datetime.fromtimestamp(t0).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3],
+        "route": t["route"],
+        "status": status,
+        "durationMs": round((end - t0) * 1000.0, 3),
+        "spans": spans,
+    }
+    try:
+        _trace_logger().info(json.dumps(record, default=str))
+    except Exception:
+        pass  # Tracing must never break a route
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
+import time
 import traceback
 from datetime import datetime
 
 from pyrevit import DB, revit, routes
 
+from revit_mcp import cancellation, metrics, profiler, tracing
+
 LOG_FILE = r"C:\Users\m170488\AppData\Roaming\pyRevit\Extensions\revit_routes.log"
 
 logger = logging.getLogger("revit_mcp.routes")
@@ -81,14 +85,26 @@ def _sanitize_for_json(obj):
         return obj
 
 
+def _duration_header():
+    """Time spent in Revit so far, so clients can tell it apart from network time."""
+    ms = metrics.current_elapsed_ms()
+    return {"X-Revit-Duration-Ms": "%.3f" % ms} if ms is not None else None
+
+
 def ok(data):
     """Return successful response with UTF-8 safe data."""
     _write_to_log("ok() [called with data: %s]" % str(data))
     try:
         # Always sanitize to handle Unicode properly
-        safe_data = _sanitize_for_json(data)
-        _write_to_log("ok() [after sanitization: %s]" % str(safe_data))
-        return routes.make_response(data=safe_data, status=200)
+        with tracing.span("serialize"):
+            safe_data = _sanitize_for_json(data)
+            _write_to_log("ok() [after sanitization: %s]" % str(safe_data))
+            response = routes.make_response(data=safe_data, status=200, headers=_duration_header())
+        profiler.end()
+        cancellation.end()
+        metrics.end_request(200)
+        tracing.end_trace(200)
+        return response
     except Exception as e:
         _write_to_log("ERROR in ok(): %s" % str(e))
         import traceback
@@ -96,10 +112,40 @@ def ok(data):
         return err(e)
 
 
+def request_data(request):
+    """Parse the JSON body of a request (timed as the trace's parse span)."""
+    t0 = time.time()
+    data = request.data if isinstance(request.data, dict) else json.loads(request.data or "{}")
+    tracing.record_parse(t0, time.time())
+    cancellation.begin(request_header(request, "X-MCP-Request-Id"))
+    return data
+
+
+def request_header(request, name):
+    """Header value by case-insensitive name, or None."""
+    headers = getattr(request, "headers", None) or {}
+    try:
+        value = headers.get(name)
+        if value is None:
+            wanted = name.lower()
+            value = next((v for k, v in headers.items() if k.lower() == wanted), None)
+        return value
+    except Exception:
+        return None
+
+
+# Routes call this between batch items so a cancelled request stops early.
+check_cancelled = cancellation.check
+
+
 def log_api_call(method, endpoint, payload=None):
     """Log API calls."""
     msg = "API CALL %s %s" % (method, endpoint)
     _write_to_log(msg)
+    key = metrics.route_key(method, endpoint)
+    metrics.begin_request(method, endpoint)
+    tracing.begin_trace(key)
+    profiler.begin(key)
 
 
 def err(message, status=500):
@@ -133,24 +179,63 @@ def err(message, status=500):
     
     # Return simple, safe error response
     payload = {"ok": False, "error": str(message)}
-    return routes.make_response(data=payload, status=status)
+    if isinstance(message, cancellation.Cancelled):
+        status = 499  # client closed request
+        payload["cancelled"] = True
+    headers = _duration_header()  # before end_request clears the current request
+    profiler.end()
+    cancellation.end()
+    metrics.end_request(status)
+    tracing.end_trace(status)
+    return routes.make_response(data=payload, status=status, headers=headers)
 
 class Tx(object):
     def __init__(self, doc, name):
         self.doc = doc
         self.name = name
         self._t = None
+        self._span = None
     def __enter__(self):
+        cancellation.check()  # cancelled before it started: never touch the model
+        self._span = tracing.span("transaction", name=self.name)
+        self._span.__enter__()
         self._t = DB.Transaction(self.doc, self.name)
         self._t.Start()
         return self._t
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                with tracing.span("commit"):
+                    self._t.Commit()
+                metrics.count_transaction(True)
+            else:
+                if self._t.HasStarted() and not self._t.HasEnded():
+                    self._t.RollBack()
+                    metrics.count_transaction(False)
+        finally:
+            self._span.__exit__(exc_type, exc, tb)
+
+class TxGroup(object):
+    """Transaction group assimilated into a single undo step on success."""
+    def __init__(self, doc, name):
+        self.doc = doc
+        self.name = name
+        self._g = None
+    def __enter__(self):
+        cancellation.check()
+        self._g = DB.TransactionGroup(self.doc, self.name)
+        self._g.Start()
+        return self._g
     def __exit__(self, exc_type, exc, tb):
         if exc_type is None:
-            self._t.Commit()
+            self._g.Assimilate()
+            metrics.count_transaction(True, group=True)
         else:
-            if self._t.HasStarted() and not self._t.HasEnded():
-                self._t.RollBack()
+            if self._g.HasStarted() and not self._g.HasEnded():
+                self._g.RollBack()
+                metrics.count_transaction(False, group=True)
 
+@tracing.traced("lookup")
 def find_level_by_name(doc, name):
     it = DB.FilteredElementCollector(doc).OfClass(DB.Level)
     # Ensure name is unicode for proper comparison with .NET strings
@@ -171,6 +256,7 @@ def find_level_by_name(doc, name):
             return lvl
     return None
 
+@tracing.traced("lookup")
 def find_type_by_name(doc, bic, typename):
     it = DB.FilteredElementCollector(doc)\
         .OfCategory(bic)\
@@ -199,6 +285,7 @@ def find_type_by_name(doc, bic, typename):
             return t
     return None
 
+@tracing.traced("lookup")
 def find_rebar_bar_type_by_name(doc, name):
     if isinstance(name, str):
         try:
@@ -217,6 +304,7 @@ def find_rebar_bar_type_by_name(doc, name):
             return t
     return None
 
+@tracing.traced("lookup")
 def find_rebar_shape_by_name(doc, name):
     if isinstance(name, str):
         try:
@@ -243,6 +331,31 @@ def ensure_plane_for_line(p1, p2):
     p3 = DB.XYZ(p1.X + seed.X, p1.Y + seed.Y, p1.Z + seed.Z)
     return DB.Plane.CreateByThreePoints(p1, p2, p3)
 
+def plane_for_points(xyz):
+    """Plane through the first three non-collinear points, else through the first segment."""
+    if len(xyz) > 2:
+        p0 = xyz[0]
+        for i in range(1, len(xyz) - 1):
+            d1 = xyz[i] - p0
+            if d1.GetLength() < 1e-9:
+                continue
+            for j in range(i + 1, len(xyz)):
+                if d1.CrossProduct(xyz[j] - p0).GetLength() > 1e-9:
+                    return DB.Plane.CreateByThreePoints(p0, xyz[i], xyz[j])
+            break
+    return ensure_plane_for_line(xyz[0], xyz[-1])
+
+def curve_from_spec(spec):
+    """Build a DB curve from {"type": "line"|"arc", "points": [[x,y,z], ...]}."""
+    pts = [DB.XYZ(float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0) for p in spec["points"]]
+    kind = spec.get("type", "line")
+    if kind == "line" and len(pts) == 2:
+        return DB.Line.CreateBound(pts[0], pts[1])
+    if kind == "arc" and len(pts) == 3:
+        # points = [start, point on arc, end]
+        return DB.Arc.Create(pts[0], pts[2], pts[1])
+    raise ValueError("Unsupported curve spec: %s with %d points" % (kind, len(pts)))
+
 def active_uidoc():
     return revit.uidoc
 
@@ -299,6 +412,20 @@ def get_detail_view_validation(view):
         pass
     return {"canDrawDetailLine": False, "reason": reason, "viewType": vt_str}
 
+# Last active view validation, keyed by view UniqueId. A different active
+# view replaces the entry, so switching views invalidates it.
+_view_validation = {"key": None, "info": None}
+
+def cached_detail_view_validation(view):
+    key = getattr(view, "UniqueId", None) if view is not None else None
+    if key is None or key != _view_validation["key"]:
+        metrics.cache_miss("detailViewValidation")
+        _view_validation["key"] = key
+        _view_validation["info"] = get_detail_view_validation(view)
+    else:
+        metrics.cache_hit("detailViewValidation")
+    return dict(_view_validation["info"])
+
 def _deprecated_log_request(func):
     # Kept to avoid accidental import breaks; prefer the top decorator above
     return func
@@ -10,10 +10,19 @@ from pyrevit import routes
 # from PyRevit
 # Import and register all route modules
 from revit_mcp.catalog import register_routes as _cat
+from revit_mcp.debug import register_routes as _debug
 from revit_mcp.elements import register_routes as _ele
 from revit_mcp.families import register_routes as _fam
 from revit_mcp.geometry import register_routes as _geom
+from revit_mcp.parameters import register_routes as _params
+from revit_mcp.query import register_routes as _query
 from revit_mcp.routes_core import register_routes as _core
+from revit_mcp.snapshot import register_routes as _snapshot
+from revit_mcp.spatial import register_routes as _spatial
+from revit_mcp.layout import register_routes as _layout
+from revit_mcp.grids import register_routes as _grids
+from revit_mcp.framing import register_routes as _framing
+from revit_mcp.rebar import register_routes as _rebar
 
 # --------- logging (file) ----------
 logger = logging.getLogger("revit_mcp.routes")
@@ -36,6 +45,25 @@ try:
     _ele(api)
     _cat(api)
     _fam(api)
+    _debug(api)
+    _query(api)
+    _params(api)
+    _snapshot(api)
+    _spatial(api)
+    _layout(api)
+    _grids(api)
+    _framing(api)
+    _rebar(api)
 except Exception as e:
     logger.error("Failed to register Revit MCP routes: %s" % str(e))
-    raise
\ No newline at end of file
+    raise
+
+# --------- change events: http://127.0.0.1:48885/events (SSE) ----------
+try:
+    from pyrevit import HOST_APP
+    from revit_mcp import events
+
+    events.install(HOST_APP.uiapp)
+    events.start_stream_server()
+except Exception as e:
+    logger.error("Failed to start Revit MCP event stream: %s" % str(e))
\ No newline at end of file
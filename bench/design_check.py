@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Check the NBR 6118 column design engine (revit_mcp/nbr6118.py).
+
+Checks:
+
+1. hand-worked columns (20x20 / 40x60 cm, a 40 cm circular column, an
+   undersized 15x15 cm column) give the expected steel and layout;
+2. every designed column meets the rules it claims to (As,min <= As <= As,max,
+   bar size, clear and maximum spacing, stirrup size and spacing);
+3. the NumPy and pure-Python paths give identical results;
+4. timing of both paths on --columns random columns.
+
+Usage:
+    python bench/design_check.py [--columns 10000]
+
+Exits 1 if a check fails.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+import harness
+
+sys.path.append(os.path.join(harness.ROOT, "revit_mcp"))
+import nbr6118  # noqa: E402  (the MCP server's module)
+
+HAND = [
+    ({"id": "C1", "b": 0.2, "h": 0.2, "fck": 30, "nd": 500},
+     {"status": "ok", "bars": 4, "barDiameter": 10.0, "asMin": 1.725, "stirrupSpacing": 0.12}),
+    ({"id": "C3", "b": 0.4, "h": 0.6, "fck": 30, "nd": 2500},
+     {"status": "ok", "bars": 8, "barDiameter": 12.5, "asMin": 9.6, "barsPerFace": [2, 4], "crossTies": True}),
+    ({"id": "P1", "diameter": 0.4, "fck": 30, "nd": 3000},
+     {"status": "ok", "shape": "circular", "bars": 14, "barDiameter": 12.5}),
+    ({"id": "X", "b": 0.15, "h": 0.15, "fck": 20, "nd": 2000},
+     {"status": "exceedsAsMax"}),
+]
+
+
+def _random_columns(n, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        c = {"id": i, "fck": rng.choice([20, 25, 30, 35, 40, 50]), "nd": rng.uniform(50, 9000),
+             "cover": rng.choice([0.025, 0.03, 0.04])}
+        if i % 5 == 0:
+            c["diameter"] = rng.choice([0.25, 0.3, 0.4, 0.5, 0.6])
+        else:
+            c["b"], c["h"] = rng.choice([0.14, 0.19, 0.2, 0.25, 0.3, 0.4]), rng.choice([0.2, 0.3, 0.4, 0.6, 0.8, 1.0])
+        out.append(c)
+    return out
+
+
+def _violations(col, res):
+    """Rules a designed column breaks (empty when it is fine)."""
+    bad = []
+    phi, phi_t = res["barDiameter"], res["stirrupDiameter"]
+    b_min = 1000.0 * (col.get("diameter") or min(col["b"], col["h"]))
+    if not res["asRequired"] <= res["asProvided"] <= res["asMax"] + 1e-9:
+        bad.append("As")
+    if not 10.0 <= phi <= b_min / 8.0:
+        bad.append("phi_l")
+    clear_min = max(20.0, phi, 1.2 * 19.0)
+    s_max = min(2.0 * b_min, 400.0)
+    for s in res["barSpacing"]:
+        if s - phi < clear_min - 0.05 or s > s_max + 0.05:
+            bad.append("spacing")
+    if phi_t < max(5.0, phi / 4.0):
+        bad.append("phi_t")
+    if res["stirrupSpacing"] * 1000.0 > min(200.0, b_min, 12.0 * phi) + 1e-6:
+        bad.append("s_t")
+    if res["bars"] < (6 if "diameter" in col else 4):
+        bad.append("count")
+    if abs(res["bars"] * math.pi * phi * phi / 400.0 - res["asProvided"]) > 0.01:
+        bad.append("As provided")
+    return bad
+
+
+def run(count):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    designed = nbr6118.design([c for c, _ in HAND])["columns"]
+    for (col, expected), res in zip(HAND, designed):
+        got = dict((k, res.get(k)) for k in expected)
+        check("hand example %s" % col["id"], got == expected, got)
+    check("detailing payload", designed[0]["detailing"]["barType"] == u"Ø10 CA50"
+          and designed[0]["detailing"]["barsX"] == 2 and "detailing" not in designed[3])
+
+    columns = _random_columns(count)
+    fast = nbr6118.design(columns, vectorized=True)
+    slow = nbr6118.design(columns, vectorized=False)
+    broken = [(c["id"], _violations(c, r)) for c, r in zip(columns, fast["columns"])
+              if r["status"] == "ok" and _violations(c, r)]
+    check("designed columns meet the rules", not broken, broken[:3] or fast["summary"]["byStatus"])
+    check("NumPy and pure Python agree", fast["columns"] == slow["columns"])
+    print("     %d columns: %s ms (NumPy: %s), %s ms pure Python"
+          % (count, fast["summary"]["ms"], fast["summary"]["vectorized"], slow["summary"]["ms"]))
+
+    try:
+        nbr6118.design([{"b": 0.2, "fck": 30, "nd": 100}])
+        check("missing h -> DesignError", False)
+    except nbr6118.DesignError as ex:
+        check("missing h -> DesignError", True, ex)
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--columns", type=int, default=10000)
+    args = ap.parse_args()
+    return 0 if run(args.columns) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
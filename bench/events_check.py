@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Check the change event stream end to end against a local stand-in.
+
+Runs the extension's SSE server (RevitMCP.extension/revit_mcp/events.py) on
+a free port, publishes events the way Revit's handlers would, and subscribes
+with the MCP server's EventStream/ReadCache (revit_mcp/events.py). Checks:
+
+1. the cache turns live once the stream is up, and a change drops only the
+   entries it affects;
+2. nothing is served from the cache while the stream is down;
+3. after a dropped connection the client resumes with Last-Event-ID and
+   receives the events published meanwhile, without a reset;
+4. when more events were missed than the buffer holds, or Revit restarted
+   (new epoch), the client gets "reset" and clears the cache;
+5. a level edit in a non-English Revit (localized category name) still
+   drops /levels/: events carry category ids.
+
+Usage:
+    python bench/events_check.py
+
+Needs httpx. Exits 1 if a check fails.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import harness
+import model
+from revit_mcp import events as feed
+
+sys.path.append(os.path.join(harness.ROOT, "revit_mcp"))
+import events as client  # noqa: E402  (the MCP server's module)
+
+BASE = "http://127.0.0.1:48884/revit_mcp"
+
+
+class _Ids(list):
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _Changed(object):
+    """DocumentChangedEventArgs stand-in."""
+
+    def __init__(self, doc, modified):
+        self._doc, self._modified = doc, modified
+        self.Operation = "TransactionCommitted"
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetAddedElementIds(self):
+        return _Ids()
+
+    def GetModifiedElementIds(self):
+        return _Ids(self._modified)
+
+    def GetDeletedElementIds(self):
+        return _Ids()
+
+    def GetTransactionNames(self):
+        return ["MCP: test"]
+
+
+def _changed(**data):
+    data.setdefault("added", [])
+    data.setdefault("modified", [1])
+    data.setdefault("deleted", [])
+    data.setdefault("categories", [])
+    data.setdefault("elementTypes", False)
+    data.setdefault("truncated", False)
+    return feed.publish("document_changed", document="Fake Project", transactions=["MCP: test"], **data)
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+def _fill(cache):
+    gen = cache.generation
+    cache.put(BASE + "/levels/", {"levels": []}, gen)
+    cache.put(BASE + "/types/", {"walls": []}, gen)
+
+
+async def run():
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    server = feed.start_stream_server(port=0)
+    port = server.server_address[1]
+    cache = client.ReadCache()
+    stream = client.EventStream("http://127.0.0.1:%d/events" % port, cache)
+    stream.ensure_started()
+    levels, types = BASE + "/levels/", BASE + "/types/"
+
+    check("stream connects and cache turns live", await _until(lambda: cache.live))
+    _fill(cache)
+    _changed(categories=[client.OST_WALLS])
+    await _until(lambda: stream.last_id == feed.last_id())
+    check("unrelated change keeps entries", cache.get(levels) is not None and cache.get(types) is not None)
+    _changed(categories=[client.OST_LEVELS])
+    await _until(lambda: cache.get(levels) is None)
+    check("level change drops /levels/ only", cache.get(levels) is None and cache.get(types) is not None)
+
+    # 3. drop the connection, publish while down, come back on the same port
+    _fill(cache)
+    feed.stop_stream_server(server)
+    check("cache bypassed while stream is down", await _until(lambda: cache.get(types) is None))
+    missed = [_changed(categories=[client.OST_WALLS]), _changed(categories=[client.OST_LEVELS]), _changed(elementTypes=True)]
+    resets = stream.snapshot()["resets"]
+    server = feed.start_stream_server(port=port)
+    check("reconnects", await _until(lambda: cache.live, timeout=15.0))
+    check("resumes with Last-Event-ID", stream.last_id == missed[-1]["id"] and stream.snapshot()["resets"] == resets,
+          "last %s" % stream.last_id)
+    check("missed changes invalidated entries", cache.get(levels) is None and cache.get(types) is None)
+
+    # 4a. more missed events than the buffer holds
+    _fill(cache)
+    feed.stop_stream_server(server)
+    await _until(lambda: not cache.live)
+    for _ in range(feed.BUFFER_SIZE + 10):
+        _changed(categories=[client.OST_WALLS])
+    server = feed.start_stream_server(port=port)
+    await _until(lambda: cache.live, timeout=15.0)
+    check("buffer overflow -> reset", stream.snapshot()["resets"] == resets + 1 and cache.get(types) is None)
+
+    # 4b. Revit restarted: new epoch
+    _fill(cache)
+    feed.stop_stream_server(server)
+    await _until(lambda: not cache.live)
+    feed._buffer.clear()  # a fresh Revit session: empty buffer, new epoch
+    feed._seq[0] = 0
+    feed.EPOCH = "restarted"
+    server = feed.start_stream_server(port=port)
+    await _until(lambda: cache.live, timeout=15.0)
+    check("new epoch -> reset", stream.snapshot()["resets"] == resets + 2 and cache.get(levels) is None,
+          "now at %s" % stream.last_id)
+
+    # 5. Portuguese Revit: the level's category is "Níveis"
+    doc, _ = model.build_model(10)
+    level = [lv for lv in model.DB.FilteredElementCollector(doc).OfClass(model.DB.Level)][0]
+    level.Category.Name = u"Níveis"
+    _fill(cache)
+    feed._on_document_changed(None, _Changed(doc, [level.Id]))
+    check("localized level change drops /levels/", await _until(lambda: cache.get(levels) is None),
+          feed._buffer[-1][1]["categories"] if feed._buffer else None)
+    level.Category.Name = "Levels"
+
+    stream._task.cancel()
+    feed.stop_stream_server(server)
+    print(stream.snapshot())
+    return all(checks)
+
+
+def main():
+    return 0 if asyncio.run(run()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
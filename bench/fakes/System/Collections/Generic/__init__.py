@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+
+class _List(list):
+    def Add(self, item):
+        self.append(item)
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _Generic(object):
+    def __init__(self, cls):
+        self._cls = cls
+
+    def __getitem__(self, item_type):
+        return self._cls
+
+    def __call__(self, *args):
+        return self._cls(*args)
+
+
+List = _Generic(_List)
+Dictionary = _Generic(dict)
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+"""Minimal stand-in for the .NET System namespace used by the route modules."""
+String = str
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Fake pyRevit package for running the route modules outside Revit (see bench/)."""
+from pyrevit import db as DB
+from pyrevit import revit, routes
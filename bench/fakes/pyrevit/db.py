@@ -0,0 +1,1251 @@
+# -*- coding: utf-8 -*-
+"""In-memory stand-in for the parts of Autodesk.Revit.DB the route modules use.
+
+Only behaviour the routes depend on is modelled: element storage and lookup,
+quick filters on FilteredElementCollector, transactions that must be open to
+modify the document, and enough geometry (XYZ, lines, arcs, planes) to build
+curves. Nothing here tries to reproduce Revit's own cost.
+"""
+import enum
+import math
+import types
+
+
+class InvalidOperationException(Exception):
+    pass
+
+
+class ArgumentException(Exception):
+    pass
+
+
+# ---------------------------------------------------------------- enums
+
+class BuiltInCategory(enum.IntEnum):
+    INVALID = -1
+    OST_Walls = -2000011
+    OST_Windows = -2000014
+    OST_Doors = -2000023
+    OST_Lines = -2000051
+    OST_Levels = -2000240
+    OST_Grids = -2000220
+    OST_Views = -2000279
+    OST_SketchLines = -2000045
+    OST_StructuralFraming = -2001320
+    OST_StructuralColumns = -2001330
+    OST_Rebar = -2009000
+
+
+class BuiltInParameter(enum.IntEnum):
+    INVALID = -1
+    ALL_MODEL_MARK = -1001203
+    ALL_MODEL_TYPE_COMMENTS = -1010103
+    ALL_MODEL_INSTANCE_COMMENTS = -1010106
+    HOST_AREA_COMPUTED = -1012805
+    HOST_VOLUME_COMPUTED = -1012806
+    CURVE_ELEM_LENGTH = -1004005
+    WALL_USER_HEIGHT_PARAM = -1001300
+    STRUCTURAL_MATERIAL_TYPE = -1001000
+    LEVEL_ELEV = -1007000
+    INSTANCE_REFERENCE_LEVEL_PARAM = -1001383
+    REBAR_ELEM_LENGTH = -1018902
+    REBAR_ELEM_TOTAL_LENGTH = -1018911
+    REBAR_ELEM_QUANTITY_OF_BARS = -1018906
+    REBAR_BAR_DIAMETER = -1018903
+
+
+class ViewType(enum.IntEnum):
+    Undefined = 0
+    FloorPlan = 1
+    CeilingPlan = 2
+    Elevation = 3
+    ThreeD = 4
+    Schedule = 5
+    DrawingSheet = 6
+    ProjectBrowser = 7
+    Report = 8
+    DraftingView = 10
+    Legend = 11
+    EngineeringPlan = 115
+    Section = 117
+    Detail = 118
+    Internal = 214
+
+
+class StorageType(enum.IntEnum):
+    None_ = 0
+    Integer = 1
+    Double = 2
+    String = 3
+    ElementId = 4
+
+
+# ---------------------------------------------------------------- geometry
+
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, o):
+        return XYZ(self.X + o.X, self.Y + o.Y, self.Z + o.Z)
+
+    def __sub__(self, o):
+        return XYZ(self.X - o.X, self.Y - o.Y, self.Z - o.Z)
+
+    def __mul__(self, k):
+        return XYZ(self.X * k, self.Y * k, self.Z * k)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def __repr__(self):
+        return "(%g, %g, %g)" % (self.X, self.Y, self.Z)
+
+    def Add(self, o):
+        return self + o
+
+    def Subtract(self, o):
+        return self - o
+
+    def Multiply(self, k):
+        return self * k
+
+    def GetLength(self):
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def DistanceTo(self, o):
+        return (self - o).GetLength()
+
+    def DotProduct(self, o):
+        return self.X * o.X + self.Y * o.Y + self.Z * o.Z
+
+    def CrossProduct(self, o):
+        return XYZ(self.Y * o.Z - self.Z * o.Y, self.Z * o.X - self.X * o.Z, self.X * o.Y - self.Y * o.X)
+
+    def Normalize(self):
+        n = self.GetLength()
+        return XYZ(self.X / n, self.Y / n, self.Z / n) if n else XYZ()
+
+    def IsAlmostEqualTo(self, o, tol=1e-9):
+        return self.DistanceTo(o) <= tol
+
+
+XYZ.Zero = XYZ(0, 0, 0)
+XYZ.BasisX = XYZ(1, 0, 0)
+XYZ.BasisY = XYZ(0, 1, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class Curve(object):
+    def GetEndPoint(self, i):
+        return self._ends[i]
+
+    @property
+    def Length(self):
+        return self._length()
+
+
+class Line(Curve):
+    def __init__(self, p, q):
+        self._ends = (p, q)
+
+    @staticmethod
+    def CreateBound(p, q):
+        if p.DistanceTo(q) < 1e-9:
+            raise ArgumentException("Curve length is too small for Revit's tolerance")
+        return Line(p, q)
+
+    @property
+    def Direction(self):
+        return (self._ends[1] - self._ends[0]).Normalize()
+
+    def _length(self):
+        return self._ends[0].DistanceTo(self._ends[1])
+
+
+class Arc(Curve):
+    def __init__(self, p0, p1, mid):
+        self._ends = (p0, p1)
+        self._mid = mid
+        a = p0.DistanceTo(mid)
+        b = mid.DistanceTo(p1)
+        c = p0.DistanceTo(p1)
+        area2 = (mid - p0).CrossProduct(p1 - p0).GetLength()
+        if area2 < 1e-12:
+            raise ArgumentException("Points are collinear")
+        self.Radius = a * b * c / (2.0 * area2)
+        self._chord = c
+        self._mid_chord = (a, b)
+
+    @staticmethod
+    def Create(end0, end1, point_on_arc):
+        return Arc(end0, end1, point_on_arc)
+
+    def _length(self):
+        r = self.Radius
+        a, b = self._mid_chord
+        return 2.0 * r * (math.asin(min(1.0, a / (2.0 * r))) + math.asin(min(1.0, b / (2.0 * r))))
+
+
+class CurveArray(object):
+    def __init__(self):
+        self._items = []
+
+    def Append(self, c):
+        self._items.append(c)
+
+    @property
+    def Size(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Plane(object):
+    def __init__(self, normal, origin):
+        self.Normal = normal
+        self.Origin = origin
+
+    @staticmethod
+    def CreateByNormalAndOrigin(normal, origin):
+        return Plane(normal.Normalize(), origin)
+
+    @staticmethod
+    def CreateByThreePoints(p0, p1, p2):
+        n = (p1 - p0).CrossProduct(p2 - p0)
+        if n.GetLength() < 1e-12:
+            raise ArgumentException("Points are collinear")
+        return Plane(n.Normalize(), p0)
+
+
+class Transform(object):
+    def __init__(self, origin=None, basis_x=None, basis_y=None, basis_z=None):
+        self.Origin = origin or XYZ()
+        self.BasisX = basis_x or XYZ.BasisX
+        self.BasisY = basis_y or XYZ.BasisY
+        self.BasisZ = basis_z or XYZ.BasisZ
+
+    def OfVector(self, v):
+        return self.BasisX * v.X + self.BasisY * v.Y + self.BasisZ * v.Z
+
+    def OfPoint(self, p):
+        return self.OfVector(p) + self.Origin
+
+    @property
+    def Inverse(self):
+        """Orthonormal bases only, as for family instances."""
+        bx, by, bz = self.BasisX, self.BasisY, self.BasisZ
+        inv = Transform(XYZ(), XYZ(bx.X, by.X, bz.X), XYZ(bx.Y, by.Y, bz.Y), XYZ(bx.Z, by.Z, bz.Z))
+        inv.Origin = inv.OfVector(self.Origin) * -1.0
+        return inv
+
+    @property
+    def IsIdentity(self):
+        o = self.Origin
+        return o.X == 0.0 and o.Y == 0.0 and o.Z == 0.0 and \
+            self.BasisX.IsAlmostEqualTo(XYZ.BasisX) and self.BasisY.IsAlmostEqualTo(XYZ.BasisY)
+
+
+Transform.Identity = Transform()
+
+
+class BoundingBoxXYZ(object):
+    def __init__(self, mn, mx, transform=None):
+        self.Min = mn
+        self.Max = mx
+        self.Transform = transform or Transform.Identity
+
+
+class LocationPoint(object):
+    def __init__(self, point):
+        self.Point = point
+
+
+class LocationCurve(object):
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+# ---------------------------------------------------------------- ids, categories, parameters
+
+class ElementId(object):
+    __slots__ = ("IntegerValue",)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+    @property
+    def Value(self):
+        return self.IntegerValue
+
+    def __eq__(self, o):
+        return isinstance(o, ElementId) and o.IntegerValue == self.IntegerValue
+
+    def __ne__(self, o):
+        return not self == o
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __repr__(self):
+        return "ElementId(%d)" % self.IntegerValue
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+class Category(object):
+    _names = {
+        BuiltInCategory.OST_Walls: "Walls",
+        BuiltInCategory.OST_Windows: "Windows",
+        BuiltInCategory.OST_Doors: "Doors",
+        BuiltInCategory.OST_Lines: "Lines",
+        BuiltInCategory.OST_Levels: "Levels",
+        BuiltInCategory.OST_Grids: "Grids",
+        BuiltInCategory.OST_Views: "Views",
+        BuiltInCategory.OST_SketchLines: "Sketch Lines",
+        BuiltInCategory.OST_StructuralFraming: "Structural Framing",
+        BuiltInCategory.OST_StructuralColumns: "Structural Columns",
+        BuiltInCategory.OST_Rebar: "Structural Rebar",
+    }
+    _cache = {}
+
+    def __init__(self, bic):
+        self.Id = ElementId(int(bic))
+        self.Name = self._names.get(bic, str(bic))
+        self.BuiltInCategory = bic
+
+    @classmethod
+    def of(cls, bic):
+        c = cls._cache.get(bic)
+        if c is None:
+            c = cls._cache[bic] = Category(bic)
+        return c
+
+
+class ForgeTypeId(object):
+    def __init__(self, type_id=""):
+        self.TypeId = type_id
+
+    def __eq__(self, o):
+        return isinstance(o, ForgeTypeId) and o.TypeId == self.TypeId
+
+    def __ne__(self, o):
+        return not self == o
+
+    def __hash__(self):
+        return hash(self.TypeId)
+
+
+class SpecTypeId(object):
+    Length = ForgeTypeId("autodesk.spec.aec:length-2.0.0")
+    Area = ForgeTypeId("autodesk.spec.aec:area-2.0.0")
+    Volume = ForgeTypeId("autodesk.spec.aec:volume-2.0.0")
+    Number = ForgeTypeId("autodesk.spec:number-2.0.0")
+    String = ForgeTypeId("autodesk.spec:string-2.0.0")
+
+
+class UnitTypeId(object):
+    Meters = ForgeTypeId("autodesk.unit.unit:meters-1.0.1")
+    SquareMeters = ForgeTypeId("autodesk.unit.unit:squareMeters-1.0.1")
+    CubicMeters = ForgeTypeId("autodesk.unit.unit:cubicMeters-1.0.1")
+
+
+_FEET = {  # internal units per display unit
+    UnitTypeId.Meters: 1 / 0.3048,
+    UnitTypeId.SquareMeters: 1 / 0.09290304,
+    UnitTypeId.CubicMeters: 1 / 0.028316846592,
+}
+
+
+class UnitUtils(object):
+    @staticmethod
+    def IsMeasurableSpec(spec):
+        return spec in (SpecTypeId.Length, SpecTypeId.Area, SpecTypeId.Volume)
+
+    @staticmethod
+    def ConvertFromInternalUnits(value, unit):
+        return value / _FEET[unit]
+
+    @staticmethod
+    def ConvertToInternalUnits(value, unit):
+        return value * _FEET[unit]
+
+
+class FormatOptions(object):
+    def __init__(self, unit):
+        self._unit = unit
+
+    def GetUnitTypeId(self):
+        return self._unit
+
+
+class Units(object):
+    """Metric project units."""
+    _display = {SpecTypeId.Length: UnitTypeId.Meters, SpecTypeId.Area: UnitTypeId.SquareMeters,
+                SpecTypeId.Volume: UnitTypeId.CubicMeters}
+
+    def GetFormatOptions(self, spec):
+        return FormatOptions(self._display.get(spec))
+
+
+class Definition(object):
+    def __init__(self, name, spec=None):
+        self.Name = name
+        self._spec = spec
+
+    def GetDataType(self):
+        return self._spec
+
+
+_SPECS = {
+    BuiltInParameter.HOST_AREA_COMPUTED: SpecTypeId.Area,
+    BuiltInParameter.HOST_VOLUME_COMPUTED: SpecTypeId.Volume,
+    BuiltInParameter.CURVE_ELEM_LENGTH: SpecTypeId.Length,
+    BuiltInParameter.WALL_USER_HEIGHT_PARAM: SpecTypeId.Length,
+    BuiltInParameter.LEVEL_ELEV: SpecTypeId.Length,
+    BuiltInParameter.REBAR_ELEM_LENGTH: SpecTypeId.Length,
+    BuiltInParameter.REBAR_ELEM_TOTAL_LENGTH: SpecTypeId.Length,
+    BuiltInParameter.REBAR_BAR_DIAMETER: SpecTypeId.Length,
+}
+
+_param_ids = {}  # project/shared parameter name -> id, shared by every element
+
+
+def _param_id(name, bip):
+    if bip != BuiltInParameter.INVALID:
+        return ElementId(int(bip))
+    pid = _param_ids.get(name)
+    if pid is None:
+        pid = _param_ids[name] = ElementId(900000 + len(_param_ids))
+    return pid
+
+
+class Parameter(object):
+    def __init__(self, name, value, storage=None, read_only=False, bip=BuiltInParameter.INVALID):
+        self.Id = _param_id(name, bip)
+        if storage is None:
+            if isinstance(value, bool) or isinstance(value, int):
+                storage = StorageType.Integer
+            elif isinstance(value, float):
+                storage = StorageType.Double
+            elif isinstance(value, ElementId):
+                storage = StorageType.ElementId
+            else:
+                storage = StorageType.String
+        self.StorageType = storage
+        self.Definition = Definition(name, _SPECS.get(bip, SpecTypeId.Number if storage == StorageType.Double
+                                                        else SpecTypeId.String))
+        self.IsReadOnly = read_only
+        self.BuiltInParameter = bip
+        self._value = value
+
+    @property
+    def HasValue(self):
+        return self._value is not None
+
+    def AsDouble(self):
+        return float(self._value) if self.StorageType == StorageType.Double and self._value is not None else 0.0
+
+    def AsInteger(self):
+        return int(self._value) if self.StorageType == StorageType.Integer and self._value is not None else 0
+
+    def AsString(self):
+        return self._value if self.StorageType == StorageType.String else None
+
+    def AsElementId(self):
+        return self._value if self.StorageType == StorageType.ElementId else ElementId.InvalidElementId
+
+    def AsValueString(self):
+        return None if self._value is None else str(self._value)
+
+    def Set(self, value):
+        if self.IsReadOnly:
+            raise InvalidOperationException("Parameter is read-only")
+        self._value = value
+        return True
+
+    def SetValueString(self, text):
+        """Parses a leading number in the display unit; units written after it are ignored."""
+        import re
+        m = re.match(r"\s*(-?[0-9]*\.?[0-9]+)", text)
+        if m is None or self.StorageType not in (StorageType.Double, StorageType.Integer):
+            return False
+        value = float(m.group(1))
+        unit = Units().GetFormatOptions(self.Definition.GetDataType()).GetUnitTypeId()
+        if unit is not None:
+            value = UnitUtils.ConvertToInternalUnits(value, unit)
+        return self.Set(value if self.StorageType == StorageType.Double else int(value))
+
+
+# ---------------------------------------------------------------- elements
+
+class Element(object):
+    category = None  # BuiltInCategory of instances of this class, if fixed
+    LevelId = ElementId.InvalidElementId
+    ViewSpecific = False
+
+    def __init__(self, name="", bic=None):
+        self.Id = ElementId.InvalidElementId
+        self.UniqueId = None
+        self.Document = None
+        self.Name = name
+        bic = bic if bic is not None else self.category
+        self.Category = Category.of(bic) if bic is not None else None
+        self._params = {}
+        self._named = {}
+
+    def _bic(self):
+        return self.Category.BuiltInCategory if self.Category is not None else None
+
+    def set_param(self, bip, name, value, storage=None, read_only=False):
+        p = Parameter(name, value, storage, read_only, bip)
+        if bip != BuiltInParameter.INVALID:
+            self._params[bip] = p
+        self._named[name] = p
+        return p
+
+    def get_Parameter(self, key):
+        if isinstance(key, Definition):
+            return self._named.get(key.Name)
+        return self._params.get(key)
+
+    def _parameter_by_id(self, param_id):
+        for p in self._named.values():
+            if p.Id == param_id:
+                return p
+        return None
+
+    def LookupParameter(self, name):
+        return self._named.get(name)
+
+    def GetParameters(self, name):
+        p = self._named.get(name)
+        return [p] if p is not None else []
+
+    @property
+    def Parameters(self):
+        return list(self._named.values())
+
+    def GetTypeId(self):
+        t = getattr(self, "_type", None)
+        return t.Id if t is not None else ElementId.InvalidElementId
+
+    def ChangeTypeId(self, type_id):
+        self.Document._require_tx()
+        t = self.Document.GetElement(type_id)
+        self._type = t
+        if hasattr(self, "Symbol"):
+            self.Symbol = t
+        self.Name = t.Name
+        return type_id
+
+    def get_BoundingBox(self, view):
+        return getattr(self, "_bbox", None)
+
+    @property
+    def Location(self):
+        return getattr(self, "_location", None)
+
+
+class ElementType(Element):
+    def __init__(self, name="", family_name="", bic=None):
+        Element.__init__(self, name, bic)
+        self.FamilyName = family_name
+
+
+class Level(Element):
+    category = BuiltInCategory.OST_Levels
+
+    def __init__(self, name, elevation):
+        Element.__init__(self, name)
+        self.Elevation = float(elevation)
+        self.set_param(BuiltInParameter.LEVEL_ELEV, "Elevation", self.Elevation)
+
+    @staticmethod
+    def Create(doc, elevation):
+        return doc._add(Level("Level %d" % (doc._next_id + 1), elevation))
+
+
+class Grid(Element):
+    category = BuiltInCategory.OST_Grids
+
+    def __init__(self, curve, name=""):
+        Element.__init__(self, name)
+        self.Curve = curve
+
+    @staticmethod
+    def Create(doc, line):
+        return doc._add(Grid(line, str(len(doc._by_class(Grid)) + 1)))
+
+
+class WallType(ElementType):
+    category = BuiltInCategory.OST_Walls
+
+    def __init__(self, name, width=0.656):
+        ElementType.__init__(self, name, "Basic Wall")
+        self.Width = width
+
+
+class Wall(Element):
+    category = BuiltInCategory.OST_Walls
+
+    def __init__(self, curve, level, wall_type, height=10.0):
+        Element.__init__(self, wall_type.Name if wall_type is not None else "Wall")
+        self._location = LocationCurve(curve)
+        self.LevelId = level.Id if level is not None else ElementId.InvalidElementId
+        self._type = wall_type
+        self.set_param(BuiltInParameter.WALL_USER_HEIGHT_PARAM, "Unconnected Height", float(height))
+        self.set_param(BuiltInParameter.HOST_AREA_COMPUTED, "Area", curve.Length * height, read_only=True)
+        width = wall_type.Width if wall_type is not None else 0.656
+        self.set_param(BuiltInParameter.HOST_VOLUME_COMPUTED, "Volume", curve.Length * height * width, read_only=True)
+        self.set_param(BuiltInParameter.ALL_MODEL_MARK, "Mark", "")
+        self.set_param(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS, "Comments", "")
+        lo, hi = curve.GetEndPoint(0), curve.GetEndPoint(1)
+        pad = width / 2.0  # the box takes in the wall's thickness, as in Revit
+        self._bbox = BoundingBoxXYZ(XYZ(min(lo.X, hi.X) - pad, min(lo.Y, hi.Y) - pad, lo.Z),
+                                    XYZ(max(lo.X, hi.X) + pad, max(lo.Y, hi.Y) + pad, lo.Z + height))
+
+    @property
+    def WallType(self):
+        return self._type
+
+    @staticmethod
+    def Create(doc, curve, level_id, structural):
+        level = doc.GetElement(level_id)
+        wt = doc._default_type(WallType)
+        return doc._add(Wall(curve, level, wt))
+
+
+class Family(Element):
+    def __init__(self, name, bic):
+        Element.__init__(self, name)
+        self.FamilyCategory = Category.of(bic)
+        self._symbol_ids = []
+
+    def GetFamilySymbolIds(self):
+        from System.Collections.Generic import List  # type: ignore
+        ids = List[ElementId]()
+        for i in self._symbol_ids:
+            ids.Add(i)
+        return ids
+
+
+class FamilySymbol(ElementType):
+    def __init__(self, name, family, bic):
+        ElementType.__init__(self, name, family.Name, bic)
+        self.Family = family
+        self.IsActive = False
+
+    def Activate(self):
+        if self.Document is not None:
+            self.Document._require_tx()
+        self.IsActive = True
+
+
+class FamilyInstance(Element):
+    def __init__(self, symbol, point, level, bic=None, size=(1.0, 1.0, 10.0)):
+        Element.__init__(self, symbol.Name, bic if bic is not None else symbol._bic())
+        self._type = symbol
+        self.Symbol = symbol
+        self.LevelId = level.Id if level is not None else ElementId.InvalidElementId
+        self._location = LocationPoint(point)
+        self._transform = Transform(point)
+        w, d, h = size
+        self._bbox = BoundingBoxXYZ(XYZ(-w / 2.0, -d / 2.0, 0.0), XYZ(w / 2.0, d / 2.0, h), self._transform)
+        self.set_param(BuiltInParameter.ALL_MODEL_MARK, "Mark", "")
+        self.set_param(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS, "Comments", "")
+
+    def GetTransform(self):
+        return self._transform
+
+
+class _CurveDrivenInstance(FamilyInstance):
+    """Beam/brace: a family instance located by a curve (NewFamilyInstance(curve, ...))."""
+
+    def __init__(self, symbol, curve, level, size=(1.0, 2.0)):
+        Element.__init__(self, symbol.Name, symbol._bic())
+        self._type = symbol
+        self.Symbol = symbol
+        # As in Revit, framing leaves LevelId empty and keeps its level in the reference level
+        self.LevelId = ElementId.InvalidElementId
+        self.set_param(BuiltInParameter.INSTANCE_REFERENCE_LEVEL_PARAM, "Reference Level",
+                       level.Id if level is not None else ElementId.InvalidElementId)
+        self._location = LocationCurve(curve)
+        self._transform = Transform(XYZ(0, 0, 0))
+        p, q = curve.GetEndPoint(0), curve.GetEndPoint(1)
+        w, h = size
+        self._bbox = BoundingBoxXYZ(XYZ(min(p.X, q.X) - w / 2.0, min(p.Y, q.Y) - w / 2.0, min(p.Z, q.Z) - h),
+                                    XYZ(max(p.X, q.X) + w / 2.0, max(p.Y, q.Y) + w / 2.0, max(p.Z, q.Z)))
+        self.set_param(BuiltInParameter.ALL_MODEL_MARK, "Mark", "")
+        self.set_param(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS, "Comments", "")
+        self.set_param(BuiltInParameter.CURVE_ELEM_LENGTH, "Length", curve.Length, read_only=True)
+
+
+class CurveElement(Element):
+    def __init__(self, curve, bic=BuiltInCategory.OST_Lines):
+        Element.__init__(self, "Lines", bic)
+        self.GeometryCurve = curve
+        self._location = LocationCurve(curve)
+        self.set_param(BuiltInParameter.CURVE_ELEM_LENGTH, "Length", curve.Length, read_only=True)
+
+
+class DetailCurve(CurveElement):
+    ViewSpecific = True
+
+    def __init__(self, view, curve):
+        CurveElement.__init__(self, curve)
+        self.OwnerViewId = view.Id
+
+
+class DetailLine(DetailCurve):
+    pass
+
+
+class ModelCurve(CurveElement):
+    def __init__(self, curve, sketch_plane):
+        CurveElement.__init__(self, curve)
+        self.SketchPlane = sketch_plane
+
+
+class ModelLine(ModelCurve):
+    pass
+
+
+class SketchPlane(Element):
+    category = BuiltInCategory.OST_SketchLines
+
+    def __init__(self, plane):
+        Element.__init__(self, "Sketch Plane")
+        self._plane = plane
+
+    def GetPlane(self):
+        return self._plane
+
+    @staticmethod
+    def Create(doc, plane):
+        return doc._add(SketchPlane(plane))
+
+
+class View(Element):
+    category = BuiltInCategory.OST_Views
+
+    def __init__(self, name, view_type, is_template=False):
+        Element.__init__(self, name)
+        self.ViewType = view_type
+        self.IsTemplate = is_template
+
+
+class ViewPlan(View):
+    pass
+
+
+class View3D(View):
+    def __init__(self, name, is_perspective=False):
+        View.__init__(self, name, ViewType.ThreeD)
+        self.IsPerspective = is_perspective
+
+
+# ---------------------------------------------------------------- structure
+
+class StructuralType(enum.IntEnum):
+    NonStructural = 0
+    Beam = 1
+    Brace = 2
+    Column = 3
+    Footing = 4
+    UnknownFraming = 5
+
+
+class StructuralMaterialType(enum.IntEnum):
+    Undefined = 0
+    Steel = 1
+    Concrete = 2
+    Wood = 3
+    Other = 4
+    PrecastConcrete = 5
+    Generic = 7
+    Aluminum = 8
+
+
+class RebarStyle(enum.IntEnum):
+    Standard = 0
+    StirrupTie = 1
+
+
+class RebarHookOrientation(enum.IntEnum):
+    Right = -1
+    Left = 1
+
+
+class RebarBarType(ElementType):
+    category = BuiltInCategory.OST_Rebar
+
+    def __init__(self, name, diameter):
+        ElementType.__init__(self, name, "Rebar Bar")
+        self.BarDiameter = diameter
+        self.BarNominalDiameter = diameter
+        self.set_param(BuiltInParameter.REBAR_BAR_DIAMETER, "Bar Diameter", diameter)
+
+
+class RebarShape(ElementType):
+    category = BuiltInCategory.OST_Rebar
+
+    def __init__(self, name):
+        ElementType.__init__(self, name, "Rebar Shape")
+
+
+class RebarHookType(ElementType):
+    category = BuiltInCategory.OST_Rebar
+
+    def __init__(self, name):
+        ElementType.__init__(self, name, "Rebar Hook")
+
+
+class RebarCoverType(ElementType):
+    def __init__(self, name, distance):
+        ElementType.__init__(self, name, "Rebar Cover")
+        self.CoverDistance = distance
+
+
+class RebarShapeDrivenAccessor(object):
+    def __init__(self, rebar):
+        self._rebar = rebar
+
+    def _layout(self, count, spacing, length):
+        r = self._rebar
+        r.NumberOfBarPositions = max(1, int(count))
+        r.MaxSpacing = spacing
+        r.ArrayLength = length
+        r._refresh_quantities()
+
+    def SetLayoutAsSingle(self):
+        self._layout(1, 0.0, 0.0)
+
+    def SetLayoutAsFixedNumber(self, count, length, bars_on_normal_side, first, last):
+        self._layout(count, length / max(1, count - 1), length)
+
+    def SetLayoutAsMaximumSpacing(self, spacing, length, bars_on_normal_side, first, last):
+        self._layout(int(math.ceil(length / spacing - 1e-9)) + 1, spacing, length)
+
+    def SetLayoutAsNumberWithSpacing(self, count, spacing, bars_on_normal_side, first, last):
+        self._layout(count, spacing, spacing * max(0, count - 1))
+
+
+class Rebar(Element):
+    category = BuiltInCategory.OST_Rebar
+
+    def __init__(self, bar_type, host, curves, shape=None, normal=None):
+        Element.__init__(self, bar_type.Name if bar_type is not None else "Rebar")
+        self._type = bar_type
+        self._shape = shape
+        self._normal = normal
+        self._curves = list(curves)
+        self._host = host
+        self.NumberOfBarPositions = 1
+        self.MaxSpacing = 0.0
+        self.ArrayLength = 0.0
+        self.set_param(BuiltInParameter.ALL_MODEL_MARK, "Mark", "")
+        self.set_param(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS, "Comments", "")
+        self._refresh_quantities()
+
+    def _refresh_quantities(self):
+        length = sum(c.Length for c in self._curves)
+        self.set_param(BuiltInParameter.REBAR_ELEM_LENGTH, "Bar Length", length, read_only=True)
+        self.set_param(BuiltInParameter.REBAR_ELEM_QUANTITY_OF_BARS, "Quantity", self.NumberOfBarPositions,
+                       read_only=True)
+        self.set_param(BuiltInParameter.REBAR_ELEM_TOTAL_LENGTH, "Total Bar Length",
+                       length * self.NumberOfBarPositions, read_only=True)
+
+    @property
+    def Quantity(self):
+        return self.NumberOfBarPositions
+
+    @property
+    def TotalLength(self):
+        return self.get_Parameter(BuiltInParameter.REBAR_ELEM_TOTAL_LENGTH).AsDouble()
+
+    def GetHostId(self):
+        return self._host.Id if self._host is not None else ElementId.InvalidElementId
+
+    def GetShapeId(self):
+        return self._shape.Id if self._shape is not None else ElementId.InvalidElementId
+
+    def GetShapeDrivenAccessor(self):
+        return RebarShapeDrivenAccessor(self)
+
+    def GetCenterlineCurves(self, *args):
+        return list(self._curves)
+
+    @staticmethod
+    def CreateFromCurves(doc, style, bar_type, start_hook, end_hook, host, norm, curves, start_orient, end_orient,
+                         use_existing_shape, create_new_shape):
+        if bar_type is None or host is None:
+            raise ArgumentException("barType and host are required")
+        return doc._add(Rebar(bar_type, host, curves, normal=norm))
+
+    @staticmethod
+    def CreateFromCurvesAndShape(doc, shape, bar_type, start_hook, end_hook, host, norm, curves, *orient):
+        if shape is None or bar_type is None or host is None:
+            raise ArgumentException("rebarShape, barType and host are required")
+        return doc._add(Rebar(bar_type, host, curves, shape, norm))
+
+
+Structure = types.SimpleNamespace(
+    StructuralType=StructuralType,
+    StructuralMaterialType=StructuralMaterialType,
+    RebarStyle=RebarStyle,
+    RebarHookOrientation=RebarHookOrientation,
+    RebarBarType=RebarBarType,
+    RebarShape=RebarShape,
+    RebarHookType=RebarHookType,
+    RebarCoverType=RebarCoverType,
+    Rebar=Rebar,
+    RebarShapeDrivenAccessor=RebarShapeDrivenAccessor,
+)
+
+
+# ---------------------------------------------------------------- transactions
+
+class Transaction(object):
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self._name = name
+        self._started = False
+        self._ended = False
+        self._mark = None
+
+    def Start(self):
+        if self._started:
+            raise InvalidOperationException("Transaction has already been started")
+        self._doc._tx_depth += 1
+        self._mark = self._doc._journal_mark()
+        self._started = True
+
+    def Commit(self):
+        self._end()
+
+    def RollBack(self):
+        self._doc._rollback_to(self._mark)
+        self._end()
+
+    def _end(self):
+        if not self._started or self._ended:
+            raise InvalidOperationException("Transaction is not active")
+        self._doc._tx_depth -= 1
+        self._ended = True
+
+    def HasStarted(self):
+        return self._started
+
+    def HasEnded(self):
+        return self._ended
+
+
+class TransactionGroup(object):
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self._started = False
+        self._ended = False
+        self._mark = None
+
+    def Start(self):
+        self._started = True
+        self._mark = self._doc._journal_mark()
+
+    def Assimilate(self):
+        self._ended = True
+
+    def RollBack(self):
+        self._doc._rollback_to(self._mark)
+        self._ended = True
+
+    def HasStarted(self):
+        return self._started
+
+    def HasEnded(self):
+        return self._ended
+
+
+# ---------------------------------------------------------------- filters
+
+class ElementMulticategoryFilter(object):
+    def __init__(self, categories, inverted=False):
+        self._bics = set(int(c) for c in categories)
+        self._inverted = inverted
+
+    def PassesFilter(self, el):
+        bic = el._bic()
+        return (bic is not None and int(bic) in self._bics) != self._inverted
+
+
+class _ParameterRule(object):
+    def __init__(self, param_id, test, value, epsilon=0.0):
+        self.param_id = param_id
+        self.test = test
+        self.value = value
+        self.epsilon = epsilon
+
+    def matches(self, el):
+        p = el._parameter_by_id(self.param_id)
+        if p is None:
+            return False
+        if p.StorageType == StorageType.String:
+            v = p.AsString() or ""
+            return self.test(v.lower(), self.value.lower(), 0)
+        if p.StorageType == StorageType.ElementId:
+            return self.test(p.AsElementId().IntegerValue, self.value.IntegerValue, 0)
+        v = p.AsDouble() if p.StorageType == StorageType.Double else p.AsInteger()
+        return self.test(v, self.value, self.epsilon)
+
+
+def _rule(test):
+    def create(param_id, value, epsilon=0.0):
+        return _ParameterRule(param_id, test, value, epsilon)
+    return staticmethod(create)
+
+
+class ParameterFilterRuleFactory(object):
+    CreateEqualsRule = _rule(lambda v, x, e: abs(v - x) <= e if e else v == x)
+    CreateNotEqualsRule = _rule(lambda v, x, e: abs(v - x) > e if e else v != x)
+    CreateGreaterRule = _rule(lambda v, x, e: v > x + e if e else v > x)
+    CreateGreaterOrEqualRule = _rule(lambda v, x, e: v >= x - e if e else v >= x)
+    CreateLessRule = _rule(lambda v, x, e: v < x - e if e else v < x)
+    CreateLessOrEqualRule = _rule(lambda v, x, e: v <= x + e if e else v <= x)
+    CreateContainsRule = _rule(lambda v, x, e: x in v)
+    CreateBeginsWithRule = _rule(lambda v, x, e: v.startswith(x))
+    CreateEndsWithRule = _rule(lambda v, x, e: v.endswith(x))
+
+
+class ElementParameterFilter(object):
+    def __init__(self, rule, inverted=False):
+        self._rules = rule if isinstance(rule, (list, tuple)) else [rule]
+        self._inverted = inverted
+
+    def PassesFilter(self, el):
+        return all(r.matches(el) for r in self._rules) != self._inverted
+
+
+# ---------------------------------------------------------------- collector
+
+class FilteredElementCollector(object):
+    def __init__(self, doc, view_id=None):
+        self._doc = doc
+        self._view_id = view_id
+        self._cls = None
+        self._bic = None
+        self._is_type = None
+        self._filters = []
+
+    def OfClass(self, cls):
+        self._cls = cls
+        return self
+
+    def OfCategory(self, bic):
+        self._bic = bic
+        return self
+
+    def OfCategoryId(self, cat_id):
+        self._bic = BuiltInCategory(cat_id.IntegerValue)
+        return self
+
+    def WhereElementIsElementType(self):
+        self._is_type = True
+        return self
+
+    def WhereElementIsNotElementType(self):
+        self._is_type = False
+        return self
+
+    def WherePasses(self, element_filter):
+        self._filters.append(element_filter)
+        return self
+
+    def _candidates(self):
+        doc = self._doc
+        if self._bic is not None:
+            pool = doc._by_category.get(self._bic, ())
+        elif self._cls is not None:
+            pool = doc._by_class(self._cls)
+        else:
+            pool = doc._elements.values()
+        for el in pool:
+            if self._cls is not None and not isinstance(el, self._cls):
+                continue
+            if self._is_type is not None and isinstance(el, ElementType) != self._is_type:
+                continue
+            if self._view_id is not None and getattr(el, "OwnerViewId", self._view_id) != self._view_id:
+                continue
+            if self._filters and not all(f.PassesFilter(el) for f in self._filters):
+                continue
+            yield el
+
+    def __iter__(self):
+        return self._candidates()
+
+    def ToElements(self):
+        return list(self._candidates())
+
+    def ToElementIds(self):
+        return [el.Id for el in self._candidates()]
+
+    def FirstElement(self):
+        return next(self._candidates(), None)
+
+    def FirstElementId(self):
+        el = self.FirstElement()
+        return el.Id if el is not None else ElementId.InvalidElementId
+
+    def GetElementCount(self):
+        return sum(1 for _ in self._candidates())
+
+
+# ---------------------------------------------------------------- document
+
+class Application(object):
+    ShortCurveTolerance = 0.00256
+    VersionNumber = "2025"
+    VersionName = "Fake Revit 2025"
+
+
+class _Creation(object):
+    def __init__(self, doc):
+        self._doc = doc
+
+    def NewFamilyInstance(self, location, symbol, level, structural_type):
+        if not symbol.IsActive:
+            raise InvalidOperationException("The symbol is not active")
+        if isinstance(location, Curve):
+            return self._doc._add(_CurveDrivenInstance(symbol, location, level))
+        return self._doc._add(FamilyInstance(symbol, location, level))
+
+    def NewDetailCurve(self, view, curve):
+        cls = DetailLine if isinstance(curve, Line) else DetailCurve
+        return self._doc._add(cls(view, curve))
+
+    def NewDetailCurveArray(self, view, curves):
+        return [self.NewDetailCurve(view, c) for c in curves]
+
+    def NewModelCurve(self, curve, sketch_plane):
+        cls = ModelLine if isinstance(curve, Line) else ModelCurve
+        return self._doc._add(cls(curve, sketch_plane))
+
+    def NewModelCurveArray(self, curves, sketch_plane):
+        return [self.NewModelCurve(c, sketch_plane) for c in curves]
+
+
+class Document(object):
+    def __init__(self, title="Fake Project"):
+        self.Title = title
+        self.PathName = ""
+        self.Application = Application()
+        self.Create = _Creation(self)
+        self.IsModifiable = False
+        self._elements = {}
+        self._by_uid = {}
+        self._by_category = {}
+        self._class_index = {}
+        self._journal = []
+        self._tx_depth = 0
+        self._next_id = 100000
+        self._regenerations = 0
+
+    # -- storage
+
+    def _require_tx(self):
+        if self._tx_depth <= 0:
+            raise InvalidOperationException("Attempt to modify the model outside of transaction.")
+
+    def _journal_mark(self):
+        return len(self._journal)
+
+    def _rollback_to(self, mark):
+        while len(self._journal) > mark:
+            self._remove(self._journal.pop())
+
+    def _add(self, el, loading=False):
+        if not loading:
+            self._require_tx()
+        self._next_id += 1
+        el.Id = ElementId(self._next_id)
+        el.UniqueId = "fake-%08d" % self._next_id
+        el.Document = self
+        self._elements[self._next_id] = el
+        self._by_uid[el.UniqueId] = el
+        bic = el._bic()
+        if bic is not None:
+            self._by_category.setdefault(bic, []).append(el)
+        for cls, lst in self._class_index.items():
+            if isinstance(el, cls):
+                lst.append(el)
+        if not loading:
+            self._journal.append(el)
+        return el
+
+    def _remove(self, el):
+        self._elements.pop(el.Id.IntegerValue, None)
+        self._by_uid.pop(el.UniqueId, None)
+        bic = el._bic()
+        if bic is not None and el in self._by_category.get(bic, ()):
+            self._by_category[bic].remove(el)
+        for lst in self._class_index.values():
+            if el in lst:
+                lst.remove(el)
+
+    def _by_class(self, cls):
+        lst = self._class_index.get(cls)
+        if lst is None:
+            lst = self._class_index[cls] = [el for el in self._elements.values() if isinstance(el, cls)]
+        return lst
+
+    def _default_type(self, cls):
+        for el in self._by_class(cls):
+            return el
+        return None
+
+    # -- Revit API surface
+
+    def GetElement(self, ref):
+        if isinstance(ref, ElementId):
+            return self._elements.get(ref.IntegerValue)
+        if isinstance(ref, int):
+            return self._elements.get(ref)
+        return self._by_uid.get(ref)
+
+    def Delete(self, element_ids):
+        self._require_tx()
+        if isinstance(element_ids, ElementId):
+            element_ids = [element_ids]
+        deleted = []
+        for element_id in element_ids:
+            el = self.GetElement(element_id)
+            if el is not None:
+                self._remove(el)
+                deleted.append(element_id)
+        return deleted
+
+    def GetUnits(self):
+        return Units()
+
+    def Regenerate(self):
+        self._regenerations += 1
+
+    def LoadFamily(self, path):
+        import os
+        self._require_tx()
+        name = os.path.splitext(os.path.basename(path))[0]
+        fam = self._add(Family(name, BuiltInCategory.OST_StructuralColumns))
+        for type_name in ("Type 1", "Type 2"):
+            sym = self._add(FamilySymbol(type_name, fam, BuiltInCategory.OST_StructuralColumns))
+            fam._symbol_ids.append(sym.Id)
+        return True, fam
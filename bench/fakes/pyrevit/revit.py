@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Stand-in for pyrevit.revit: the active document and UI document."""
+
+
+class UIDocument(object):
+    def __init__(self, document, active_view=None):
+        self.Document = document
+        self.ActiveView = active_view
+
+
+doc = None
+uidoc = None
+
+
+def set_active(document, active_view=None):
+    global doc, uidoc
+    doc = document
+    uidoc = UIDocument(document, active_view)
+    return uidoc
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Stand-in for pyrevit.routes: collects handlers and dispatches requests to them.
+
+Handlers receive arguments by name the way pyRevit does it: ``doc``,
+``request`` and any ``<int:...>`` path parameters.
+"""
+import inspect
+import re
+
+from pyrevit import revit
+
+_registry = []
+
+
+class Request(object):
+    def __init__(self, data=None, params=None, headers=None):
+        self.data = data if data is not None else {}
+        self.params = params or {}
+        self.headers = headers or {}
+
+
+class Response(object):
+    def __init__(self, data, status, headers):
+        self.data = data
+        self.status = status
+        self.headers = headers or {}
+
+
+def make_response(data=None, status=200, headers=None):
+    return Response(data, status, headers)
+
+
+class API(object):
+    def __init__(self, name):
+        self.name = name
+        self.handlers = []  # (method, path, regex, fn)
+        _registry.append(self)
+
+    def route(self, path, methods=None):
+        pattern = re.compile("^" + re.sub(r"<int:(\w+)>", r"(?P<\1>-?\\d+)", path) + "$")
+
+        def deco(fn):
+            for method in methods or ["GET"]:
+                self.handlers.append((method.upper(), path, pattern, fn))
+            return fn
+        return deco
+
+    def find(self, method, path):
+        for m, _, pattern, fn in self.handlers:
+            if m == method:
+                match = pattern.match(path)
+                if match:
+                    return fn, dict((k, int(v)) for k, v in match.groupdict().items())
+        return None, None
+
+    def dispatch(self, method, path, data=None, headers=None, doc=None):
+        fn, path_args = self.find(method.upper(), path)
+        if fn is None:
+            return Response({"error": "No route for %s %s" % (method, path)}, 404, None)
+        kwargs = {}
+        for name in inspect.signature(fn).parameters:
+            if name == "doc":
+                kwargs["doc"] = doc if doc is not None else revit.doc
+            elif name == "uidoc":
+                kwargs["uidoc"] = revit.uidoc
+            elif name == "request":
+                kwargs["request"] = Request(data, headers=headers)
+            elif name in path_args:
+                kwargs[name] = path_args[name]
+        return fn(**kwargs)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Load the extension's route modules against the fake pyRevit in bench/fakes.
+
+    from harness import load_api
+    api = load_api()
+    doc, info = model.build_model(10000)
+    activate(doc, info["activeView"])
+    response = api.dispatch("GET", "/levels/")
+
+Importing this module puts bench/fakes and RevitMCP.extension on sys.path,
+turns tracing off and sends the routes log to os.devnull, so nothing is
+written to the Windows paths the extension uses.
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+EXTENSION = os.path.join(ROOT, "RevitMCP.extension")
+
+for _p in (os.path.join(HERE, "fakes"), EXTENSION, HERE):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+os.environ.setdefault("REVIT_MCP_TRACE", "0")
+
+from pyrevit import revit, routes  # noqa: E402
+
+# The same modules startup.py registers, in the same order.
+ROUTE_MODULES = ("routes_core", "geometry", "elements", "catalog", "families", "debug", "query", "parameters",
+                 "snapshot", "spatial", "layout", "grids", "framing", "rebar")
+
+
+def load_api(name="revit_mcp"):
+    import importlib
+    import logging
+    from revit_mcp import utils
+    utils.LOG_FILE = os.devnull
+    utils.logger.addHandler(logging.NullHandler())
+    utils.logger.propagate = False
+    api = routes.API(name)
+    for mod in ROUTE_MODULES:
+        importlib.import_module("revit_mcp." + mod).register_routes(api)
+    return api
+
+
+def activate(doc, active_view=None):
+    """Make doc the active document (what pyRevit passes as ``doc``)."""
+    return revit.set_active(doc, active_view)
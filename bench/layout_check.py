@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Check /layout/reconcile/ on a synthetic model.
+
+Builds a plan of columns and walls on an empty level, applies it, edits it
+and re-applies it through the extension's route (fake DB). Checks:
+
+1. the first run creates every item in one transaction;
+2. re-running the same plan (with jitter below the tolerance) changes nothing;
+3. after moving, retyping, adding and removing a few items only those are
+   touched, and the model then matches the plan exactly;
+4. dryRun reports the same diff without changing the model;
+5. kinds the request does not list are left alone;
+6. re-running /place_beams/ skips the beams it created (framing keeps its
+   level in the reference level parameter, not LevelId).
+
+Usage:
+    python bench/layout_check.py [--items 2000]
+
+Exits 1 if a check fails.
+"""
+import argparse
+import random
+import sys
+import time
+
+import harness
+import model
+import sim_routes
+from revit_mcp import metrics
+
+DB = model.DB
+
+
+def _call(api, body):
+    resp = api.dispatch("POST", "/layout/reconcile/", body)
+    return resp.status, sim_routes._plain(resp.data)
+
+
+def _state(doc, level_id):
+    """Sorted (kind, rounded location, type name) of columns and walls on the level."""
+    out = []
+    for el in DB.FilteredElementCollector(doc).WhereElementIsNotElementType():
+        if int(el.LevelId.IntegerValue) != level_id:
+            continue
+        if isinstance(el, DB.Wall):
+            c = el.Location.Curve
+            p, q = sorted([(round(c.GetEndPoint(0).X, 3), round(c.GetEndPoint(0).Y, 3)),
+                           (round(c.GetEndPoint(1).X, 3), round(c.GetEndPoint(1).Y, 3))])
+            out.append(("wall", p + q, el.Name))
+        elif el.Category is not None and el.Category.Name == "Structural Columns":
+            pt = el.Location.Point
+            out.append(("column", (round(pt.X, 3), round(pt.Y, 3)), el.Name))
+    return sorted(out)
+
+
+def _expected(plan, default_column, default_wall):
+    out = [("column", (round(c["x"], 3), round(c["y"], 3)), c.get("type") or default_column)
+           for c in plan["columns"]]
+    for w in plan["walls"]:
+        p, q = sorted([(round(w["x1"], 3), round(w["y1"], 3)), (round(w["x2"], 3), round(w["y2"], 3))])
+        out.append(("wall", p + q, w.get("type") or default_wall))
+    return sorted(out)
+
+
+def run(items):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    api = harness.load_api()
+    doc, info = model.build_model(1000)
+    harness.activate(doc, info["activeView"])
+    t = DB.Transaction(doc, "level")
+    t.Start()
+    level = DB.Level.Create(doc, 100.0)
+    level.Name = "Reconcile"
+    t.Commit()
+    level_id = int(level.Id.IntegerValue)
+    rng = random.Random(3)
+
+    side = int(items ** 0.5)
+    columns = [{"x": 20.0 * (i % side), "y": 20.0 * (i // side), "type": info["columnTypes"][0]}
+               for i in range(items)]
+    walls = [{"x1": 20.0 * i, "y1": -10.0, "x2": 20.0 * (i + 1), "y2": -10.0} for i in range(side)]
+    plan = {"level": "Reconcile", "columns": columns, "walls": walls}
+
+    def transactions():
+        return metrics.snapshot()["transactions"]["committed"]
+
+    before = transactions()
+    status, res = _call(api, plan)
+    check("first run creates everything", status == 200 and res["counts"]["created"] == len(columns) + len(walls)
+          and transactions() - before == 1, "%s, %.2fs" % (res.get("counts"), res.get("seconds", 0)))
+    default_wall = [n for k, _, n in _state(doc, level_id) if k == "wall"][0]
+
+    jitter = dict(plan, columns=[dict(c, x=c["x"] + rng.uniform(-0.004, 0.004)) for c in columns])
+    before = transactions()
+    t0 = time.perf_counter()
+    status, res = _call(api, jitter)
+    rerun_ms = (time.perf_counter() - t0) * 1000.0
+    check("unchanged plan touches nothing", res["counts"]["unchanged"] == len(columns) + len(walls)
+          and transactions() == before, "%s, %.1f ms" % (res["counts"], rerun_ms))
+
+    edited = {"level": "Reconcile", "columns": [dict(c) for c in columns], "walls": [dict(w) for w in walls]}
+    edited["columns"][0]["x"] += 3.0  # moved: one delete + one create
+    edited["columns"][1]["type"] = info["columnTypes"][-1]  # retyped: one update
+    del edited["columns"][2]  # removed: one delete
+    edited["columns"].append({"x": -40.0, "y": -40.0})  # added, default type: one create
+    edited["walls"][0]["x1"], edited["walls"][0]["x2"] = walls[0]["x2"], walls[0]["x1"]  # reversed: same wall
+    edited["walls"].append({"x1": 0.0, "y1": -30.0, "x2": 0.0, "y2": -50.0, "type": info["wallTypes"][-1]})
+
+    status, dry = _call(api, dict(edited, dryRun=True))
+    check("dryRun reports the diff without applying it", dry["counts"]["created"] == 3
+          and dry["counts"]["updated"] == 1 and dry["counts"]["deleted"] == 2
+          and [k for k, _, _ in _state(doc, level_id)].count("column") == len(columns), dry["counts"])
+
+    before = transactions()
+    status, res = _call(api, edited)
+    check("edit touches only what changed", res["counts"] == dict(dry["counts"], removedWithDependents=2)
+          and transactions() - before == 1, res["counts"])
+    default_column = doc.GetElement(DB.ElementId(res["created"][-2]["id"])).Name \
+        if res["created"][-2]["kind"] == "column" else None
+    check("model matches the edited plan",
+          _state(doc, level_id) == _expected(edited, default_column, default_wall))
+
+    status, res = _call(api, {"level": "Reconcile", "columns": edited["columns"]})
+    check("walls are left alone when not listed", res["counts"]["deleted"] == 0
+          and len([k for k, _, _ in _state(doc, level_id) if k == "wall"]) == len(edited["walls"]))
+
+    status, res = _call(api, {"level": "Nowhere", "columns": []})
+    check("unknown level -> 400", status == 400, res.get("error"))
+
+    beams = {"level": "Reconcile", "beams": [{"x1": 0, "y1": 30.0 * i, "x2": 30, "y2": 30.0 * i} for i in range(5)]}
+    first = sim_routes._plain(api.dispatch("POST", "/place_beams/", beams).data)
+    again = sim_routes._plain(api.dispatch("POST", "/place_beams/", beams).data)
+    check("re-run /place_beams/ skips existing beams", first.get("count") == 5 and again.get("count") == 0
+          and sorted(s["id"] for s in again.get("skipped", [])) == sorted(b["id"] for b in first["beams"]),
+          "%s created, then %s" % (first.get("count"), again.get("count")))
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--items", type=int, default=2000)
+    args = ap.parse_args()
+    return 0 if run(args.items) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
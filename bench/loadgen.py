@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""End-to-end load generator: MCP client -> revit_mcp/main.py (stdio) -> routes.
+
+Starts the MCP server as a subprocess over stdio, points REVIT_ROUTES_URL at
+a simulated routes server (started in-process unless --routes-url is given)
+and keeps `concurrency` tool calls in flight for --duration seconds, drawing
+tools from a weighted mix. Reports throughput and latency percentiles per
+concurrency level, so the point where throughput stops growing and latency
+only queues up is visible.
+
+Usage:
+    python bench/loadgen.py [--mix agent] [--concurrency 1 2 4 8] [--duration 20]
+                            [--elements 10000] [--time-scale 1.0] [--routes-url URL] [--json out.json]
+
+Needs the MCP server's dependencies (mcp, httpx) in the running Python.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+import harness
+
+MAIN_PY = os.path.join(harness.ROOT, "revit_mcp", "main.py")
+
+
+def _lines(rnd, n):
+    return [[rnd.uniform(0, 100), rnd.uniform(0, 100), rnd.uniform(0, 100), rnd.uniform(0, 100)] for _ in range(n)]
+
+
+def _mixes(info):
+    """{mix: [(weight, tool, args_factory(rnd)), ...]} built from the simulated model."""
+    lvl = info["levels"][0]
+    cols = info.get("columnIds") or [0]
+    fam = info.get("columnFamilyId", 0)
+    catalog = [
+        (1, "get_status", lambda r: {}),
+        (4, "get_levels", lambda r: {}),
+        (2, "get_element_types", lambda r: {}),
+        (2, "list_families", lambda r: {}),
+        (1, "get_family_symbols", lambda r: {"familyId": fam}),
+        (2, "search_families", lambda r: {"query": r.choice(["column", "beam", "door", "x"])}),
+    ]
+    placement = [
+        (4, "create_wall_line", lambda r: {"x1": r.uniform(0, 100), "y1": 0, "x2": r.uniform(0, 100), "y2": 10,
+                                           "level": lvl}),
+        (3, "place_column", lambda r: {"x": r.uniform(0, 100), "y": r.uniform(0, 100), "level": lvl}),
+        (2, "draw_detail_line", lambda r: {"x1": 0, "y1": 0, "x2": r.uniform(1, 50), "y2": r.uniform(1, 50)}),
+        (1, "get_levels", lambda r: {}),
+    ]
+    batch = [
+        (3, "draw_detail_lines", lambda r: {"lines": _lines(r, 50)}),
+        (2, "draw_model_polyline", lambda r: {"points": [[float(i), r.uniform(0, 5), 0.0] for i in range(100)]}),
+        (1, "place_rebar_cage_column", lambda r: {"columnId": r.choice(cols), "stirrupShape": "M_T1"}),
+        (1, "quantify_walls", lambda r: {}),
+    ]
+    agent = [(w * 2, t, f) for w, t, f in catalog] + [(w * 2, t, f) for w, t, f in placement] + batch
+    return {"catalog": catalog, "placement": placement, "batch": batch, "agent": agent}
+
+
+def _pct(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class Stats(object):
+    def __init__(self):
+        self.samples = {}  # tool -> [ms]
+        self.errors = {}  # tool -> count
+
+    def add(self, tool, ms, failed):
+        self.samples.setdefault(tool, []).append(ms)
+        if failed:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+
+    def summary(self, seconds):
+        all_ms = sorted(ms for v in self.samples.values() for ms in v)
+        out = {
+            "calls": len(all_ms),
+            "errors": sum(self.errors.values()),
+            "throughput": round(len(all_ms) / seconds, 3) if seconds else 0.0,
+            "p50Ms": round(_pct(all_ms, 0.50), 1),
+            "p95Ms": round(_pct(all_ms, 0.95), 1),
+            "p99Ms": round(_pct(all_ms, 0.99), 1),
+            "maxMs": round(all_ms[-1], 1) if all_ms else 0.0,
+            "tools": {},
+        }
+        for tool, v in sorted(self.samples.items()):
+            o = sorted(v)
+            out["tools"][tool] = {"calls": len(o), "errors": self.errors.get(tool, 0),
+                                  "p50Ms": round(_pct(o, 0.5), 1), "p95Ms": round(_pct(o, 0.95), 1)}
+        return out
+
+
+async def _run_level(session, mix, concurrency, duration, seed):
+    from mcp.shared.exceptions import McpError
+
+    rnd = random.Random(seed)
+    weights = [w for w, _, _ in mix]
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            _, tool, args = rnd.choices(mix, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                result = await session.call_tool(tool, args(rnd))
+                failed = bool(result.isError)
+            except McpError:
+                failed = True
+            stats.add(tool, (time.perf_counter() - t0) * 1000.0, failed)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return stats.summary(time.perf_counter() - t0)
+
+
+async def run(routes_url, info, mix_name, levels, duration, seed):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    env = dict(os.environ)
+    env["REVIT_ROUTES_URL"] = routes_url
+    params = StdioServerParameters(command=sys.executable, args=[MAIN_PY], env=env,
+                                   cwd=os.path.dirname(MAIN_PY))
+    mix = _mixes(info)[mix_name]
+    results = []
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for i, concurrency in enumerate(levels):
+                summary = await _run_level(session, mix, concurrency, duration, seed + i)
+                summary["concurrency"] = concurrency
+                results.append(summary)
+                _print_row(summary)
+            metrics = await session.call_tool("server_metrics", {})
+            server = json.loads(metrics.content[0].text) if metrics.content else None
+    return results, server
+
+
+def _print_header():
+    print("%6s %8s %7s %10s %9s %9s %9s %9s" % ("conc", "calls", "errors", "calls/s", "p50 ms", "p95 ms",
+                                                  "p99 ms", "max ms"))
+
+
+def _print_row(s):
+    print("%6d %8d %7d %10.2f %9.1f %9.1f %9.1f %9.1f" % (s["concurrency"], s["calls"], s["errors"],
+                                                          s["throughput"], s["p50Ms"], s["p95Ms"], s["p99Ms"],
+                                                          s["maxMs"]))
+
+
+def saturation(results, gain=1.05):
+    """First concurrency level whose throughput is not `gain` times the previous one."""
+    for prev, cur in zip(results, results[1:]):
+        if cur["throughput"] < prev["throughput"] * gain:
+            return prev["concurrency"]
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mix", default="agent", choices=["agent", "catalog", "placement", "batch"])
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    ap.add_argument("--elements", type=int, default=10000)
+    ap.add_argument("--time-scale", type=float, default=1.0, help="scale simulated service times")
+    ap.add_argument("--routes-url", default=None, help="use this routes server instead of the simulator")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--json", default=None, help="also write the results to this file")
+    args = ap.parse_args(argv)
+
+    server = None
+    if args.routes_url:
+        url = args.routes_url.rstrip("/")
+        try:
+            with urllib.request.urlopen(url + "/_sim/info/", timeout=5) as r:
+                info = json.loads(r.read().decode("utf-8"))
+        except Exception:
+            info = {"levels": ["Level 1"]}
+    else:
+        import sim_routes
+        sim = sim_routes.SimulatedRevit(args.elements, time_scale=args.time_scale)
+        server, url = sim_routes.serve(sim, port=0)
+        info = sim.public_info()
+    print("mix=%s routes=%s duration=%gs per level" % (args.mix, url, args.duration))
+    _print_header()
+    try:
+        results, server_metrics = asyncio.run(run(url, info, args.mix, args.concurrency, args.duration, args.seed))
+    finally:
+        if server is not None:
+            server.shutdown()
+    knee = saturation(results)
+    if knee is not None:
+        print("\nThroughput stops growing after concurrency %d; beyond it calls only queue in Revit." % knee)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mix": args.mix, "levels": results, "saturatesAt": knee, "serverMetrics": server_metrics},
+                      f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
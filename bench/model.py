@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Synthetic Revit models for the fake DB, at a configurable element count.
+
+build_model(n) returns a (doc, info) pair: a fake Document with about n
+instances (walls, columns, beams, doors, windows, detail lines, rebar) on a
+few levels, a structural grid (lettered lines along Y, numbered along X), plus the types and families routes look up by name, and an info
+dict with ids and names scenarios can use.
+"""
+import random
+
+from pyrevit import DB
+
+# Share of instances per kind; the rest are detail lines in the active view.
+MIX = (("walls", 0.35), ("columns", 0.15), ("beams", 0.15), ("doors", 0.08), ("windows", 0.08),
+       ("rebar", 0.10))
+
+BAR_DIAMETERS_MM = (6.3, 8.0, 10.0, 12.5, 16.0, 20.0, 25.0, 32.0)
+GRID_LETTERS = "ABCDEFGHJK"  # I is skipped, as on drawings
+GRID_NUMBERS = 12
+MM = 1.0 / 304.8
+
+
+def _family(doc, name, bic, type_names, active=True):
+    fam = doc._add(DB.Family(name, bic), loading=True)
+    symbols = []
+    for type_name in type_names:
+        sym = doc._add(DB.FamilySymbol(type_name, fam, bic), loading=True)
+        sym.IsActive = active
+        fam._symbol_ids.append(sym.Id)
+        symbols.append(sym)
+    return fam, symbols
+
+
+def build_model(n, seed=1, title=None):
+    rnd = random.Random(seed)
+    doc = DB.Document(title or "Synthetic %d" % n)
+
+    def add(el):
+        return doc._add(el, loading=True)
+
+    n_levels = max(2, min(100, n // 5000))
+    levels = [add(DB.Level("Level %d" % (i + 1), 10.0 * i)) for i in range(n_levels)]
+
+    wall_types = [add(DB.WallType("Generic - %dmm" % w, w * MM)) for w in (100, 150, 200, 250, 300, 400)]
+    _, col_syms = _family(doc, "Concrete-Rectangular-Column", DB.BuiltInCategory.OST_StructuralColumns,
+                          ["300 x 300mm", "300 x 450mm", "400 x 600mm", "600 x 600mm"])
+    for sym in col_syms:
+        b, h = [float(v) for v in sym.Name[:-2].split(" x ")]
+        sym.set_param(DB.BuiltInParameter.INVALID, "b", b * MM)
+        sym.set_param(DB.BuiltInParameter.INVALID, "h", h * MM)
+    _, steel_cols = _family(doc, "W-Wide Flange-Column", DB.BuiltInCategory.OST_StructuralColumns,
+                            ["W10X33", "W12X26"], active=False)
+    _, beam_syms = _family(doc, "Concrete-Rectangular Beam", DB.BuiltInCategory.OST_StructuralFraming,
+                           ["200 x 400mm", "300 x 600mm"])
+    _, door_syms = _family(doc, "Single-Flush", DB.BuiltInCategory.OST_Doors, ["0915 x 2134mm", "0762 x 2032mm"])
+    _, win_syms = _family(doc, "Fixed", DB.BuiltInCategory.OST_Windows, ["0915 x 1220mm", "0610 x 1830mm"])
+
+    bar_types = [add(DB.Structure.RebarBarType("%smm" % ("%g" % d), d * MM)) for d in BAR_DIAMETERS_MM]
+    shapes = [add(DB.Structure.RebarShape(name)) for name in ("M_00", "M_T1", "M_T6", "M_17")]
+    for name in ("Standard - 90 deg.", "Standard - 180 deg.", "Stirrup/Tie - 135 deg."):
+        add(DB.Structure.RebarHookType(name))
+    for name, mm in (("Interior (framing, columns)", 40), ("Exterior", 50), ("Slab", 25)):
+        add(DB.Structure.RebarCoverType(name, mm * MM))
+
+    plans = [add(DB.ViewPlan(lvl.Name, DB.ViewType.FloorPlan)) for lvl in levels]
+    add(DB.View3D("{3D}"))
+    add(DB.View("Sheet A101", DB.ViewType.DrawingSheet))
+
+    counts = dict((kind, int(n * share)) for kind, share in MIX)
+    counts["lines"] = max(0, n - sum(counts.values()))
+    side = max(100.0, (n ** 0.5) * 10.0)
+
+    spacing = side / len(GRID_LETTERS)
+    for i, name in enumerate(GRID_LETTERS):
+        x = (i + 0.5) * spacing
+        add(DB.Grid(DB.Line.CreateBound(DB.XYZ(x, -5.0, 0.0), DB.XYZ(x, side + 5.0, 0.0)), name))
+    for i in range(GRID_NUMBERS):
+        y = (i + 0.5) * side / GRID_NUMBERS
+        add(DB.Grid(DB.Line.CreateBound(DB.XYZ(-5.0, y, 0.0), DB.XYZ(side + 5.0, y, 0.0)), str(i + 1)))
+
+    def pt(z=0.0):
+        return DB.XYZ(rnd.uniform(0, side), rnd.uniform(0, side), z)
+
+    def segment(z, length):
+        p = pt(z)
+        angle = rnd.choice((0.0, 90.0, 180.0, 270.0))
+        d = DB.XYZ(1, 0, 0) if angle in (0.0, 180.0) else DB.XYZ(0, 1, 0)
+        return DB.Line.CreateBound(p, p + d * length)
+
+    columns = []
+    for _ in range(counts["walls"]):
+        lvl = rnd.choice(levels)
+        add(DB.Wall(segment(lvl.Elevation, rnd.uniform(3.0, 40.0)), lvl, rnd.choice(wall_types)))
+    for _ in range(counts["columns"]):
+        lvl = rnd.choice(levels)
+        sym = rnd.choice(col_syms)
+        col = add(DB.FamilyInstance(sym, pt(lvl.Elevation), lvl, size=(1.3, 1.3, 10.0)))
+        col.set_param(DB.BuiltInParameter.HOST_VOLUME_COMPUTED, "Volume", 1.3 * 1.3 * 10.0, read_only=True)
+        col.set_param(DB.BuiltInParameter.STRUCTURAL_MATERIAL_TYPE, "Structural Material",
+                      int(DB.Structure.StructuralMaterialType.Concrete))
+        columns.append(col)
+    for _ in range(counts["beams"]):
+        lvl = rnd.choice(levels)
+        beam = add(DB.FamilyInstance(rnd.choice(beam_syms), pt(lvl.Elevation + 10.0), lvl, size=(20.0, 1.0, 2.0)))
+        beam.set_param(DB.BuiltInParameter.HOST_VOLUME_COMPUTED, "Volume", 20.0 * 1.0 * 2.0, read_only=True)
+        beam.set_param(DB.BuiltInParameter.STRUCTURAL_MATERIAL_TYPE, "Structural Material",
+                       int(DB.Structure.StructuralMaterialType.Concrete))
+    for kind, syms in (("doors", door_syms), ("windows", win_syms)):
+        for _ in range(counts[kind]):
+            lvl = rnd.choice(levels)
+            add(DB.FamilyInstance(rnd.choice(syms), pt(lvl.Elevation), lvl, size=(3.0, 0.5, 7.0)))
+    for _ in range(counts["rebar"]):
+        host = rnd.choice(columns) if columns else None
+        if host is None:
+            break
+        p = host.Location.Point
+        add(DB.Structure.Rebar(rnd.choice(bar_types), host, [DB.Line.CreateBound(p, p + DB.XYZ(0, 0, 9.5))]))
+    for _ in range(counts["lines"]):
+        add(DB.DetailLine(plans[0], segment(0.0, rnd.uniform(1.0, 20.0))))
+
+    info = {
+        "levels": [lvl.Name for lvl in levels],
+        "wallTypes": [t.Name for t in wall_types],
+        "columnTypes": [s.Name for s in col_syms],
+        "inactiveSymbolIds": [int(s.Id.IntegerValue) for s in steel_cols],
+        "columnFamilyId": int(col_syms[0].Family.Id.IntegerValue),
+        "columnIds": [int(c.Id.IntegerValue) for c in columns[:100]],
+        "barTypes": [t.Name for t in bar_types],
+        "rebarShapes": [s.Name for s in shapes],
+        "activeView": plans[0],
+        "side": side,
+        "grids": list(GRID_LETTERS) + [str(i + 1) for i in range(GRID_NUMBERS)],
+        "counts": counts,
+    }
+    return doc, info
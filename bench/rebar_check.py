@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Check column rebar cage layouts (revit_mcp/cage.py) and the cage routes.
+
+Checks:
+
+1. a rectangular layout with bars per face puts every bar on the section
+   perimeter at the right cover, once, and needs at most five elements;
+2. a circular layout puts the bars and the hoop on their circles;
+3. on a column rotated 30 degrees the created bars follow its faces rather
+   than its axis-aligned bounding box;
+4. designs from revit_mcp/nbr6118.py detailed with /place/rebar_cages/ are
+   created in one transaction, with unusable specs reported and skipped;
+5. /quantify/rebar/ totals match a direct sum over the rebar, and its
+   per-host pages cover every host once.
+
+Usage:
+    python bench/rebar_check.py [--columns 200]
+
+Exits 1 if a check fails.
+"""
+import argparse
+import math
+import os
+import sys
+
+import harness
+import model
+import sim_routes
+from revit_mcp import cage, metrics
+
+sys.path.append(os.path.join(harness.ROOT, "revit_mcp"))
+import nbr6118  # noqa: E402  (the MCP server's module)
+
+DB = model.DB
+MM = 1.0 / 304.8
+
+
+def _rotated(angle):
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    return cage.Frame((10.0, 20.0, 0.0), (c, s, 0.0), (-s, c, 0.0))
+
+
+def _all_positions(sets, role="longitudinal"):
+    return [p for s in sets if s.role == role for p in s.positions()]
+
+
+def _rebar_positions(rebar):
+    """Start point of every bar of a created (fake) Rebar, from its curve, normal and layout."""
+    p = rebar._curves[0].GetEndPoint(0)
+    n = rebar.NumberOfBarPositions
+    step = rebar.ArrayLength / (n - 1) if n > 1 else 0.0
+    d = rebar._normal
+    return [(p.X + d.X * step * k, p.Y + d.Y * step * k, p.Z + d.Z * step * k) for k in range(n)]
+
+
+def run(count):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    # 1. rectangular, rotated frame
+    frame = _rotated(30.0)
+    b, h, cover, bar, stirrup = 400 * MM, 600 * MM, 30 * MM, 16 * MM, 6.3 * MM
+    sets = cage.rectangular(frame, b, h, 0.1, 9.9, cover, bar, stirrup, 3, 5, 150 * MM)
+    local = [frame.local(p) for p in _all_positions(sets)]
+    cu, cv = b / 2 - cover - stirrup - bar / 2, h / 2 - cover - stirrup - bar / 2
+    on_perimeter = all(abs(abs(u) - cu) < 1e-9 or abs(abs(v) - cv) < 1e-9 for u, v, _ in local)
+    inside = all(abs(u) <= cu + 1e-9 and abs(v) <= cv + 1e-9 for u, v, _ in local)
+    distinct = len(set((round(u, 9), round(v, 9)) for u, v, _ in local))
+    totals = cage.totals(sets)
+    check("rectangular 3 x 5: 12 distinct bars on the perimeter", on_perimeter and inside and distinct == 12
+          and totals["bars"] == 12, totals)
+    check("identical bars share sets", totals["elements"] == 5, "%d elements for %d bars and %d stirrups"
+          % (totals["elements"], totals["bars"], totals["stirrups"]))
+    stirrups = [s for s in sets if s.role == "stirrup"][0]
+    check("stirrups at most the maximum spacing apart",
+          stirrups.array_length / (stirrups.bars - 1) <= 150 * MM + 1e-9
+          and stirrups.array_length / (stirrups.bars - 2) > 150 * MM, stirrups.bars)
+
+    # 2. circular
+    sets = cage.circular(frame, 500 * MM, 0.1, 9.9, cover, bar, stirrup, 8, 150 * MM)
+    r = 250 * MM - cover - stirrup - bar / 2
+    radii = [math.hypot(*frame.local(p)[:2]) for p in _all_positions(sets)]
+    hoop = [s for s in sets if s.role == "stirrup"][0]
+    hoop_r = [math.hypot(*frame.local(c[3])[:2]) for c in hoop.curves]
+    check("circular: bars and hoop on their circles", len(radii) == 8 and max(abs(x - r) for x in radii) < 1e-9
+          and max(abs(x - (250 * MM - cover - stirrup / 2)) for x in hoop_r) < 1e-9)
+    try:
+        cage.rectangular(frame, 100 * MM, 100 * MM, 0.0, 9.0, 50 * MM, bar, stirrup)
+        check("section too small -> CageError", False)
+    except cage.CageError as ex:
+        check("section too small -> CageError", True, ex)
+
+    # 3. route on a rotated column
+    api = harness.load_api()
+    doc, info = model.build_model(1000)
+    harness.activate(doc, info["activeView"])
+    sym = [s for s in DB.FilteredElementCollector(doc).OfCategory(DB.BuiltInCategory.OST_StructuralColumns)
+           .WhereElementIsElementType() if s.Name == "400 x 600mm"][0]
+    level = [lv for lv in DB.FilteredElementCollector(doc).OfClass(DB.Level)][0]
+    t = DB.Transaction(doc, "rotated column")
+    t.Start()
+    col = doc.Create.NewFamilyInstance(DB.XYZ(50.0, 60.0, level.Elevation), sym, level,
+                                       DB.Structure.StructuralType.Column)
+    c, s = math.cos(math.radians(30.0)), math.sin(math.radians(30.0))
+    col._transform = DB.Transform(DB.XYZ(50.0, 60.0, level.Elevation), DB.XYZ(c, s, 0), DB.XYZ(-s, c, 0))
+    corners = [col._transform.OfPoint(DB.XYZ(u * b / 2, v * h / 2, 0.0)) for u in (-1, 1) for v in (-1, 1)]
+    col._bbox = DB.BoundingBoxXYZ(DB.XYZ(min(p.X for p in corners), min(p.Y for p in corners), level.Elevation),
+                                  DB.XYZ(max(p.X for p in corners), max(p.Y for p in corners), level.Elevation + 10))
+    t.Commit()
+    resp = api.dispatch("POST", "/place/rebar_cage_column/",
+                        {"columnId": int(col.Id.IntegerValue), "barType": "16mm", "stirrupBarType": "6.3mm",
+                         "barsX": 2, "barsY": 3, "cover": 0.03, "stirrupSpacing": 0.15})
+    res = sim_routes._plain(resp.data)
+    frame = cage.Frame((50.0, 60.0, level.Elevation), (c, s, 0.0), (-s, c, 0.0))
+    created = [doc.GetElement(DB.ElementId(i)) for i in res.get("elementIds") or []]
+    bars = [frame.local(p) for rb in created if rb.Name == "16mm" for p in _rebar_positions(rb)]
+    expected = sorted((round(u * cu, 6), round(v * cv, 6)) for u in (-1, 1) for v in (-1, 0, 1))
+    check("rotated column: bars on its faces", resp.status == 200
+          and sorted((round(u, 6), round(v, 6)) for u, v, _ in bars) == expected, res.get("error") or res["bars"])
+    check("rotated column: no bounding-box warning (section from b/h)", "warnings" not in res)
+
+    # 4. batch from the design engine
+    columns = [col for col in DB.FilteredElementCollector(doc).OfCategory(DB.BuiltInCategory.OST_StructuralColumns)
+               .WhereElementIsNotElementType()][:count]
+    loads = [{"id": int(col.Id.IntegerValue), "b": col.Symbol.LookupParameter("b").AsDouble() * 0.3048,
+              "h": col.Symbol.LookupParameter("h").AsDouble() * 0.3048, "fck": 30, "nd": 400.0 + 25.0 * i}
+             for i, col in enumerate(columns)]
+    design = nbr6118.design(loads, stirrup_diameters=(6.3, 8.0, 10.0), bar_type_format="{d}mm")
+    detailing = [d["detailing"] for d in design["columns"] if d["status"] == "ok"]
+    detailing.append({"columnId": 1, "barType": "10mm"})
+    detailing.append({"columnId": detailing[0]["columnId"], "barType": "no such bar"})
+    before = metrics.snapshot()["transactions"]["committed"]
+    resp = api.dispatch("POST", "/place/rebar_cages/", {"cages": detailing})
+    res = sim_routes._plain(resp.data)
+    committed = metrics.snapshot()["transactions"]["committed"] - before
+    check("design -> /place/rebar_cages/ in one transaction", resp.status == 200
+          and res["count"] == len(detailing) - 2 and committed == 1,
+          "%d cages, %d bars, %d stirrups in %d elements" % (res.get("count", 0), res.get("bars", 0),
+                                                             sum(r["stirrups"] for r in res.get("cages", [])),
+                                                             res.get("elements", 0)))
+    check("unusable specs reported, not fatal", [f["error"] for f in res.get("failed", [])]
+          == ["Invalid element", "RebarBarType not found: no such bar"])
+    per_design = dict((d["id"], d["bars"]) for d in design["columns"] if d["status"] == "ok")
+    check("placed bar counts match the design", all(r["bars"] == per_design[r["columnId"]] for r in res["cages"]))
+
+    # 5. takeoff
+    bars, kg = 0, 0.0
+    for rb in DB.FilteredElementCollector(doc).OfClass(DB.Structure.Rebar):
+        d = rb._type.BarNominalDiameter * 0.3048
+        bars += rb.Quantity
+        kg += rb.TotalLength * 0.3048 * 7850.0 * math.pi * d * d / 4.0
+    resp = api.dispatch("POST", "/quantify/rebar/", {"groupBy": ["diameter", "level"]})
+    res = sim_routes._plain(resp.data)
+    check("takeoff total == direct sum", resp.status == 200 and res["total"]["bars"] == bars
+          and abs(res["total"]["weightKg"] - kg) < 0.01
+          and abs(sum(g["weightKg"] for g in res["groups"]) - kg) < 0.05, "%d bars, %.1f kg" % (bars, kg))
+    per_m = dict((b["barType"], b["kgPerM"]) for b in res["barTypes"])
+    check("linear mass from the nominal diameter", abs(per_m["10mm"] - 0.617) < 0.001
+          and abs(per_m["25mm"] - 3.853) < 0.001, per_m)
+    seen, host_kg, cursor = [], 0.0, None
+    while True:
+        page = sim_routes._plain(api.dispatch("POST", "/quantify/rebar/",
+                                              {"perHost": True, "limit": 40, "cursor": cursor}).data)
+        seen.extend(h["hostId"] for h in page["hosts"])
+        host_kg += sum(h["weightKg"] for h in page["hosts"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    check("per-host pages cover every host once", len(seen) == len(set(seen)) == page["hostCount"]
+          and abs(host_kg - kg) < 0.05, "%d hosts" % len(seen))
+    resp = api.dispatch("POST", "/quantify/rebar/", {"groupBy": ["colour"]})
+    check("unknown groupBy -> 400", resp.status == 400)
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--columns", type=int, default=200)
+    args = ap.parse_args()
+    return 0 if run(args.columns) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
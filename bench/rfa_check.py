@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Check the .rfa reader (revit_mcp/rfa.py) against generated family files.
+
+Writes a minimal OLE compound file with BasicFileInfo (small, in the mini
+stream) and PartAtom (large, in regular sectors) streams, plus a sibling
+type catalog, and reads it back with describe_family_file. Checks:
+
+1. version, build, category, OmniClass and types come from the streams;
+2. the type catalog reads the same whether saved as UTF-16 or UTF-8 with a
+   BOM, UTF-8 without one, or ANSI (cp1252), at odd and even byte lengths;
+3. a file that is not a compound file raises RfaError.
+
+Usage:
+    python bench/rfa_check.py [--types 60]
+
+Exits 1 if a check fails.
+"""
+import argparse
+import codecs
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+import harness
+
+sys.path.append(os.path.join(harness.ROOT, "revit_mcp"))
+import rfa  # noqa: E402  (the MCP server's module)
+
+SECTOR, MINI, CUTOFF = 512, 64, 4096
+FREE, END, FATSECT, NOSTREAM = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF
+
+CATALOG_HEADER = u",Largura##LENGTH##MILLIMETERS,Altura##LENGTH##MILLIMETERS"
+CATALOG_ROWS = [(u"Pilar Ø30 × 45", u"300", u"450"), (u"Pilar Ø20 × 40", u"200", u"400")]
+
+
+def _pad(data, size):
+    return data + b"\0" * (-len(data) % size)
+
+
+def _dir_entry(name, etype, left=NOSTREAM, right=NOSTREAM, child=NOSTREAM, start=END, size=0):
+    encoded = (name + u"\0").encode("utf-16-le") if name else b""
+    entry = encoded.ljust(64, b"\0")
+    entry += struct.pack("<HBBIII", len(encoded), etype, 1, left, right, child)
+    entry += b"\0" * 36  # clsid, state bits, times
+    entry += struct.pack("<III", start, size, 0)
+    return entry
+
+
+def compound_file(streams):
+    """Bytes of a v3 compound file holding streams ({name: bytes}, at most two, one sector of FAT)."""
+    names = sorted(streams)
+    fat, sectors = [], []
+
+    def add(data):
+        """Append data as a sector chain; returns its first sector."""
+        first = len(sectors)
+        chunks = [data[i:i + SECTOR] for i in range(0, len(data), SECTOR)] or [b""]
+        for k, chunk in enumerate(chunks):
+            sectors.append(_pad(chunk, SECTOR))
+            fat.append(len(sectors) if k < len(chunks) - 1 else END)
+        return first
+
+    sectors.append(b"")  # the FAT itself, filled in last
+    fat.append(FATSECT)
+    mini, minifat, placed = b"", [], {}
+    for name in names:
+        data = streams[name]
+        if len(data) < CUTOFF:
+            first = len(mini) // MINI
+            count = max(1, (len(data) + MINI - 1) // MINI)
+            minifat.extend(first + k + 1 if k < count - 1 else END for k in range(count))
+            mini += _pad(data, MINI)
+            placed[name] = first
+    for name in names:
+        if len(streams[name]) >= CUTOFF:
+            placed[name] = add(streams[name])
+    mini_start = add(mini) if mini else END
+    minifat_start = add(struct.pack("<%dI" % len(minifat), *minifat)) if minifat else END
+
+    entries = [_dir_entry(u"Root Entry", 5, child=1, start=mini_start, size=len(mini))]
+    for i, name in enumerate(names):
+        entries.append(_dir_entry(name, 2, right=i + 2 if i + 1 < len(names) else NOSTREAM,
+                                  start=placed[name], size=len(streams[name])))
+    dir_start = add(b"".join(entries).ljust(SECTOR * ((len(entries) * 128 + SECTOR - 1) // SECTOR), b"\0"))
+    assert len(fat) <= SECTOR // 4, "more than one FAT sector"
+    sectors[0] = struct.pack("<%dI" % (SECTOR // 4), *(fat + [FREE] * (SECTOR // 4 - len(fat))))
+
+    header = rfa._SIGNATURE + b"\0" * 16
+    header += struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+    header += struct.pack("<IIIIIIIII", 0, 1, dir_start, 0, CUTOFF, minifat_start,
+                          1 if minifat else 0, END, 0)
+    header += struct.pack("<109I", *([0] + [FREE] * 108))
+    return header.ljust(SECTOR, b"\0") + b"".join(sectors)
+
+
+def basic_file_info(version, build):
+    text = u"Worksharing: Not enabled\r\nFormat: %s\r\nBuild: %s\r\n" % (version, build)
+    return b"\x04\x00\x00\x00" + text.encode("utf-16-le")
+
+
+def part_atom(title, types):
+    parts = "".join('<A:part type="user"><title>%s</title><b units="mm">%d</b><h units="mm">%d</h>'
+                    '<Material>Concreto</Material></A:part>' % (name, b, h) for name, b, h in types)
+    xml = ('<?xml version="1.0" encoding="UTF-8"?>'
+           '<entry xmlns="http://www.w3.org/2005/Atom" xmlns:A="urn:schemas-autodesk-com:partatom">'
+           '<title>%s</title>'
+           '<category><term>Structural Columns</term><scheme>adsk:revit:grouping</scheme></category>'
+           '<category><term>23.25.30.11.14.14</term><scheme>std:oc1</scheme></category>'
+           '<A:family type="user">%s</A:family></entry>' % (title, parts))
+    return xml.encode("utf-8")
+
+
+def catalog_text(extra=u""):
+    lines = [CATALOG_HEADER] + [u",".join(r) for r in CATALOG_ROWS]
+    return u"\r\n".join(lines) + u"\r\n" + extra
+
+
+def run(type_count):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    types = [("%d x %dmm" % (b, h), b, h) for b, h in
+             ((200 + 50 * (i % 6), 300 + 50 * (i // 6)) for i in range(type_count))]
+    data = compound_file({"BasicFileInfo": basic_file_info("2024", "20230308_1635(x64)"),
+                          "PartAtom": part_atom("M_Concreto-Coluna Retangular", types)})
+    tmp = tempfile.mkdtemp(prefix="rfa_check_")
+    try:
+        path = os.path.join(tmp, "M_Concreto-Coluna Retangular.rfa")
+        with open(path, "wb") as f:
+            f.write(data)
+        res = rfa.describe_family_file(path)
+        check("version and build from BasicFileInfo", res["revitVersion"] == "2024"
+              and res["build"] == "20230308_1635(x64)", "%s %s" % (res["revitVersion"], res["build"]))
+        check("category and OmniClass from PartAtom", res["category"] == "Structural Columns"
+              and res["omniClass"] == "23.25.30.11.14.14", res["category"])
+        check("types from PartAtom (%d, stream of %d bytes)" % (type_count, len(part_atom("", types))),
+              [t["name"] for t in res["types"]] == [t[0] for t in types]
+              and res["types"][0]["parameters"] == {"b": "200 mm", "h": "300 mm", "Material": "Concreto"}
+              and res["typeCatalog"] is None and "partAtom" not in res)
+
+        expected = {"parameters": [u"Largura", u"Altura"],
+                    "types": [{"name": n, "parameters": {u"Largura": b, u"Altura": h}} for n, b, h in CATALOG_ROWS]}
+        encodings = (("UTF-16 with BOM", lambda t: codecs.BOM_UTF16_LE + t.encode("utf-16-le")),
+                     ("UTF-8 with BOM", lambda t: codecs.BOM_UTF8 + t.encode("utf-8")),
+                     ("UTF-8", lambda t: t.encode("utf-8")),
+                     ("ANSI", lambda t: t.encode("cp1252")))
+        for label, encode in encodings:
+            for extra in (u"", u" "):
+                raw = encode(catalog_text(extra))
+                folder = os.path.join(tmp, "%s-%d" % (label.replace(" ", "_"), len(raw)))
+                os.mkdir(folder)
+                rfa_path = os.path.join(folder, "Family.rfa")
+                with open(rfa_path, "wb") as f:
+                    f.write(data)
+                with open(os.path.join(folder, "Family.txt"), "wb") as f:
+                    f.write(raw)
+                catalog = rfa.describe_family_file(rfa_path)["typeCatalog"] or {}
+                got = {"parameters": catalog.get("parameters"), "types": catalog.get("types")}
+                check("type catalog, %s, %d bytes" % (label, len(raw)),
+                      got == expected, got["types"][0]["name"] if got["types"] else got)
+
+        bad = os.path.join(tmp, "not_a_family.rfa")
+        with open(bad, "wb") as f:
+            f.write(b"PK\x03\x04" + b"\0" * 1024)
+        try:
+            rfa.describe_family_file(bad)
+            check("not a compound file -> RfaError", False)
+        except rfa.RfaError as ex:
+            check("not a compound file -> RfaError", True, ex)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--types", type=int, default=60)
+    args = ap.parse_args()
+    return 0 if run(args.types) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Route-level benchmarks on synthetic models, stored per commit.
+
+Usage:
+    python bench/run_bench.py [--scales 1000 10000 100000] [--repeat 5] [--route levels]
+                              [--save] [--compare [COMMIT]] [--threshold 1.25]
+
+Every route registered by the extension is called against a fake document of
+each size (see model.py) and timed with the Python overhead of the route
+itself: collectors, lookups, serialization and logging. Revit's own cost is
+not modelled, so compare runs with each other, not with Revit.
+
+--save writes bench/results/<commit>.json ("-dirty" when the tree has local
+changes). --compare prints the ratio of medians against the results of
+COMMIT (default: the newest saved result of another commit) and exits with
+status 1 when any route got slower than --threshold.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import harness
+import model
+
+RESULTS_DIR = os.path.join(harness.HERE, "results")
+NOISE_FLOOR_MS = 0.05  # medians below this are too small to compare
+
+
+def scenarios(info):
+    """(name, method, path, body) for every route; write routes create a few elements each call."""
+    lvl = info["levels"][0]
+    col_id = info["columnIds"][0] if info["columnIds"] else -1
+    fam_id = info["columnFamilyId"]
+    sym_id = info["inactiveSymbolIds"][0]
+    rfa = os.path.join(tempfile.gettempdir(), "revit_mcp_bench_family.rfa")
+    if not os.path.exists(rfa):
+        open(rfa, "wb").close()
+    pts = [[float(i), float(i % 2), 0.0] for i in range(50)]
+    curves = [{"type": "line", "points": [[float(i), 0.0, 0.0], [float(i) + 0.5, 1.0, 0.0]]} for i in range(200)]
+    return [
+        ("status", "GET", "/status/", None),
+        ("levels", "GET", "/levels/", None),
+        ("types", "GET", "/types/", None),
+        ("validate_create_wall_line", "POST", "/validate/create_wall_line/",
+         {"level": info["levels"][-1], "wall_type": info["wallTypes"][-1], "x1": 0, "y1": 0, "x2": 10, "y2": 0}),
+        ("validate_place_column", "POST", "/validate/place_column/", {"level": lvl, "type": info["columnTypes"][-1]}),
+        ("create_wall_line", "POST", "/create_wall_line/",
+         {"level": lvl, "wall_type": info["wallTypes"][-1], "x1": 0, "y1": 0, "x2": 10, "y2": 0}),
+        ("place_column", "POST", "/place_column/", {"level": lvl, "type": info["columnTypes"][-1], "x": 5, "y": 5}),
+        ("quantify_walls", "GET", "/quantify/walls/", None),
+        ("validate_rebar_cage_column", "POST", "/validate/rebar_cage_column/",
+         {"columnId": col_id, "barType": info["barTypes"][-1], "stirrupShape": info["rebarShapes"][-1]}),
+        ("place_rebar_cage_column", "POST", "/place/rebar_cage_column/",
+         {"columnId": col_id, "barType": info["barTypes"][-1], "stirrupShape": info["rebarShapes"][1]}),
+        ("families", "GET", "/families/", None),
+        ("family_symbols", "GET", "/families/%d/symbols/" % fam_id, None),
+        ("search_libraries", "POST", "/families/search_libraries/", {"familyName": "M_Concrete-Rectangular-Column"}),
+        ("load_family", "POST", "/families/load/", {"filePath": rfa}),
+        ("activate_symbol", "POST", "/families/symbols/%d/activate/" % sym_id, None),
+        ("search_families", "POST", "/families/search/", {"query": "column"}),
+        ("validate_detail_line_view", "GET", "/validate/detail_line_view/", None),
+        ("draw_detail_line", "POST", "/draw_detail_line/", {"x1": 0, "y1": 0, "x2": 5, "y2": 5}),
+        ("draw_detail_lines", "POST", "/draw_detail_lines/", {"curves": curves}),
+        ("draw_model_line", "POST", "/draw_model_line/", {"x1": 0, "y1": 0, "z1": 0, "x2": 5, "y2": 5, "z2": 0}),
+        ("draw_model_polyline", "POST", "/draw_model_polyline/", {"points": pts}),
+        ("draw_curves_model", "POST", "/draw_curves/", {"mode": "model", "curves": curves, "chunk": 0}),
+        ("profile_status", "GET", "/debug/profile/", None),
+        ("query_elements", "POST", "/elements/query/",
+         {"categories": ["OST_Walls"], "filters": [{"parameter": "HOST_AREA_COMPUTED", "op": "gt", "value": 50.0}],
+          "fields": ["Mark", "HOST_AREA_COMPUTED"], "limit": 100}),
+        ("get_parameters_bulk", "POST", "/parameters/get_bulk/",
+         {"elementIds": info["columnIds"][:200], "parameters": ["Mark", "Comments", "Structural Material"]}),
+        ("set_parameters_bulk", "POST", "/parameters/set_bulk/",
+         {"elementIds": info["columnIds"][:200], "values": {"Mark": "C", "Comments": "bench"}}),
+        ("snapshot", "POST", "/snapshot/", {"path": os.path.join(tempfile.gettempdir(), "revit_mcp_bench_snapshot")}),
+        ("spatial_nearby", "POST", "/spatial/nearby/", {"x": 5, "y": 5, "radius": 10, "level": lvl}),
+        ("spatial_overlaps", "POST", "/spatial/overlaps/", {"elementId": col_id, "tolerance": 1.0}),
+        ("place_column_clash_check", "POST", "/place_column/",
+         {"level": lvl, "type": info["columnTypes"][-1], "x": 5, "y": 5, "clashCheck": True}),
+        ("reconcile_layout_dry_run", "POST", "/layout/reconcile/",
+         {"level": lvl, "columns": [{"x": 5, "y": 5}], "walls": [{"x1": 0, "y1": 0, "x2": 10, "y2": 0}],
+          "dryRun": True}),
+        ("grids", "GET", "/grids/", None),
+        ("grid_intersections", "POST", "/grids/intersections/", {"first": "A-F", "second": "1-8"}),
+        ("place_columns_at_grids", "POST", "/place/columns_at_grids/",
+         {"level": lvl, "first": "A-F", "second": "1-8", "type": info["columnTypes"][0]}),
+        ("place_beams_grid", "POST", "/place_beams/", {"level": lvl, "connect": "grid", "tolerance": 0.01}),
+        ("place_beams", "POST", "/place_beams/",
+         {"level": lvl, "beams": [{"x1": 0, "y1": 20.0 * i, "x2": 20, "y2": 20.0 * i} for i in range(50)],
+          "skipExisting": False}),
+        ("place_rebar_cages", "POST", "/place/rebar_cages/",
+         {"cages": [{"columnId": i, "barType": "12.5mm", "stirrupBarType": "6.3mm", "barsX": 2, "barsY": 3}
+                    for i in info["columnIds"][:20]]}),
+        ("quantify_rebar", "POST", "/quantify/rebar/", {"groupBy": ["level", "diameter"]}),
+        ("quantify_rebar_per_host", "POST", "/quantify/rebar/", {"perHost": True, "limit": 100}),
+    ]
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(("git",) + args, cwd=harness.ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(scales, repeat, route_filter=None):
+    api = harness.load_api()
+    results = {}
+    for n in scales:
+        t0 = time.perf_counter()
+        doc, info = model.build_model(n)
+        build_s = time.perf_counter() - t0
+        harness.activate(doc, info["activeView"])
+        print("\n%d elements (built in %.1fs)" % (n, build_s))
+        print("%-28s %10s %10s %10s %7s" % ("route", "min ms", "median ms", "max ms", "status"))
+        rows = {}
+        for name, method, path, body in scenarios(info):
+            if route_filter and route_filter not in name and route_filter not in path:
+                continue
+            times = []
+            status = None
+            for i in range(repeat + 1):  # first call warms up caches and imports
+                payload = json.loads(json.dumps(body)) if body is not None else None
+                t = time.perf_counter()
+                resp = api.dispatch(method, path, payload)
+                ms = (time.perf_counter() - t) * 1000.0
+                status = resp.status
+                if i:
+                    times.append(ms)
+            rows[name] = {
+                "path": "%s %s" % (method, path),
+                "status": status,
+                "minMs": round(min(times), 4),
+                "medianMs": round(statistics.median(times), 4),
+                "meanMs": round(statistics.mean(times), 4),
+                "maxMs": round(max(times), 4),
+                "repeat": repeat,
+            }
+            flag = "" if status < 400 else "  <-- %s" % str(resp.data.get("error"))[:60]
+            print("%-28s %10.3f %10.3f %10.3f %7d%s" % (name, min(times), statistics.median(times), max(times),
+                                                        status, flag))
+        results[str(n)] = rows
+    return results
+
+
+def save(results):
+    commit = _git("rev-parse", "--short", "HEAD") or "nogit"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    if not os.path.isdir(RESULTS_DIR):
+        os.makedirs(RESULTS_DIR)
+    path = os.path.join(RESULTS_DIR, "%s%s.json" % (commit, "-dirty" if dirty else ""))
+    with open(path, "w") as f:
+        json.dump({"commit": commit, "dirty": dirty, "timestamp": time.time(), "python": platform.python_version(),
+                   "scales": results}, f, indent=1, sort_keys=True)
+    return path
+
+
+def _baseline(commit):
+    if commit:
+        matches = sorted(glob.glob(os.path.join(RESULTS_DIR, "%s*.json" % commit)))
+        return matches[0] if matches else None
+    head = _git("rev-parse", "--short", "HEAD")
+    candidates = [p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json"))
+                  if not os.path.basename(p).startswith(head or "\0")]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        base = json.load(f)
+    print("\nCompared with %s (median ratio, >%.2f flagged)" % (base["commit"], threshold))
+    regressions = 0
+    for scale, rows in sorted(results.items(), key=lambda kv: int(kv[0])):
+        old_rows = base["scales"].get(scale, {})
+        for name, row in sorted(rows.items()):
+            old = old_rows.get(name)
+            if old is None:
+                continue
+            new_ms, old_ms = row["medianMs"], old["medianMs"]
+            if max(new_ms, old_ms) < NOISE_FLOOR_MS:
+                continue
+            ratio = new_ms / old_ms if old_ms else float("inf")
+            mark = ""
+            if ratio > threshold:
+                mark = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1.0 / threshold:
+                mark = "  faster"
+            print("%8s %-28s %10.3f -> %10.3f  x%.2f%s" % (scale, name, old_ms, new_ms, ratio, mark))
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scales", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--route", default=None, help="only routes whose name or path contains this")
+    ap.add_argument("--save", action="store_true")
+    ap.add_argument("--compare", nargs="?", const="", default=None, metavar="COMMIT")
+    ap.add_argument("--threshold", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    results = run(args.scales, args.repeat, args.route)
+    status = 0
+    if args.compare is not None:
+        baseline = _baseline(args.compare)
+        if baseline is None:
+            print("\nNo saved results to compare with.")
+        elif compare(results, baseline, args.threshold):
+            status = 1
+    if args.save:
+        print("\nSaved %s" % save(results))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Simulated pyRevit routes server for load tests.
+
+Serves /revit_mcp/... like the extension does, by dispatching to the real
+route modules on a synthetic fake model (see harness.py), then padding each
+request to a configured service time. Requests hold one lock while they run,
+the way Revit executes routes one at a time on its UI thread, so concurrent
+callers queue exactly as they would against Revit.
+
+Usage:
+    python bench/sim_routes.py [--port 48884] [--elements 10000] [--service-times times.json]
+                               [--time-scale 1.0] [--jitter 0.2]
+
+times.json maps route keys to milliseconds, e.g. {"GET /levels/": 15,
+"POST /place/rebar_cage_column/": 900}; unlisted routes use SERVICE_MS or
+--default-ms. GET /revit_mcp/_sim/info/ returns ids and names of the
+synthetic model for load generators.
+
+POST /revit_mcp/_sim/stall/ {"seconds": 30} simulates a modal dialog: routes
+stop answering until it is closed, then the requests held meanwhile run.
+{"seconds": 0} closes it early.
+"""
+import argparse
+import inspect
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import harness
+import model
+from revit_mcp import metrics as route_metrics
+
+PREFIX = "/revit_mcp"
+
+# Rough service times (ms) of routes in Revit on a mid-size project.
+SERVICE_MS = {
+    "GET /status/": 2,
+    "GET /levels/": 15,
+    "GET /types/": 40,
+    "GET /quantify/walls/": 400,
+    "GET /families/": 60,
+    "GET /families/<id>/symbols/": 20,
+    "GET /validate/detail_line_view/": 5,
+    "POST /validate/create_wall_line/": 20,
+    "POST /validate/place_column/": 20,
+    "POST /create_wall_line/": 120,
+    "POST /place_column/": 150,
+    "POST /validate/rebar_cage_column/": 25,
+    "POST /place/rebar_cage_column/": 900,
+    "POST /families/search/": 60,
+    "POST /families/search_libraries/": 300,
+    "POST /families/load/": 1500,
+    "POST /families/symbols/<id>/activate/": 200,
+    "POST /draw_detail_line/": 60,
+    "POST /draw_detail_lines/": 250,
+    "POST /draw_model_line/": 80,
+    "POST /draw_model_polyline/": 200,
+    "POST /draw_curves/": 600,
+}
+
+
+def _plain(obj):
+    """The routes return UTF-8 bytes for strings (IronPython convention); make them JSON-safe."""
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", "replace")
+    if isinstance(obj, dict):
+        return dict((_plain(k), _plain(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    return obj
+
+
+class SimulatedRevit(object):
+    def __init__(self, elements=10000, service_ms=None, default_ms=20.0, time_scale=1.0, jitter=0.2, seed=1):
+        self.api = harness.load_api()
+        self.doc, self.info = model.build_model(elements, seed=seed)
+        harness.activate(self.doc, self.info["activeView"])
+        self.service_ms = dict(SERVICE_MS)
+        self.service_ms.update(service_ms or {})
+        self.default_ms = default_ms
+        self.time_scale = time_scale
+        self.jitter = jitter
+        self.lock = threading.Lock()  # Revit's single API thread
+        self.rnd = random.Random(seed)
+        self.served = 0
+        self.stall_until = 0.0
+
+    def public_info(self):
+        return dict((k, v) for k, v in self.info.items() if k != "activeView")
+
+    def stall(self, seconds):
+        self.stall_until = time.time() + max(0.0, seconds)
+
+    def target_ms(self, key):
+        ms = self.service_ms.get(key, self.default_ms) * self.time_scale
+        if self.jitter:
+            ms *= 1.0 + self.rnd.uniform(-self.jitter, self.jitter)
+        return max(0.0, ms)
+
+    def handle(self, method, path, body, headers=None):
+        """Run one request to completion; returns (status, data, headers)."""
+        if path == "/_sim/info/":
+            return 200, self.public_info(), {}
+        if path == "/_sim/stall/":
+            self.stall(float((body or {}).get("seconds", 30)))
+            return 200, {"stalledForSeconds": max(0.0, self.stall_until - time.time())}, {}
+        fn, _ = self.api.find(method, path)
+        if fn is not None and "doc" not in inspect.signature(fn).parameters:
+            # pyRevit runs doc-less routes (/cancel/) on its server thread, not Revit's
+            resp = self.api.dispatch(method, path, body, headers)
+            return resp.status, _plain(resp.data), dict(resp.headers or {})
+        key = route_metrics.route_key(method, path)
+        while time.time() < self.stall_until:  # modal dialog: Revit is not idling
+            time.sleep(0.02)
+        with self.lock:
+            t0 = time.perf_counter()
+            resp = self.api.dispatch(method, path, body, headers)
+            remaining = self.target_ms(key) / 1000.0 - (time.perf_counter() - t0)
+            if remaining > 0:
+                time.sleep(remaining)
+            self.served += 1
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        headers = dict(resp.headers or {})
+        headers["X-Revit-Duration-Ms"] = "%.3f" % elapsed_ms
+        return resp.status, _plain(resp.data), headers
+
+
+def make_handler(sim):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _serve(self, method):
+            if not self.path.startswith(PREFIX + "/"):
+                return self._send(404, {"error": "Unknown API"}, {})
+            body = None
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length).decode("utf-8"))
+                except ValueError:
+                    return self._send(400, {"error": "Invalid JSON body"}, {})
+            path = self.path[len(PREFIX):].split("?", 1)[0]
+            try:
+                status, data, headers = sim.handle(method, path, body, dict(self.headers.items()))
+            except Exception as ex:  # a crash in the fakes, not a route error
+                status, data, headers = 500, {"error": "simulator: %s" % ex}, {}
+            self._send(status, data, headers)
+
+        def _send(self, status, data, headers):
+            payload = json.dumps(data, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._serve("GET")
+
+        def do_POST(self):
+            self._serve("POST")
+
+    return Handler
+
+
+def serve(sim, host="127.0.0.1", port=48884):
+    """Start the server on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(sim))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="sim-routes", daemon=True).start()
+    return server, "http://%s:%d%s" % (host, server.server_address[1], PREFIX)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=48884)
+    ap.add_argument("--elements", type=int, default=10000)
+    ap.add_argument("--service-times", default=None, help="JSON file of {route key: ms}")
+    ap.add_argument("--default-ms", type=float, default=20.0)
+    ap.add_argument("--time-scale", type=float, default=1.0, help="multiply every service time")
+    ap.add_argument("--jitter", type=float, default=0.2)
+    args = ap.parse_args(argv)
+    service_ms = None
+    if args.service_times:
+        with open(args.service_times) as f:
+            service_ms = json.load(f)
+    sim = SimulatedRevit(args.elements, service_ms, args.default_ms, args.time_scale, args.jitter)
+    server, url = serve(sim, args.host, args.port)
+    print("Simulated routes at %s (%d elements); Ctrl+C to stop" % (url, args.elements))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Check snapshot-backed reads against the live routes on a synthetic model.
+
+Takes a snapshot through the extension's /snapshot/ route (fake DB), loads
+it with the MCP server's revit_mcp/snapshot.py and runs its LocalReads
+behind a real change event stream (extension SSE server on a free port).
+Checks:
+
+1. while the model is unchanged, /levels/, /types/, /families/,
+   /families/search/ and /quantify/walls/ are answered locally with the
+   same body the live route returns;
+2. a DocumentChanged makes the snapshot stale (reads go live) until a new
+   snapshot is taken;
+3. switching to another document, losing the stream or a Revit restart
+   (new epoch) also send reads live;
+4. aggregations give the same result with and without NumPy;
+5. in a Portuguese Revit ("Paredes") /quantify/walls/ still answers locally
+   with the live walls, and goes live when the snapshot has no walls.
+
+Usage:
+    python bench/snapshot_check.py [--elements 20000]
+
+Needs httpx. Exits 1 if a check fails.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import harness
+import model
+import sim_routes
+from revit_mcp import events as feed
+
+sys.path.append(os.path.join(harness.ROOT, "revit_mcp"))
+import events as client  # noqa: E402  (the MCP server's modules)
+import snapshot as snapshots  # noqa: E402
+
+BASE = "http://127.0.0.1:48884/revit_mcp"
+READS = (("GET", "/levels/", None), ("GET", "/types/", None), ("GET", "/families/", None),
+         ("POST", "/families/search/", {"query": "column"}),
+         ("POST", "/families/search/", {"query": "", "category": "Doors"}),
+         ("GET", "/quantify/walls/", None))
+
+
+class _Ids(list):
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _Changed(object):
+    """DocumentChangedEventArgs stand-in."""
+
+    def __init__(self, doc, modified):
+        self._doc, self._modified = doc, modified
+        self.Operation = "TransactionCommitted"
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetAddedElementIds(self):
+        return _Ids()
+
+    def GetModifiedElementIds(self):
+        return _Ids(self._modified)
+
+    def GetDeletedElementIds(self):
+        return _Ids()
+
+    def GetTransactionNames(self):
+        return ["MCP: test"]
+
+
+class _Opened(object):
+    def __init__(self, title):
+        self.Document = type("Doc", (), {"Title": title})()
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+def _live(api, method, path, body):
+    resp = api.dispatch(method, path, dict(body) if body else None)
+    return sim_routes._plain(resp.data)
+
+
+def _take(api):
+    resp = api.dispatch("POST", "/snapshot/", {})
+    return snapshots.load(sim_routes._plain(resp.data)["path"])
+
+
+async def run(n):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    api = harness.load_api()
+    doc, info = model.build_model(n)
+    harness.activate(doc, info["activeView"])
+
+    server = feed.start_stream_server(port=0)
+    port = server.server_address[1]
+    stream = client.EventStream("http://127.0.0.1:%d/events" % port, client.ReadCache())
+    local = snapshots.LocalReads(stream)
+    stream.ensure_started()
+    await _until(lambda: stream.live)
+
+    def answers():
+        return [local.answer(m, BASE + p, b) for m, p, b in READS]
+
+    check("no snapshot -> live", answers() == [None] * len(READS), local.stale_reason(None))
+    snap = _take(api)
+    fresh = answers()
+    same = [a == _live(api, m, p, b) for a, (m, p, b) in zip(fresh, READS)]
+    check("fresh snapshot answers every read like the live route", all(same), same)
+
+    feed._on_document_changed(None, _Changed(doc, [doc.GetElement(model.DB.ElementId(info["columnIds"][0])).Id]))
+    await _until(lambda: stream.last_id == feed.last_id())
+    check("document change -> stale", answers() == [None] * len(READS), local.stale_reason(snap))
+    snap = _take(api)
+    check("new snapshot -> fresh again", None not in answers())
+
+    feed._on_document_opened(None, _Opened("Other Project"))
+    await _until(lambda: stream.last_id == feed.last_id())
+    check("other document active -> live", local.stale_reason(snap) == "otherDocument")
+    snap = _take(api)  # back on the synthetic model
+
+    feed.stop_stream_server(server)
+    await _until(lambda: not stream.live)
+    check("stream down -> live", local.answer("GET", BASE + "/levels/") is None, local.stale_reason(snap))
+    feed.EPOCH = "restarted"
+    server = feed.start_stream_server(port=port)
+    await _until(lambda: stream.live, timeout=15.0)
+    check("Revit restarted -> live", local.stale_reason(snap) == "revitRestarted")
+    snap = _take(api)
+    check("snapshot in the new session -> fresh", local.stale_reason(snap) is None)
+
+    for args in (("HOST_VOLUME_COMPUTED", "sum", "level", None), (None, "count", "category", None),
+                 ("HOST_AREA_COMPUTED", "mean", "type", ["Walls"]), ("max_z", "max", None, None)):
+        with_np = snap.aggregate(*args)
+        saved, snapshots.np = snapshots.np, None
+        try:
+            without = snapshots.Snapshot(snap.path).aggregate(*args)
+        finally:
+            snapshots.np = saved
+        same = abs((with_np["value"] or 0) - (without["value"] or 0)) <= 1e-9 * max(1.0, abs(with_np["value"] or 0))
+        same = same and [(g["key"], g["count"]) for g in with_np.get("groups", [])] == \
+            [(g["key"], g["count"]) for g in without.get("groups", [])]
+        check("aggregate %s/%s by %s: NumPy == pure Python" % (args[0], args[1], args[2]), same,
+              "%.1f ms vs %.1f ms" % (with_np["ms"], without["ms"]))
+
+    walls = model.DB.Category.of(model.DB.BuiltInCategory.OST_Walls)
+    walls.Name = u"Paredes"
+    try:
+        snap = _take(api)
+        answer = local.answer("GET", BASE + "/quantify/walls/")
+        check("localized wall category -> same walls as live", answer is not None and answer["total_walls"] > 0
+              and answer == _live(api, "GET", "/quantify/walls/", None), (answer or {}).get("total_walls"))
+    finally:
+        walls.Name = "Walls"
+    del snap.categories[snapshots.OST_WALLS]
+    check("no walls in the snapshot -> live", local.answer("GET", BASE + "/quantify/walls/") is None)
+
+    stream._task.cancel()
+    feed.stop_stream_server(server)
+    print(local.snapshot()["routes"], local.snapshot()["liveReasons"])
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--elements", type=int, default=20000)
+    args = ap.parse_args()
+    return 0 if asyncio.run(run(args.elements)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
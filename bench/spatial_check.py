@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Check the spatial index against a brute-force scan on a synthetic model.
+
+Runs /spatial/nearby/ and /spatial/overlaps/ through the extension's routes
+(fake DB) and compares each answer with a scan over every element's world
+bounding box. Then places and deletes columns, delivers the matching
+DocumentChanged events (as Revit would after the commit) and checks:
+
+1. nearby and overlap queries return exactly the brute-force ids;
+2. a column placed with clashCheck on top of an existing one is refused,
+   and one placed in free space is created;
+3. added and deleted elements show up in the next query without a rebuild;
+4. a truncated change event drops the index and the next query rebuilds it;
+5. with clashCheck a wall may join an existing wall at an L corner, a T or
+   in line, but not cross it or run alongside it.
+
+Usage:
+    python bench/spatial_check.py [--elements 20000] [--queries 200]
+
+Exits 1 if a check fails.
+"""
+import argparse
+import random
+import sys
+import time
+
+import harness
+import model
+import sim_routes
+from revit_mcp import events, spatial
+from revit_mcp.snapshot import element_level_id, is_model_element, world_box
+
+DB = model.DB
+
+
+class _Ids(list):
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _Changed(object):
+    """DocumentChangedEventArgs stand-in."""
+
+    def __init__(self, doc, added=(), deleted=()):
+        self._doc, self._added, self._deleted = doc, added, deleted
+        self.Operation = "TransactionCommitted"
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetAddedElementIds(self):
+        return _Ids(DB.ElementId(i) for i in self._added)
+
+    def GetModifiedElementIds(self):
+        return _Ids()
+
+    def GetDeletedElementIds(self):
+        return _Ids(DB.ElementId(i) for i in self._deleted)
+
+    def GetTransactionNames(self):
+        return ["MCP: test"]
+
+
+def _call(api, path, body):
+    resp = api.dispatch("POST", path, body)
+    return resp.status, sim_routes._plain(resp.data)
+
+
+def _boxes(doc):
+    out = {}
+    for el in DB.FilteredElementCollector(doc).WhereElementIsNotElementType():
+        if not is_model_element(el) or isinstance(el, (DB.Level, DB.Grid)):
+            continue
+        box = world_box(el)
+        if box is not None:
+            out[int(el.Id.IntegerValue)] = (box, element_level_id(el))
+    return out
+
+
+def _brute_nearby(boxes, x, y, radius, level):
+    return sorted(eid for eid, (b, lv) in boxes.items()
+                  if (level is None or lv == level) and spatial._point_box_distance(x, y, None, b) <= radius)
+
+
+def _brute_overlaps(boxes, box, exclude):
+    return sorted(eid for eid, (b, _) in boxes.items()
+                  if eid != exclude and b[0] <= box[3] and b[3] >= box[0] and b[1] <= box[4]
+                  and b[4] >= box[1] and b[2] <= box[5] and b[5] >= box[2])
+
+
+def run(n, queries):
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append(passed)
+        print("%-4s %s%s" % ("ok" if passed else "FAIL", name, " (%s)" % detail if detail else ""))
+
+    api = harness.load_api()
+    doc, info = model.build_model(n)
+    harness.activate(doc, info["activeView"])
+    events.installed = True  # events are delivered by hand below
+    rng = random.Random(7)
+    boxes = _boxes(doc)
+    extent = max(max(b[3], b[4]) for b, _ in boxes.values())
+    level = int(spatial.find_level_by_name(doc, info["levels"][0]).Id.IntegerValue)
+
+    t0 = time.perf_counter()
+    status, first = _call(api, "/spatial/nearby/", {"x": 0, "y": 0, "radius": 1})
+    build_ms = (time.perf_counter() - t0) * 1000.0
+
+    mismatches = 0
+    route_us = []
+    for _ in range(queries):
+        x, y, r = rng.uniform(0, extent), rng.uniform(0, extent), rng.uniform(0.5, 25.0)
+        t = time.perf_counter()
+        _, res = _call(api, "/spatial/nearby/", {"x": x, "y": y, "radius": r, "levelId": level,
+                                                 "limit": spatial.MAX_LIMIT})
+        route_us.append((time.perf_counter() - t) * 1e6)
+        if sorted(e["id"] for e in res["elements"]) != _brute_nearby(boxes, x, y, r, level):
+            mismatches += 1
+    check("nearby == brute force (%d queries)" % queries, mismatches == 0, "%d mismatches" % mismatches)
+
+    mismatches = 0
+    ids = sorted(boxes)
+    for eid in rng.sample(ids, min(queries, len(ids))):
+        _, res = _call(api, "/spatial/overlaps/", {"elementId": eid, "limit": spatial.MAX_LIMIT})
+        if sorted(e["id"] for e in res["elements"]) != _brute_overlaps(boxes, boxes[eid][0], eid):
+            mismatches += 1
+    check("overlaps == brute force (%d queries)" % min(queries, len(ids)), mismatches == 0,
+          "%d mismatches" % mismatches)
+
+    col = doc.GetElement(DB.ElementId(info["columnIds"][0]))
+    p = col.Location.Point
+    body = {"x": p.X, "y": p.Y, "level": doc.GetElement(col.LevelId).Name, "type": info["columnTypes"][-1],
+            "clashCheck": True}
+    _, res = _call(api, "/place_column/", body)
+    check("clashCheck refuses a column on top of another", res.get("ok") is False
+          and col.Id.IntegerValue in [c["id"] for c in res.get("clashes", [])], res.get("error"))
+
+    free = (-50.0, -50.0)
+    _, res = _call(api, "/place_column/", dict(body, x=free[0], y=free[1]))
+    new_id = res.get("elementId")
+    check("clashCheck places a column in free space", res.get("ok") is True)
+    events._on_document_changed(None, _Changed(doc, added=[new_id]))
+    _, res = _call(api, "/spatial/nearby/", {"x": free[0], "y": free[1], "radius": 0.1})
+    check("added column is indexed from its change event", [e["id"] for e in res["elements"]] == [new_id],
+          "updates=%s" % res["index"]["updates"])
+
+    _, res = _call(api, "/place_column/", dict(body, x=free[0], y=free[1]))
+    check("second column at the same spot is refused", res.get("ok") is False)
+
+    t = DB.Transaction(doc, "delete")
+    t.Start()
+    doc.Delete(DB.ElementId(new_id))
+    t.Commit()
+    events._on_document_changed(None, _Changed(doc, deleted=[new_id]))
+    _, res = _call(api, "/spatial/nearby/", {"x": free[0], "y": free[1], "radius": 0.1})
+    check("deleted column leaves the index", res["count"] == 0)
+
+    built = res["index"]["buildMs"]
+    events.publish("document_changed", document=doc.Title, added=[], modified=[], deleted=[], truncated=True)
+    _, res = _call(api, "/spatial/nearby/", {"x": 0, "y": 0, "radius": 1})
+    check("truncated event rebuilds the index", res["index"]["updates"] == 0 and res["index"]["buildMs"] != built)
+
+    # 5. wall joins: existing wall (0, 0)-(20, 0), offset into free space
+    ox, oy = -200.0, -200.0
+    wall = {"level": info["levels"][0], "wall_type": info["wallTypes"][2], "clashCheck": True}
+    _, res = _call(api, "/create_wall_line/", dict(wall, x1=ox, y1=oy, x2=ox + 20, y2=oy))
+    events._on_document_changed(None, _Changed(doc, added=[res.get("elementId")]))
+    cases = (("L corner", (20, 0, 20, 15), True), ("T onto the wall", (10, 0, 10, -15), True),
+             ("in line", (20, 0, 35, 0), True), ("crossing", (5, -5, 5, 5), False),
+             ("alongside", (2, 0.2, 18, 0.2), False))
+    for name, (x1, y1, x2, y2), allowed in cases:
+        _, res = _call(api, "/validate/create_wall_line/",
+                       dict(wall, x1=ox + x1, y1=oy + y1, x2=ox + x2, y2=oy + y2))
+        check("wall %s %s" % (name, "allowed" if allowed else "refused"), res.get("canCreate") is allowed,
+              res.get("reason"))
+
+    route_us.sort()
+    print("%d elements: build %.1f ms, nearby route median %.0f us (first index query %.0f us), stats %s"
+          % (n, build_ms, route_us[len(route_us) // 2], first["queryUs"], first["index"]))
+    return all(checks)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--elements", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+    return 0 if run(args.elements, args.queries) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Check the MCP server's retry/circuit breaker against a stalled Revit.
+
+Runs revit_mcp/main.py over stdio against sim_routes.py with short timeouts,
+then simulates a modal dialog and checks that:
+
+1. calls work before the stall;
+2. during the stall, after FAILURE_THRESHOLD timeouts, calls fail fast
+   (well under the timeout) instead of each waiting it out;
+3. get_status reports "unavailable" with the breaker state;
+4. after the dialog closes, calls succeed again without intervention.
+
+Usage:
+    python bench/stall_check.py [--timeout 2] [--stall 12]
+
+Needs the MCP server's dependencies (mcp, httpx). Exits 1 if a check fails.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import harness
+import sim_routes
+from loadgen import MAIN_PY
+
+
+async def _timed(session, tool, args=None):
+    t0 = time.perf_counter()
+    result = await session.call_tool(tool, args or {})
+    text = result.content[0].text if result.content else ""
+    return bool(result.isError), (time.perf_counter() - t0), text
+
+
+async def run(url, sim, timeout, stall):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    env = dict(os.environ)
+    env.update({"REVIT_ROUTES_URL": url, "REVIT_MCP_GET_TIMEOUT": str(timeout),
+                "REVIT_MCP_POST_TIMEOUT": str(timeout)})
+    params = StdioServerParameters(command=sys.executable, args=[MAIN_PY], env=env, cwd=os.path.dirname(MAIN_PY))
+    checks = []
+
+    def check(name, passed, detail):
+        checks.append(passed)
+        print("%-4s %s (%s)" % ("ok" if passed else "FAIL", name, detail))
+
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            failed, secs, _ = await _timed(session, "get_levels")
+            check("call before stall", not failed, "%.2fs" % secs)
+
+            sim.stall(stall)
+            t_stall = time.perf_counter()
+            fast = []
+            while time.perf_counter() - t_stall < stall * 0.6:
+                failed, secs, _ = await _timed(session, "get_levels")
+                fast.append(secs)
+            slow = [s for s in fast if s >= timeout * 0.5]
+            quick = [s for s in fast if s < 0.2]
+            check("breaker opens: few calls wait for the timeout", len(slow) <= 3, "%d of %d waited" % (
+                len(slow), len(fast)))
+            check("breaker open: calls fail fast", len(quick) >= 1, "%d failed in <0.2s" % len(quick))
+
+            failed, secs, text = await _timed(session, "get_status")
+            status = json.loads(text) if text.startswith("{") else {}
+            check("get_status reports unavailable", status.get("status") == "unavailable",
+                  "%s in %.2fs" % (status.get("status"), secs))
+
+            while time.time() < sim.stall_until:
+                await asyncio.sleep(0.1)
+            t_up = time.perf_counter()
+            recovered = None
+            while time.perf_counter() - t_up < 60:
+                failed, secs, _ = await _timed(session, "get_levels")
+                if not failed:
+                    recovered = time.perf_counter() - t_up
+                    break
+                await asyncio.sleep(0.2)
+            check("recovers after the dialog closes", recovered is not None,
+                  "%.1fs after" % recovered if recovered is not None else "not within 60s")
+    return all(checks)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--timeout", type=float, default=2.0, help="MCP server GET/POST timeout (s)")
+    ap.add_argument("--stall", type=float, default=12.0, help="modal dialog duration (s)")
+    ap.add_argument("--elements", type=int, default=2000)
+    args = ap.parse_args(argv)
+    sim = sim_routes.SimulatedRevit(args.elements, time_scale=0.1)
+    server, url = sim_routes.serve(sim, port=0)
+    try:
+        ok = asyncio.run(run(url, sim, args.timeout, args.stall))
+    finally:
+        sim.stall(0)
+        server.shutdown()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
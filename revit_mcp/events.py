@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Change events from Revit, and the GET cache they keep fresh.
+
+EventStream holds the extension's SSE stream (RevitMCP.extension/revit_mcp/
+events.py) open and reconnects with backoff, sending the last event id as
+Last-Event-ID so nothing is missed across reconnects. ReadCache answers
+repeated GETs (levels, types, families, wall quantities) from memory while
+the stream is live:
+
+- document_changed drops the entries whose data the change can affect
+  (by category, or element types); deletions and truncated events drop all;
+- a document switch, open/close or a "reset" (events were missed) drops all;
+- while the stream is down nothing is served from the cache.
+
+Set REVIT_EVENTS_URL="" to disable (every GET then goes to Revit).
+"""
+import asyncio
+import json
+import time
+
+import httpx
+from resilience import backoff
+
+CACHE_TTL = 300.0  # upper bound even while the stream is live
+MAX_BACKOFF_ATTEMPT = 6
+OST_LEVELS, OST_WALLS = -2000240, -2000011  # events carry category ids, not localized names
+
+# (path prefix, predicate(document_changed event) -> entry is stale)
+RULES = (
+    ("/levels/", lambda e: OST_LEVELS in e.get("categories", ())),
+    ("/types/", lambda e: e.get("elementTypes")),
+    ("/families/", lambda e: e.get("elementTypes")),
+    ("/quantify/walls/", lambda e: OST_WALLS in e.get("categories", ())),
+)
+CLEAR_ALL = ("reset", "document_opened", "document_closed")
+
+
+def _path(url):
+    return url.split("/revit_mcp", 1)[-1].split("?", 1)[0]
+
+
+def _rule(url):
+    path = _path(url)
+    for prefix, stale in RULES:
+        if path.startswith(prefix):
+            return stale
+    return None
+
+
+class ReadCache(object):
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self.live = False
+        self.generation = 0  # bumped on every invalidation; put() ignores answers fetched before it
+        self._entries = {}  # url -> (value, stored at)
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "clears": 0}
+
+    def cacheable(self, url):
+        return _rule(url) is not None
+
+    def get(self, url):
+        if not self.live or not self.cacheable(url):
+            return None
+        entry = self._entries.get(url)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return entry[0]
+
+    def put(self, url, value, generation):
+        if self.live and generation == self.generation and self.cacheable(url):
+            self._entries[url] = (value, time.monotonic())
+
+    def clear(self):
+        if self._entries:
+            self._stats["clears"] += 1
+        self._entries.clear()
+        self.generation += 1
+
+    def apply(self, event):
+        kind = event.get("type")
+        if kind in CLEAR_ALL or (kind == "view_activated" and event.get("documentSwitched")):
+            self.clear()
+        elif kind == "document_changed":
+            if event.get("deleted") or event.get("truncated"):
+                self.clear()
+                return
+            self.generation += 1
+            for url in list(self._entries):
+                if _rule(url)(event):
+                    del self._entries[url]
+                    self._stats["invalidations"] += 1
+
+    def snapshot(self):
+        out = {"live": self.live, "entries": len(self._entries)}
+        out.update(self._stats)
+        return out
+
+
+class SSEParser(object):
+    """Incremental Server-Sent Events parser: feed(text) -> [(event, id, data), ...]."""
+
+    def __init__(self):
+        self._rest = ""
+        self._event, self._id, self._data = None, None, []
+
+    def feed(self, chunk):
+        lines = (self._rest + chunk).replace("\r\n", "\n").split("\n")
+        self._rest = lines.pop()  # incomplete last line
+        out = []
+        for line in lines:
+            if line == "":
+                if self._data:
+                    out.append((self._event or "message", self._id, "\n".join(self._data)))
+                self._event, self._id, self._data = None, None, []
+            elif not line.startswith(":"):
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    self._event = value
+                elif field == "id":
+                    self._id = value
+                elif field == "data":
+                    self._data.append(value)
+        return out
+
+
+class EventStream(object):
+    def __init__(self, url, cache):
+        self.url = url
+        self.cache = cache
+        self.last_id = None
+        self.listeners = []  # callables(kind, event) run for every event, "ready" included
+        self._task = None
+        self._stats = {"connects": 0, "events": 0, "resets": 0, "lastError": None}
+
+    def ensure_started(self):
+        """Start the subscriber on the running loop (first tool call); no-op if disabled or running."""
+        if self.url and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+
+    @property
+    def live(self):
+        return self.cache.live
+
+    def _handle(self, kind, event_id, data):
+        event = json.loads(data)
+        for listener in self.listeners:
+            listener(kind, event)
+        if kind == "ready":
+            self.last_id = event.get("lastId") or self.last_id
+            self.cache.live = True  # missed events were replayed: the cache can be trusted again
+            return
+        self._stats["events"] += 1
+        if kind == "reset":
+            self._stats["resets"] += 1
+        self.cache.apply(event)
+        if event_id:
+            self.last_id = event_id
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            try:
+                headers = {"Accept": "text/event-stream"}
+                if self.last_id:
+                    headers["Last-Event-ID"] = self.last_id
+                timeout = httpx.Timeout(5.0, read=None)
+                async with httpx.AsyncClient(timeout=timeout) as c:
+                    async with c.stream("GET", self.url, headers=headers) as r:
+                        r.raise_for_status()
+                        self._stats["connects"] += 1
+                        attempt = 0
+                        parser = SSEParser()
+                        async for chunk in r.aiter_text():
+                            for kind, event_id, data in parser.feed(chunk):
+                                self._handle(kind, event_id, data)
+            except asyncio.CancelledError:
+                self.cache.live = False
+                raise
+            except Exception as ex:
+                self._stats["lastError"] = "%s: %s" % (type(ex).__name__, ex)
+            self.cache.live = False
+            await asyncio.sleep(backoff(min(attempt, MAX_BACKOFF_ATTEMPT)) + 0.5)
+            attempt += 1
+
+    def snapshot(self):
+        out = {"url": self.url or None, "connected": self.cache.live, "lastEventId": self.last_id}
+        out.update(self._stats)
+        out["cache"] = self.cache.snapshot()
+        return out
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""Stream 2D linework from DXF, SVG and GeoJSON files as curve specs.
+
+Every reader is a generator yielding the curve specs understood by the
+geometry routes, so large drawings are never held in memory:
+
+    {"type": "line", "points": [[x, y, z], [x, y, z]]}
+    {"type": "arc",  "points": [start, point_on_arc, end]}
+
+Supported content:
+
+- DXF (ASCII): LINE, LWPOLYLINE, POLYLINE/VERTEX, ARC, CIRCLE. Polyline
+  segments with a bulge (group code 42, rounded corners and fillets) become
+  arcs.
+- SVG: line, polyline, polygon, rect and path (M/L/H/V/Z; C/S/Q/T are
+  flattened). Elliptical arcs (A) become a line to their end point and
+  transforms are ignored. The y axis is flipped so the drawing is not mirrored.
+- GeoJSON: LineString, MultiLineString, Polygon, MultiPolygon and
+  GeometryCollection. ``.geojsonl``/``.ndjson`` files (one feature per line)
+  are read lazily; other GeoJSON files are parsed whole.
+"""
+import json
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+
+BEZIER_STEPS = 8
+
+
+def _line(p, q):
+    return {"type": "line", "points": [list(p), list(q)]}
+
+
+def _polyline(pts, closed=False):
+    if closed and len(pts) > 2 and pts[0] != pts[-1]:
+        pts = list(pts) + [pts[0]]
+    for a, b in zip(pts[:-1], pts[1:]):
+        if a != b:
+            yield _line(a, b)
+
+
+def _arc(cx, cy, z, r, a0, a1):
+    """Counter-clockwise arc from angle a0 to a1 (radians)."""
+    while a1 <= a0:
+        a1 += 2.0 * math.pi
+    am = (a0 + a1) / 2.0
+    pts = [[cx + r * math.cos(a), cy + r * math.sin(a), z] for a in (a0, am, a1)]
+    return {"type": "arc", "points": pts}
+
+
+def _bulge_arc(p, q, bulge):
+    """Arc from p to q for a DXF bulge: tan(included angle / 4), positive counter-clockwise."""
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    # The arc's midpoint sits off the chord's midpoint by the sagitta, bulge * chord / 2,
+    # to the right of p -> q for a counter-clockwise arc.
+    s = bulge / 2.0
+    mid = [(p[0] + q[0]) / 2.0 + s * dy, (p[1] + q[1]) / 2.0 - s * dx, (p[2] + q[2]) / 2.0]
+    return {"type": "arc", "points": [list(p), mid, list(q)]}
+
+
+def _bulged_polyline(pts, bulges, closed=False):
+    """Like _polyline, but a vertex with a non-zero bulge starts an arc to the next vertex."""
+    if closed and len(pts) > 2 and pts[0] != pts[-1]:
+        pts, bulges = list(pts) + [pts[0]], list(bulges) + [0.0]
+    for a, b, bulge in zip(pts[:-1], pts[1:], bulges):
+        if a == b:
+            continue
+        yield _bulge_arc(a, b, bulge) if bulge else _line(a, b)
+
+
+# ---------------------------------------------------------------- DXF
+
+def _dxf_pairs(f):
+    while True:
+        code = f.readline()
+        value = f.readline()
+        if not code or not value:
+            return
+        try:
+            yield int(code.strip()), value.rstrip("\r\n")
+        except ValueError:
+            return
+
+
+def _dxf_entities(path):
+    """Yield (type, [(code, value), ...]) for each entity in the ENTITIES section."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        in_entities = False
+        current = None
+        for code, value in _dxf_pairs(f):
+            if code == 2 and value == "ENTITIES":
+                in_entities = True
+                continue
+            if not in_entities or code != 0:
+                if current is not None:
+                    current[1].append((code, value))
+                continue
+            if current is not None:
+                yield current
+            if value in ("ENDSEC", "EOF"):
+                return
+            current = (value, [])
+
+
+def iter_dxf(path):
+    poly = None  # [closed, z, vertices, bulges] for POLYLINE/VERTEX/SEQEND
+    for etype, tags in _dxf_entities(path):
+        g = {}
+        for code, value in tags:
+            g.setdefault(code, value)
+        if etype == "VERTEX" and poly is not None:
+            poly[2].append([float(g.get(10, 0)), float(g.get(20, 0)), float(g.get(30, poly[1]))])
+            poly[3].append(float(g.get(42, 0)))
+            continue
+        if etype == "SEQEND" and poly is not None:
+            for c in _bulged_polyline(poly[2], poly[3], poly[0]):
+                yield c
+            poly = None
+            continue
+        if etype == "LINE":
+            p = [float(g.get(10, 0)), float(g.get(20, 0)), float(g.get(30, 0))]
+            q = [float(g.get(11, 0)), float(g.get(21, 0)), float(g.get(31, 0))]
+            if p != q:
+                yield _line(p, q)
+        elif etype == "LWPOLYLINE":
+            z = float(g.get(38, 0))
+            pts, bulges = [], []
+            for c, v in tags:  # a vertex is 10, 20 and optionally 40/41/42 until the next 10
+                if c == 10:
+                    pts.append([float(v), 0.0, z])
+                    bulges.append(0.0)
+                elif c == 20 and pts:
+                    pts[-1][1] = float(v)
+                elif c == 42 and pts:
+                    bulges[-1] = float(v)
+            for c in _bulged_polyline(pts, bulges, int(g.get(70, 0)) & 1):
+                yield c
+        elif etype == "POLYLINE":
+            poly = [int(g.get(70, 0)) & 1, float(g.get(30, 0)), [], []]
+        elif etype == "ARC":
+            yield _arc(float(g.get(10, 0)), float(g.get(20, 0)), float(g.get(30, 0)), float(g.get(40, 0)),
+                       math.radians(float(g.get(50, 0))), math.radians(float(g.get(51, 0))))
+        elif etype == "CIRCLE":
+            cx, cy, z, r = float(g.get(10, 0)), float(g.get(20, 0)), float(g.get(30, 0)), float(g.get(40, 0))
+            yield _arc(cx, cy, z, r, 0.0, math.pi)
+            yield _arc(cx, cy, z, r, math.pi, 2.0 * math.pi)
+
+
+# ---------------------------------------------------------------- SVG
+
+_NUM = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_PATH_TOKEN = re.compile(r"([MmLlHhVvZzCcSsQqTtAa])|(%s)" % _NUM)
+
+
+def _floats(text):
+    return [float(v) for v in re.findall(_NUM, text or "")]
+
+
+def _bezier(p0, ctrl, p3, steps=BEZIER_STEPS):
+    pts = []
+    for k in range(1, steps + 1):
+        t = float(k) / steps
+        u = 1.0 - t
+        if len(ctrl) == 1:
+            c = ctrl[0]
+            pts.append((u * u * p0[0] + 2 * u * t * c[0] + t * t * p3[0],
+                        u * u * p0[1] + 2 * u * t * c[1] + t * t * p3[1]))
+        else:
+            c1, c2 = ctrl
+            pts.append((u ** 3 * p0[0] + 3 * u * u * t * c1[0] + 3 * u * t * t * c2[0] + t ** 3 * p3[0],
+                        u ** 3 * p0[1] + 3 * u * u * t * c1[1] + 3 * u * t * t * c2[1] + t ** 3 * p3[1]))
+    return pts
+
+
+def _svg_path(d):
+    """Yield lists of (x, y) subpaths from SVG path data."""
+    tokens = [(m.group(1), m.group(2)) for m in _PATH_TOKEN.finditer(d or "")]
+    sub, cur, start, last_ctrl = [], (0.0, 0.0), (0.0, 0.0), None
+    i, cmd = 0, None
+    arity = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+    while i < len(tokens):
+        if tokens[i][0]:
+            cmd = tokens[i][0]
+            i += 1
+            if cmd in "Zz":
+                if sub:
+                    sub.append(start)
+                    yield sub
+                sub, cur = [], start
+                continue
+        if cmd is None:
+            return
+        n = arity[cmd.upper()]
+        args = [float(t[1]) for t in tokens[i:i + n] if t[1]]
+        if len(args) < n:
+            break
+        i += n
+        rel = cmd.islower()
+        ox, oy = cur if rel else (0.0, 0.0)
+        up = cmd.upper()
+        if up == "M":
+            if len(sub) > 1:
+                yield sub
+            cur = start = (ox + args[0], oy + args[1])
+            sub = [cur]
+            cmd = "l" if rel else "L"  # implicit lineto after moveto
+            last_ctrl = None
+            continue
+        if not sub:
+            sub = [cur]
+        if up == "L" or up == "T" or up == "A":
+            nxt = (ox + args[-2], oy + args[-1])
+            if up == "T":
+                c = (2 * cur[0] - last_ctrl[0], 2 * cur[1] - last_ctrl[1]) if last_ctrl else cur
+                sub.extend(_bezier(cur, [c], nxt))
+                last_ctrl = c
+            else:
+                sub.append(nxt)
+                last_ctrl = None
+        elif up == "H":
+            nxt = (ox + args[0], cur[1])
+            sub.append(nxt)
+        elif up == "V":
+            nxt = (cur[0], oy + args[0])
+            sub.append(nxt)
+        elif up == "C":
+            c1, c2, nxt = (ox + args[0], oy + args[1]), (ox + args[2], oy + args[3]), (ox + args[4], oy + args[5])
+            sub.extend(_bezier(cur, [c1, c2], nxt))
+            last_ctrl = c2
+        elif up == "S":
+            c1 = (2 * cur[0] - last_ctrl[0], 2 * cur[1] - last_ctrl[1]) if last_ctrl else cur
+            c2, nxt = (ox + args[0], oy + args[1]), (ox + args[2], oy + args[3])
+            sub.extend(_bezier(cur, [c1, c2], nxt))
+            last_ctrl = c2
+        elif up == "Q":
+            c, nxt = (ox + args[0], oy + args[1]), (ox + args[2], oy + args[3])
+            sub.extend(_bezier(cur, [c], nxt))
+            last_ctrl = c
+        if up not in "CSQT":
+            last_ctrl = None
+        cur = nxt
+    if len(sub) > 1:
+        yield sub
+
+
+def iter_svg(path):
+    def xyz(pts):
+        return [[x, -y, 0.0] for x, y in pts]
+
+    for _, el in ET.iterparse(path, events=("end",)):
+        tag = el.tag.rsplit("}", 1)[-1]
+        a = el.attrib
+        if tag == "line":
+            p = [float(a.get("x1", 0)), -float(a.get("y1", 0)), 0.0]
+            q = [float(a.get("x2", 0)), -float(a.get("y2", 0)), 0.0]
+            if p != q:
+                yield _line(p, q)
+        elif tag in ("polyline", "polygon"):
+            v = _floats(a.get("points"))
+            for c in _polyline(xyz(zip(v[0::2], v[1::2])), tag == "polygon"):
+                yield c
+        elif tag == "rect":
+            x, y = float(a.get("x", 0)), float(a.get("y", 0))
+            w, h = float(a.get("width", 0)), float(a.get("height", 0))
+            for c in _polyline(xyz([(x, y), (x + w, y), (x + w, y + h), (x, y + h)]), True):
+                yield c
+        elif tag == "path":
+            for sub in _svg_path(a.get("d")):
+                for c in _polyline(xyz(sub)):
+                    yield c
+        el.clear()
+
+
+# ---------------------------------------------------------------- GeoJSON
+
+def _geojson_geometry(geom):
+    if not geom:
+        return
+    kind = geom.get("type")
+    coords = geom.get("coordinates") or []
+
+    def pts(ring):
+        return [[float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0] for p in ring]
+
+    if kind == "LineString":
+        lines = [coords]
+    elif kind in ("MultiLineString", "Polygon"):
+        lines = coords
+    elif kind == "MultiPolygon":
+        lines = [ring for poly in coords for ring in poly]
+    elif kind == "GeometryCollection":
+        for g in geom.get("geometries", []):
+            for c in _geojson_geometry(g):
+                yield c
+        return
+    else:
+        return
+    for ring in lines:
+        for c in _polyline(pts(ring)):
+            yield c
+
+
+def _geojson_object(obj):
+    kind = obj.get("type")
+    if kind == "FeatureCollection":
+        for feat in obj.get("features", []):
+            for c in _geojson_geometry(feat.get("geometry")):
+                yield c
+    elif kind == "Feature":
+        for c in _geojson_geometry(obj.get("geometry")):
+            yield c
+    else:
+        for c in _geojson_geometry(obj):
+            yield c
+
+
+def iter_geojson(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".geojsonl", ".ndjson"):
+            # Newline-delimited GeoJSON: one feature per line, read lazily.
+            for line in f:
+                if line.strip():
+                    for c in _geojson_object(json.loads(line)):
+                        yield c
+            return
+        for c in _geojson_object(json.load(f)):
+            yield c
+
+
+# ---------------------------------------------------------------- pipeline
+
+_READERS = {".dxf": iter_dxf, ".svg": iter_svg, ".geojson": iter_geojson,
+            ".json": iter_geojson, ".geojsonl": iter_geojson, ".ndjson": iter_geojson}
+
+
+def iter_curves(path, scale=1.0, offset=(0.0, 0.0, 0.0)):
+    """Yield curve specs from a DXF/SVG/GeoJSON file, scaled then offset."""
+    ext = os.path.splitext(path)[1].lower()
+    reader = _READERS.get(ext)
+    if reader is None:
+        raise ValueError("Unsupported linework file: %s" % ext)
+    ox, oy, oz = offset
+    for c in reader(path):
+        c["points"] = [[p[0] * scale + ox, p[1] * scale + oy, p[2] * scale + oz] for p in c["points"]]
+        yield c
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
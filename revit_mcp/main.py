@@ -1,21 +1,101 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import json
 import os
+import uuid
 
 import httpx
+import metrics
+import snapshot
+from events import EventStream, ReadCache
 from mcp.server.fastmcp import FastMCP
+from resilience import Guard
+from scheduler import Scheduler
 from tools import register_all
 
 BASE = os.environ.get("REVIT_ROUTES_URL", "http://127.0.0.1:48884/revit_mcp")
+GET_TIMEOUT = float(os.environ.get("REVIT_MCP_GET_TIMEOUT", 15))
+POST_TIMEOUT = float(os.environ.get("REVIT_MCP_POST_TIMEOUT", 30))
+CANCEL_TIMEOUT = 3.0
+EVENTS_URL = os.environ.get("REVIT_EVENTS_URL", "http://127.0.0.1:48885/events")
+
+scheduler = Scheduler.from_env()
+metrics.add_source("scheduler", scheduler.snapshot)
+
+async def _probe(timeout):
+    async with httpx.AsyncClient(timeout=timeout) as c:
+        r = await c.get(BASE + "/status/")
+    return r.status_code == 200 and bool(r.json().get("revit_available"))
+
+def _http_status(exc):
+    return exc.response.status_code if isinstance(exc, httpx.HTTPStatusError) else None
+
+guard = Guard(_probe, (httpx.TransportError,), _http_status)
+metrics.add_source("breaker", guard.snapshot)
+
+cache = ReadCache()
+stream = EventStream(EVENTS_URL, cache)
+metrics.add_source("events", stream.snapshot)
+local = snapshot.LocalReads(stream)
+metrics.add_source("snapshot", local.snapshot)
+
+_cancels = set()  # in-flight /cancel/ posts, referenced so they are not collected
+
+async def _post_cancel(request_id):
+    # Straight to the routes: no scheduler slot, no breaker. /cancel/ runs on
+    # pyRevit's server thread, so it is answered even while Revit is busy.
+    try:
+        async with httpx.AsyncClient(timeout=CANCEL_TIMEOUT) as c:
+            await c.post(BASE + "/cancel/", json={"requestId": request_id})
+    except httpx.HTTPError:
+        pass
+
+def _cancel_in_revit(request_id):
+    task = asyncio.ensure_future(_post_cancel(request_id))
+    _cancels.add(task)
+    task.add_done_callback(_cancels.discard)
+
+async def _send(method, url, payload, timeout):
+    body = json.dumps(payload).encode("utf-8") if method == "POST" else None
+    request_id = uuid.uuid4().hex
+    headers = {"X-MCP-Request-Id": request_id}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+    async with scheduler.slot(method, url, timeout) as remaining:
+        with metrics.http_call(len(body) if body else 0) as call:
+            try:
+                async with httpx.AsyncClient(timeout=remaining) as c:
+                    if body is None:
+                        r = await c.get(url, headers=headers)
+                    else:
+                        r = await c.post(url, content=body, headers=headers)
+            except (asyncio.CancelledError, httpx.TimeoutException):
+                # Nobody will read the answer: let Revit skip or stop the work.
+                _cancel_in_revit(request_id)
+                raise
+            call.response(r); r.raise_for_status(); return r.json()
 
 async def _get(url):
-    async with httpx.AsyncClient(timeout=15) as c:
-        r = await c.get(url); r.raise_for_status(); return r.json()
+    stream.ensure_started()
+    answer = local.answer("GET", url)
+    if answer is not None:
+        return answer
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+    generation = cache.generation
+    result = await guard.call("GET", lambda t: _send("GET", url, None, t), GET_TIMEOUT)
+    cache.put(url, result, generation)
+    return result
 
 async def _post(url, payload):
-    async with httpx.AsyncClient(timeout=30) as c:
-        r = await c.post(url, json=payload); r.raise_for_status(); return r.json()
+    stream.ensure_started()
+    answer = local.answer("POST", url, payload)
+    if answer is not None:
+        return answer
+    return await guard.call("POST", lambda t: _send("POST", url, payload, t), POST_TIMEOUT)
 
 m = FastMCP(name="Revit-MCP via Routes")
-register_all(m, BASE, _get, _post)
+register_all(metrics.instrument(m), BASE, _get, _post)
 if __name__ == "__main__":
     m.run(transport="stdio")
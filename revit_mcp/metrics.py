@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""Client-side metrics of the MCP server: tool latency and HTTP calls to Revit.
+
+Every tool is timed end to end (instrument() wraps mcp.tool). The HTTP calls a
+tool makes are attributed to it: request/response bytes, errors, retries and
+the time Revit reported spending on the route (X-Revit-Duration-Ms), so
+"network" below is HTTP time minus Revit time.
+
+Other modules add sections with add_source() (the scheduler's queue depth).
+
+Set REVIT_MCP_METRICS_FILE to also write the metrics in Prometheus text format
+(rewritten at most every DUMP_INTERVAL seconds and on exit).
+"""
+import atexit
+import contextvars
+import functools
+import os
+import threading
+import time
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+SAMPLES_PER_TOOL = 1024
+DUMP_FILE = os.environ.get("REVIT_MCP_METRICS_FILE")
+DUMP_INTERVAL = 10.0
+
+_lock = threading.Lock()
+_state = {"pending": 0, "started": time.time(), "lastDump": 0.0}
+_tools = {}
+_sources = {}  # name -> callable returning a dict of extra metrics (e.g. the scheduler)
+_current = contextvars.ContextVar("revit_mcp_tool", default=None)
+
+
+class _Tool(object):
+    __slots__ = ("calls", "errors", "retries", "http_calls", "http_errors", "total_ms", "http_ms", "revit_ms",
+                 "max_ms", "request_bytes", "response_bytes", "buckets", "samples", "pos")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.http_calls = 0
+        self.http_errors = 0
+        self.total_ms = 0.0
+        self.http_ms = 0.0
+        self.revit_ms = 0.0
+        self.max_ms = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = []
+        self.pos = 0
+
+    def add(self, ms, failed):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        if len(self.samples) < SAMPLES_PER_TOOL:
+            self.samples.append(ms)
+        else:
+            self.samples[self.pos] = ms
+            self.pos = (self.pos + 1) % SAMPLES_PER_TOOL
+
+
+def _tool(name):
+    t = _tools.get(name)
+    if t is None:
+        t = _tools[name] = _Tool()
+    return t
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))], 3)
+
+
+# ---------------------------------------------------------------- tools
+
+def _is_error_result(result):
+    return isinstance(result, dict) and (result.get("ok") is False or "error" in result)
+
+
+def timed_tool(fn, name=None):
+    """Wrap an async tool so each call is recorded under its name."""
+    name = name or fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = _current.set(name)
+        t0 = time.perf_counter()
+        failed = True
+        try:
+            result = await fn(*args, **kwargs)
+            failed = _is_error_result(result)
+            return result
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            _current.reset(token)
+            with _lock:
+                _tool(name).add(ms, failed)
+            _maybe_dump()
+    return wrapper
+
+
+class _InstrumentedMCP(object):
+    """Stands in for FastMCP while tools register, timing every tool."""
+
+    def __init__(self, mcp):
+        self._mcp = mcp
+
+    def tool(self, *args, **kwargs):
+        register = self._mcp.tool(*args, **kwargs)
+
+        def deco(fn):
+            register(timed_tool(fn, kwargs.get("name")))
+            return fn
+        return deco
+
+    def __getattr__(self, name):
+        return getattr(self._mcp, name)
+
+
+def instrument(mcp):
+    return _InstrumentedMCP(mcp)
+
+
+# ---------------------------------------------------------------- HTTP calls
+
+class http_call(object):
+    """Times one HTTP call to Revit and attributes it to the running tool."""
+
+    def __init__(self, request_bytes=0):
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.revit_ms = None
+        self._t0 = None
+
+    def response(self, r):
+        self.response_bytes = len(r.content)
+        try:
+            self.revit_ms = float(r.headers.get("X-Revit-Duration-Ms"))
+        except (TypeError, ValueError):
+            self.revit_ms = None
+
+    def __enter__(self):
+        with _lock:
+            _state["pending"] += 1
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self._t0) * 1000.0
+        name = _current.get() or "(no tool)"
+        with _lock:
+            _state["pending"] -= 1
+            t = _tool(name)
+            t.http_calls += 1
+            if exc_type is not None:
+                t.http_errors += 1
+            t.http_ms += ms
+            if self.revit_ms is not None:
+                t.revit_ms += self.revit_ms
+            t.request_bytes += self.request_bytes
+            t.response_bytes += self.response_bytes
+        return False
+
+
+def count_retry():
+    """Record a retried HTTP call for the running tool."""
+    with _lock:
+        _tool(_current.get() or "(no tool)").retries += 1
+
+
+def pending_requests():
+    """HTTP requests sent to Revit that have not returned yet."""
+    return _state["pending"]
+
+
+# ---------------------------------------------------------------- reporting
+
+def add_source(name, fn):
+    """Include fn() under `name` in snapshot() and its numbers as Prometheus gauges."""
+    _sources[name] = fn
+
+
+def section(name):
+    """Current value of one add_source() section, or None."""
+    fn = _sources.get(name)
+    return fn() if fn is not None else None
+
+
+def snapshot():
+    with _lock:
+        tools = {}
+        for name, t in sorted(_tools.items()):
+            ordered = sorted(t.samples)
+            hist = {}
+            for bound, n in zip(BUCKETS_MS + ("+Inf",), t.buckets):
+                hist["le_%s" % bound] = n
+            tools[name] = {
+                "calls": t.calls,
+                "errors": t.errors,
+                "retries": t.retries,
+                "meanMs": round(t.total_ms / t.calls, 3) if t.calls else None,
+                "maxMs": round(t.max_ms, 3),
+                "p50Ms": _percentile(ordered, 0.50),
+                "p95Ms": _percentile(ordered, 0.95),
+                "p99Ms": _percentile(ordered, 0.99),
+                "histogramMs": hist,
+                "http": {
+                    "calls": t.http_calls,
+                    "errors": t.http_errors,
+                    "totalMs": round(t.http_ms, 3),
+                    "revitMs": round(t.revit_ms, 3),
+                    "networkMs": round(max(0.0, t.http_ms - t.revit_ms), 3),
+                    "requestBytes": t.request_bytes,
+                    "responseBytes": t.response_bytes,
+                },
+            }
+        out = {
+            "uptimeSeconds": round(time.time() - _state["started"], 3),
+            "pendingRequests": _state["pending"],
+            "tools": tools,
+        }
+    for name, fn in _sources.items():
+        out[name] = fn()
+    return out
+
+
+def prometheus_text():
+    lines = []
+
+    def family(metric, kind, help_text):
+        lines.append("# HELP %s %s" % (metric, help_text))
+        lines.append("# TYPE %s %s" % (metric, kind))
+
+    with _lock:
+        items = sorted(_tools.items())
+        family("revit_mcp_tool_duration_ms", "histogram", "End-to-end MCP tool latency in milliseconds.")
+        for name, t in items:
+            cumulative = 0
+            for bound, n in zip(BUCKETS_MS + ("+Inf",), t.buckets):
+                cumulative += n
+                lines.append('revit_mcp_tool_duration_ms_bucket{tool="%s",le="%s"} %d' % (name, bound, cumulative))
+            lines.append('revit_mcp_tool_duration_ms_sum{tool="%s"} %.3f' % (name, t.total_ms))
+            lines.append('revit_mcp_tool_duration_ms_count{tool="%s"} %d' % (name, t.calls))
+        counters = (
+            ("revit_mcp_tool_errors_total", "Tool calls that failed or returned an error.", "errors"),
+            ("revit_mcp_tool_retries_total", "HTTP retries made by tool calls.", "retries"),
+            ("revit_mcp_http_requests_total", "HTTP calls to the Revit routes.", "http_calls"),
+            ("revit_mcp_http_errors_total", "HTTP calls to the Revit routes that raised.", "http_errors"),
+            ("revit_mcp_http_request_bytes_total", "Request body bytes sent to Revit.", "request_bytes"),
+            ("revit_mcp_http_response_bytes_total", "Response body bytes received from Revit.", "response_bytes"),
+            ("revit_mcp_http_duration_ms_total", "Time spent in HTTP calls to Revit.", "http_ms"),
+            ("revit_mcp_revit_duration_ms_total", "Time Revit reported spending on routes.", "revit_ms"),
+        )
+        for metric, help_text, attr in counters:
+            family(metric, "counter", help_text)
+            for name, t in items:
+                lines.append('%s{tool="%s"} %s' % (metric, name, getattr(t, attr)))
+        family("revit_mcp_pending_requests", "gauge", "HTTP calls to Revit that have not returned yet.")
+        lines.append("revit_mcp_pending_requests %d" % _state["pending"])
+    for name, fn in sorted(_sources.items()):
+        for key, value in sorted(fn().items()):
+            if isinstance(value, dict):
+                for label, v in sorted(value.items()):
+                    lines.append('revit_mcp_%s_%s{key="%s"} %s' % (name, key, label, v))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append("revit_mcp_%s_%s %s" % (name, key, value))
+    return "\n".join(lines) + "\n"
+
+
+def dump(path=None):
+    """Write the Prometheus text to path (default REVIT_MCP_METRICS_FILE); returns the path."""
+    path = path or DUMP_FILE
+    if not path:
+        return None
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+    _state["lastDump"] = time.time()
+    return path
+
+
+def _maybe_dump(force=False):
+    if DUMP_FILE and (force or time.time() - _state["lastDump"] >= DUMP_INTERVAL):
+        try:
+            dump()
+        except OSError:
+            pass
+
+
+if DUMP_FILE:
+    atexit.register(_maybe_dump, True)
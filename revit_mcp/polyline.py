@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""Polyline simplification before curves are sent to Revit.
+
+Dense point lists (digitized contours, sampled arcs) are reduced to as few
+curves as possible within a distance tolerance (Revit internal units, feet):
+
+1. collinear segments are merged,
+2. runs of points lying on a common circle become arcs (optional),
+3. the remaining runs are reduced with Douglas-Peucker.
+
+NumPy is used when installed; the pure-Python path gives the same result.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+MIN_ARC_POINTS = 5
+DEFAULT_ARC_TOLERANCE = 1.0 / 304.8  # 1 mm, when arcs are asked for without a tolerance
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _norm(a):
+    return math.sqrt(_dot(a, a))
+
+
+def _as_points(points):
+    out = []
+    for p in points:
+        z = float(p[2]) if len(p) > 2 else 0.0
+        q = (float(p[0]), float(p[1]), z)
+        if not out or q != out[-1]:
+            out.append(q)
+    return out
+
+
+def _segment_distances(pts, i, j):
+    """Distances of pts[i+1:j] to the segment pts[i]-pts[j]."""
+    if np is not None:
+        arr = np.asarray(pts[i:j + 1], dtype=float)
+        a, b = arr[0], arr[-1]
+        ab = b - a
+        ap = arr[1:-1] - a
+        denom = float(ab.dot(ab))
+        if denom == 0.0:
+            return np.linalg.norm(ap, axis=1)
+        t = np.clip(ap.dot(ab) / denom, 0.0, 1.0)
+        return np.linalg.norm(ap - np.outer(t, ab), axis=1)
+    a, b = pts[i], pts[j]
+    ab = _sub(b, a)
+    denom = _dot(ab, ab)
+    out = []
+    for k in range(i + 1, j):
+        ap = _sub(pts[k], a)
+        t = 0.0 if denom == 0.0 else min(1.0, max(0.0, _dot(ap, ab) / denom))
+        out.append(_norm(_sub(ap, (ab[0] * t, ab[1] * t, ab[2] * t))))
+    return out
+
+
+def douglas_peucker(points, tolerance):
+    """Return the indices of ``points`` kept by Douglas-Peucker."""
+    n = len(points)
+    if n < 3 or tolerance <= 0.0:
+        return list(range(n))
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        d = _segment_distances(points, i, j)
+        if np is not None:
+            k = int(np.argmax(d))
+            dmax = float(d[k])
+        else:
+            k = max(range(len(d)), key=d.__getitem__)
+            dmax = d[k]
+        if dmax > tolerance:
+            k += i + 1
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return [i for i in range(n) if keep[i]]
+
+
+def merge_collinear(points, tolerance=1e-9):
+    """Drop interior points that do not change the direction of travel."""
+    if len(points) < 3:
+        return list(points)
+    out = [points[0]]
+    for k in range(1, len(points) - 1):
+        a, b, c = out[-1], points[k], points[k + 1]
+        ab, bc = _sub(b, a), _sub(c, b)
+        lab, lbc = _norm(ab), _norm(bc)
+        if lab == 0.0:
+            continue
+        if lbc > 0.0 and _dot(ab, bc) > 0.0 and _norm(_cross(ab, bc)) / lbc <= tolerance:
+            continue
+        out.append(b)
+    out.append(points[-1])
+    return out
+
+
+def _circle(a, b, c):
+    """Center, radius and unit normal of the circle through a, b, c."""
+    ab, ac = _sub(b, a), _sub(c, a)
+    n = _cross(ab, ac)
+    nn = _dot(n, n)
+    if nn < 1e-18:
+        return None
+    t1 = _cross(n, ab)
+    t2 = _cross(ac, n)
+    s1 = _dot(ac, ac) / (2.0 * nn)
+    s2 = _dot(ab, ab) / (2.0 * nn)
+    center = (a[0] + t1[0] * s1 + t2[0] * s2,
+              a[1] + t1[1] * s1 + t2[1] * s2,
+              a[2] + t1[2] * s1 + t2[2] * s2)
+    ln = math.sqrt(nn)
+    return center, _norm(_sub(a, center)), (n[0] / ln, n[1] / ln, n[2] / ln)
+
+
+def _on_arc(pts, i, j, tolerance):
+    """True when pts[i..j] lie on one circle and turn one way, under 360 degrees."""
+    circ = _circle(pts[i], pts[(i + j) // 2], pts[j])
+    if circ is None:
+        return False
+    center, radius, normal = circ
+    if np is not None:
+        arr = np.asarray(pts[i:j + 1], dtype=float)
+        rel = arr - np.asarray(center)
+        if np.abs(np.linalg.norm(rel, axis=1) - radius).max() > tolerance:
+            return False
+        if np.abs(rel.dot(np.asarray(normal))).max() > tolerance:
+            return False
+        turns = np.cross(rel[:-1], rel[1:]).dot(np.asarray(normal))
+        if (turns <= 0.0).any():
+            return False
+        half = np.linalg.norm(arr[1:] - arr[:-1], axis=1) / 2.0
+        if (radius - np.sqrt(np.maximum(radius * radius - half * half, 0.0))).max() > tolerance:
+            return False
+        sweep = float(np.arctan2(turns, (rel[:-1] * rel[1:]).sum(axis=1)).sum())
+    else:
+        sweep = 0.0
+        prev = None
+        for k in range(i, j + 1):
+            rel = _sub(pts[k], center)
+            if abs(_norm(rel) - radius) > tolerance or abs(_dot(rel, normal)) > tolerance:
+                return False
+            if prev is not None:
+                turn = _dot(_cross(prev, rel), normal)
+                if turn <= 0.0:
+                    return False
+                # Sagitta: how far the original chord strays from the arc.
+                half = _norm(_sub(pts[k], pts[k - 1])) / 2.0
+                if radius - math.sqrt(max(radius * radius - half * half, 0.0)) > tolerance:
+                    return False
+                sweep += math.atan2(turn, _dot(prev, rel))
+            prev = rel
+    return sweep < 2.0 * math.pi - 1e-6
+
+
+def fit_arcs(points, tolerance, min_points=MIN_ARC_POINTS):
+    """Split points into runs: [("arc", i, j) | ("polyline", i, j), ...]."""
+    n = len(points)
+    runs = []
+    start = 0
+    i = 0
+    while i < n - 1:
+        j = i + min_points - 1
+        if j < n and _on_arc(points, i, j, tolerance):
+            # Grow the arc by doubling, then bisect back to the longest fit.
+            good, step = j, 1
+            while good + step < n and _on_arc(points, i, good + step, tolerance):
+                good += step
+                step *= 2
+            lo, hi = good, min(good + step, n - 1)
+            if hi > lo and _on_arc(points, i, hi, tolerance):
+                lo = hi
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _on_arc(points, i, mid, tolerance):
+                    lo = mid
+                else:
+                    hi = mid
+            if start < i:
+                runs.append(("polyline", start, i))
+            runs.append(("arc", i, lo))
+            start = i = lo
+        else:
+            i += 1
+    if start < n - 1:
+        runs.append(("polyline", start, n - 1))
+    return runs
+
+
+def simplify_polyline(points, tolerance, arcs=False):
+    """Reduce ``points`` to curve specs understood by the geometry routes.
+
+    Returns (curves, stats) where curves is
+    [{"type": "line", "points": [p, q]}, {"type": "arc", "points": [p, m, q]}, ...].
+    Arc fitting needs a tolerance: DEFAULT_ARC_TOLERANCE is used when it is 0.
+    """
+    if arcs and tolerance <= 0.0:
+        tolerance = DEFAULT_ARC_TOLERANCE
+    pts = merge_collinear(_as_points(points))
+    runs = fit_arcs(pts, tolerance) if arcs and tolerance > 0.0 else [("polyline", 0, len(pts) - 1)]
+    curves = []
+    for kind, i, j in runs:
+        if kind == "arc":
+            curves.append({"type": "arc", "points": [list(pts[i]), list(pts[(i + j) // 2]), list(pts[j])]})
+            continue
+        run = pts[i:j + 1]
+        keep = douglas_peucker(run, tolerance)
+        for a, b in zip(keep[:-1], keep[1:]):
+            curves.append({"type": "line", "points": [list(run[a]), list(run[b])]})
+    stats = {
+        "inputPoints": len(points),
+        "curves": len(curves),
+        "lines": sum(1 for c in curves if c["type"] == "line"),
+        "arcs": sum(1 for c in curves if c["type"] == "arc"),
+        "tolerance": tolerance,
+        "vectorized": np is not None,
+    }
+    return curves, stats
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Retries and a circuit breaker for calls to a busy or closed Revit.
+
+When Revit sits in a modal dialog (or has no document open) routes do not
+answer, and every call would wait for its full timeout. Guard.call():
+
+- fails fast with RevitUnavailable while the breaker is open;
+- retries idempotent GETs on transport errors and 502/503/504, with full
+  jitter exponential backoff, within the call's original deadline;
+- opens the breaker after FAILURE_THRESHOLD consecutive transport failures
+  (timeouts, refused connections), for an open period that doubles on each
+  failed recovery up to MAX_OPEN_SECONDS;
+- once the open period is over, lets one caller probe /status/ (half-open);
+  the breaker closes if Revit answers with a document, else reopens.
+
+Route errors (4xx, 500) mean Revit is responsive and never trip the breaker;
+calls the scheduler refused (queue full, deadline passed) do not count at all.
+"""
+import asyncio
+import random
+import time
+
+import metrics
+
+FAILURE_THRESHOLD = 3
+OPEN_SECONDS = 5.0
+MAX_OPEN_SECONDS = 60.0
+PROBE_TIMEOUT = 3.0
+RETRY_ATTEMPTS = 3
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 4.0
+RETRY_STATUS = (502, 503, 504)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class RevitUnavailable(Exception):
+    """Revit is not answering; the call was not sent."""
+
+
+def backoff(attempt, rnd=random):
+    """Full jitter: uniform(0, min(cap, base * 2**attempt))."""
+    return rnd.uniform(0.0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+class Guard(object):
+    """Circuit breaker plus retry policy around one routes server."""
+
+    def __init__(self, probe, transport_errors=(), status_of=None):
+        """probe(timeout) -> awaitable bool (Revit answered /status/ with a document).
+        transport_errors: exception types meaning Revit did not answer.
+        status_of(exc) -> HTTP status of an HTTP error exception, or None."""
+        self.probe = probe
+        self.transport_errors = tuple(transport_errors)
+        self.status_of = status_of or (lambda exc: None)
+        self.state = CLOSED
+        self.failures = 0
+        self.open_seconds = OPEN_SECONDS
+        self.open_until = 0.0
+        self.last_error = None
+        self._probing = None
+        self._stats = {"opened": 0, "shortCircuited": 0, "probes": 0, "probeFailures": 0, "retries": 0}
+
+    # -- breaker
+
+    def _is_transport_failure(self, exc):
+        if isinstance(exc, self.transport_errors):
+            return True
+        return self.status_of(exc) in RETRY_STATUS
+
+    def _record_success(self):
+        self.failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.open_seconds = OPEN_SECONDS
+
+    def _record_failure(self, exc):
+        self.failures += 1
+        self.last_error = "%s: %s" % (type(exc).__name__, exc)
+        if self.state == CLOSED and self.failures >= FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.open_until = time.monotonic() + self.open_seconds
+        self._stats["opened"] += 1
+
+    async def _probe(self):
+        self._stats["probes"] += 1
+        try:
+            healthy = await self.probe(PROBE_TIMEOUT)
+        except Exception as ex:
+            healthy = False
+            self.last_error = "probe %s: %s" % (type(ex).__name__, ex)
+        if healthy:
+            self._record_success()
+        else:
+            self._stats["probeFailures"] += 1
+            self.open_seconds = min(MAX_OPEN_SECONDS, self.open_seconds * 2.0)
+            self._open()
+        return healthy
+
+    async def _admit(self):
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and time.monotonic() < self.open_until:
+            self._stats["shortCircuited"] += 1
+            raise RevitUnavailable("Revit is not responding (%s); retry in %.1fs" % (
+                self.last_error, self.open_until - time.monotonic()))
+        # Half-open: one caller probes, the others wait for its verdict.
+        if self._probing is None:
+            self.state = HALF_OPEN
+            self._probing = asyncio.ensure_future(self._probe())
+            self._probing.add_done_callback(lambda _: setattr(self, "_probing", None))
+        if not await asyncio.shield(self._probing):
+            self._stats["shortCircuited"] += 1
+            raise RevitUnavailable("Revit is still not responding (%s)" % self.last_error)
+
+    # -- calls
+
+    async def call(self, method, send, timeout):
+        """send(timeout) performs one attempt; GETs are retried within `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        attempts = RETRY_ATTEMPTS if method == "GET" else 1
+        attempt = 0
+        while True:
+            await self._admit()
+            try:
+                result = await send(max(0.001, deadline - time.monotonic()))
+            except Exception as ex:
+                if not self._is_transport_failure(ex):
+                    if self.status_of(ex) is not None:
+                        self._record_success()  # Revit answered, just not with 2xx
+                    raise
+                self._record_failure(ex)
+                attempt += 1
+                delay = backoff(attempt - 1)
+                if attempt >= attempts or self.state == OPEN or time.monotonic() + delay >= deadline:
+                    raise
+                self._stats["retries"] += 1
+                metrics.count_retry()
+                await asyncio.sleep(delay)
+                continue
+            self._record_success()
+            return result
+
+    def snapshot(self):
+        out = {
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "openForSeconds": round(max(0.0, self.open_until - time.monotonic()), 3) if self.state == OPEN else 0.0,
+            "lastError": self.last_error,
+        }
+        out.update(self._stats)
+        return out
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""Read metadata from Revit family (.rfa) files without opening Revit.
+
+An .rfa file is an OLE compound file. Two of its streams are plain enough to
+read directly:
+
+- ``BasicFileInfo``: UTF-16 text with the Revit build/format that saved it.
+- ``PartAtom``: Atom XML with the family category and its types (parts).
+
+A type catalog (``<family>.txt`` next to the .rfa) is read when present.
+Results are cached by path, mtime and size.
+"""
+import codecs
+import csv
+import io
+import os
+import re
+import struct
+import xml.etree.ElementTree as ET
+
+_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_FREESECT = 0xFFFFFFFF
+_ENDOFCHAIN = 0xFFFFFFFE
+_NOSTREAM = 0xFFFFFFFF
+_STREAM = 2
+_ROOT = 5
+
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_PART_NS = "urn:schemas-autodesk-com:partatom"
+_REVIT_SCHEME = "adsk:revit:grouping"
+
+_CACHE = {}
+_CACHE_MAX = 256
+
+
+class RfaError(Exception):
+    pass
+
+
+class CompoundFile(object):
+    """Minimal read-only OLE compound file reader (MS-CFB v3/v4)."""
+
+    def __init__(self, data):
+        if len(data) < 512 or data[:8] != _SIGNATURE:
+            raise RfaError("Not an OLE compound file")
+        self._data = data
+        (self._sector_shift, self._mini_shift) = struct.unpack_from("<HH", data, 0x1E)
+        self._sector_size = 1 << self._sector_shift
+        self._mini_size = 1 << self._mini_shift
+        (n_fat, first_dir, _, self._mini_cutoff, first_minifat, n_minifat,
+         first_difat, n_difat) = struct.unpack_from("<IIIIIIII", data, 0x2C)
+        self._fat = self._read_fat(n_fat, first_difat, n_difat)
+        self._entries = self._read_directory(first_dir)
+        root = self._entries[0]
+        self._mini_stream = self._read_chain(root["start"], root["size"]) if root["size"] else b""
+        self._minifat = []
+        if n_minifat and first_minifat not in (_ENDOFCHAIN, _FREESECT):
+            raw = self._read_chain(first_minifat)
+            self._minifat = list(struct.unpack("<%dI" % (len(raw) // 4), raw))
+
+    def _sector(self, sid):
+        start = (sid + 1) << self._sector_shift
+        return self._data[start:start + self._sector_size]
+
+    def _read_fat(self, n_fat, first_difat, n_difat):
+        sids = [s for s in struct.unpack_from("<109I", self._data, 0x4C) if s != _FREESECT]
+        per = self._sector_size // 4 - 1
+        sid = first_difat
+        for _ in range(n_difat):
+            if sid in (_ENDOFCHAIN, _FREESECT):
+                break
+            vals = struct.unpack("<%dI" % (per + 1), self._sector(sid))
+            sids.extend(s for s in vals[:per] if s != _FREESECT)
+            sid = vals[per]
+        fat = []
+        for s in sids[:n_fat]:
+            fat.extend(struct.unpack("<%dI" % (self._sector_size // 4), self._sector(s)))
+        return fat
+
+    def _read_chain(self, sid, size=None):
+        out = []
+        seen = set()
+        while sid not in (_ENDOFCHAIN, _FREESECT) and sid < len(self._fat):
+            if sid in seen:
+                raise RfaError("Corrupt sector chain")
+            seen.add(sid)
+            out.append(self._sector(sid))
+            sid = self._fat[sid]
+        buf = b"".join(out)
+        return buf[:size] if size is not None else buf
+
+    def _read_mini_chain(self, sid, size):
+        out = []
+        seen = set()
+        while sid not in (_ENDOFCHAIN, _FREESECT) and sid < len(self._minifat):
+            if sid in seen:
+                raise RfaError("Corrupt mini sector chain")
+            seen.add(sid)
+            start = sid * self._mini_size
+            out.append(self._mini_stream[start:start + self._mini_size])
+            sid = self._minifat[sid]
+        return b"".join(out)[:size]
+
+    def _read_directory(self, first_dir):
+        raw = self._read_chain(first_dir)
+        entries = []
+        for off in range(0, len(raw) - 127, 128):
+            name_len, etype = struct.unpack_from("<HB", raw, off + 0x40)
+            left, right, child = struct.unpack_from("<III", raw, off + 0x44)
+            start, size = struct.unpack_from("<II", raw, off + 0x74)
+            name = raw[off:off + max(name_len - 2, 0)].decode("utf-16-le", "replace")
+            entries.append({"name": name, "type": etype, "left": left, "right": right,
+                            "child": child, "start": start, "size": size})
+        if not entries or entries[0]["type"] != _ROOT:
+            raise RfaError("Missing root directory entry")
+        return entries
+
+    def _walk(self, idx, prefix, out):
+        stack = [idx]
+        while stack:
+            i = stack.pop()
+            if i == _NOSTREAM or i >= len(self._entries):
+                continue
+            e = self._entries[i]
+            stack.append(e["left"])
+            stack.append(e["right"])
+            path = prefix + e["name"]
+            if e["type"] == _STREAM:
+                out[path] = i
+            elif e["child"] != _NOSTREAM:
+                self._walk(e["child"], path + "/", out)
+
+    def streams(self):
+        """Return {path: directory index} for every stream in the file."""
+        out = {}
+        self._walk(self._entries[0]["child"], "", out)
+        return out
+
+    def read(self, path):
+        idx = self.streams().get(path)
+        if idx is None:
+            return None
+        e = self._entries[idx]
+        if e["size"] < self._mini_cutoff:
+            return self._read_mini_chain(e["start"], e["size"])
+        return self._read_chain(e["start"], e["size"])
+
+
+def _parse_basic_file_info(raw):
+    info = {"revitVersion": None, "build": None, "centralModel": None}
+    if not raw:
+        return info
+    text = raw.decode("utf-16-le", "ignore")
+    m = re.search(r"Format:\s*(\d{4})", text)
+    if m:
+        info["revitVersion"] = m.group(1)
+    m = re.search(r"Build:\s*([^\r\n\x00]+)", text)
+    if m:
+        info["build"] = m.group(1).strip()
+    if info["revitVersion"] is None:
+        m = re.search(r"Autodesk Revit (\d{4})", text) or re.search(r"Autodesk Revit (\d{4})", raw.decode("latin-1"))
+        if m:
+            info["revitVersion"] = m.group(1)
+    m = re.search(r"Central Model Path:\s*([^\r\n\x00]*)", text)
+    if m and m.group(1).strip():
+        info["centralModel"] = m.group(1).strip()
+    return info
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_part_atom(raw):
+    out = {"title": None, "category": None, "omniClass": None, "types": [], "partAtom": None}
+    if not raw:
+        return out
+    xml = raw.decode("utf-8", "replace").strip("\x00\r\n ")
+    out["partAtom"] = xml
+    try:
+        root = ET.fromstring(xml.encode("utf-8"))
+    except ET.ParseError:
+        return out
+    title = root.find("{%s}title" % _ATOM_NS)
+    if title is not None:
+        out["title"] = title.text
+    for cat in root.findall("{%s}category" % _ATOM_NS):
+        term = cat.findtext("{%s}term" % _ATOM_NS)
+        scheme = cat.findtext("{%s}scheme" % _ATOM_NS) or ""
+        if scheme == _REVIT_SCHEME and out["category"] is None:
+            out["category"] = term
+        elif scheme.startswith("std:oc") and out["omniClass"] is None:
+            out["omniClass"] = term
+    for part in root.iter("{%s}part" % _PART_NS):
+        name = part.findtext("{%s}title" % _ATOM_NS)
+        params = {}
+        for child in part:
+            key = _local(child.tag)
+            if key == "title":
+                continue
+            value = (child.text or "").strip()
+            unit = child.attrib.get("units")
+            params[key] = "%s %s" % (value, unit) if unit else value
+        out["types"].append({"name": name, "parameters": params})
+    return out
+
+
+def _decode_catalog(raw):
+    """Type catalogs are saved as UTF-16 or UTF-8 (with a BOM), UTF-8, or ANSI.
+
+    Without a BOM, UTF-16 cannot be told from 8-bit text (any even-length
+    file decodes), so it is only trusted when the BOM says so."""
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return raw.decode("utf-16")
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw.decode("utf-8-sig")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        return raw.decode("cp1252")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def _read_type_catalog(rfa_path):
+    txt = os.path.splitext(rfa_path)[0] + ".txt"
+    if not os.path.isfile(txt):
+        return None
+    with open(txt, "rb") as f:
+        raw = f.read()
+    text = _decode_catalog(raw)
+    rows = list(csv.reader(io.StringIO(text)))
+    if not rows:
+        return None
+    # Header: ",Width##LENGTH##MILLIMETERS,Depth##LENGTH##MILLIMETERS"
+    params = [h.split("##")[0].strip() for h in rows[0][1:]]
+    types = []
+    for row in rows[1:]:
+        if not row or not row[0].strip():
+            continue
+        types.append({"name": row[0].strip(), "parameters": dict(zip(params, [c.strip() for c in row[1:]]))})
+    return {"path": txt, "parameters": params, "types": types}
+
+
+def describe_family_file(path, include_part_atom=False):
+    """Return version, category, types and PartAtom XML of an .rfa file."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    txt = os.path.splitext(path)[0] + ".txt"
+    key = (st.st_mtime, st.st_size, os.path.getmtime(txt) if os.path.isfile(txt) else None)
+    cached = _CACHE.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, "rb") as f:
+            cf = CompoundFile(f.read())
+        info = _parse_basic_file_info(cf.read("BasicFileInfo"))
+        atom = _parse_part_atom(cf.read("PartAtom"))
+        catalog = _read_type_catalog(path)
+        result = {
+            "filePath": path,
+            "familyName": atom["title"] or os.path.splitext(os.path.basename(path))[0],
+            "revitVersion": info["revitVersion"],
+            "build": info["build"],
+            "category": atom["category"],
+            "omniClass": atom["omniClass"],
+            "types": atom["types"],
+            "typeCatalog": catalog,
+            "partAtom": atom["partAtom"],
+        }
+        if len(_CACHE) >= _CACHE_MAX:
+            _CACHE.pop(next(iter(_CACHE)))
+        _CACHE[path] = cached = (key, result)
+    result = dict(cached[1])
+    if not include_part_atom:
+        result.pop("partAtom")
+    return result
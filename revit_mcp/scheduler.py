@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Bounded-concurrency scheduler for HTTP calls to the Revit routes.
+
+Revit runs routes one at a time, so extra concurrent calls only wait inside
+Revit until they time out. Calls instead wait here, in priority order:
+
+    READ  - GETs and POST /validate/... (cheap, never modify the model)
+    WRITE - other POSTs
+    BULK  - batch routes that can hold Revit for seconds
+
+At most REVIT_MCP_MAX_CONCURRENCY calls (default 1) are sent at once and at
+most REVIT_MCP_MAX_QUEUE (default 32) wait; beyond that calls fail fast with
+SchedulerBusy. Each call carries a deadline from the moment it was queued
+(its HTTP timeout): a call whose deadline passes while queued is never sent,
+and a call that is sent gets only the time left as its HTTP timeout.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+
+READ, WRITE, BULK = 0, 1, 2
+CLASS_NAMES = {READ: "read", WRITE: "write", BULK: "bulk"}
+
+BULK_ROUTES = ("/draw_curves/", "/draw_detail_lines/", "/draw_model_polyline/", "/place/rebar_cage_column/",
+               "/families/load/", "/quantify/walls/", "/quantify/rebar/", "/layout/reconcile/",
+               "/place/columns_at_grids/", "/place_beams/", "/place/rebar_cages/")
+WAIT_SAMPLES = 1024
+
+
+class SchedulerBusy(Exception):
+    """The queue is full; the call was not sent."""
+
+
+class DeadlineExceeded(Exception):
+    """The call's deadline passed before it could be sent."""
+
+
+def classify(method, url):
+    path = url.split("/revit_mcp", 1)[-1]
+    if any(path.startswith(r) for r in BULK_ROUTES):
+        return BULK
+    if method == "GET" or path.startswith("/validate/"):
+        return READ
+    return WRITE
+
+
+class Scheduler(object):
+    def __init__(self, max_concurrency=1, max_queue=32):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self._active = 0
+        self._heap = []  # (priority, seq, future, deadline)
+        self._seq = itertools.count()
+        self._stats = {"sent": 0, "rejected": 0, "expired": 0, "maxDepth": 0}
+        self._waits = []  # queue wait samples (ms)
+        self._wait_pos = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get("REVIT_MCP_MAX_CONCURRENCY", 1), os.environ.get("REVIT_MCP_MAX_QUEUE", 32))
+
+    # -- queue
+
+    def _depth(self):
+        return sum(1 for _, _, fut, _ in self._heap if not fut.done())
+
+    def _record_wait(self, ms):
+        if len(self._waits) < WAIT_SAMPLES:
+            self._waits.append(ms)
+        else:
+            self._waits[self._wait_pos] = ms
+            self._wait_pos = (self._wait_pos + 1) % WAIT_SAMPLES
+
+    def _wake_next(self):
+        now = time.monotonic()
+        while self._heap and self._active < self.max_concurrency:
+            _, _, fut, deadline = heapq.heappop(self._heap)
+            if fut.done():
+                continue  # caller gave up (cancelled or timed out)
+            if deadline <= now:
+                self._stats["expired"] += 1
+                fut.set_exception(DeadlineExceeded("Deadline passed while queued for Revit"))
+                continue
+            self._active += 1
+            fut.set_result(None)
+
+    async def _acquire(self, priority, deadline):
+        if self._active < self.max_concurrency and not self._depth():
+            self._active += 1
+            return
+        if self._depth() >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise SchedulerBusy("Revit request queue is full (%d waiting); retry later" % self._depth())
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), fut, deadline))
+        self._stats["maxDepth"] = max(self._stats["maxDepth"], self._depth())
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                self._release()  # granted just as the wait timed out
+            fut.cancel()
+            self._stats["expired"] += 1
+            raise DeadlineExceeded("Deadline passed while queued for Revit")
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                self._release()
+            fut.cancel()
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._wake_next()
+
+    @asynccontextmanager
+    async def slot(self, method, url, timeout):
+        """Wait for a turn to call Revit; yields the seconds left before the deadline."""
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+        await self._acquire(classify(method, url), deadline)
+        self._record_wait((time.monotonic() - t0) * 1000.0)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._stats["expired"] += 1
+            self._release()
+            raise DeadlineExceeded("Deadline passed while queued for Revit")
+        self._stats["sent"] += 1
+        try:
+            yield remaining
+        finally:
+            self._release()
+
+    # -- reporting
+
+    def queued(self):
+        return self._depth()
+
+    def snapshot(self):
+        by_class = dict((name, 0) for name in CLASS_NAMES.values())
+        for priority, _, fut, _ in self._heap:
+            if not fut.done():
+                by_class[CLASS_NAMES[priority]] += 1
+        ordered = sorted(self._waits)
+
+        def pct(q):
+            return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))], 3) if ordered else None
+
+        out = {
+            "maxConcurrency": self.max_concurrency,
+            "maxQueue": self.max_queue,
+            "inFlight": self._active,
+            "queued": sum(by_class.values()),
+            "queuedByClass": by_class,
+            "waitP50Ms": pct(0.50),
+            "waitP95Ms": pct(0.95),
+        }
+        out.update(self._stats)
+        return out
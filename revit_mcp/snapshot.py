@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""Model snapshots written by the extension's /snapshot/ route, read locally.
+
+A snapshot is a directory of flat binary columns plus manifest.json (see
+RevitMCP.extension/revit_mcp/snapshot.py): one row per element with id,
+category, type_id, level_id, the world bounding box and the numeric
+parameters asked for, in Revit internal units.
+
+With NumPy the columns are memory-mapped, so opening a snapshot reads only
+the manifest and an aggregation over millions of rows takes milliseconds.
+Without it they are read into array.array and aggregated in pure Python:
+same results, slower.
+
+LocalReads answers /levels/, /types/, /families/, /families/search/ and
+/quantify/walls/ from the loaded snapshot while change events show the
+model has not changed since it was taken.
+"""
+import json
+import os
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+OPS = ("sum", "mean", "min", "max", "count")
+GROUP_COLUMNS = {"level": "level_id", "category": "category", "type": "type_id"}
+
+# spec (ForgeTypeId without version) -> (internal unit to SI factor, unit)
+TO_METRIC = {
+    "autodesk.spec.aec:length": (0.3048, "m"),
+    "autodesk.spec.aec:area": (0.09290304, "m²"),
+    "autodesk.spec.aec:volume": (0.028316846592, "m³"),
+}
+BOX_SPEC = "autodesk.spec.aec:length"
+OST_WALLS = -2000011  # BuiltInCategory id: the manifest's category names are localized
+
+_current = [None]
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _category_key(name):
+    """"OST_StructuralColumns", "Structural Columns" and "structural columns" compare equal."""
+    name = name[4:] if name.startswith("OST_") else name
+    return name.replace(" ", "").lower()
+
+
+def _seq(event_id):
+    """Sequence number of an "<epoch>:<seq>" event id (-1 when missing)."""
+    try:
+        return int(str(event_id).rsplit(":", 1)[1])
+    except (IndexError, ValueError):
+        return -1
+
+
+def _accumulate(a, v):
+    a[0] += v
+    a[1] += 1
+    a[2] = v if a[2] is None or v < a[2] else a[2]
+    a[3] = v if a[3] is None or v > a[3] else a[3]
+
+
+class Snapshot(object):
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (IOError, OSError, ValueError) as ex:
+            raise SnapshotError("Not a snapshot: %s (%s)" % (path, ex))
+        self.rows = self.manifest["rows"]
+        self._specs = dict((c["name"], c) for c in self.manifest["columns"])
+        self._columns = {}
+        self.levels = dict((lvl["id"], lvl["name"]) for lvl in self.manifest["catalog"]["levels"])
+        self.categories = dict((int(k), v) for k, v in self.manifest["categories"].items())
+        self.types = dict((int(k), v) for k, v in self.manifest["types"].items())
+
+    @property
+    def column_names(self):
+        return [c["name"] for c in self.manifest["columns"]]
+
+    def column(self, name):
+        """The column as a read-only NumPy array (memory-mapped) or array.array."""
+        col = self._columns.get(name)
+        if col is not None:
+            return col
+        spec = self._specs.get(name)
+        if spec is None:
+            raise SnapshotError("Unknown column '%s' (have %s)" % (name, ", ".join(self.column_names)))
+        fname = os.path.join(self.path, spec["file"])
+        dtype = spec["dtype"]
+        if np is not None:
+            if self.rows == 0:
+                col = np.zeros(0, dtype=np.dtype(dtype))
+            else:
+                col = np.memmap(fname, dtype=np.dtype(dtype), mode="r", shape=(self.rows,))
+        else:
+            col = array("i" if dtype.endswith("i4") else "d")
+            with open(fname, "rb") as f:
+                col.fromfile(f, self.rows)
+            if dtype[0] != ("<" if sys.byteorder == "little" else ">"):
+                col.byteswap()
+        self._columns[name] = col
+        return col
+
+    def unit(self, name):
+        """(factor to SI, unit) for a column, or (1.0, None) when unitless or unknown."""
+        if name in ("min_x", "min_y", "min_z", "max_x", "max_y", "max_z"):
+            spec = BOX_SPEC
+        else:
+            spec = (self.manifest["parameters"].get(name) or {}).get("spec") or ""
+        return TO_METRIC.get(spec.split("-", 1)[0], (1.0, None))
+
+    def category_ids(self, names):
+        wanted = set(_category_key(n) for n in names)
+        ids = [cid for cid, cname in self.categories.items() if _category_key(cname) in wanted]
+        if not ids:
+            raise SnapshotError("No rows of categories %s in the snapshot (have %s)"
+                                % (", ".join(names), ", ".join(sorted(self.categories.values()))))
+        return ids
+
+    def group_name(self, by, key):
+        if key == -1:
+            return None
+        if by == "level":
+            return self.levels.get(key)
+        if by == "category":
+            return self.categories.get(key)
+        row = self.types.get(key)
+        return "%s: %s" % (row["family"], row["name"]) if row and row.get("family") else (row or {}).get("name")
+
+    def aggregate(self, column=None, op="sum", by=None, categories=None, metric=True):
+        """op over a column (ignoring missing values), optionally per level, category or type.
+
+        op "count" without a column counts rows."""
+        if op not in OPS:
+            raise SnapshotError("Unknown op '%s' (use %s)" % (op, ", ".join(OPS)))
+        if by is not None and by not in GROUP_COLUMNS:
+            raise SnapshotError("Unknown grouping '%s' (use %s)" % (by, ", ".join(GROUP_COLUMNS)))
+        if column is None and op != "count":
+            raise SnapshotError("op '%s' needs a column" % op)
+        started = time.perf_counter()
+        cat_ids = self.category_ids(categories) if categories else None
+        values = self.column(column) if column is not None else None
+        keys = self.column(GROUP_COLUMNS[by]) if by else None
+        if np is not None:
+            total, groups = self._aggregate_np(values, op, keys, cat_ids)
+        else:
+            total, groups = self._aggregate_py(values, op, keys, cat_ids)
+        factor, unit = self.unit(column) if column is not None and metric and op != "count" else (1.0, None)
+
+        def scaled(v):
+            return v if v is None or factor == 1.0 else v * factor
+
+        out = {
+            "column": column,
+            "op": op,
+            "by": by,
+            "unit": unit,
+            "value": scaled(total[0]),
+            "count": total[1],
+        }
+        if by:
+            out["groups"] = [{"key": k, "name": self.group_name(by, k), "value": scaled(v), "count": n}
+                             for k, (v, n) in sorted(groups.items())]
+        out["snapshot"] = self.info()
+        out["ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        return out
+
+    @staticmethod
+    def _reduce_np(vals, op):
+        n = int(vals.size)
+        if op == "count":
+            return n, n
+        if n == 0:
+            return None, 0
+        fn = {"sum": np.sum, "mean": np.mean, "min": np.min, "max": np.max}[op]
+        return float(fn(vals)), n
+
+    def _aggregate_np(self, values, op, keys, cat_ids):
+        mask = np.ones(self.rows, dtype=bool)
+        if cat_ids is not None:
+            mask &= np.isin(self.column("category"), cat_ids)
+        if values is not None:
+            vals = np.asarray(values, dtype=float)
+            mask &= ~np.isnan(vals)
+            vals = vals[mask]
+        else:
+            vals = np.zeros(int(mask.sum()))
+        total = self._reduce_np(vals, op)
+        groups = {}
+        if keys is not None and vals.size:
+            uniq, inv = np.unique(np.asarray(keys)[mask], return_inverse=True)
+            counts = np.bincount(inv, minlength=uniq.size)
+            if op in ("sum", "mean"):
+                sums = np.bincount(inv, weights=vals, minlength=uniq.size)
+                res = sums / counts if op == "mean" else sums
+            elif op == "min":
+                res = np.full(uniq.size, np.inf)
+                np.minimum.at(res, inv, vals)
+            elif op == "max":
+                res = np.full(uniq.size, -np.inf)
+                np.maximum.at(res, inv, vals)
+            else:
+                res = counts
+            for k, v, n in zip(uniq.tolist(), res.tolist(), counts.tolist()):
+                groups[k] = (v, n)
+        return total, groups
+
+    def _aggregate_py(self, values, op, keys, cat_ids):
+        cats = self.column("category") if cat_ids is not None else None
+        wanted = set(cat_ids or ())
+        acc = {}  # key -> [sum, count, min, max]
+        total = [0.0, 0, None, None]
+        for i in range(self.rows):
+            if cats is not None and cats[i] not in wanted:
+                continue
+            v = values[i] if values is not None else 0.0
+            if v != v:  # NaN: missing
+                continue
+            _accumulate(total, v)
+            if keys is not None:
+                _accumulate(acc.setdefault(keys[i], [0.0, 0, None, None]), v)
+
+        def result(a):
+            if op == "count":
+                return a[1], a[1]
+            if a[1] == 0:
+                return None, 0
+            return {"sum": a[0], "mean": a[0] / a[1], "min": a[2], "max": a[3]}[op], a[1]
+
+        return result(total), dict((k, result(a)) for k, a in acc.items())
+
+    def info(self):
+        m = self.manifest
+        return {"path": self.path, "document": m["document"], "rows": self.rows, "created": m["created"],
+                "ageSeconds": round(time.time() - m["created"], 1), "changeCounter": m["changeCounter"],
+                "columns": self.column_names}
+
+
+def load(path):
+    """Open the snapshot at path and make it the current one."""
+    snap = Snapshot(path)
+    _current[0] = snap
+    return snap
+
+
+def current():
+    return _current[0]
+
+
+class LocalReads(object):
+    """Answers read-only routes from the current snapshot while it still describes the model.
+
+    Freshness comes from the change event stream: the snapshot is used only
+    while the stream is live, Revit's epoch (session) is the one it was taken
+    in, its document is the active one and that document's change counter
+    has not moved since. Anything else goes to Revit, and the reason is
+    counted, so "snapshot" in server_metrics() shows local vs. live hits.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.epoch = None
+        self.active_document = None
+        self.active_seq = -1  # event seq the active document is known as of
+        self.counters = {}
+        self._hits = {}  # path -> {"local": n, "live": n}
+        self._stale = {}  # reason -> n
+        stream.listeners.append(self.observe)
+        self._answers = {
+            ("GET", "/levels/"): lambda snap, body: {"levels": snap.manifest["catalog"]["levels"]},
+            ("GET", "/types/"): lambda snap, body: snap.manifest["catalog"]["types"],
+            ("GET", "/families/"): self._families,
+            ("POST", "/families/search/"): self._search_families,
+            ("GET", "/quantify/walls/"): self._quantify_walls,
+        }
+
+    def observe(self, kind, event):
+        if kind == "ready":
+            self.epoch = event.get("epoch")
+            self.active_document, self.active_seq = event.get("activeDocument"), _seq(event.get("lastId"))
+            self.counters = dict(event.get("changeCounters") or {})
+        elif kind == "document_changed":
+            self.counters[event.get("document")] = event.get("changeCounter")
+        elif kind in ("view_activated", "document_opened"):
+            self.active_document, self.active_seq = event.get("document"), _seq(event.get("id"))
+        elif kind == "document_closed" and event.get("document") == self.active_document:
+            self.active_document, self.active_seq = None, _seq(event.get("id"))
+
+    def stale_reason(self, snap):
+        """None when snap can answer for the model, else why not."""
+        if snap is None:
+            return "noSnapshot"
+        if not self.stream.live:
+            return "streamDown"
+        m = snap.manifest
+        if m.get("epoch") != self.epoch:
+            return "revitRestarted"
+        # The snapshot route ran on the active document: that holds until a later event says otherwise
+        if self.active_seq > _seq(m.get("lastEventId")) and m["document"] != self.active_document:
+            return "otherDocument"
+        if self.counters.get(m["document"], 0) != m["changeCounter"]:
+            return "modelChanged"
+        return None
+
+    def answer(self, method, url, body=None):
+        """The route's response computed from the snapshot, or None to ask Revit."""
+        path = url.split("/revit_mcp", 1)[-1].split("?", 1)[0]
+        fn = self._answers.get((method, path))
+        if fn is None:
+            return None
+        hits = self._hits.setdefault(path, {"local": 0, "live": 0})
+        snap = current()
+        reason = self.stale_reason(snap)
+        result = fn(snap, body or {}) if reason is None else None
+        if reason is None and result is None:
+            reason = "notInSnapshot"
+        if reason is not None:
+            hits["live"] += 1
+            self._stale[reason] = self._stale.get(reason, 0) + 1
+            return None
+        hits["local"] += 1
+        return result
+
+    @staticmethod
+    def _families(snap, body):
+        families = snap.manifest["catalog"]["families"]
+        return {"families": families, "count": len(families)}
+
+    @staticmethod
+    def _search_families(snap, body):
+        # Same matching as the extension's /families/search/
+        query = body.get("query", "").lower()
+        category_filter = body.get("category")
+        families = []
+        for fam in snap.manifest["catalog"]["families"]:
+            cat_name = fam["category"]
+            if category_filter and cat_name.lower() != category_filter.lower():
+                continue
+            if query and query not in fam["name"].lower() and query not in cat_name.lower():
+                continue
+            families.append(fam)
+        return {"families": families, "count": len(families), "query": query, "categoryFilter": category_filter}
+
+    @staticmethod
+    def _quantify_walls(snap, body):
+        # Same rows as the extension's /quantify/walls/; needs HOST_AREA_COMPUTED in the snapshot
+        wanted = snap.manifest.get("categoryFilter")
+        if "HOST_AREA_COMPUTED" not in snap.column_names or (
+                wanted and _category_key("Walls") not in set(_category_key(c) for c in wanted)):
+            return None
+        if OST_WALLS not in snap.categories:
+            return None  # no wall rows: cannot tell an empty model from a missing category
+        walls_cat = [OST_WALLS]
+        cats, ids, areas, types = (snap.column(c) for c in ("category", "id", "HOST_AREA_COMPUTED", "type_id"))
+        if np is not None:
+            mask = np.isin(cats, walls_cat) & ~np.isnan(areas)
+            rows = zip(ids[mask].tolist(), areas[mask].tolist(), types[mask].tolist())
+        else:
+            wanted = set(walls_cat)
+            rows = [(ids[i], areas[i], types[i]) for i in range(snap.rows)
+                    if cats[i] in wanted and areas[i] == areas[i]]
+        factor = TO_METRIC["autodesk.spec.aec:area"][0]
+        walls = []
+        total_area = 0.0
+        for eid, area, type_id in rows:
+            area_sqm = area * factor
+            paint_area = area_sqm * 2  # both faces
+            walls.append({"id": eid, "name": (snap.types.get(type_id) or {}).get("name", "Wall"),
+                          "area_m2": round(area_sqm, 2), "paint_area_m2": round(paint_area, 2)})
+            total_area += paint_area
+        return {"walls": walls, "total_walls": len(walls), "total_paint_area_m2": round(total_area, 2), "unit": "m²"}
+
+    def snapshot(self):
+        local = sum(h["local"] for h in self._hits.values())
+        live = sum(h["live"] for h in self._hits.values())
+        snap = current()
+        return {
+            "loaded": snap.info() if snap is not None else None,
+            "staleReason": self.stale_reason(snap),
+            "local": local,
+            "live": live,
+            "localRatio": round(local / float(local + live), 4) if local + live else None,
+            "routes": dict((path, dict(h)) for path, h in self._hits.items()),
+            "liveReasons": dict(self._stale),
+        }
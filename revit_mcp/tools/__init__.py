@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
-from . import catalog, elements, families, geometry
+from . import catalog, core, design, elements, families, geometry, grids, layout, parameters, query, snapshot, spatial
 
 
 def register_all(mcp, base_url, http_get, http_post):
+    core.register(mcp, base_url, http_get, http_post)
     catalog.register(mcp, base_url, http_get, http_post)
     geometry.register(mcp, base_url, http_get, http_post)
     elements.register(mcp, base_url, http_get,http_post)
     families.register(mcp, base_url, http_get, http_post)
+    query.register(mcp, base_url, http_get, http_post)
+    parameters.register(mcp, base_url, http_get, http_post)
+    snapshot.register(mcp, base_url, http_get, http_post)
+    spatial.register(mcp, base_url, http_get, http_post)
+    layout.register(mcp, base_url, http_get, http_post)
+    grids.register(mcp, base_url, http_get, http_post)
+    design.register(mcp, base_url, http_get, http_post)
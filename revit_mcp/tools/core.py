@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import metrics
+from resilience import RevitUnavailable
+
+
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def get_status(ctx=None):
+        """Report whether Revit is reachable and how busy it is.
+        
+        Returns the document status plus route metrics collected inside Revit:
+        uptime, per-route call counts and p50/p95/p99 latency, transaction
+        counts and cache hit ratios. "client" shows requests this MCP server
+        has sent that are still waiting; since Revit runs routes one at a time,
+        anything beyond the one being executed is queued. "queuedInScheduler"
+        are calls held back by this server until Revit is free. While Revit
+        does not answer (modal dialog, closing), returns "status": "unavailable"
+        with the circuit breaker state instead of waiting for a timeout.
+        
+        Example return:
+        {
+            "status": "active",
+            "revit_available": true,
+            "document_title": "Project1",
+            "metrics": {
+                "uptimeSeconds": 3600.2,
+                "inFlight": 0,
+                "routes": {"GET /levels/": {"calls": 12, "errors": 0, "p50Ms": 4.1, "p95Ms": 9.8, "p99Ms": 12.0}},
+                "transactions": {"committed": 40, "rolledBack": 1},
+                "caches": {"detailViewValidation": {"hits": 1999, "misses": 1, "hitRatio": 0.9995}}
+            },
+            "client": {"pendingRequests": 1, "queuedInRevit": 0, "queuedInScheduler": 4}
+        }
+        """
+        try:
+            result = await http_get(base_url + "/status/")
+        except RevitUnavailable as ex:
+            return {"status": "unavailable", "revit_available": False, "reason": str(ex),
+                    "breaker": metrics.section("breaker")}
+        # This call is no longer pending once its response is back.
+        pending = metrics.pending_requests()
+        running = 1 if pending else 0
+        sched = metrics.section("scheduler") or {}
+        result["client"] = {"pendingRequests": pending, "queuedInRevit": max(0, pending - running),
+                            "queuedInScheduler": sched.get("queued", 0)}
+        return result
+
+    @mcp.tool()
+    async def server_metrics(writePrometheus: bool = False, ctx=None):
+        """Latency and traffic of this MCP server's tools since it started.
+        
+        "scheduler" shows calls queued for Revit by priority class, queue
+        wait percentiles and calls rejected (queue full) or expired (deadline
+        passed before they were sent).
+        
+        Per tool: calls, errors, retries, p50/p95/p99 and a latency histogram
+        (end to end), plus its HTTP calls to Revit split into time Revit spent
+        on the route ("revitMs") and the rest ("networkMs": transport, queueing
+        in Revit, JSON handling), with request/response bytes.
+        
+        Args:
+            writePrometheus: Also write the metrics in Prometheus text format to
+                REVIT_MCP_METRICS_FILE (when that variable is set)
+        
+        Example return:
+        {
+            "uptimeSeconds": 812.4,
+            "pendingRequests": 0,
+            "tools": {
+                "get_levels": {
+                    "calls": 6, "errors": 0, "retries": 0,
+                    "meanMs": 41.2, "maxMs": 88.0, "p50Ms": 35.1, "p95Ms": 88.0, "p99Ms": 88.0,
+                    "histogramMs": {"le_5": 0, "le_10": 0, "le_25": 1, "le_50": 4, "le_100": 1, ...},
+                    "http": {"calls": 6, "errors": 0, "totalMs": 240.3, "revitMs": 61.8, "networkMs": 178.5,
+                             "requestBytes": 0, "responseBytes": 5120}
+                }
+            },
+            "prometheusFile": null
+        }
+        """
+        result = metrics.snapshot()
+        result["prometheusFile"] = metrics.dump() if writePrometheus else None
+        return result
+
+    @mcp.tool()
+    async def start_route_profiling(mode: str = "deterministic", requests: int = None, seconds: float = None,
+                                    routes: list = None, intervalMs: int = 5, ctx=None):
+        """Profile the next Revit route calls to find out why they are slow.
+        
+        Args:
+            mode: "deterministic" (every function call) or "sampling" (stack samples every intervalMs)
+            requests: Number of matching requests to profile (default 10 if seconds is not given)
+            seconds: Profile matching requests for this many seconds
+            routes: Only profile these routes, e.g. ["POST /draw_curves/", "GET /types/"]
+            intervalMs: Sampling interval for mode="sampling"
+        
+        Run the slow tool calls afterwards, then call get_route_profile for the report.
+        """
+        return await http_post(base_url + "/debug/profile/", {
+            "mode": mode, "requests": requests, "seconds": seconds, "routes": routes, "intervalMs": intervalMs
+        })
+
+    @mcp.tool()
+    async def get_route_profile(ctx=None):
+        """Return the report of the current or last route profiling session.
+        
+        "text" holds the top functions (deterministic) or hottest stacks (sampling);
+        "statsPath" is the full pstats/folded-stack file saved on the Revit machine.
+        """
+        return await http_get(base_url + "/debug/profile/report/")
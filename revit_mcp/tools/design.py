@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import nbr6118
+
+
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def design_columns_nbr6118(columns: list, barDiameters: list = None, stirrupDiameters: list = None,
+                                     barTypeFormat: str = nbr6118.BAR_TYPE_FORMAT, ctx=None):
+        """Design reinforced concrete columns to NBR 6118:2014 under centred compression, in bulk.
+
+        Runs locally (no Revit call): As,min/As,max, required steel, the
+        cheapest longitudinal layout (bar diameter, count, bars per face) that
+        meets the bar size and spacing limits, and stirrup diameter and
+        spacing. Moments are not designed for: pass Nd already amplified for
+        the eccentricities you consider. Each designed column carries a
+        "detailing" entry for the rebar placement tools; all of them are also
+        returned together in "detailing".
+
+        Args:
+            columns: [{"id": 398870, "b": 0.2, "h": 0.4, "fck": 30, "nd": 850}]
+                b, h (or "diameter" for circular) and cover in m, fck/fyk in MPa,
+                nd in kN; optional "fyk" (500), "cover" (0.03), "aggregate" (19 mm)
+            barDiameters: Candidate longitudinal diameters in mm (default 10 .. 40)
+            stirrupDiameters: Stirrup diameters in mm the project stocks (default 5, 6.3, 8, 10, 12.5)
+            barTypeFormat: Rebar bar type name for a diameter, "{d}" is replaced (default "Ø{d} CA50")
+
+        Example return:
+        {
+            "columns": [{"id": 398870, "status": "ok", "asMin": 1.955, "asMax": 32.0, "asRequired": 1.955,
+                         "bars": 4, "barDiameter": 10.0, "barsPerFace": [2, 2], "asProvided": 3.142,
+                         "stirrupDiameter": 5.0, "stirrupSpacing": 0.12, "crossTies": false, "warnings": [],
+                         "detailing": {"columnId": 398870, "barType": "Ø10 CA50", "stirrupSpacing": 0.12,
+                                       "cover": 0.03, "shape": "rectangular", "barsX": 2, "barsY": 2}}],
+            "detailing": [{"columnId": 398870, "barType": "Ø10 CA50", "...": "..."}],
+            "summary": {"columns": 1, "byStatus": {"ok": 1}, "vectorized": true, "ms": 0.4}
+        }
+        """
+        try:
+            result = nbr6118.design(columns, barDiameters or nbr6118.LONGITUDINAL_MM,
+                                    stirrupDiameters or nbr6118.STIRRUP_MM, barTypeFormat)
+        except nbr6118.DesignError as ex:
+            return {"ok": False, "error": str(ex)}
+        result["detailing"] = [c["detailing"] for c in result["columns"] if c["status"] == "ok"]
+        return result
@@ -1,16 +1,35 @@
 # -*- coding: utf-8 -*-
 def register(mcp, base_url, http_get, http_post):
     @mcp.tool()
-    async def create_wall_line(x1, y1, x2, y2, z=0.0, level="Level 1", wall_type=None, ctx=None):
-        return await http_post(base_url + "/create_wall_line/", {
+    async def create_wall_line(x1, y1, x2, y2, z=0.0, level="Level 1", wall_type=None,
+                               clashCheck: bool = False, clearance: float = None, ctx=None):
+        """Create a straight wall (coordinates in feet).
+
+        With clashCheck the wall is not created if an existing wall on the level
+        lies within clearance (default: half the wall type's width) of the line;
+        the response then has "ok": false and the "clashes".
+        """
+        payload = {
             "x1": x1, "y1": y1, "x2": x2, "y2": y2, "z": z,
-            "level": level, "wall_type": wall_type
-        })
+            "level": level, "wall_type": wall_type, "clashCheck": clashCheck
+        }
+        if clearance is not None:
+            payload["clearance"] = clearance
+        return await http_post(base_url + "/create_wall_line/", payload)
 
     @mcp.tool()
-    async def place_column(x, y, z=0.0, level="Level 1", type=None, ctx=None):
+    async def place_column(x, y, z=0.0, level="Level 1", type=None,
+                           clashCheck: bool = False, clearance: float = 0.0, ctx=None):
+        """Place a structural column (coordinates in feet).
+
+        With clashCheck the column is not placed if an existing column on the
+        level is within clearance of (x, y); the response then has "ok": false
+        and the "clashes", e.g. [{"id": 3312, "category": "Structural Columns",
+        "levelId": 311, "distance": 0.0}].
+        """
         return await http_post(base_url + "/place_column/", {
-            "x": x, "y": y, "z": z, "level": level, "type": type
+            "x": x, "y": y, "z": z, "level": level, "type": type,
+            "clashCheck": clashCheck, "clearance": clearance
         })
     
     @mcp.tool()
@@ -21,28 +40,148 @@ def register(mcp, base_url, http_get, http_post):
         and total paint area in square meters (m²).
         """
         return await http_get(base_url + "/quantify/walls/")
+
+    @mcp.tool()
+    async def quantify_rebar(groupBy: list = None, perHost: bool = False, limit: int = 100, cursor: int = None,
+                             ctx=None):
+        """Steel takeoff: bar count, length and weight of all rebar, grouped for budgeting.
+
+        Walks the rebar once in Revit. Weight is total bar length x linear mass
+        (7850 kg/m³ x nominal bar area), so 10 mm bars weigh 0.617 kg/m.
+
+        Args:
+            groupBy: Any of "level", "category" (host category), "barType", "diameter"
+                (default ["level", "category", "barType"]); e.g. ["level", "diameter"] for kg per diameter per level
+            perHost: Also list each host element's bars, length and weight, a page at a time
+            limit: Hosts per page (max 1000)
+            cursor: "nextCursor" of the previous page
+
+        Example return:
+        {
+            "groupBy": ["level", "diameter"],
+            "groups": [{"level": "Level 1", "diameter": 10.0, "bars": 480, "lengthM": 1392.0, "weightKg": 858.3,
+                        "elements": 96}],
+            "total": {"bars": 4681, "lengthM": 9655.1, "weightKg": 5927.0, "elements": 1203},
+            "barTypes": [{"barType": "Ø10 CA50", "diameterMm": 10.0, "kgPerM": 0.6165}],
+            "hosts": [{"hostId": 398870, "category": "Structural Columns", "level": "Level 1", "bars": 24,
+                       "lengthM": 70.2, "weightKg": 61.9, "byBarType": {"Ø12.5 CA50": 44.1, "Ø5 CA50": 17.8}}],
+            "hostCount": 144, "nextCursor": 398870
+        }
+        """
+        payload = {"groupBy": groupBy, "perHost": perHost, "limit": limit}
+        if cursor is not None:
+            payload["cursor"] = cursor
+        return await http_post(base_url + "/quantify/rebar/", payload)
     
     @mcp.tool()
     async def place_rebar_cage_column(columnId: int, barType: str = None, stirrupShape: str = None, 
-                                       stirrupSpacing: float = 0.2, cover: float = 0.03, ctx=None):
+                                       stirrupSpacing: float = None, cover: float = 0.03, barsX: int = 2,
+                                       barsY: int = 2, stirrupBarType: str = None, ctx=None):
         """Create reinforcement cage for a concrete column with longitudinal bars and stirrups.
         
-        Places 4 vertical rebar bars at corners (with cover) and stirrups distributed along height.
+        Places barsX bars on each face along the column's width and barsY along
+        its depth (corners shared), following the column's own axes, and
+        stirrups distributed along its height when stirrupShape or
+        stirrupSpacing is given. Identical bars are created as one rebar set,
+        so a cage is at most five elements.
         
         Args:
             columnId: Element ID of the structural concrete column to detail
             barType: Name of RebarBarType (e.g., "Ø12 CA50"). Uses first available if not specified.
-            stirrupShape: Name of RebarShape for stirrups (e.g., "Stirrup"). Optional.
-            stirrupSpacing: Maximum spacing between stirrups in meters (default: 0.2m = 200mm)
+            stirrupShape: Name of RebarShape for stirrups (e.g., "Stirrup"). Optional; without it
+                and stirrupSpacing no stirrups are placed
+            stirrupSpacing: Maximum spacing between stirrups in meters (0.2m = 200mm when only
+                stirrupShape is given); stirrups without a shape use a Revit stirrup/tie style
             cover: Concrete cover in meters (default: 0.03m = 30mm)
+            barsX: Bars per face along the width, corners included (default 2)
+            barsY: Bars per face along the depth, corners included (default 2)
+            stirrupBarType: RebarBarType for the stirrups (default: barType)
         
         Returns:
-            {"ok": True, "elementIds": [list of created rebar element IDs]}
+            {"ok": True, "elementIds": [...], "bars": 4, "stirrups": 16, "elements": 3, "sets": [...]}
         """
         return await http_post(base_url + "/place/rebar_cage_column/", {
             "columnId": columnId,
             "barType": barType,
             "stirrupShape": stirrupShape,
             "stirrupSpacing": stirrupSpacing,
-            "cover": cover
-        })
\ No newline at end of file
+            "cover": cover,
+            "barsX": barsX,
+            "barsY": barsY,
+            "stirrupBarType": stirrupBarType
+        })
+
+    @mcp.tool()
+    async def place_rebar_cages(cages: list, cover: float = None, stirrupShape: str = None, dryRun: bool = False,
+                                ctx=None):
+        """Detail many concrete columns in one transaction, e.g. the "detailing" list of design_columns_nbr6118.
+
+        Each cage follows its column's axes (rotated columns included) and its
+        section: bars per face for rectangular columns, bars round a hoop for
+        circular ones. Cages that cannot be built (unknown bar type, section
+        too small for cover and bars) are listed in "failed"; the rest are created.
+
+        Args:
+            cages: [{"columnId": 398870, "barType": "Ø12.5 CA50", "stirrupBarType": "Ø5 CA50",
+                     "stirrupSpacing": 0.15, "cover": 0.03, "barsX": 2, "barsY": 4}]
+                circular columns: {"columnId": ..., "shape": "circular", "bars": 8, ...}
+            cover: Cover in meters for cages that do not give one
+            stirrupShape: RebarShape name for stirrups (default: Revit picks a stirrup/tie shape).
+                Cages get stirrups when they (or this) give stirrupShape or stirrupSpacing
+            dryRun: Only lay out the cages and report bar counts
+
+        Example return:
+        {
+            "ok": true, "dryRun": false, "count": 2, "bars": 12, "elements": 8,
+            "cages": [{"columnId": 398870, "shape": "rectangular", "barType": "Ø12.5 CA50", "bars": 8,
+                       "stirrups": 20, "elements": 5, "elementIds": [401200, 401201, 401202, 401203, 401204]}],
+            "failed": [{"index": 1, "columnId": 398871, "error": "RebarBarType not found: Ø40 CA50"}]
+        }
+        """
+        payload = {"cages": cages, "dryRun": dryRun}
+        if cover is not None:
+            payload["cover"] = cover
+        if stirrupShape:
+            payload["stirrupShape"] = stirrupShape
+        return await http_post(base_url + "/place/rebar_cages/", payload)
+
+    @mcp.tool()
+    async def place_beams(level: str = "Level 1", beams: list = None, connect: str = None,
+                          columnLevel: str = None, type: str = None, offset: float = 0.0,
+                          tolerance: float = 0.5, maxSpan: float = None, skipExisting: bool = True,
+                          dryRun: bool = False, ctx=None):
+        """Create structural beams in one transaction, from explicit lines or by connecting columns.
+
+        Either pass beams, or connect="grid" to frame every pair of neighbouring
+        columns that sit on the same grid line (model X/Y rows when there are
+        no grids). Coordinates are feet.
+
+        Args:
+            level: Level the beams are placed on (drawn at its elevation + offset)
+            beams: [{"x1": 0, "y1": 0, "x2": 20, "y2": 0, "z": 10.0}] ("z" optional)
+            connect: "grid" to connect adjacent columns instead of beams
+            columnLevel: Level whose columns are connected (default: level)
+            type: Framing type name (default: first structural framing type)
+            offset: Height above the level in feet
+            tolerance: How far (feet) a column centre may be off its grid line
+            maxSpan: Do not create beams longer than this (feet)
+            skipExisting: Skip beams that already exist on the level with the same end points
+            dryRun: Only report the beams that would be created
+
+        Example return:
+        {
+            "ok": true, "dryRun": false,
+            "beams": [{"start": [0.0, 0.0], "end": [20.0, 0.0], "id": 402200,
+                       "fromColumn": 402113, "toColumn": 402114, "grid": "1"}],
+            "skipped": [], "count": 1, "type": "300 x 600mm", "level": "Level 2"
+        }
+        """
+        payload = {"level": level, "type": type, "offset": offset, "skipExisting": skipExisting, "dryRun": dryRun}
+        if beams:
+            payload["beams"] = beams
+        elif connect:
+            payload.update({"connect": connect, "columnLevel": columnLevel, "tolerance": tolerance,
+                            "maxSpan": maxSpan})
+        else:
+            return {"ok": False, "error": 'Give beams or connect="grid"'}
+        return await http_post(base_url + "/place_beams/", payload)
@@ -1,4 +1,9 @@
 # -*- coding: utf-8 -*-
+import asyncio
+
+import rfa
+
+
 def register(mcp, base_url, http_get, http_post):
     @mcp.tool()
     async def list_families(ctx=None):
@@ -69,6 +74,38 @@ def register(mcp, base_url, http_get, http_post):
             payload["relativePath"] = relativePath
         return await http_post(base_url + "/families/search_libraries/", payload)
 
+    @mcp.tool()
+    async def describe_family_file(filePath: str, includePartAtom: bool = False, ctx=None):
+        """Preview a family (.rfa file) without loading it into Revit.
+        
+        Reads the file directly (no Revit round-trip), so it is safe to call on
+        many candidates before choosing which one to load with load_family.
+        
+        Args:
+            filePath: Full path to the .rfa family file
+            includePartAtom: Also return the raw PartAtom XML embedded in the file
+        
+        Returns the Revit version that saved the file, the family category, the
+        types listed in the file and, when a <family>.txt type catalog sits next
+        to it, the catalog types.
+        
+        Example return:
+        {
+            "filePath": "C:/ProgramData/.../M_Concreto-Coluna Retangular.rfa",
+            "familyName": "M_Concreto-Coluna Retangular",
+            "revitVersion": "2024",
+            "build": "20230308_1635(x64)",
+            "category": "Structural Columns",
+            "omniClass": "23.25.30.11.14.14",
+            "types": [{"name": "300x300mm", "parameters": {"b": "300.00 mm", "h": "300.00 mm"}}],
+            "typeCatalog": null
+        }
+        """
+        try:
+            return await asyncio.to_thread(rfa.describe_family_file, filePath, includePartAtom)
+        except (OSError, rfa.RfaError) as ex:
+            return {"ok": False, "error": str(ex), "filePath": filePath}
+
     @mcp.tool()
     async def load_family(filePath: str, ctx=None):
         """Load a family (.rfa file) into the active Revit document.
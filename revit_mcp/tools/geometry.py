@@ -1,4 +1,15 @@
 # -*- coding: utf-8 -*-
+import linework
+import polyline
+from mcp.server.fastmcp import Context
+
+
+def _simplified(points, tolerance, fitArcs):
+    """Curve specs and stats for points, or (None, None) when simplification is off."""
+    if tolerance is None and not fitArcs:
+        return None, None
+    return polyline.simplify_polyline(points, float(tolerance or 0.0), arcs=fitArcs)
+
 
 def register(mcp, base_url, http_get, http_post):
     @mcp.tool()
@@ -6,12 +17,107 @@ def register(mcp, base_url, http_get, http_post):
         payload = {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "z1": z1, "z2": z2}
         return await http_post(base_url + "/draw_detail_line/", payload)
 
+    @mcp.tool()
+    async def draw_detail_lines(lines, ctx=None):
+        """Draw many detail lines in the active view in one transaction.
+
+        Args:
+            lines: [{"x1", "y1", "x2", "y2", "z1", "z2"}, ...] or [[x1, y1, x2, y2], ...]
+
+        The view is validated once for the whole batch. Lines that cannot be
+        created are reported in "skipped" with their index.
+        """
+        return await http_post(base_url + "/draw_detail_lines/", {"lines": lines})
+
     @mcp.tool()
     async def draw_model_line(x1, y1, z1, x2, y2, z2, ctx=None):
         payload = {"x1": x1, "y1": y1, "z1": z1, "x2": x2, "y2": y2, "z2": z2}
         return await http_post(base_url + "/draw_model_line/", payload)
 
     @mcp.tool()
-    async def draw_model_polyline(points, ctx=None):
-        # points = [[x,y,z], ...]
-        return await http_post(base_url + "/draw_model_polyline/", {"points": points})
+    async def draw_model_polyline(points, tolerance: float = None, fitArcs: bool = False, ctx=None):
+        """Draw a polyline of model curves through points [[x, y, z], ...].
+
+        Args:
+            points: Polyline vertices in feet
+            tolerance: Optional simplification tolerance in feet. Points closer than
+                this to the simplified polyline are dropped (Douglas-Peucker) and
+                collinear segments are merged.
+            fitArcs: Also replace runs of points on a common circle by arcs (without a
+                tolerance, 1 mm = 1/304.8 ft is used)
+
+        With simplification on, "simplification" in the result reports how many
+        input points became how many curves.
+        """
+        curves, stats = _simplified(points, tolerance, fitArcs)
+        if curves is None:
+            return await http_post(base_url + "/draw_model_polyline/", {"points": points})
+        if not curves:
+            return {"ok": False, "error": "Need at least two distinct points", "simplification": stats}
+        result = await http_post(base_url + "/draw_model_polyline/", {"curves": curves})
+        result["simplification"] = stats
+        return result
+
+    @mcp.tool()
+    async def draw_detail_polyline(points, tolerance: float = None, fitArcs: bool = False, ctx=None):
+        """Draw a polyline of detail curves in the active view through points [[x, y, z], ...].
+
+        Takes the same simplification options as draw_model_polyline.
+        """
+        curves, stats = _simplified(points, tolerance, fitArcs)
+        if curves is None:
+            curves, stats = polyline.simplify_polyline(points, 0.0)
+        if not curves:
+            return {"ok": False, "error": "Need at least two distinct points", "simplification": stats}
+        result = await http_post(base_url + "/draw_detail_lines/", {"curves": curves})
+        result["simplification"] = stats
+        return result
+
+    @mcp.tool()
+    async def import_linework(filePath: str, mode: str = "detail", chunkSize: int = 500, startChunk: int = 0,
+                              scale: float = 1.0, offsetX: float = 0.0, offsetY: float = 0.0, offsetZ: float = 0.0,
+                              ctx: Context = None):
+        """Import 2D linework from a local DXF, SVG or GeoJSON file as detail or model curves.
+
+        The file is read as a stream and sent to Revit in chunks of chunkSize curves.
+        Each chunk is committed as its own transaction group (one undo step), so a
+        failure only loses the chunk that failed.
+
+        Args:
+            filePath: Path to a .dxf, .svg, .geojson/.json or .geojsonl/.ndjson file
+            mode: "detail" (active view) or "model" (horizontal model curves at each z)
+            chunkSize: Curves per request to Revit
+            startChunk: Resume from this chunk; earlier chunks are read but not sent
+            scale: Multiplier from file units to feet (e.g. 1/304.8 for millimetres)
+            offsetX, offsetY, offsetZ: Offset in feet applied after scaling
+
+        Returns counts per import. On failure it returns "resumeFrom" to pass back
+        as startChunk after fixing the cause.
+        """
+        curves = linework.iter_curves(filePath, scale, (offsetX, offsetY, offsetZ))
+        sent = created = 0
+        skipped = []
+        chunk = -1
+        committed = startChunk - 1  # last chunk Revit has created
+        try:
+            for chunk, batch in enumerate(linework.chunked(curves, max(1, int(chunkSize)))):
+                if chunk < startChunk:
+                    continue
+                result = await http_post(base_url + "/draw_curves/", {"mode": mode, "curves": batch, "chunk": chunk})
+                if not result.get("ok", False):
+                    raise RuntimeError(result.get("error") or "chunk %d failed" % chunk)
+                committed = chunk
+                sent += len(batch)
+                created += result.get("count", 0)
+                skipped.extend(dict(s, chunk=chunk) for s in result.get("skipped", []))
+                if ctx is not None:
+                    await ctx.report_progress(sent, None)
+                    await ctx.info("chunk %d: %d curves created (%d total)" % (chunk, result.get("count", 0), created))
+        except Exception as ex:
+            # chunk is the last one read: it failed in Revit unless it was already
+            # committed (or skipped), in which case reading the next one failed
+            return {"ok": False, "error": str(ex), "failedChunk": chunk if chunk > committed else chunk + 1,
+                    "resumeFrom": committed + 1, "curvesSent": sent, "created": created,
+                    "skipped": skipped}
+        return {"ok": True, "chunks": chunk + 1, "startChunk": startChunk, "curvesSent": sent,
+                "created": created, "skipped": skipped}
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def list_grids(ctx=None):
+        """List the document's straight grid lines in drawing order (A, B, ..., 1, 2, ...).
+
+        Example return:
+        {
+            "grids": [{"id": 2101, "name": "A", "start": [0.0, -5.0], "end": [0.0, 95.0], "direction": [0.0, 1.0]}],
+            "count": 14,
+            "skipped": ["R1"]
+        }
+        """
+        return await http_get(base_url + "/grids/")
+
+    @mcp.tool()
+    async def grid_intersections(first: str = None, second: str = None, extend: bool = False, ctx=None):
+        """Compute where grid lines cross, without changing the model.
+
+        Args:
+            first: Grid names, e.g. "A-F", "A,C,E" or "A-C,F" (default: all grids)
+            second: Grid names to cross with first, e.g. "1-8" (default: all grids)
+            extend: Also count crossings beyond the grid lines' ends
+
+        Example return:
+        {"intersections": [{"label": "A-1", "grids": ["A", "1"], "x": 0.0, "y": 0.0}], "count": 48}
+        """
+        return await http_post(base_url + "/grids/intersections/", {"first": first, "second": second,
+                                                                     "extend": extend})
+
+    @mcp.tool()
+    async def place_columns_at_grids(first: str = None, second: str = None, level: str = "Level 1",
+                                     type: str = None, z: float = 0.0, skipExisting: bool = True,
+                                     extend: bool = False, dryRun: bool = False, ctx=None):
+        """Place structural columns at every intersection of the selected grids in one transaction.
+
+        Args:
+            first: Grid names, e.g. "A-F" (default: all grids)
+            second: Grid names to cross with first, e.g. "1-8" (default: all grids)
+            level: Level to place on
+            type: Column type name (default: first structural column type)
+            z: Elevation of the placement point in feet
+            skipExisting: Leave intersections that already have a column on the level
+            extend: Also use crossings beyond the grid lines' ends
+            dryRun: Only report the intersections that would get a column
+
+        Example return:
+        {
+            "ok": true, "dryRun": false,
+            "placed": [{"label": "A-1", "grids": ["A", "1"], "x": 0.0, "y": 0.0, "id": 402113}],
+            "skipped": [{"label": "B-2", "reason": "column exists", "id": 398870}],
+            "count": 47, "intersections": 48, "type": "300 x 300mm", "level": "Level 1"
+        }
+        """
+        return await http_post(base_url + "/place/columns_at_grids/", {
+            "first": first, "second": second, "level": level, "type": type, "z": z,
+            "skipExisting": skipExisting, "extend": extend, "dryRun": dryRun
+        })
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def reconcile_layout(columns: list = None, walls: list = None, level: str = "Level 1",
+                               tolerance: float = 0.01, deleteMissing: bool = True, dryRun: bool = False,
+                               ctx=None):
+        """Make the model match a column/wall plan, changing only what differs.
+
+        Re-run the same plan after editing it: existing elements at the same
+        location (within tolerance, feet) are kept, a different "type" is
+        changed in place, missing items are created and, with deleteMissing,
+        existing columns/walls on the plan's levels that are not in the plan
+        are deleted. Everything is applied in one transaction. Pass only the
+        kinds you manage: omitting walls leaves every wall alone.
+
+        Args:
+            columns: [{"x": 0, "y": 0, "type": "300x300mm", "level": "Level 1"}] ("type"/"level" optional)
+            walls: [{"x1": 0, "y1": 0, "x2": 20, "y2": 0, "type": "Generic - 200mm"}]
+            level: Level for items without one
+            tolerance: Match distance in feet (default 0.01)
+            deleteMissing: Delete existing columns/walls the plan does not list
+            dryRun: Only report what would change
+
+        Example return:
+        {
+            "ok": true, "dryRun": false,
+            "created": [{"kind": "column", "index": 12, "id": 402113}],
+            "updated": [{"kind": "column", "index": 3, "id": 398870, "fromType": "300x300mm", "toType": "400x400mm"}],
+            "deleted": [{"kind": "wall", "id": 397002}],
+            "counts": {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1997, "removedWithDependents": 1},
+            "seconds": 0.41
+        }
+        """
+        if columns is None and walls is None:
+            return {"ok": False, "error": "Give columns and/or walls"}
+        payload = {"level": level, "tolerance": tolerance, "deleteMissing": deleteMissing, "dryRun": dryRun}
+        if columns is not None:
+            payload["columns"] = columns
+        if walls is not None:
+            payload["walls"] = walls
+        return await http_post(base_url + "/layout/reconcile/", payload)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def get_parameters_bulk(elementIds: list, parameters: list, units: str = "display", ctx=None):
+        """Read parameters of many elements in one call.
+
+        Args:
+            elementIds: Element ids, e.g. [100123, 100124]
+            parameters: Parameter display names ("Mark", "Unconnected Height"), BuiltInParameter names
+                ("WALL_USER_HEIGHT_PARAM") or built-in parameter ids (negative ints). Parameters not on the
+                element are read from its type.
+            units: "display" converts lengths, areas, volumes... to the project's units; "internal" returns feet
+
+        Example return:
+        {
+            "elements": [{"id": 100123, "values": {"Mark": "W1", "Unconnected Height": 3.0}}],
+            "units": {"Unconnected Height": "autodesk.unit.unit:meters-1.0.1"},
+            "errors": [{"id": 100124, "parameter": "Mark", "error": "Parameter not found"}],
+            "definitionCache": {"hits": 1, "misses": 2}
+        }
+        """
+        return await http_post(base_url + "/parameters/get_bulk/", {
+            "elementIds": elementIds, "parameters": parameters, "units": units
+        })
+
+    @mcp.tool()
+    async def set_parameters_bulk(items: list = None, elementIds: list = None, values: dict = None,
+                                  units: str = "display", allowTypeParameters: bool = False, ctx=None):
+        """Set parameters of many elements in a single transaction (one undo step).
+
+        Args:
+            items: Individual writes, e.g. [{"id": 100123, "parameter": "Mark", "value": "P1"}]
+            elementIds: Elements that all get `values`, e.g. [100123, 100124]
+            values: Parameter name -> value applied to every id in elementIds, e.g. {"Comments": "checked"}
+            units: "display" reads numbers in the project's units (e.g. meters); "internal" in feet.
+                Text such as "3.5 m" is parsed by Revit.
+            allowTypeParameters: Allow writing parameters that live on the element type (changes every instance)
+
+        Items that fail are reported and skipped; the others are still applied.
+
+        Example return:
+        {"ok": True, "updated": 199, "failed": 1,
+         "errors": [{"index": 7, "id": 100130, "parameter": "Area", "error": "Parameter is read-only"}]}
+        """
+        return await http_post(base_url + "/parameters/set_bulk/", {
+            "items": items or [],
+            "elementIds": elementIds or [],
+            "values": values or {},
+            "units": units,
+            "allowTypeParameters": allowTypeParameters,
+        })
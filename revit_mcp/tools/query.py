@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def query_elements(categories: list = None, classes: list = None, filters: list = None,
+                             fields: list = None, elementTypes: bool = False, limit: int = 100,
+                             cursor: int = None, ctx=None):
+        """Query model elements with filters evaluated inside Revit, returning only the fields asked for.
+
+        Args:
+            categories: BuiltInCategory names, e.g. ["OST_Walls", "OST_StructuralColumns"] ("Walls" also works)
+            classes: Revit API class names, e.g. ["Wall", "FamilyInstance", "Rebar"]
+            filters: Parameter conditions, all of which must hold, e.g.
+                [{"parameter": "HOST_AREA_COMPUTED", "op": "gt", "value": 100.0},
+                 {"parameter": "Mark", "op": "startswith", "value": "P"}]
+                "parameter" is a BuiltInParameter name or a parameter's display name.
+                "op" is one of eq, ne, gt, ge, lt, le, contains, startswith, endswith.
+                Numeric values are in Revit internal units (feet, ft², ft³).
+            fields: Parameters to return per element (same naming as filters), e.g. ["Mark", "Comments"]
+            elementTypes: Query element types instead of instances
+            limit: Page size (max 1000)
+            cursor: "nextCursor" of the previous page
+
+        Example return:
+        {
+            "elements": [{"id": 100123, "name": "Generic - 200mm", "category": "Walls", "typeId": 100010,
+                          "fields": {"Mark": "W1", "HOST_AREA_COMPUTED": 215.3}}],
+            "count": 1,
+            "total": 240,
+            "nextCursor": 100123
+        }
+        Pass "nextCursor" back as cursor until it is null.
+        """
+        return await http_post(base_url + "/elements/query/", {
+            "categories": categories or [],
+            "classes": classes or [],
+            "filters": filters or [],
+            "fields": fields or [],
+            "elementTypes": elementTypes,
+            "limit": limit,
+            "cursor": cursor,
+        })
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import snapshot as snapshots
+
+
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def snapshot_model(parameters: list = None, categories: list = None, ctx=None):
+        """Export every model element to a columnar snapshot on disk and load it for query_snapshot.
+
+        One Revit call scans the model; afterwards questions like "concrete
+        volume per level" are answered locally in milliseconds. Each row has
+        id, category, type_id, level_id, the bounding box (min_x .. max_z) and
+        one column per numeric parameter. Take a new snapshot after the model
+        changes: "changeCounter" identifies the model state it describes.
+        Until the model changes, get_levels, get_element_types, list_families,
+        search_families and quantify_walls are answered from the snapshot too.
+
+        Args:
+            parameters: Numeric parameters to store (BuiltInParameter or display names).
+                Default ["HOST_VOLUME_COMPUTED", "HOST_AREA_COMPUTED", "CURVE_ELEM_LENGTH"]
+            categories: Limit to these categories, e.g. ["OST_StructuralColumns", "OST_Walls"]
+
+        Example return:
+        {
+            "path": "C:/Users/me/AppData/Local/Temp/revit_mcp_snapshots/Project1_20250101-120000-000",
+            "document": "Project1",
+            "rows": 48211,
+            "chunks": 3,
+            "bytes": 4628256,
+            "columns": ["id", "category", "type_id", "level_id", "min_x", "...", "HOST_VOLUME_COMPUTED"],
+            "changeCounter": 112,
+            "seconds": 6.4
+        }
+        """
+        payload = {"parameters": parameters or [], "categories": categories or []}
+        result = await http_post(base_url + "/snapshot/", payload)
+        try:
+            snapshots.load(result["path"])
+        except snapshots.SnapshotError as ex:
+            # Written on another machine or a path this process cannot read
+            return dict(result, loaded=False, error=str(ex))
+        return dict(result, loaded=True)
+
+    @mcp.tool()
+    async def query_snapshot(column: str = None, op: str = "sum", by: str = None, categories: list = None,
+                             metric: bool = True, ctx=None):
+        """Aggregate a column of the loaded model snapshot without calling Revit.
+
+        Args:
+            column: Parameter or bounding box column, e.g. "HOST_VOLUME_COMPUTED", "max_z"
+            op: sum, mean, min, max or count (count without a column counts elements)
+            by: Group by "level", "category" or "type"
+            categories: Only rows of these categories, e.g. ["Structural Columns"] or ["OST_Walls"]
+            metric: Convert lengths, areas and volumes from Revit internal units to m, m², m³
+
+        Missing values (elements without the parameter) are skipped.
+
+        Example return:
+        {
+            "column": "HOST_VOLUME_COMPUTED", "op": "sum", "by": "level", "unit": "m³",
+            "value": 1840.2, "count": 5120,
+            "groups": [{"key": 311, "name": "Level 1", "value": 612.4, "count": 1704}],
+            "snapshot": {"document": "Project1", "rows": 48211, "ageSeconds": 42.0, "changeCounter": 112},
+            "ms": 3.1
+        }
+        """
+        snap = snapshots.current()
+        if snap is None:
+            return {"ok": False, "error": "No snapshot loaded; call snapshot_model first"}
+        try:
+            return snap.aggregate(column, op, by, categories, metric)
+        except snapshots.SnapshotError as ex:
+            return {"ok": False, "error": str(ex)}
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+def register(mcp, base_url, http_get, http_post):
+    @mcp.tool()
+    async def spatial_nearby(x: float, y: float, radius: float = 5.0, z: float = None, level: str = None,
+                             categories: list = None, limit: int = 100, ctx=None):
+        """Find elements whose bounding box lies within radius of a point, nearest first.
+
+        Answered from a spatial index kept in Revit (built on first use, then
+        kept current from model changes), so repeated queries do not scan the model.
+
+        Args:
+            x, y: Point in feet
+            radius: Search radius in feet (default 5)
+            z: Also measure vertical distance from this elevation; omit to search in plan
+            level: Only elements on this level, e.g. "Level 1"
+            categories: e.g. ["OST_StructuralColumns", "OST_Walls"]
+            limit: Maximum elements returned (total has the full count)
+
+        Example return:
+        {
+            "elements": [{"id": 3312, "category": "Structural Columns", "levelId": 311, "distance": 0.0}],
+            "count": 1, "total": 1, "queryUs": 41.7,
+            "index": {"elements": 48211, "levels": 6, "cellSize": 10.0, "buildMs": 2140.0, "updates": 12, "large": 3}
+        }
+        """
+        payload = {"x": x, "y": y, "radius": radius, "z": z, "level": level,
+                   "categories": categories or [], "limit": limit}
+        return await http_post(base_url + "/spatial/nearby/", payload)
+
+    @mcp.tool()
+    async def spatial_overlaps(elementId: int = None, min: list = None, max: list = None, tolerance: float = 0.0,
+                               level: str = None, categories: list = None, limit: int = 100, ctx=None):
+        """Find elements whose bounding box overlaps an element's box or a given box.
+
+        Args:
+            elementId: Element to test against (excluded from the result)
+            min, max: Box corners [x, y, z] in feet, instead of elementId
+            tolerance: Grow the box by this many feet on every side
+            level: Only elements on this level
+            categories: e.g. ["OST_StructuralFraming"]
+            limit: Maximum elements returned (total has the full count)
+
+        Example return:
+        {
+            "elements": [{"id": 4410, "category": "Structural Framing", "levelId": 311}],
+            "count": 1, "total": 1, "queryUs": 22.3, "index": {"elements": 48211, "...": "..."}
+        }
+        """
+        payload = {"tolerance": tolerance, "level": level, "categories": categories or [], "limit": limit}
+        if elementId is not None:
+            payload["elementId"] = elementId
+        elif min is not None and max is not None:
+            payload["min"], payload["max"] = min, max
+        else:
+            return {"ok": False, "error": "Give elementId or both min and max"}
+        return await http_post(base_url + "/spatial/overlaps/", payload)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Summarize route traces written by the extension (revit_mcp_traces.jsonl).
+
+Usage:
+    python trace_report.py revit_mcp_traces.jsonl [more.jsonl ...] [--top 15] [--route "POST /draw_curves/"]
+
+Prints per-route latency, then the hot spots: spans ranked by self time
+(their duration minus their children's), summed over all requests.
+"""
+import argparse
+import json
+from collections import defaultdict
+
+
+def _pct(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def load(paths, route=None):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if route is None or rec.get("route") == route:
+                    yield rec
+
+
+def summarize(records):
+    routes = defaultdict(list)
+    spans = defaultdict(lambda: {"count": 0, "total": 0.0, "self": 0.0, "samples": []})
+    for rec in records:
+        routes[rec["route"]].append(rec["durationMs"])
+        items = rec.get("spans", [])
+        child_ms = defaultdict(float)
+        for s in items:
+            if s.get("parent") is not None:
+                child_ms[s["parent"]] += s["durationMs"]
+        top_ms = sum(s["durationMs"] for s in items if s.get("parent") is None)
+        for i, s in enumerate(items):
+            st = spans[(rec["route"], s["name"])]
+            st["count"] += 1
+            st["total"] += s["durationMs"]
+            st["self"] += s["durationMs"] - child_ms[i]
+            st["samples"].append(s["durationMs"])
+        # Time inside the handler not covered by any span.
+        st = spans[(rec["route"], "(untraced)")]
+        st["count"] += 1
+        own = max(0.0, rec["durationMs"] - top_ms)
+        st["total"] += own
+        st["self"] += own
+        st["samples"].append(own)
+    return routes, spans
+
+
+def report(routes, spans, top=15):
+    lines = ["%-45s %7s %10s %10s %10s %12s" % ("route", "calls", "p50 ms", "p95 ms", "max ms", "total ms")]
+    for route, ds in sorted(routes.items(), key=lambda kv: -sum(kv[1])):
+        o = sorted(ds)
+        lines.append("%-45s %7d %10.2f %10.2f %10.2f %12.1f" % (route, len(o), _pct(o, 0.5), _pct(o, 0.95), o[-1], sum(o)))
+    grand = sum(st["self"] for st in spans.values()) or 1.0
+    lines.append("")
+    lines.append("Hot spots (self time)")
+    lines.append("%-45s %-14s %7s %12s %7s %10s" % ("route", "span", "count", "self ms", "share", "p95 ms"))
+    ranked = sorted(spans.items(), key=lambda kv: -kv[1]["self"])[:top]
+    for (route, name), st in ranked:
+        o = sorted(st["samples"])
+        lines.append("%-45s %-14s %7d %12.1f %6.1f%% %10.2f" % (
+            route, name, st["count"], st["self"], 100.0 * st["self"] / grand, _pct(o, 0.95)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("files", nargs="+")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--route", default=None)
+    args = ap.parse_args(argv)
+    routes, spans = summarize(load(args.files, args.route))
+    if not routes:
+        print("No trace records found.")
+        return 1
+    print(report(routes, spans, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())